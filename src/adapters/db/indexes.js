@@ -0,0 +1,113 @@
+'use strict';
+
+/**
+ * Database Indexes
+ * The indexes the game needs, and idempotent index management: each collection's
+ * existing indexes are listed once and only the missing ones are created, all
+ * collections in parallel. A boot against an up-to-date database costs one
+ * listIndexes round trip per collection instead of a createIndex per index.
+ */
+
+// action_buckets is not listed: its TTL index follows the configured retention
+// and is managed by ActionRecorder.ensureStorage
+const INDEXES = {
+  players: [
+    { key: { name: 1 }, unique: true },
+    { key: { account: 1 } },
+    { key: { room: 1 } },
+    { key: { 'metadata.lastLogin': 1 } }
+  ],
+  accounts: [
+    { key: { username: 1 }, unique: true },
+    { key: { email: 1 }, unique: true }
+  ],
+  rooms: [
+    { key: { id: 1 }, unique: true },
+    { key: { areaId: 1 } }
+  ],
+  areas: [
+    { key: { id: 1 }, unique: true }
+  ],
+  items: [
+    { key: { id: 1 }, unique: true },
+    { key: { areaId: 1 } },
+    // TTL backstop for decaying corpses and dropped items (see ItemLifecycleSystem)
+    { key: { expiresAt: 1 }, expireAfterSeconds: 0 }
+  ],
+  npcs: [
+    { key: { id: 1 }, unique: true },
+    { key: { areaId: 1 } }
+  ]
+};
+
+/**
+ * Key pattern as a comparable string (field order matters in an index)
+ */
+function keyOf(key) {
+  return JSON.stringify(Object.entries(key));
+}
+
+/**
+ * Existing indexes of a collection ([] if the collection does not exist yet)
+ */
+async function listIndexes(collection) {
+  try {
+    return await collection.listIndexes().toArray();
+  } catch (error) {
+    if (error.code === 26 || error.codeName === 'NamespaceNotFound') return [];
+    throw error;
+  }
+}
+
+/**
+ * Create the indexes of one collection that do not exist yet
+ * An index whose TTL changed is updated in place; one whose other options differ is reported, not rebuilt.
+ * @param {Array} specs - [{ key, unique?, expireAfterSeconds? }]
+ * @returns {Promise<Object>} { created, present, updated, conflicts }
+ */
+async function ensureIndexes(db, collectionName, specs) {
+  const collection = db.collection(collectionName);
+  const existing = new Map((await listIndexes(collection)).map(index => [keyOf(index.key), index]));
+  const result = { created: 0, present: 0, updated: 0, conflicts: [] };
+  const missing = [];
+
+  for (const spec of specs) {
+    const index = existing.get(keyOf(spec.key));
+    if (!index) {
+      missing.push(spec);
+    } else if (!!index.unique !== !!spec.unique) {
+      result.conflicts.push(`${collectionName}.${index.name}`);
+    } else if (spec.expireAfterSeconds !== undefined && index.expireAfterSeconds !== spec.expireAfterSeconds) {
+      await db.command({ collMod: collectionName, index: { keyPattern: spec.key, expireAfterSeconds: spec.expireAfterSeconds } });
+      result.updated++;
+    } else {
+      result.present++;
+    }
+  }
+
+  if (missing.length > 0) {
+    await collection.createIndexes(missing);
+    result.created = missing.length;
+  }
+  return result;
+}
+
+/**
+ * Ensure every collection's indexes, collections in parallel
+ * @returns {Promise<Object>} Totals: { created, present, updated, conflicts }
+ */
+async function ensureAllIndexes(db, indexes = INDEXES) {
+  const results = await Promise.all(Object.entries(indexes).map(([name, specs]) => ensureIndexes(db, name, specs)));
+  return results.reduce((total, result) => ({
+    created: total.created + result.created,
+    present: total.present + result.present,
+    updated: total.updated + result.updated,
+    conflicts: total.conflicts.concat(result.conflicts)
+  }), { created: 0, present: 0, updated: 0, conflicts: [] });
+}
+
+module.exports = {
+  INDEXES,
+  ensureIndexes,
+  ensureAllIndexes
+};
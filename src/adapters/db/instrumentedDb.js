@@ -0,0 +1,126 @@
+'use strict';
+
+const metrics = require('../../utils/metrics');
+const queryAudit = require('./queryAudit');
+
+const dbLatency = metrics.histogram('gs3_db_operation_duration_ms', 'MongoDB operation latency by collection and operation');
+const dbErrors = metrics.counter('gs3_db_errors_total', 'Failed MongoDB operations by collection and operation');
+
+// Collection methods that return a promise and are timed directly
+const TIMED_OPERATIONS = new Set([
+  'findOne', 'insertOne', 'insertMany', 'updateOne', 'updateMany', 'replaceOne',
+  'deleteOne', 'deleteMany', 'bulkWrite', 'countDocuments', 'estimatedDocumentCount',
+  'distinct', 'findOneAndUpdate', 'findOneAndDelete', 'findOneAndReplace', 'createIndex', 'createIndexes'
+]);
+
+// Collection methods that return a cursor; the round trip is timed when results are read
+const CURSOR_OPERATIONS = new Set(['find', 'aggregate', 'listIndexes']);
+const CURSOR_READS = new Set(['toArray', 'next', 'hasNext', 'forEach']);
+
+/**
+ * Record one finished operation (and count it against the running command, if any)
+ */
+function record(collection, op, started, failed) {
+  const labels = { collection, op };
+  dbLatency.observe(metrics.since(started), labels);
+  if (failed) dbErrors.inc(labels);
+
+  const context = metrics.currentContext();
+  if (context) context.dbOps = (context.dbOps || 0) + 1;
+}
+
+function timePromise(promise, collection, op) {
+  const started = metrics.now();
+  return promise.then(
+    result => { record(collection, op, started, false); return result; },
+    error => { record(collection, op, started, true); throw error; }
+  );
+}
+
+/**
+ * @param {Object} audit - { filter, sort } while the query audit is recording (the query is recorded on its first read)
+ */
+function instrumentCursor(cursor, collection, op, audit = null) {
+  return new Proxy(cursor, {
+    get(target, prop) {
+      const value = target[prop];
+      if (typeof value !== 'function') return value;
+      if (CURSOR_READS.has(prop)) {
+        return (...args) => {
+          if (audit && !audit.recorded) {
+            audit.recorded = true;
+            queryAudit.record(collection, op, audit.filter, audit.sort);
+          }
+          return timePromise(value.apply(target, args), collection, op);
+        };
+      }
+      const bound = value.bind(target);
+      // Builder methods (sort, limit, project, ...) return the cursor; keep it wrapped
+      return (...args) => {
+        if (audit && prop === 'sort') audit.sort = args[0];
+        const result = bound(...args);
+        return result === target ? instrumentCursor(result, collection, op, audit) : result;
+      };
+    }
+  });
+}
+
+/**
+ * What the query audit records for a cursor operation (null: nothing to audit)
+ */
+function cursorAudit(op, args) {
+  if (!queryAudit.enabled) return null;
+  if (op === 'find') {
+    return { filter: args[0] || {}, sort: (args[1] && args[1].sort) || null, recorded: false };
+  }
+  // An aggregation is audited by its leading $match, the part an index can serve
+  const first = op === 'aggregate' && Array.isArray(args[0]) ? args[0][0] : null;
+  return first && first.$match ? { filter: first.$match, sort: null, recorded: false } : null;
+}
+
+function instrumentCollection(collection) {
+  const name = collection.collectionName;
+  return new Proxy(collection, {
+    get(target, prop) {
+      const value = target[prop];
+      if (typeof value !== 'function') return value;
+      if (TIMED_OPERATIONS.has(prop)) {
+        return (...args) => {
+          if (queryAudit.enabled) queryAudit.recordCall(name, prop, args);
+          return timePromise(value.apply(target, args), name, prop);
+        };
+      }
+      if (CURSOR_OPERATIONS.has(prop)) {
+        return (...args) => instrumentCursor(value.apply(target, args), name, prop, cursorAudit(prop, args));
+      }
+      return value.bind(target);
+    }
+  });
+}
+
+/**
+ * Wrap a MongoDB Db so every collection operation reports its latency
+ * Callers keep using db.collection(name) unchanged.
+ */
+function instrumentDb(db) {
+  const collections = new Map();
+  return new Proxy(db, {
+    get(target, prop) {
+      if (prop === 'collection') {
+        return (name, options) => {
+          if (options) return instrumentCollection(target.collection(name, options));
+          let collection = collections.get(name);
+          if (!collection) {
+            collection = instrumentCollection(target.collection(name));
+            collections.set(name, collection);
+          }
+          return collection;
+        };
+      }
+      const value = target[prop];
+      return typeof value === 'function' ? value.bind(target) : value;
+    }
+  });
+}
+
+module.exports = { instrumentDb };
@@ -1,6 +1,8 @@
 'use strict';
 
 const { MongoClient } = require('mongodb');
+const { instrumentDb } = require('./instrumentedDb');
+const { ensureAllIndexes } = require('./indexes');
 
 /**
  * MongoDB Database Manager
@@ -10,28 +12,40 @@ class DatabaseManager {
   constructor() {
     this.client = null;
     this.db = null;
+    this.connecting = null; // Promise of the connected db
     this.connectionString = process.env.MONGODB_URI || 'mongodb://localhost:27017';
     this.dbName = 'gs3';
   }
 
   /**
    * Initialize the database manager
+   * Safe to call from systems initializing in parallel: they share one connection attempt
    */
-  async initialize() {
-    // If already initialized, return existing connection
-    if (this.db && this.client) {
-      return this.db;
+  initialize() {
+    // If already initialized (or connecting), return the same connection
+    if (!this.connecting) {
+      this.connecting = this.connect().catch(error => {
+        this.connecting = null;
+        throw error;
+      });
     }
-    
+    return this.connecting;
+  }
+
+  /**
+   * Connect and make sure the indexes exist
+   */
+  async connect() {
     try {
       this.client = new MongoClient(this.connectionString);
       await this.client.connect();
-      this.db = this.client.db(this.dbName);
+      // Every collection operation reports latency to the metrics registry
+      this.db = instrumentDb(this.client.db(this.dbName));
       
       console.log('Connected to MongoDB successfully');
       console.log(`Using database: ${this.dbName}`);
       
-      // Create indexes for better performance
+      // Create missing indexes for better performance
       await this.createIndexes();
       
       return this.db;
@@ -42,42 +56,16 @@ class DatabaseManager {
   }
 
   /**
-   * Create database indexes
+   * Create database indexes that do not exist yet (see indexes.js)
    */
   async createIndexes() {
+    const started = Date.now();
     try {
-      // Players collection indexes
-      await this.db.collection('players').createIndex({ name: 1 }, { unique: true });
-      await this.db.collection('players').createIndex({ account: 1 });
-      await this.db.collection('players').createIndex({ room: 1 });
-      await this.db.collection('players').createIndex({ 'metadata.lastLogin': 1 });
-
-      // Accounts collection indexes
-      await this.db.collection('accounts').createIndex({ username: 1 }, { unique: true });
-      await this.db.collection('accounts').createIndex({ email: 1 }, { unique: true });
-
-      // Actions collection indexes
-      await this.db.collection('actions').createIndex({ timestamp: 1 });
-      await this.db.collection('actions').createIndex({ playerId: 1 });
-      await this.db.collection('actions').createIndex({ action: 1 });
-      await this.db.collection('actions').createIndex({ 'context.location': 1 });
-
-      // Rooms collection indexes
-      await this.db.collection('rooms').createIndex({ id: 1 }, { unique: true });
-      await this.db.collection('rooms').createIndex({ area: 1 });
-
-      // Areas collection indexes
-      await this.db.collection('areas').createIndex({ id: 1 }, { unique: true });
-
-      // Items collection indexes
-      await this.db.collection('items').createIndex({ id: 1 }, { unique: true });
-      await this.db.collection('items').createIndex({ areaId: 1 });
-
-      // NPCs collection indexes
-      await this.db.collection('npcs').createIndex({ id: 1 }, { unique: true });
-      await this.db.collection('npcs').createIndex({ areaId: 1 });
-
-      console.log('Database indexes created successfully');
+      const result = await ensureAllIndexes(this.db);
+      console.log(`Database indexes: ${result.present} present, ${result.created} created, ${result.updated} updated (${Date.now() - started}ms)`);
+      if (result.conflicts.length > 0) {
+        console.warn(`Indexes with different options than expected (drop them to rebuild): ${result.conflicts.join(', ')}`);
+      }
     } catch (error) {
       console.error('Failed to create indexes:', error);
     }
@@ -99,6 +87,9 @@ class DatabaseManager {
   async close() {
     if (this.client) {
       await this.client.close();
+      this.client = null;
+      this.db = null;
+      this.connecting = null;
       console.log('MongoDB connection closed');
     }
   }
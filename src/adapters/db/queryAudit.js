@@ -0,0 +1,351 @@
+'use strict';
+
+const path = require('path');
+const metrics = require('../../utils/metrics');
+
+const SRC_DIR = path.join(__dirname, '../..');
+const MAX_SHAPES = 1000; // Shapes are structural, so this only guards against generated field names
+const LOGICAL = new Set(['$and', '$or', '$nor']);
+const EQUALITY = new Set(['$eq', '$in', '$all', '$elemMatch']);
+
+// Operations whose first argument is a filter (findOneAndX also take options.sort)
+const FILTER_OPERATIONS = new Set([
+  'findOne', 'updateOne', 'updateMany', 'replaceOne', 'deleteOne', 'deleteMany',
+  'countDocuments', 'findOneAndUpdate', 'findOneAndDelete', 'findOneAndReplace'
+]);
+const SINGLE_DOCUMENT = new Set(['findOne', 'updateOne', 'replaceOne', 'deleteOne', 'findOneAndUpdate', 'findOneAndDelete', 'findOneAndReplace']);
+
+/**
+ * Structure of a filter with values replaced by '?': { id: '?' }, { id: { $in: '?' } }
+ */
+function shapeOf(value) {
+  if (value === null || typeof value !== 'object' || Array.isArray(value) ||
+      value instanceof Date || value instanceof RegExp || value._bsontype) {
+    return '?';
+  }
+  const shape = {};
+  for (const [key, child] of Object.entries(value)) {
+    shape[key] = LOGICAL.has(key) && Array.isArray(child) ? child.map(shapeOf) : shapeOf(child);
+  }
+  return shape;
+}
+
+/**
+ * Fields of a filter by how an index can serve them: equality, or range (anything else)
+ * @returns {Object|null} { equality: [], range: [] }, or null for $or/$nor (one index per branch)
+ */
+function filterFields(filter, fields = { equality: [], range: [] }) {
+  for (const [key, value] of Object.entries(filter || {})) {
+    if (key === '$and' && Array.isArray(value)) {
+      for (const clause of value) {
+        if (!filterFields(clause, fields)) return null;
+      }
+    } else if (key === '$or' || key === '$nor') {
+      return null;
+    } else if (key.startsWith('$')) {
+      continue; // $expr, $text, $where: no plain index serves these
+    } else {
+      const operators = value && typeof value === 'object' && !Array.isArray(value) && !(value instanceof Date) && !value._bsontype
+        ? Object.keys(value).filter(op => op.startsWith('$'))
+        : [];
+      const isEquality = operators.length === 0 || operators.every(op => EQUALITY.has(op));
+      const list = isEquality ? fields.equality : fields.range;
+      if (!list.includes(key)) list.push(key);
+    }
+  }
+  return fields;
+}
+
+/**
+ * Index key for a query: equality fields, then sort fields, then range fields
+ */
+function suggestKey(filter, sort) {
+  const fields = filterFields(filter);
+  if (!fields) return null;
+  const key = {};
+  for (const field of fields.equality) key[field] = 1;
+  for (const [field, direction] of Object.entries(sort || {})) {
+    if (!(field in key)) key[field] = direction === -1 || direction === 'desc' ? -1 : 1;
+  }
+  for (const field of fields.range) {
+    if (!(field in key)) key[field] = 1;
+  }
+  const names = Object.keys(key);
+  if (names.length === 0 || (names.length === 1 && names[0] === '_id')) return null;
+  return key;
+}
+
+/**
+ * Whether index key `prefix` is a leading prefix of index key `key`
+ */
+function isPrefix(prefix, key) {
+  const a = Object.entries(prefix);
+  const b = Object.entries(key);
+  return a.length <= b.length && a.every(([field, direction], i) => b[i][0] === field && b[i][1] === direction);
+}
+
+/**
+ * Stages of a winning plan (any server version), outermost first
+ */
+function planStages(plan, stages = []) {
+  if (!plan) return stages;
+  const node = plan.queryPlan || plan;
+  stages.push(node);
+  if (node.inputStage) planStages(node.inputStage, stages);
+  for (const input of node.inputStages || []) planStages(input, stages);
+  return stages;
+}
+
+/**
+ * Where in the code a database call came from: the running command, else the first frame outside adapters/db
+ */
+function callerOf() {
+  const context = metrics.currentContext();
+  const frames = (new Error().stack || '').split('\n').slice(1);
+  let site = 'unknown';
+  for (const frame of frames) {
+    const match = frame.match(/\(?([^\s()]+):(\d+):\d+\)?$/);
+    if (!match || match[1].includes(`${path.sep}adapters${path.sep}db${path.sep}`) ||
+        match[1].includes('node_modules') || match[1].startsWith('node:')) {
+      continue;
+    }
+    site = `${path.relative(SRC_DIR, match[1])}:${match[2]}`;
+    break;
+  }
+  return context && context.command ? `${context.command} (${site})` : site;
+}
+
+/**
+ * Query Audit
+ * Records the distinct query shapes each collection receives while enabled
+ * (DB_AUDIT=on at startup, or the DBAUDIT command), with call counts and
+ * the code paths that issue them. explain() runs each shape's first sample
+ * through the query planner and reports collection scans, queries an index
+ * only partly serves, in-memory sorts and indexes no recorded query uses,
+ * plus a suggested index set in the indexes.js format.
+ *
+ * Recording happens in instrumentedDb; when disabled it costs one flag check.
+ */
+class QueryAudit {
+  constructor() {
+    this.enabled = process.env.DB_AUDIT === 'on';
+    this.shapes = new Map(); // "collection op shape sort" -> entry
+    this.since = this.enabled ? Date.now() : null;
+    this.dropped = 0;
+  }
+
+  /**
+   * Start recording
+   */
+  enable() {
+    if (!this.enabled) this.since = Date.now();
+    this.enabled = true;
+  }
+
+  /**
+   * Stop recording (recorded shapes are kept for the report)
+   */
+  disable() {
+    this.enabled = false;
+  }
+
+  /**
+   * Forget recorded shapes
+   */
+  reset() {
+    this.shapes.clear();
+    this.dropped = 0;
+    this.since = this.enabled ? Date.now() : null;
+  }
+
+  /**
+   * Record a query
+   * @param {string} collection - Collection name
+   * @param {string} op - Operation (find, findOne, bulkWrite.updateOne, ...)
+   * @param {Object} filter - Query filter
+   * @param {Object} sort - Sort specification, if any
+   */
+  record(collection, op, filter, sort = null) {
+    const shape = shapeOf(filter || {});
+    const key = `${collection} ${op} ${JSON.stringify(shape)} ${JSON.stringify(sort || null)}`;
+    let entry = this.shapes.get(key);
+    if (!entry) {
+      if (this.shapes.size >= MAX_SHAPES) {
+        this.dropped++;
+        return;
+      }
+      entry = { collection, op, shape, sort: sort || null, sample: filter || {}, count: 0, callers: new Map() };
+      this.shapes.set(key, entry);
+    }
+    entry.count++;
+    const caller = callerOf();
+    entry.callers.set(caller, (entry.callers.get(caller) || 0) + 1);
+  }
+
+  /**
+   * Record a collection method call from its arguments (see instrumentedDb)
+   */
+  recordCall(collection, op, args) {
+    if (FILTER_OPERATIONS.has(op)) {
+      this.record(collection, op, args[0], args[1] && args[1].sort);
+    } else if (op === 'distinct') {
+      this.record(collection, op, args[1]);
+    } else if (op === 'bulkWrite' && Array.isArray(args[0])) {
+      for (const write of args[0]) {
+        const [type, spec] = Object.entries(write)[0] || [];
+        if (spec && spec.filter) this.record(collection, `bulkWrite.${type}`, spec.filter);
+      }
+    }
+  }
+
+  /**
+   * Run every recorded shape through the planner and audit the indexes it touched
+   * @param {Object} db - Database
+   * @param {Object} expected - Index definitions the game creates (indexes.js INDEXES)
+   * @returns {Promise<Object>} { queries, unused, suggestions, missing }
+   */
+  async explain(db, expected = {}) {
+    const queries = [];
+    const used = new Map(); // collection -> Set<indexName>
+    const indexes = new Map(); // collection -> [index]
+
+    for (const name of new Set([...Object.keys(expected), ...Array.from(this.shapes.values(), entry => entry.collection)])) {
+      try {
+        indexes.set(name, await db.collection(name).listIndexes().toArray());
+      } catch (error) {
+        indexes.set(name, []);
+      }
+      used.set(name, new Set());
+    }
+
+    for (const entry of Array.from(this.shapes.values()).sort((a, b) => b.count - a.count)) {
+      const query = { ...entry, findings: [], index: null, docsExamined: null, returned: null, error: null };
+      queries.push(query);
+      try {
+        const options = {};
+        if (entry.sort) options.sort = entry.sort;
+        if (SINGLE_DOCUMENT.has(entry.op.replace('bulkWrite.', ''))) options.limit = 1;
+        const explained = await db.collection(entry.collection).find(entry.sample, options).explain('executionStats');
+        const stages = planStages(explained.queryPlanner && explained.queryPlanner.winningPlan);
+        const stats = explained.executionStats || {};
+        query.docsExamined = stats.totalDocsExamined ?? null;
+        query.returned = stats.nReturned ?? null;
+
+        const indexed = stages.filter(stage => stage.indexName);
+        for (const stage of indexed) used.get(entry.collection).add(stage.indexName);
+        query.index = indexed.length > 0 ? indexed.map(stage => stage.indexName).join('+') : null;
+
+        if (stages.some(stage => stage.stage === 'COLLSCAN')) {
+          query.findings.push('collection scan');
+        } else if (indexed.length > 0 && stages.some(stage => stage.stage === 'FETCH' && stage.filter)) {
+          query.findings.push('index covers only part of the filter');
+        }
+        if (entry.sort && stages.some(stage => stage.stage === 'SORT')) {
+          query.findings.push('in-memory sort');
+        }
+      } catch (error) {
+        query.error = error.message;
+      }
+    }
+
+    // Suggested indexes for queries with findings, minus what an existing index already leads with
+    const suggestions = {};
+    for (const query of queries) {
+      if (query.findings.length === 0) continue;
+      const key = suggestKey(query.sample, query.sort);
+      if (!key) continue;
+      const existing = indexes.get(query.collection) || [];
+      if (existing.some(index => isPrefix(key, index.key))) continue;
+      const list = suggestions[query.collection] || (suggestions[query.collection] = []);
+      if (list.some(spec => isPrefix(key, spec.key))) continue;
+      // A longer key replaces suggestions it extends
+      suggestions[query.collection] = list.filter(spec => !isPrefix(spec.key, key)).concat({ key });
+    }
+
+    // Indexes no recorded query used (unique ones still enforce their constraint)
+    const unused = [];
+    for (const [name, list] of indexes) {
+      for (const index of list) {
+        if (index.name === '_id_' || used.get(name).has(index.name)) continue;
+        unused.push({ collection: name, name: index.name, key: index.key, unique: !!index.unique, ttl: index.expireAfterSeconds !== undefined });
+      }
+    }
+
+    // Index definitions the game expects that are not in the database
+    const missing = [];
+    for (const [name, specs] of Object.entries(expected)) {
+      const actual = indexes.get(name) || [];
+      for (const spec of specs) {
+        if (!actual.some(index => JSON.stringify(index.key) === JSON.stringify(spec.key))) {
+          missing.push({ collection: name, key: spec.key });
+        }
+      }
+    }
+
+    return { since: this.since, dropped: this.dropped, queries, unused, suggestions, missing };
+  }
+
+  /**
+   * Report lines for an explain() result
+   * @param {Object} report - From explain()
+   * @param {number} top - Queries listed (most frequent first)
+   */
+  format(report, top = 20) {
+    const lines = [];
+    const minutes = report.since ? ((Date.now() - report.since) / 60000).toFixed(1) : '0';
+    lines.push(`Query audit: ${report.queries.length} query shapes recorded over ${minutes} minutes` +
+      (report.dropped > 0 ? ` (${report.dropped} calls not recorded: shape limit)` : ''));
+
+    const flagged = report.queries.filter(query => query.findings.length > 0 || query.error);
+    lines.push('', `Queries with findings (${flagged.length}):`);
+    if (flagged.length === 0) lines.push('  None.');
+    for (const query of flagged.slice(0, top)) {
+      lines.push(`  ${query.collection}.${query.op} ${JSON.stringify(query.shape)}${query.sort ? ` sort ${JSON.stringify(query.sort)}` : ''}`);
+      lines.push(`    ${query.count} calls; ${query.error ? `explain failed: ${query.error}` : query.findings.join(', ')}` +
+        (query.docsExamined !== null ? `; examined ${query.docsExamined} docs for ${query.returned}` : ''));
+      lines.push(`    from ${this.formatCallers(query.callers)}`);
+    }
+
+    lines.push('', 'Most frequent queries:');
+    for (const query of report.queries.slice(0, top)) {
+      lines.push(`  ${String(query.count).padStart(7)}  ${query.collection}.${query.op} ${JSON.stringify(query.shape)}  ` +
+        `[${query.index || (query.error ? 'not explained' : 'no index')}]`);
+      lines.push(`           from ${this.formatCallers(query.callers)}`);
+    }
+
+    lines.push('', 'Indexes no recorded query used:');
+    if (report.unused.length === 0) lines.push('  None.');
+    for (const index of report.unused) {
+      const note = index.unique ? ' (unique: keeps enforcing its constraint)' : index.ttl ? ' (TTL: used for expiry)' : '';
+      lines.push(`  ${index.collection}.${index.name} ${JSON.stringify(index.key)}${note}`);
+    }
+
+    if (report.missing.length > 0) {
+      lines.push('', 'Expected indexes missing from the database:');
+      for (const index of report.missing) {
+        lines.push(`  ${index.collection} ${JSON.stringify(index.key)}`);
+      }
+    }
+
+    lines.push('', 'Suggested indexes (DBAUDIT APPLY creates them):');
+    const collections = Object.keys(report.suggestions);
+    if (collections.length === 0) lines.push('  None.');
+    for (const name of collections) {
+      lines.push(`  ${name}: [${report.suggestions[name].map(spec => `{ key: ${JSON.stringify(spec.key)} }`).join(', ')}]`);
+    }
+    return lines;
+  }
+
+  /**
+   * Top call sites of a query shape, busiest first
+   */
+  formatCallers(callers, top = 3) {
+    const total = Array.from(callers.values()).reduce((sum, count) => sum + count, 0);
+    const sorted = Array.from(callers).sort((a, b) => b[1] - a[1]);
+    const shown = sorted.slice(0, top).map(([caller, count]) => `${caller} ${Math.round(100 * count / total)}%`);
+    if (sorted.length > top) shown.push(`${sorted.length - top} more`);
+    return shown.join(', ');
+  }
+}
+
+module.exports = new QueryAudit();
@@ -0,0 +1,41 @@
+'use strict';
+
+const http = require('http');
+const metrics = require('../../utils/metrics');
+const log = require('../../utils/logger').child('metrics');
+
+/**
+ * Metrics HTTP Server
+ * Serves the metrics registry as Prometheus text on GET /metrics.
+ * Binds to localhost by default; it is meant for a local scraper, not players.
+ *
+ * Configuration (environment, all optional):
+ *   METRICS_PORT=9464       port (0 disables the endpoint)
+ *   METRICS_HOST=127.0.0.1  bind address
+ */
+function startMetricsServer(options = {}) {
+  const port = options.port ?? parseInt(process.env.METRICS_PORT ?? '9464', 10);
+  const host = options.host || process.env.METRICS_HOST || '127.0.0.1';
+  if (!port) return null;
+
+  const server = http.createServer((req, res) => {
+    if (req.method !== 'GET' || req.url.split('?')[0] !== '/metrics') {
+      res.writeHead(404, { 'Content-Type': 'text/plain' });
+      res.end('Not found\n');
+      return;
+    }
+    res.writeHead(200, { 'Content-Type': 'text/plain; version=0.0.4; charset=utf-8' });
+    res.end(metrics.toPrometheus());
+  });
+
+  server.on('error', (error) => {
+    log.error('Metrics endpoint failed', { port, error: error.message });
+  });
+  server.listen(port, host, () => {
+    log.info('Metrics endpoint listening', { url: `http://${host}:${port}/metrics` });
+  });
+  server.unref();
+  return server;
+}
+
+module.exports = { startMetricsServer };
@@ -2,12 +2,14 @@
 
 const CombatSystem = require('../systems/CombatSystem');
 const DamageSystem = require('../systems/DamageSystem');
-const WoundSystem = require('../systems/WoundSystem');
 const { checkRoundtime } = require('../utils/roundtimeChecker');
-const { calculateStatBonus, getRawStat } = require('../services/statBonus');
+const { matchesText } = require('../utils/keywordMatcher');
+const DerivedStats = require('../services/derivedStats');
+const random = require('../utils/random');
+const log = require('../utils/logger').child('combat');
 
 let combatSystem = null;
-let damageSystem = null;
+let sharedDamageSystem = null;
 
 /**
  * Get stance information
@@ -46,16 +48,7 @@ function findTarget(player, searchTerm) {
   // Search NPCs in room
   if (player.gameEngine && player.gameEngine.npcSystem) {
     const npcsInRoom = player.gameEngine.npcSystem.getNPCsInRoom(player.room);
-    const npc = npcsInRoom.find(npc => {
-      const name = npc.name || npc.npcId;
-      if (name.toLowerCase().includes(searchLower)) {
-        return true;
-      }
-      if (npc.keywords && npc.keywords.some(kw => kw.toLowerCase().includes(searchLower))) {
-        return true;
-      }
-      return false;
-    });
+    const npc = npcsInRoom.find(npc => matchesText(npc, searchLower));
 
     if (npc) {
       return npc;
@@ -65,47 +58,12 @@ function findTarget(player, searchTerm) {
   // Search other players
   const playersInRoom = player.gameEngine.roomSystem.getPlayersInRoom(player.room);
   const targetPlayer = playersInRoom.find(p => 
-    p.name.toLowerCase().includes(searchLower) && p.name !== player.name
+    p.name !== player.name && matchesText(p, searchLower)
   );
 
   return targetPlayer || null;
 }
 
-/**
- * Calculate skill bonus with diminishing returns
- * Ranks 1-10: +5 per rank
- * Ranks 11-20: +4 per rank
- * Ranks 21-30: +3 per rank
- * Ranks 31-40: +2 per rank
- * Ranks 41+: +1 per rank
- */
-function calculateSkillBonus(ranks) {
-  let bonus = 0;
-  let remainingRanks = ranks;
-  
-  if (remainingRanks > 40) {
-    bonus += (remainingRanks - 40) * 1;
-    remainingRanks = 40;
-  }
-  if (remainingRanks > 30) {
-    bonus += (remainingRanks - 30) * 2;
-    remainingRanks = 30;
-  }
-  if (remainingRanks > 20) {
-    bonus += (remainingRanks - 20) * 3;
-    remainingRanks = 20;
-  }
-  if (remainingRanks > 10) {
-    bonus += (remainingRanks - 10) * 4;
-    remainingRanks = 10;
-  }
-  if (remainingRanks > 0) {
-    bonus += remainingRanks * 5;
-  }
-  
-  return bonus;
-}
-
 /**
  * Attack Command
  * Allows players to attack NPCs or other players
@@ -121,9 +79,11 @@ module.exports = {
     if (!combatSystem) {
       combatSystem = new CombatSystem();
     }
-    if (!damageSystem) {
-      damageSystem = new DamageSystem();
+    if (!sharedDamageSystem) {
+      sharedDamageSystem = new DamageSystem();
     }
+    // An engine can bring its own damage system (the combat simulator observes every attack)
+    const damageSystem = player.gameEngine?.damageSystem || sharedDamageSystem;
     
     // Check roundtime/lag
     const roundtimeCheck = checkRoundtime(player);
@@ -132,7 +92,7 @@ module.exports = {
     }
 
     // Check wound penalties
-    const woundPenalties = WoundSystem.getWoundPenalties(player);
+    const woundPenalties = DerivedStats.getWoundPenalties(player);
     
     // Prevent ranged attacks if arms/hands are wounded
     if (!woundPenalties.canRangeAttack) {
@@ -169,58 +129,16 @@ module.exports = {
     }
 
     // Get equipped weapon
-    const weapon = await damageSystem.getEquippedWeapon(player);
+    const weapon = await DerivedStats.getEquippedWeapon(player, damageSystem);
 
     // Calculate Attack Strength (AS) using proper formula:
     // AS = STR Bonus + Weapon Skill Bonus + [Combat Maneuvers Ranks / 2] + Weapon Enchantment + Modifiers
-    const strRaw = getRawStat(player, 'strength');
-    const strBonus = calculateStatBonus(strRaw, player.race, 'strength');
-    
-    // Weapon Skill Bonus (get from one_handed_edged for broadsword, or brawling for unarmed)
-    let weaponSkillBonus = 0;
-    let combatManeuversBonus = 0;
-    if (player.skills) {
-      if (weapon) {
-        // Armed combat - use weapon-specific skill
-      console.log(`[AS CALC] Weapon metadata:`, weapon.metadata);
-      
-      // Check weapon type to use correct skill
-      const weaponType = weapon.metadata?.weapon_type || weapon.metadata?.baseWeapon || '';
-      console.log(`[AS CALC] Weapon type: ${weaponType}`);
-      
-      const weaponSkill = weaponType.includes('edged') ? player.skills.one_handed_edged : 
-                         weaponType.includes('blunt') ? player.skills.one_handed_blunt : null;
-      
-      console.log(`[AS CALC] Weapon skill object:`, weaponSkill);
-      
-      if (weaponSkill) {
-        const ranks = weaponSkill.ranks || 0;
-        // Calculate weapon skill bonus with diminishing returns
-        // Ranks 1-10: +5 per rank
-        // Ranks 11-20: +4 per rank
-        // Ranks 21-30: +3 per rank
-        // Ranks 31-40: +2 per rank
-        // Ranks 41+: +1 per rank
-        weaponSkillBonus = calculateSkillBonus(ranks);
-        console.log(`[AS CALC] Weapon skill ranks: ${ranks}, bonus: ${weaponSkillBonus}`);
-        }
-      } else {
-        // Unarmed combat - use brawling skill
-        const brawlingSkill = player.skills.brawling;
-        if (brawlingSkill) {
-          const ranks = brawlingSkill.ranks || 0;
-          // Brawling skill bonus with diminishing returns (same as weapon skills)
-          weaponSkillBonus = calculateSkillBonus(ranks);
-          console.log(`[AS CALC] Brawling skill ranks: ${ranks}, bonus: ${weaponSkillBonus}`);
-        }
-      }
-      
-      // Combat Maneuvers bonus
-      if (player.skills.combat_maneuvers) {
-        const cmRanks = player.skills.combat_maneuvers.ranks || 0;
-        combatManeuversBonus = Math.floor(cmRanks / 2);
-      }
-    }
+    // Bonuses come from the derived-stat cache (recomputed only when stats, skills or wounds change)
+    const derived = DerivedStats.getBaseStats(player);
+    const strRaw = derived.rawStats.strength;
+    const strBonus = derived.statBonuses.strength;
+    const weaponSkillBonus = DerivedStats.getWeaponSkillBonus(player, weapon);
+    const combatManeuversBonus = player.skills ? derived.combatManeuversBonus : 0;
     
     // Get stance modifier for AS (50% to 100% multiplier)
     const stance = player.combatStance || 'neutral';
@@ -236,15 +154,9 @@ module.exports = {
 
     // Apply Low Spirit penalty to AS based on current/max spirit percentage
     // Max spirit = round(Aura / 10), capped at 13
-    function getSpiritInfo(p) {
-      const auraRaw = getRawStat(p, 'aura') || 50;
-      const computedMax = Math.min(13, Math.round(auraRaw / 10));
-      const spiritObj = p.attributes && p.attributes.spirit ? p.attributes.spirit : {};
-      const current = typeof spiritObj.current === 'number' ? spiritObj.current : computedMax;
-      const max = typeof spiritObj.base === 'number' ? Math.min(13, spiritObj.base) : computedMax;
-      return { current, max };
-    }
-    const { current: spiritCurrent, max: spiritMax } = getSpiritInfo(player);
+    const spiritObj = player.attributes && player.attributes.spirit ? player.attributes.spirit : {};
+    const spiritMax = typeof spiritObj.base === 'number' ? Math.min(13, spiritObj.base) : derived.spiritMax;
+    const spiritCurrent = typeof spiritObj.current === 'number' ? spiritObj.current : derived.spiritMax;
     const spiritPct = spiritMax > 0 ? (spiritCurrent / spiritMax) : 1;
     let spiritMultiplier = 1.0;
     if (spiritPct >= 0.75) {
@@ -258,9 +170,21 @@ module.exports = {
     }
     
     // Debug logging
-    console.log(`[AS CALC] STR raw: ${strRaw}, STR bonus: ${strBonus}`);
-    console.log(`[AS CALC] Weapon skill bonus: ${weaponSkillBonus}, CM bonus: ${combatManeuversBonus}`);
-    console.log(`[AS CALC] Base AS: ${baseAS}, Stance multiplier: ${stanceMultiplierDecimal}, Spirit: ${spiritCurrent}/${spiritMax} (${Math.round(spiritPct*100)}%), Spirit multiplier: ${spiritMultiplier}, Final AS: ${Math.floor(baseAS * stanceMultiplierDecimal * spiritMultiplier)}`);
+    if (log.isEnabled('debug')) {
+      log.debug('AS calculated', {
+        player: player.name,
+        weaponType: weapon?.metadata?.weapon_type || weapon?.metadata?.baseWeapon || 'unarmed',
+        strRaw,
+        strBonus,
+        weaponSkillBonus,
+        combatManeuversBonus,
+        baseAS,
+        stanceMultiplier: stanceMultiplierDecimal,
+        spirit: `${spiritCurrent}/${spiritMax}`,
+        spiritMultiplier,
+        finalAS: Math.floor(baseAS * stanceMultiplierDecimal * spiritMultiplier)
+      });
+    }
     
     // Apply stance and spirit multipliers
     const as = Math.floor(baseAS * stanceMultiplierDecimal * spiritMultiplier);
@@ -283,7 +207,7 @@ module.exports = {
     // Get damage calculation (this provides AvD and damage factor)
     const damageResult = damageSystem.calculateWeaponDamage(player, weapon, target);
     const avd = damageResult.avd;
-    const d100Roll = Math.floor(Math.random() * 100) + 1;
+    const d100Roll = random.d100();
     const endRoll = as - ds + avd + d100Roll;
     
     // Calculate raw damage if hit using GS4 formula: (endroll - 100) * damageFactor
@@ -306,7 +230,7 @@ module.exports = {
         const meta = wornArmor.metadata || {};
         const baseRtSec = typeof meta.rt === 'number' ? meta.rt : 0;
         // Armor Use reduction: 1s per 20 ranks
-        const armorRanks = p.skills?.armor_use?.ranks || 0;
+        const armorRanks = derived.armorUseRanks;
         const reductionSec = Math.floor(armorRanks / 20);
         const effRtSec = Math.max(0, baseRtSec - reductionSec);
         return effRtSec * 1000;
@@ -337,7 +261,7 @@ module.exports = {
           
           if (isTwoHanded) {
             // Two-Handed Weapon skill reduces RT: 1s per 20 ranks
-            const twoHandedRanks = p.skills?.two_handed?.ranks || 0;
+            const twoHandedRanks = derived.twoHandedRanks;
             const reductionMs = Math.floor((twoHandedRanks / 20) * 1000);
             rtMs = Math.max(500, rtMs - reductionMs); // Minimum 0.5s
           }
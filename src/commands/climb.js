@@ -1,7 +1,6 @@
 'use strict';
 
 const { checkRoundtime } = require('../utils/roundtimeChecker');
-const ArgParser = require('../core/ArgParser');
 
 /**
  * Climb Command
@@ -34,26 +33,22 @@ module.exports = {
       return { success: false, message: 'You are nowhere.' };
     }
     
-    // Use ArgParser.findPartial to match exits (handles partial matches like "rope" -> "old rope")
-    const exits = room.exits || [];
-    const exit = ArgParser.findPartial(input, exits, (exit) => exit.direction);
+    // Directions, exact exit names, prefixes and trailing words ("rope" -> "old rope") from the room's exit index
+    const exit = player.gameEngine.roomSystem.getExit(player.room, input);
     
-    // Fallback to getExit for backwards compatibility and case-insensitive matching
-    const fallbackExit = exit || player.gameEngine.roomSystem.getExit(player.room, input);
-    
-    if (!fallbackExit) {
+    if (!exit) {
       return { success: false, message: `You can't climb ${input} from here.` };
     }
     
     // Check if this exit requires climbing
-    if (!fallbackExit.requiresClimb) {
+    if (!exit.requiresClimb) {
       return { 
         success: false, 
-        message: `You can't climb ${fallbackExit.direction}. Try using 'go ${fallbackExit.direction}' instead.` 
+        message: `You can't climb ${exit.direction}. Try using 'go ${exit.direction}' instead.` 
       };
     }
     
-    const destinationId = fallbackExit.roomId;
+    const destinationId = exit.roomId;
     const destination = player.gameEngine.roomSystem.getRoom(destinationId);
     
     if (!destination) {
@@ -61,8 +56,7 @@ module.exports = {
     }
     
     // Move the player
-    const oldRoom = player.room;
-    player.room = destinationId;
+    const oldRoom = player.gameEngine.movePlayer(player, destinationId);
     
     // Update player in database
     player.gameEngine.playerSystem.updatePlayer(player);
@@ -0,0 +1,101 @@
+'use strict';
+
+const queryAudit = require('../adapters/db/queryAudit');
+const { INDEXES, ensureAllIndexes } = require('../adapters/db/indexes');
+
+/**
+ * DB Audit Command (Admin Only)
+ * Query plan audit of the collection accesses the engine performs
+ *
+ * Usage:
+ *  dbaudit           recording status and the most frequent query shapes
+ *  dbaudit on        start recording query shapes (or start the server with DB_AUDIT=on)
+ *  dbaudit off       stop recording (recorded shapes are kept)
+ *  dbaudit reset     forget recorded shapes
+ *  dbaudit report    explain every recorded shape: collection scans, partly
+ *                    indexed queries, in-memory sorts, unused indexes and
+ *                    suggested indexes
+ *  dbaudit apply     create the suggested indexes
+ *
+ * See adapters/db/queryAudit.js.
+ */
+
+const TOP = 15;
+
+module.exports = {
+  name: 'dbaudit',
+  aliases: ['queryaudit'],
+  description: 'Admin: audit database query plans and indexes',
+  usage: 'dbaudit\r\ndbaudit on|off|reset\r\ndbaudit report\r\ndbaudit apply',
+
+  async execute(player, args) {
+    if (!player.gameEngine || !player.gameEngine.roomSystem || !player.gameEngine.roomSystem.db) {
+      return { success: false, message: 'Database not available.\r\n' };
+    }
+
+    const db = player.gameEngine.roomSystem.db;
+    // Always refresh player from DB first so role changes take effect immediately
+    try {
+      const fresh = await db.collection('players').findOne({ name: player.name });
+      if (fresh && fresh.role) {
+        player.role = fresh.role;
+      }
+    } catch (_) {
+      // Ignore reload errors; fall back to in-memory role
+    }
+
+    if (player.role !== 'admin') {
+      return { success: false, message: 'You are not authorized to use this command.\r\n' };
+    }
+
+    const sub = (args[0] || '').toLowerCase();
+
+    if (sub === 'on') {
+      queryAudit.enable();
+      return { success: true, message: 'Recording query shapes. Use DBAUDIT REPORT once the game has seen typical play.\r\n' };
+    }
+
+    if (sub === 'off') {
+      queryAudit.disable();
+      return { success: true, message: `Stopped recording; ${queryAudit.shapes.size} query shapes kept for the report.\r\n` };
+    }
+
+    if (sub === 'reset') {
+      queryAudit.reset();
+      return { success: true, message: 'Recorded query shapes cleared.\r\n' };
+    }
+
+    if (sub === 'report' || sub === 'apply') {
+      if (queryAudit.shapes.size === 0) {
+        return { success: true, message: 'No query shapes recorded. Use DBAUDIT ON first.\r\n' };
+      }
+      const report = await queryAudit.explain(db, INDEXES);
+
+      if (sub === 'apply') {
+        if (Object.keys(report.suggestions).length === 0) {
+          return { success: true, message: 'No indexes to suggest.\r\n' };
+        }
+        const result = await ensureAllIndexes(db, report.suggestions);
+        const created = Object.entries(report.suggestions)
+          .map(([name, specs]) => specs.map(spec => `  ${name} ${JSON.stringify(spec.key)}`).join('\r\n'));
+        return {
+          success: true,
+          message: `Created ${result.created} indexes (${result.present} already present):\r\n${created.join('\r\n')}\r\n` +
+            'Add them to adapters/db/indexes.js to keep them on new databases.\r\n'
+        };
+      }
+
+      return { success: true, message: queryAudit.format(report, TOP).join('\r\n') + '\r\n' };
+    }
+
+    const shapes = Array.from(queryAudit.shapes.values()).sort((a, b) => b.count - a.count);
+    const lines = [
+      `Query audit is ${queryAudit.enabled ? 'recording' : 'off'}; ${shapes.length} query shapes recorded.`
+    ];
+    for (const entry of shapes.slice(0, TOP)) {
+      lines.push(`  ${String(entry.count).padStart(7)}  ${entry.collection}.${entry.op} ${JSON.stringify(entry.shape)}`);
+      lines.push(`           from ${queryAudit.formatCallers(entry.callers)}`);
+    }
+    return { success: true, message: lines.join('\r\n') + '\r\n' };
+  }
+};
@@ -1,6 +1,28 @@
 'use strict';
 
 const { checkRoundtime } = require('../utils/roundtimeChecker');
+const { matchesText } = require('../utils/keywordMatcher');
+
+/**
+ * Put a dropped item in the room, start its decay clock and persist the change
+ */
+function placeOnGround(player, room, itemId, item) {
+  if (!room.items) {
+    room.items = [];
+  }
+  room.items.push(itemId);
+
+  const { roomSystem, itemLifecycle, persistenceQueue } = player.gameEngine;
+  if (item) {
+    roomSystem.setItemDisplayName(item);
+  }
+  if (itemLifecycle) {
+    itemLifecycle.schedule(item || { id: itemId }, room.id);
+  }
+  if (persistenceQueue) {
+    persistenceQueue.pushRoomItem(room.id, itemId);
+  }
+}
 
 /**
  * Drop Command
@@ -36,11 +58,7 @@ module.exports = {
         
         player.equipment.rightHand = null;
         
-        // Add to room
-        if (!room.items) {
-          room.items = [];
-        }
-        room.items.push(itemId);
+        placeOnGround(player, room, itemId, item);
 
         const itemName = item?.name || itemId;
         return { 
@@ -56,11 +74,7 @@ module.exports = {
         
         player.equipment.leftHand = null;
         
-        // Add to room
-        if (!room.items) {
-          room.items = [];
-        }
-        room.items.push(itemId);
+        placeOnGround(player, room, itemId, item);
 
         const itemName = item?.name || itemId;
         return { 
@@ -84,16 +98,11 @@ module.exports = {
       
       if (item) {
         const name = item.name || '';
-        const keywords = item.keywords || [];
         
-        if (name.toLowerCase().includes(searchTerm) || keywords.some(k => k.toLowerCase().includes(searchTerm))) {
+        if (matchesText(item, searchTerm)) {
           player.equipment.rightHand = null;
           
-          // Add to room
-          if (!room.items) {
-            room.items = [];
-          }
-          room.items.push(itemId);
+          placeOnGround(player, room, itemId, item);
 
           return { 
             success: true, 
@@ -110,16 +119,11 @@ module.exports = {
       
       if (item) {
         const name = item.name || '';
-        const keywords = item.keywords || [];
         
-        if (name.toLowerCase().includes(searchTerm) || keywords.some(k => k.toLowerCase().includes(searchTerm))) {
+        if (matchesText(item, searchTerm)) {
           player.equipment.leftHand = null;
           
-          // Add to room
-          if (!room.items) {
-            room.items = [];
-          }
-          room.items.push(itemId);
+          placeOnGround(player, room, itemId, item);
 
           return { 
             success: true, 
@@ -1,5 +1,7 @@
 'use strict';
 
+const DerivedStats = require('../services/derivedStats');
+
 /**
  * Edit Command (Admin Only)
  * Edits properties of the item in the admin's right hand
@@ -352,6 +354,11 @@ module.exports = {
         
         // Reload the item to show current state
         const updatedItem = await db.collection('items').findOne({ id: itemId });
+        player.gameEngine.roomSystem.setItemDisplayName(updatedItem);
+        // Whoever wields it must not keep fighting with the cached old document
+        for (const wielder of player.gameEngine.players.values()) {
+          if (wielder.equipment?.rightHand === itemId) DerivedStats.invalidate(wielder, 'equipment');
+        }
         
         return {
           success: true,
@@ -1,7 +1,9 @@
 'use strict';
 
 const { checkRoundtime } = require('../utils/roundtimeChecker');
-const { findItemWithOther } = require('../utils/keywordMatcher');
+const { findItemWithOther, matchesText } = require('../utils/keywordMatcher');
+const Enc = require('../utils/encumbrance');
+const log = require('../utils/logger').child('items');
 
 /**
  * Get Command
@@ -49,7 +51,7 @@ module.exports = {
       if (containerIsMine) {
         containerTerm = containerTerm.replace(/^my\s+/, '');
       }
-      console.log(`[GET] Getting FROM container: "${containerTerm}" (MY: ${containerIsMine})`);
+      log.debug('Getting from container', { container: containerTerm, mine: containerIsMine });
     }
 
     // Check room items ONLY if NOT getting from container
@@ -79,7 +81,7 @@ module.exports = {
           const itemId = typeof ref === 'string' ? ref : (ref?.id || ref);
           if (!itemId) continue;
           const fetched = await player.gameEngine.roomSystem.db.collection('items').findOne({ id: itemId });
-          if (fetched && (((fetched.name||'').toLowerCase().includes(containerTerm)) || (fetched.keywords||[]).some(k=>k.toLowerCase().includes(containerTerm)))) {
+          if (fetched && matchesText(fetched, containerTerm)) {
             container = fetched;
             break;
           }
@@ -89,7 +91,7 @@ module.exports = {
         const itemIds = Array.isArray(room.items)? room.items.map(x=> typeof x==='string'? x : (x.id||x)) : [];
         if (itemIds.length) {
           const candidates = await player.gameEngine.roomSystem.db.collection('items').find({ id: { $in: itemIds } }).toArray();
-          container = candidates.find(it => ((it.name||'').toLowerCase().includes(containerTerm)) || (it.keywords||[]).some(k=>k.toLowerCase().includes(containerTerm)));
+          container = candidates.find(it => matchesText(it, containerTerm));
         }
         // Fallback to belongings
         if (!container) {
@@ -107,7 +109,7 @@ module.exports = {
             const itemId = typeof ref === 'string' ? ref : (ref?.id || ref);
             if (!itemId) continue;
             const fetched = await player.gameEngine.roomSystem.db.collection('items').findOne({ id: itemId });
-            if (fetched && (((fetched.name||'').toLowerCase().includes(containerTerm)) || (fetched.keywords||[]).some(k=>k.toLowerCase().includes(containerTerm)))) {
+            if (fetched && matchesText(fetched, containerTerm)) {
               container = fetched;
               break;
             }
@@ -116,10 +118,10 @@ module.exports = {
       }
 
       if (!container || (!container.metadata?.container && container.type !== 'CONTAINER')) {
-        console.log(`[GET] Container not found or invalid: ${containerTerm}`);
+        log.debug('Container not found or invalid', { container: containerTerm });
         return { success:false, message: "You don't see that here.\r\n" };
       }
-      console.log(`[GET] Found container: ${container.name}, items: ${container.metadata?.items?.length || 0}`);
+      log.debug('Found container', { container: container.name, items: container.metadata?.items?.length || 0 });
     }
 
     // Fetch all items from the search source and use keyword matcher
@@ -128,13 +130,13 @@ module.exports = {
       ? container.metadata.items
       : (room.items || []);
     
-    console.log(`[GET] Search sources: ${searchSources.length} items (from ${container ? 'container' : 'room'})`);
+    log.trace('Search sources', { count: searchSources.length, from: container ? 'container' : 'room' });
 
     // Fetch all items from database
     const itemIds = searchSources.map(itemRef => typeof itemRef === 'string' ? itemRef : (itemRef.id || itemRef.name));
     const items = [];
     
-    console.log(`[GET] Fetching ${itemIds.length} items from DB:`, itemIds);
+    log.trace('Fetching items', { count: itemIds.length });
     
     if (player.gameEngine.roomSystem.db && itemIds.length > 0) {
       try {
@@ -142,17 +144,17 @@ module.exports = {
           .find({ id: { $in: itemIds } })
           .toArray();
         items.push(...fetched);
-        console.log(`[GET] Fetched ${items.length} items from DB`);
+        log.trace('Fetched items', { count: items.length });
       } catch (error) {
         console.error('[GET] Error fetching items:', error);
       }
     } else if (itemIds.length === 0) {
-      console.log(`[GET] No item IDs to fetch (searchSources was empty)`);
+      log.trace('No item IDs to fetch');
     }
 
     // Use keyword matcher to find the item
     foundItem = findItemWithOther(searchTerm, items);
-    console.log(`[GET] Search term: "${searchTerm}", Found: ${foundItem ? foundItem.name : 'nothing'}`);
+    log.debug('Get search', { term: searchTerm, found: foundItem ? foundItem.name : null });
 
     if (!foundItem) {
       return { 
@@ -189,7 +191,7 @@ module.exports = {
           try {
             const exists = await player.gameEngine.roomSystem.db.collection('items').findOne({ id: trimmed });
             if (!exists) {
-              console.log(`[GET] Cleaning up invalid item reference: ${trimmed}`);
+              log.debug('Cleaning up invalid item reference', { item: trimmed });
               return false; // Item doesn't exist, treat as empty
             }
             return true;
@@ -205,7 +207,7 @@ module.exports = {
 
     // Debug logging for hand state
     try {
-      console.log(`[GET] Player ${player.name} hands => right: ${JSON.stringify(player.equipment.rightHand)}, left: ${JSON.stringify(player.equipment.leftHand)}`);
+      log.trace('Hands', { player: player.name, right: player.equipment.rightHand, left: player.equipment.leftHand });
     } catch (_) {}
 
     const rightOccupied = await isOccupied(player.equipment.rightHand);
@@ -214,12 +216,12 @@ module.exports = {
     // Cleanup invalid hand references
     let needsSave = false;
     if (player.equipment.rightHand && !rightOccupied) {
-      console.log(`[GET] Removing invalid rightHand reference: ${player.equipment.rightHand}`);
+      log.debug('Removing invalid hand reference', { player: player.name, rightHand: player.equipment.rightHand });
       delete player.equipment.rightHand;
       needsSave = true;
     }
     if (player.equipment.leftHand && !leftOccupied) {
-      console.log(`[GET] Removing invalid leftHand reference: ${player.equipment.leftHand}`);
+      log.debug('Removing invalid hand reference', { player: player.name, leftHand: player.equipment.leftHand });
       delete player.equipment.leftHand;
       needsSave = true;
     }
@@ -228,7 +230,7 @@ module.exports = {
     if (needsSave && player.gameEngine?.playerSystem?.updatePlayer) {
       try {
         await player.gameEngine.playerSystem.updatePlayer(player);
-        console.log(`[GET] Saved cleanup to database for ${player.name}`);
+        log.debug('Saved hand cleanup', { player: player.name });
       } catch (error) {
         console.error(`[GET] Failed to save cleanup:`, error);
       }
@@ -242,7 +244,7 @@ module.exports = {
       hand = 'leftHand';
       handName = 'left';
     } else {
-      try { console.log(`[GET] Hands full for ${player.name}.`); } catch (_) {}
+      log.debug('Hands full', { player: player.name });
       return { 
         success: false, 
         message: 'Your hands are full.\r\n' 
@@ -259,6 +261,7 @@ module.exports = {
       const newList = (container.metadata.items || []).filter(id => id !== foundItem.id);
       container.metadata.items = newList;
       try { await player.gameEngine.roomSystem.db.collection('items').updateOne({ id: container.id }, { $set: { 'metadata.items': newList } }); } catch(_) {}
+      Enc.noteContainerRemove(player, container.id, foundItem.id);
     } else {
     const itemIndex = room.items.findIndex(itemRef => {
       const itemId = typeof itemRef === 'string' ? itemRef : (itemRef.id || itemRef.name);
@@ -266,13 +269,17 @@ module.exports = {
     });
     if (itemIndex > -1) {
       room.items.splice(itemIndex, 1);
+      // Picked up items no longer decay
+      player.gameEngine.itemLifecycle?.cancel(foundItem.id);
+      player.gameEngine.persistenceQueue?.pullRoomItem(player.room, foundItem.id);
       }
     }
 
     const itemName = foundItem.name || 'an item';
     
-    // Recalculate encumbrance
-    try { const Enc = require('../utils/encumbrance'); await Enc.recalcEncumbrance(player); } catch(_) {}
+    // Recalculate encumbrance (the ledger already has the picked-up item's document)
+    Enc.noteItem(player, foundItem);
+    await Enc.recalcEncumbrance(player);
 
     // Show appropriate message based on source
     if (container) {
@@ -1,5 +1,7 @@
 'use strict';
 
+const DerivedStats = require('../services/derivedStats');
+
 /**
  * Hotfix Command (Admin Only)
  * Reloads game data (rooms, items, NPCs) without restarting the server
@@ -18,7 +20,6 @@ module.exports = {
       message.push('Reloading player data...');
       const db = player.gameEngine.roomSystem.db;
       const playerData = await db.collection('players').findOne({ name: player.name });
-      console.log(`[HOTFIX DEBUG] Loaded from DB - role: ${playerData?.role}`);
       if (playerData) {
         // Update player with fresh data - use Object.assign but also explicitly set role
         Object.assign(player, playerData);
@@ -27,8 +28,9 @@ module.exports = {
           player.role = playerData.role;
         }
         player.gameEngine = player.gameEngine; // Keep gameEngine reference
+        // Skills, stats, race and wounds may all have changed
+        DerivedStats.invalidate(player);
         message.push(`Reloaded data for ${player.name}.`);
-        console.log(`[HOTFIX DEBUG] Player: ${player.name}, role after reload: ${player.role}`);
       } else {
         message.push('Player data not found in database.');
       }
@@ -41,57 +43,21 @@ module.exports = {
         };
       }
       
-      // Reload rooms
-      message.push('Reloading rooms...');
-      await player.gameEngine.roomSystem.loadRoomsFromDatabase();
-      const rooms = player.gameEngine.roomSystem.getAllRooms();
-      message.push(`Loaded ${rooms.length} rooms.`);
-      
-      // Reload NPCs
-      message.push('Reloading NPCs...');
-      
-      // Get all NPCs from database
-      const npcDefinitions = await db.collection('npcs').find({}).toArray();
-      const npcSystem = player.gameEngine.npcSystem;
-      
-      // Clear existing NPCs
-      npcSystem.clearAllNPCs();
-      
-      // Respawn NPCs in their designated rooms
-      const areas = await db.collection('areas').find({}).toArray();
-      let spawnedCount = 0;
-      
-      for (const area of areas) {
-        const rooms = await db.collection('rooms').find({ areaId: area.id }).toArray();
-        
-        for (const room of rooms) {
-          if (room.npcs && room.npcs.length > 0) {
-            for (const npcRef of room.npcs) {
-              try {
-                let npcId;
-                if (typeof npcRef === 'string') {
-                  npcId = npcRef;
-                } else if (npcRef && npcRef.id) {
-                  npcId = npcRef.id;
-                } else {
-                  continue;
-                }
-                
-                const npcDefinition = await npcSystem.getNPC(npcId);
-                if (npcDefinition) {
-                  npcSystem.spawnNPC(npcDefinition, room.id, player.gameEngine);
-                  spawnedCount++;
-                }
-              } catch (error) {
-                // Skip NPCs that fail to spawn
-              }
-            }
-          }
-        }
+      // Reload rooms, critical tables, NPCs and commands
+      message.push('Reloading rooms, critical tables, NPCs and commands...');
+      const engine = player.gameEngine;
+      const summary = await engine.reloadWorld();
+      message.push(`Loaded ${summary.rooms} rooms.`);
+      message.push(`Loaded ${summary.criticals.entries} criticals across ${summary.criticals.damageTypes} damage types.`);
+      message.push(`Spawned ${summary.npcs.spawned} NPCs (${summary.npcs.fetched} definitions in ${summary.npcs.timings.fetchMs}ms, spawned in ${summary.npcs.timings.spawnMs}ms).`);
+      message.push(`Loaded ${summary.commands} commands.`);
+
+      // An area shard reloaded only itself: the gateway has the other shards reload too
+      if (engine.shard) {
+        engine.emit('reload');
+        message.push('Reloading the other area shards.');
       }
       
-      message.push(`Spawned ${spawnedCount} NPCs.`);
-      
       message.push('Hotfix complete!');
       
       return { 
@@ -9,12 +9,14 @@
  *  items list [filter]
  *  items spawn <itemId>
  *  items get <itemId>
+ *  items decay
+ *  items orphans [clean]
  */
 module.exports = {
   name: 'items',
   aliases: ['item'],
   description: 'Admin: list and spawn items from the database',
-  usage: 'items list [filter]\r\nitems spawn <itemId>\r\nitems get <itemId>',
+  usage: 'items list [filter]\r\nitems spawn <itemId>\r\nitems get <itemId>\r\nitems decay\r\nitems orphans [clean]',
 
   async execute(player, args) {
     if (!player.gameEngine || !player.gameEngine.roomSystem || !player.gameEngine.roomSystem.db) {
@@ -165,6 +167,7 @@ module.exports = {
           { id: itemId },
           { $unset: { location: '' } }
         );
+        player.gameEngine.itemLifecycle?.cancel(itemId);
 
         // Find an empty hand slot
         const freeHand = !player.equipment.leftHand ? 'leftHand' : 
@@ -223,9 +226,65 @@ module.exports = {
       }
     }
 
+    if (sub === 'decay') {
+      const lifecycle = player.gameEngine.itemLifecycle;
+      if (!lifecycle) {
+        return { success: false, message: 'Item lifecycle is not running.\r\n' };
+      }
+
+      const metrics = lifecycle.getMetrics();
+      const queue = player.gameEngine.persistenceQueue ? player.gameEngine.persistenceQueue.getStats() : null;
+      const lines = [
+        'Item decay:',
+        `  Decaying items:       ${metrics.live}`,
+        `  Decayed since start:  ${metrics.decayed}`,
+        `  Orphans found:        ${metrics.orphansFound} at start`,
+        `  Orphans cleaned up:   ${metrics.orphaned}`,
+        `  Sweeps:               ${metrics.sweeps}`,
+        `  Next expiry:          ${metrics.nextExpiry ? metrics.nextExpiry.toISOString() : 'none'}`
+      ];
+      if (queue) {
+        lines.push(`  Pending writes:       ${queue.pending} (last flush ${queue.lastFlushMs}ms, ${queue.failures} failures)`);
+      }
+      return { success: true, message: lines.join('\r\n') + '\r\n' };
+    }
+
+    if (sub === 'orphans') {
+      const lifecycle = player.gameEngine.itemLifecycle;
+      if (!lifecycle || !lifecycle.db) {
+        return { success: false, message: 'Item lifecycle is not running.\r\n' };
+      }
+
+      try {
+        if ((args[1] || '').toLowerCase() === 'clean') {
+          const removed = await lifecycle.cleanupOrphans();
+          return {
+            success: true,
+            message: `Removed ${removed.missing} room references to missing items, deleted ${removed.strayCorpses} stray corpses ` +
+              `and stopped the decay of ${removed.pickedUp} items no longer on the ground.\r\n`
+          };
+        }
+
+        const orphans = await lifecycle.findOrphans();
+        const sample = orphans.missing.slice(0, 10).map(([roomId, itemId]) => `    ${itemId} in ${roomId}`);
+        const lines = [
+          'Orphaned items:',
+          `  Room references to missing items: ${orphans.missing.length}`,
+          ...sample,
+          `  Corpses in no room:               ${orphans.strayCorpses.length}`,
+          `  Decaying items in no room:        ${orphans.pickedUp.length}`,
+          'ITEMS ORPHANS CLEAN removes them.'
+        ];
+        return { success: true, message: lines.join('\r\n') + '\r\n' };
+      } catch (err) {
+        console.error('Items orphans error:', err);
+        return { success: false, message: `Failed to check orphans: ${err.message}\r\n` };
+      }
+    }
+
     return { 
       success: false, 
-      message: 'Usage:\r\nitems list [filter]\r\nitems spawn <itemId>\r\nitems get <itemId>\r\n' 
+      message: 'Usage:\r\nitems list [filter]\r\nitems spawn <itemId>\r\nitems get <itemId>\r\nitems decay\r\nitems orphans [clean]\r\n' 
     };
   }
 };
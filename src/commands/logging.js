@@ -0,0 +1,100 @@
+'use strict';
+
+const logger = require('../utils/logger');
+
+/**
+ * Logging Command (Admin Only)
+ * Inspect and change log levels, sampling and output format at runtime
+ *
+ * Usage:
+ *  logging                              show current settings
+ *  logging level <level> [subsystem]    set global (or one subsystem's) level
+ *  logging reset <subsystem>            subsystem follows the global level again
+ *  logging sample <subsystem> <rate>    keep only a fraction (0-1) of info/debug records
+ *  logging format <text|json>
+ *
+ * Levels: off, error, warn, info, debug, trace
+ */
+module.exports = {
+  name: 'logging',
+  aliases: ['loglevel'],
+  description: 'Admin: change log levels at runtime',
+  usage: 'logging\r\nlogging level <level> [subsystem]\r\nlogging reset <subsystem>\r\nlogging sample <subsystem> <rate>\r\nlogging format <text|json>',
+
+  async execute(player, args) {
+    if (!player.gameEngine || !player.gameEngine.roomSystem || !player.gameEngine.roomSystem.db) {
+      return { success: false, message: 'Database not available.\r\n' };
+    }
+
+    const db = player.gameEngine.roomSystem.db;
+    // Always refresh player from DB first so role changes take effect immediately
+    try {
+      const fresh = await db.collection('players').findOne({ name: player.name });
+      if (fresh && fresh.role) {
+        player.role = fresh.role;
+      }
+    } catch (_) {
+      // Ignore reload errors; fall back to in-memory role
+    }
+
+    if (player.role !== 'admin') {
+      return { success: false, message: 'You are not authorized to use this command.\r\n' };
+    }
+
+    const sub = (args[0] || '').toLowerCase();
+
+    if (!sub || sub === 'status') {
+      const status = logger.getStatus();
+      const subsystems = Object.entries(status.subsystems).map(([name, level]) => `${name}=${level}`);
+      const sampling = Object.entries(status.sampling).map(([name, rate]) => `${name}=${rate}`);
+      const lines = [
+        'Logging:',
+        `  Level:      ${status.level}`,
+        `  Format:     ${status.format}`,
+        `  Overrides:  ${subsystems.length > 0 ? subsystems.join(', ') : 'none'}`,
+        `  Sampling:   ${sampling.length > 0 ? sampling.join(', ') : 'none'}`,
+        `  Subsystems: ${status.known.join(', ')}`,
+        `  Records:    ${status.written} written, ${status.dropped} dropped, ${status.sampledOut} sampled out`
+      ];
+      return { success: true, message: lines.join('\r\n') + '\r\n' };
+    }
+
+    if (sub === 'level') {
+      const level = (args[1] || '').toLowerCase();
+      const subsystem = args[2] ? args[2].toLowerCase() : null;
+      if (!logger.setLevel(level, subsystem)) {
+        return { success: false, message: 'Usage: logging level <off|error|warn|info|debug|trace> [subsystem]\r\n' };
+      }
+      return { success: true, message: `Log level for ${subsystem || 'all subsystems'} set to ${level}.\r\n` };
+    }
+
+    if (sub === 'reset') {
+      const subsystem = (args[1] || '').toLowerCase();
+      if (!subsystem) {
+        return { success: false, message: 'Usage: logging reset <subsystem>\r\n' };
+      }
+      logger.clearLevel(subsystem);
+      logger.setSampleRate(subsystem, 1);
+      return { success: true, message: `${subsystem} now follows the global log level.\r\n` };
+    }
+
+    if (sub === 'sample') {
+      const subsystem = (args[1] || '').toLowerCase();
+      const rate = parseFloat(args[2]);
+      if (!subsystem || Number.isNaN(rate) || !logger.setSampleRate(subsystem, rate)) {
+        return { success: false, message: 'Usage: logging sample <subsystem> <rate 0-1>\r\n' };
+      }
+      return { success: true, message: `Sampling ${subsystem} at ${Math.min(1, Math.max(0, rate))}.\r\n` };
+    }
+
+    if (sub === 'format') {
+      const format = (args[1] || '').toLowerCase();
+      if (!logger.setFormat(format)) {
+        return { success: false, message: 'Usage: logging format <text|json>\r\n' };
+      }
+      return { success: true, message: `Log format set to ${format}.\r\n` };
+    }
+
+    return { success: false, message: `Usage:\r\n${module.exports.usage}\r\n` };
+  }
+};
@@ -1,6 +1,6 @@
 'use strict';
 
-const { findItemWithOther } = require('../utils/keywordMatcher');
+const { findItemWithOther, matchesText } = require('../utils/keywordMatcher');
 const ArgParser = require('../core/ArgParser');
 
 /**
@@ -9,45 +9,19 @@ const ArgParser = require('../core/ArgParser');
  * Based on Gemstone3-style look command
  */
 const lookRoom = async (player) => {
-  const room = player.gameEngine.roomSystem.getRoom(player.room);
-  if (!room) {
+  const roomSystem = player.gameEngine.roomSystem;
+  const render = roomSystem.getRoomRender(player.room);
+  if (!render) {
     return { success: false, message: 'You are in a void. There is nothing here.' };
   }
 
-  let message = `[${room.title}]\r\n`;
-  message += room.description;
+  let message = `${render.titleLine}\r\n`;
+  message += render.description;
 
-  // Get items in room - inline with description
-  let itemDescriptions = [];
-  if (room.items && room.items.length > 0) {
-    // Fetch items from database to get proper descriptions
-    const itemIds = room.items.map(item => typeof item === 'string' ? item : (item.id || item.name || 'an item'));
-    
-    if (player.gameEngine && player.gameEngine.roomSystem && player.gameEngine.roomSystem.db) {
-      try {
-        const items = await player.gameEngine.roomSystem.db.collection('items')
-          .find({ id: { $in: itemIds } })
-          .toArray();
-        
-        itemDescriptions = items.map(item => item.roomDesc || item.name || item.id);
-      } catch (error) {
-        // Fallback to IDs if database lookup fails
-        itemDescriptions = itemIds;
-      }
-    } else {
-      itemDescriptions = itemIds;
-    }
-
-    if (itemDescriptions.length > 0) {
-      message += '  You also see ';
-      if (itemDescriptions.length === 1) {
-        message += itemDescriptions[0] + '.';
-      } else if (itemDescriptions.length === 2) {
-        message += itemDescriptions[0] + ' and ' + itemDescriptions[1] + '.';
-      } else {
-        message += itemDescriptions.slice(0, -1).join(', ') + ', and ' + itemDescriptions[itemDescriptions.length - 1] + '.';
-      }
-    }
+  // Get items in room - inline with description (served from the room system's item cache)
+  const itemDescriptions = await roomSystem.getRoomItemDescriptions(roomSystem.getRoom(player.room));
+  if (itemDescriptions.length > 0) {
+    message += '  You also see ' + roomSystem.formatEntityList(itemDescriptions) + '.';
   }
 
   // Get NPCs in room from NPC system
@@ -58,9 +32,10 @@ const lookRoom = async (player) => {
   }
 
   // Get other players in room from GameEngine.players Map (where online players are stored)
-  const allPlayers = Array.from(player.gameEngine.players.values());
-  const playersInRoom = allPlayers.filter(p => p.room === player.room);
-  const otherPlayers = playersInRoom.filter(p => p.name !== player.name);
+  const otherPlayers = [];
+  for (const p of player.gameEngine.players.values()) {
+    if (p.room === player.room && p.name !== player.name) otherPlayers.push(p);
+  }
 
   // Add "Also here:" line if there are players or NPCs
   if (otherPlayers.length > 0 || npcNames.length > 0) {
@@ -73,42 +48,8 @@ const lookRoom = async (player) => {
     message += entities.join(', ');
   }
 
-  // Show exits
-  if (room.exits && room.exits.length > 0) {
-    // Check if player is admin (admins can see all exits, including hidden ones)
-    // Refresh role from DB to ensure it's current
-    let isAdmin = false;
-    if (player && player.gameEngine?.roomSystem?.db && player.name) {
-      try {
-        const freshPlayer = await player.gameEngine.roomSystem.db.collection('players').findOne({ name: player.name });
-        if (freshPlayer && freshPlayer.role) {
-          player.role = freshPlayer.role;
-        }
-      } catch (error) {
-        // Fall back to in-memory role if DB lookup fails
-      }
-    }
-    isAdmin = player && (player.role === 'admin');
-    
-    let exitsToShow;
-    if (isAdmin) {
-      // Admins see all exits, mark hidden ones
-      exitsToShow = room.exits.map(exit => {
-        if (exit.hidden) {
-          return `${exit.direction} [hidden]`;
-        }
-        return exit.direction;
-      });
-    } else {
-      // Regular players only see non-hidden exits
-      exitsToShow = room.exits.filter(exit => !exit.hidden).map(exit => exit.direction);
-    }
-    
-    if (exitsToShow.length > 0) {
-      message += '\r\nObvious paths: ';
-      message += exitsToShow.join(', ');
-    }
-  }
+  // Show exits (admins can see all exits, including hidden ones)
+  message += player.role === 'admin' ? render.adminExitsLine : render.exitsLine;
 
   return { success: true, message: message };
 };
@@ -146,11 +87,7 @@ const lookEntity = async (player, args) => {
     }
     if (Array.isArray(player.inventory)) belongings.push(...player.inventory);
 
-    const found = belongings.find(it => {
-      const name = (it?.name || '').toLowerCase();
-      const kws = (it?.keywords || []).map(k=>k.toLowerCase());
-      return term.length === 0 || name.includes(term) || kws.some(k=> k.includes(term));
-    });
+    const found = belongings.find(it => it && (term.length === 0 || matchesText(it, term)));
 
     if (!found) {
       return { success:false, message: "You don't see that in your belongings.\r\n" };
@@ -286,8 +223,11 @@ const lookEntity = async (player, args) => {
           message = `You see ${shown}.`;
         }
         
-        if (matchedItem.timeUntilDecay) {
-          const decayIn = Math.floor(matchedItem.timeUntilDecay / 1000);
+        const timeUntilDecay = matchedItem.expiresAt
+          ? new Date(matchedItem.expiresAt).getTime() - Date.now()
+          : matchedItem.timeUntilDecay;
+        if (timeUntilDecay > 0) {
+          const decayIn = Math.floor(timeUntilDecay / 1000);
               message += ` You estimate it will rot away in ${decayIn} seconds.`;
             }
             
@@ -301,18 +241,8 @@ const lookEntity = async (player, args) => {
   // Search NPCs in room from NPC system
   if (player.gameEngine && player.gameEngine.npcSystem) {
     const npcsInRoom = player.gameEngine.npcSystem.getNPCsInRoom(player.room);
-    const npc = npcsInRoom.find(npc => {
-      // Check name or keywords
-      const name = npc.name || npc.npcId;
-      if (name.toLowerCase().includes(searchLower)) {
-        return true;
-      }
-      // Check keywords
-      if (npc.keywords && npc.keywords.some(kw => kw.toLowerCase().includes(searchLower))) {
-        return true;
-      }
-      return false;
-    });
+    // Check name or keywords
+    const npc = npcsInRoom.find(npc => matchesText(npc, searchLower));
 
     if (npc) {
       let message = '';
@@ -429,7 +359,7 @@ const lookEntity = async (player, args) => {
 
   // Search exits
   if (room.exits && room.exits.length > 0) {
-    const exit = room.exits.find(exit => exit.direction.toLowerCase().includes(searchLower));
+    const exit = room.exits.find(exit => matchesText(exit, searchLower));
     
     if (exit) {
       const destination = player.gameEngine.roomSystem.getRoom(exit.roomId);
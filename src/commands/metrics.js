@@ -0,0 +1,130 @@
+'use strict';
+
+const metrics = require('../utils/metrics');
+
+/**
+ * Metrics Command (Admin Only)
+ * Engine latency and throughput from the metrics registry
+ *
+ * Usage:
+ *  metrics            tick, event loop, cache and session overview
+ *  metrics commands   slowest commands by p99
+ *  metrics db         slowest collection operations by p99
+ *  metrics reset      clear counters and histograms
+ *
+ * The same data is served as Prometheus text on http://127.0.0.1:9464/metrics
+ */
+
+const TOP = 15;
+
+function ms(value) {
+  return value >= 100 ? value.toFixed(0) : value.toFixed(2);
+}
+
+function latencyRow(label, summary) {
+  return `  ${label.padEnd(34)} ${String(summary.count).padStart(7)}  ` +
+    `${ms(summary.p50).padStart(8)} ${ms(summary.p90).padStart(8)} ${ms(summary.p99).padStart(8)} ${ms(summary.max).padStart(8)}`;
+}
+
+function latencyHeader(title) {
+  return [title, `  ${''.padEnd(34)} ${'count'.padStart(7)}  ${'p50'.padStart(8)} ${'p90'.padStart(8)} ${'p99'.padStart(8)} ${'max'.padStart(8)}  (ms)`];
+}
+
+function topByP99(histogram, labelOf) {
+  return histogram.summarize()
+    .sort((a, b) => b.p99 - a.p99)
+    .slice(0, TOP)
+    .map(summary => latencyRow(labelOf(summary.labels), summary));
+}
+
+module.exports = {
+  name: 'metrics',
+  aliases: ['perf'],
+  description: 'Admin: show engine latency and throughput metrics',
+  usage: 'metrics\r\nmetrics commands\r\nmetrics db\r\nmetrics reset',
+
+  async execute(player, args) {
+    if (!player.gameEngine || !player.gameEngine.roomSystem || !player.gameEngine.roomSystem.db) {
+      return { success: false, message: 'Database not available.\r\n' };
+    }
+
+    const db = player.gameEngine.roomSystem.db;
+    // Always refresh player from DB first so role changes take effect immediately
+    try {
+      const fresh = await db.collection('players').findOne({ name: player.name });
+      if (fresh && fresh.role) {
+        player.role = fresh.role;
+      }
+    } catch (_) {
+      // Ignore reload errors; fall back to in-memory role
+    }
+
+    if (player.role !== 'admin') {
+      return { success: false, message: 'You are not authorized to use this command.\r\n' };
+    }
+
+    const sub = (args[0] || '').toLowerCase();
+
+    if (sub === 'reset') {
+      metrics.reset();
+      return { success: true, message: 'Metrics counters and histograms cleared.\r\n' };
+    }
+
+    if (sub === 'commands') {
+      const rows = topByP99(metrics.histogram('gs3_command_duration_ms'), labels => labels.command);
+      const lines = latencyHeader('Slowest commands:');
+      lines.push(...(rows.length > 0 ? rows : ['  No commands recorded yet.']));
+      return { success: true, message: lines.join('\r\n') + '\r\n' };
+    }
+
+    if (sub === 'db') {
+      const rows = topByP99(metrics.histogram('gs3_db_operation_duration_ms'), labels => `${labels.collection}.${labels.op}`);
+      const lines = latencyHeader('Slowest database operations:');
+      lines.push(...(rows.length > 0 ? rows : ['  No database operations recorded yet.']));
+      return { success: true, message: lines.join('\r\n') + '\r\n' };
+    }
+
+    const lines = latencyHeader('Engine:');
+    const tick = metrics.histogram('gs3_tick_duration_ms').get();
+    if (tick) lines.push(latencyRow('tick', tick));
+    for (const summary of metrics.histogram('gs3_tick_phase_duration_ms').summarize()) {
+      lines.push(latencyRow(`  ${summary.labels.phase}`, summary));
+    }
+    lines.push(`  Tick overruns: ${metrics.counter('gs3_tick_overruns_total').get()}`);
+
+    const gauges = new Map(metrics.collectGauges().map(gauge => [gauge.name, gauge.values]));
+    const lag = gauges.get('gs3_event_loop_lag_ms');
+    if (lag) {
+      lines.push(`  Event loop lag: ${lag.map(({ labels, value }) => `${labels.quantile === 1 ? 'max' : `p${labels.quantile * 100}`} ${ms(value)}`).join(', ')} ms`);
+    }
+
+    // Cache hit rates
+    const caches = new Map();
+    for (const series of metrics.counter('gs3_cache_requests_total').series.values()) {
+      const entry = caches.get(series.labels.cache) || { hit: 0, miss: 0 };
+      entry[series.labels.result] += series.value;
+      caches.set(series.labels.cache, entry);
+    }
+    lines.push('', 'Caches:');
+    if (caches.size === 0) lines.push('  No cache lookups recorded yet.');
+    for (const [cache, { hit, miss }] of caches) {
+      const rate = hit + miss > 0 ? (100 * hit / (hit + miss)).toFixed(1) : '0.0';
+      lines.push(`  ${cache.padEnd(14)} ${rate}% hits (${hit} hits, ${miss} misses)`);
+    }
+
+    const commandSummaries = metrics.histogram('gs3_command_duration_ms').summarize();
+    const commands = commandSummaries.reduce((total, summary) => total + summary.count, 0);
+    const dbOps = metrics.histogram('gs3_command_db_ops').summarize();
+    const dbOpTotal = dbOps.reduce((total, summary) => total + summary.count * summary.mean, 0);
+    lines.push('', `Commands: ${commands} executed, ${commands > 0 ? (dbOpTotal / commands).toFixed(2) : '0.00'} DB ops per command`);
+
+    const gauge = (name) => (gauges.get(name) || []).map(({ labels, value }) => labels ? `${Object.values(labels)[0]} ${value}` : value).join(', ');
+    lines.push(
+      `Players: ${gauge('gs3_players_online')}   NPCs: ${gauge('gs3_npcs')}`,
+      `Sessions: ${gauge('gs3_sessions')}`,
+      `Pending world writes: ${gauge('gs3_persistence_queue_pending')}   Password queue: ${gauge('gs3_password_queue')}   Decay scheduled: ${gauge('gs3_item_decay_scheduled')}`
+    );
+
+    return { success: true, message: lines.join('\r\n') + '\r\n' };
+  }
+};
@@ -2,6 +2,7 @@
 
 const { checkRoundtime } = require('../utils/roundtimeChecker');
 const { findItemWithOther } = require('../utils/keywordMatcher');
+const Enc = require('../utils/encumbrance');
 
 /**
  * Put Command
@@ -171,6 +172,7 @@ module.exports = {
       if (item.id) {
         try { await db.collection('items').deleteOne({ id: item.id }); } catch(_) {}
       }
+      await Enc.recalcEncumbrance(player);
 
       return { success:true, message: `You place ${itemName} into ${contName}. It vanishes without a trace.\r\n` };
     }
@@ -236,6 +238,10 @@ module.exports = {
       console.error('Error storing item in container:', error);
     }
 
+    // Worn containers carry their contents; the ledger adjusts without re-reading them
+    Enc.noteContainerAdd(player, container.id, { ...item, id: itemId });
+    await Enc.recalcEncumbrance(player);
+
     return { success:true, message: `You put ${itemName} in ${contName}.\r\n` };
   }
 };
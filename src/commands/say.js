@@ -16,27 +16,20 @@ module.exports = {
     }
     
     const message = args.join(' ');
-    const room = player.gameEngine.getRoom(player.currentRoom);
+    const room = player.gameEngine.getRoom(player.room);
     
     if (!room) {
       return { success: false, message: 'You are nowhere.' };
     }
     
-    // Get all players in the room
-    const playersInRoom = player.gameEngine.roomSystem.getPlayersInRoom(player.currentRoom);
-    
-    // Send message to all players in the room
-    playersInRoom.forEach(playerId => {
-      const targetPlayer = player.gameEngine.getPlayer(playerId);
-      if (targetPlayer && targetPlayer.connection) {
-        if (playerId === player.id) {
-          targetPlayer.connection.send(`You say, "${message}"`);
-        } else {
-          targetPlayer.connection.send(`${player.name} says, "${message}"`);
-        }
+    // Send message to everyone else in the room (occupancy from the room event bus)
+    const playersInRoom = player.gameEngine.roomSystem.getPlayersInRoom(player.room);
+    for (const other of playersInRoom) {
+      if (other !== player && other.connection) {
+        other.connection.send(`${player.name} says, "${message}"\r\n`);
       }
-    });
+    }
     
-    return { success: true };
+    return { success: true, message: `You say, "${message}"` };
   }
 };
@@ -20,6 +20,10 @@ module.exports = {
     if (!db) return { success: false, message: 'The world flickers strangely. Try again.\r\n' };
 
     try {
+      // Make sure freshly created corpses have reached the database
+      const queue = player.gameEngine.persistenceQueue;
+      if (queue && queue.hasPending()) await queue.flush();
+
       const itemIds = Array.isArray(room.items) ? room.items.map(x => (typeof x === 'string' ? x : x.id)) : [];
       const items = await db.collection('items').find({ id: { $in: itemIds } }).toArray();
       const lower = term.toLowerCase();
@@ -69,10 +73,16 @@ module.exports = {
 
       // Remove corpse from room
       await db.collection('items').deleteOne({ id: corpse.id });
+      player.gameEngine.itemLifecycle?.forget(corpse.id);
       const newItems = (room.items || []).filter(x => (typeof x === 'string' ? x !== corpse.id : x.id !== corpse.id));
-      await db.collection('rooms').updateOne({ id: player.room }, { $set: { items: newItems } });
       const cached = player.gameEngine.roomSystem.getRoom(player.room);
       if (cached) player.gameEngine.roomSystem.rooms.set(player.room, { ...cached, items: newItems });
+      player.gameEngine.roomSystem.invalidateItemDisplayName(corpse.id);
+      if (queue) {
+        queue.pullRoomItem(player.room, corpse.id);
+      } else {
+        await db.collection('rooms').updateOne({ id: player.room }, { $pull: { items: corpse.id } });
+      }
 
       try { const Enc = require('../utils/encumbrance'); await Enc.recalcEncumbrance(player); } catch(_) {}
       return { success: true, message: msg };
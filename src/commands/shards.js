@@ -0,0 +1,91 @@
+'use strict';
+
+/**
+ * Shards Command (Admin Only)
+ * Per-shard load when the world runs as area shards (SHARDS=<n>)
+ *
+ * Usage:
+ *  shards          load table: areas, rooms, players, NPCs, tick and event loop latency, heap
+ *  shards areas    areas owned by the shard you are on
+ *
+ * The table is refreshed by the gateway every few seconds (see systems/ShardManager.js).
+ */
+
+function ms(value) {
+  return (value || 0) >= 100 ? (value || 0).toFixed(0) : (value || 0).toFixed(1);
+}
+
+module.exports = {
+  name: 'shards',
+  aliases: ['shard'],
+  description: 'Admin: show per-shard load of the sharded world',
+  usage: 'shards\r\nshards areas',
+
+  async execute(player, args) {
+    if (!player.gameEngine || !player.gameEngine.roomSystem || !player.gameEngine.roomSystem.db) {
+      return { success: false, message: 'Database not available.\r\n' };
+    }
+
+    const db = player.gameEngine.roomSystem.db;
+    // Always refresh player from DB first so role changes take effect immediately
+    try {
+      const fresh = await db.collection('players').findOne({ name: player.name });
+      if (fresh && fresh.role) {
+        player.role = fresh.role;
+      }
+    } catch (_) {
+      // Ignore reload errors; fall back to in-memory role
+    }
+
+    if (player.role !== 'admin') {
+      return { success: false, message: 'You are not authorized to use this command.\r\n' };
+    }
+
+    const engine = player.gameEngine;
+    if (!engine.shard) {
+      return {
+        success: true,
+        message: `The world is not sharded: one process runs ${engine.players.size} players and ${engine.npcSystem.count} NPCs.\r\n` +
+          'Start the server with SHARDS=<n> to run areas on <n> worker threads.\r\n'
+      };
+    }
+
+    const sub = (args[0] || '').toLowerCase();
+    const room = engine.roomSystem.getRoom(player.room);
+
+    if (sub === 'areas') {
+      const areas = Object.keys(engine.shard.assignment)
+        .filter(areaId => engine.shard.assignment[areaId] === engine.shard.index)
+        .sort();
+      const lines = [`Shard ${engine.shard.index} owns ${areas.length} areas:`];
+      for (const areaId of areas) {
+        const area = engine.roomSystem.getArea(areaId);
+        lines.push(`  ${(areaId || '(none)').padEnd(30)} ${area && area.name ? area.name : ''}`);
+      }
+      return { success: true, message: lines.join('\r\n') + '\r\n' };
+    }
+
+    const table = engine.shard.loads;
+    if (!table) {
+      return { success: true, message: `You are on shard ${engine.shard.index}. No load reports yet; try again in a few seconds.\r\n` };
+    }
+
+    const lines = [
+      `You are on shard ${engine.shard.index} (area ${(room && room.areaId) || 'none'}).`,
+      `  ${'shard'.padEnd(6)} ${'areas'.padStart(6)} ${'rooms'.padStart(7)} ${'players'.padStart(8)} ${'npcs'.padStart(7)} ` +
+        `${'tick p50'.padStart(9)} ${'p99'.padStart(7)} ${'max'.padStart(7)} ${'lag p99'.padStart(8)} ${'heap MB'.padStart(8)} ${'writes'.padStart(7)}`
+    ];
+    for (const shard of table.shards) {
+      const status = shard.ready ? '' : '  (starting)';
+      lines.push(
+        `  ${String(shard.index).padEnd(6)} ${String(shard.areas).padStart(6)} ${String(shard.rooms).padStart(7)} ` +
+        `${String(shard.players).padStart(8)} ${String(shard.npcs ?? '-').padStart(7)} ` +
+        `${ms(shard.tickP50).padStart(9)} ${ms(shard.tickP99).padStart(7)} ${ms(shard.tickMax).padStart(7)} ` +
+        `${ms(shard.lagP99).padStart(8)} ${(shard.heapMB || 0).toFixed(0).padStart(8)} ${String(shard.pendingWrites ?? '-').padStart(7)}${status}`
+      );
+    }
+    const { entered, handoffs, bounced, restarts } = table.stats;
+    lines.push(`Logins: ${entered}   Handoffs: ${handoffs}   Rerouted lines: ${bounced}   Shard restarts: ${restarts}`);
+    return { success: true, message: lines.join('\r\n') + '\r\n' };
+  }
+};
@@ -1,6 +1,8 @@
 'use strict';
 
 const CharacterCreation = require('../systems/CharacterCreation');
+const DerivedStats = require('../services/derivedStats');
+const log = require('../utils/logger').child('command');
 const characterCreation = new CharacterCreation();
 
 /**
@@ -41,13 +43,11 @@ module.exports = {
           ranks: legacyPTRanks || classPhysicalFitness?.ranks || 0,
           maxRanksPerLevel: classPhysicalFitness?.maxRanksPerLevel ?? 3
         };
+        DerivedStats.invalidate(player, 'skills');
       }
       
-      console.log(`[SKILLS DEBUG] Player: ${player.name}`);
-      console.log(`[SKILLS DEBUG] Skills object:`, JSON.stringify(player.skills, null, 2));
-      
       const skills = Object.entries(player.skills || {});
-      console.log(`[SKILLS DEBUG] Skills entries:`, skills.length);
+      log.debug('Showing skills', { player: player.name, skills: skills.length });
       
       if (skills.length === 0) {
         message += 'No skills available. This character was created before the skills system was implemented.\n';
@@ -60,8 +60,6 @@ module.exports = {
         ['brawling', 'one_handed_edged', 'one_handed_blunt', 'two_handed', 'polearm', 'ranged', 'thrown', 'combat_maneuvers', 'shield_use', 'armor_use'].includes(id)
       );
       
-      console.log(`[SKILLS DEBUG] Combat skills:`, combatSkills.map(([id, skill]) => `${id}: rank ${skill.ranks}`));
-      
       const utilitySkills = skills.filter(([id, skill]) => 
         ['climbing', 'swimming', 'disarm_traps', 'pick_locks', 'stalk_and_hide', 'perception', 'ambush', 'first_aid', 'physical_fitness'].includes(id)
       );
@@ -72,7 +70,6 @@ module.exports = {
 
       let skillNumber = 1;
       const formatSkill = (name, ranks, cost, number, maxPerLevel, skillId) => {
-        console.log(`[SKILLS DEBUG] Formatting skill ${number}: ${name} with ${ranks} ranks`);
         // Format: Number) Ranks_This_Level/Max_Per_Level (Next_Rank_Cost) Skill_Name (Total_Ranks)
         // Calculate ranks trained this level
         const ranksThisLevel = maxPerLevel > 0 ? ranks % maxPerLevel : 0;
@@ -151,7 +148,6 @@ module.exports = {
         message += 'Combat Skills\r\n';
         combatSkills.forEach(([id, skill]) => {
           const maxPerLevel = getSkillMaxRanks(id);
-          console.log(`[SKILLS DEBUG] Displaying ${id}: ranks=${skill.ranks}, maxPerLevel=${maxPerLevel}`);
           message += formatSkill(skill.name, skill.ranks, skill.cost, skillNumber++, maxPerLevel, id) + '\r\n';
         });
         message += '\r\n';
@@ -36,6 +36,10 @@ module.exports = {
 
     const targetName = args.join(' ');
     try {
+      // Make sure freshly created corpses have reached the database
+      const queue = player.gameEngine.persistenceQueue;
+      if (queue && queue.hasPending()) await queue.flush();
+
       const itemIds = Array.isArray(room.items) ? room.items.map(x => (typeof x === 'string' ? x : x.id)) : [];
       const items = await db.collection('items').find({ id: { $in: itemIds } }).toArray();
       const lower = targetName.toLowerCase();
@@ -136,17 +140,22 @@ module.exports = {
         },
         createdAt: new Date()
       };
+      player.gameEngine.itemLifecycle?.schedule(skinItem, player.room, { persist: false });
       await db.collection('items').insertOne(skinItem);
       
       // Mark corpse as skinned
       await db.collection('items').updateOne({ id: corpse.id }, { $set: { 'metadata.skinned': true } });
 
       // Add to room items
-      const freshRoom = await db.collection('rooms').findOne({ id: player.room });
-      const newItems = Array.isArray(freshRoom?.items) ? [...freshRoom.items, skinId] : [skinId];
-      await db.collection('rooms').updateOne({ id: player.room }, { $set: { items: newItems } });
       const cached = player.gameEngine.roomSystem.getRoom(player.room);
+      const newItems = Array.isArray(cached?.items) ? [...cached.items, skinId] : [skinId];
       if (cached) player.gameEngine.roomSystem.rooms.set(player.room, { ...cached, items: newItems });
+      player.gameEngine.roomSystem.setItemDisplayName(skinItem);
+      if (queue) {
+        queue.pushRoomItem(player.room, skinId);
+      } else {
+        await db.collection('rooms').updateOne({ id: player.room }, { $push: { items: skinId } });
+      }
 
       // Apply short RT for skinning
       player.gameEngine.combatSystem.addLag(player, 2000);
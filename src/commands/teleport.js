@@ -71,8 +71,7 @@ module.exports = {
     }
 
     // Move the player (no roundtime check for admin teleport)
-    const oldRoom = player.room;
-    player.room = roomId;
+    const oldRoom = player.gameEngine.movePlayer(player, roomId, 'teleport');
     
     // Update player in database
     await player.gameEngine.playerSystem.updatePlayer(player);
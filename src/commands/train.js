@@ -1,6 +1,7 @@
 'use strict';
 
 const { checkRoundtime } = require('../utils/roundtimeChecker');
+const DerivedStats = require('../services/derivedStats');
 
 /**
  * Train Command
@@ -76,6 +77,8 @@ module.exports = {
     const result = player.gameEngine.characterCreation.trainSkill(player, skillId, ranks);
     
     if (result.success) {
+      DerivedStats.invalidate(player, 'skills');
+
       // If Physical Fitness was trained, HP is already recalculated by trainSkill
       // But we should also recalculate if Constitution changed (unlikely, but good practice)
       // For now, only PF training affects HP
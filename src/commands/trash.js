@@ -73,6 +73,8 @@ module.exports = {
 
       // Delete item from database
       await db.collection('items').deleteOne({ id: item.id });
+      player.gameEngine.roomSystem.invalidateItemDisplayName(item.id);
+      player.gameEngine.itemLifecycle?.forget(item.id);
 
       // Remove from room items array
       const newItems = room.items.filter(x => {
@@ -80,17 +82,19 @@ module.exports = {
         return id !== item.id;
       });
       
-      await db.collection('rooms').updateOne(
-        { id: player.room },
-        { $set: { items: newItems } }
-      );
-
       // Update room cache
       const cached = player.gameEngine.roomSystem.getRoom(player.room);
       if (cached) {
         player.gameEngine.roomSystem.rooms.set(player.room, { ...cached, items: newItems });
       }
 
+      const queue = player.gameEngine.persistenceQueue;
+      if (queue) {
+        queue.pullRoomItem(player.room, item.id);
+      } else {
+        await db.collection('rooms').updateOne({ id: player.room }, { $pull: { items: item.id } });
+      }
+
       return { 
         success: true, 
         message: `You destroy ${item.name || 'the item'}.\r\n` 
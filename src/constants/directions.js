@@ -0,0 +1,45 @@
+'use strict';
+
+/**
+ * Direction Constants (SSOT)
+ * Words a player can type on their own to walk through an exit
+ */
+
+// Shortcut or full name -> canonical exit direction
+const DIRECTION_ALIASES = Object.freeze({
+  n: 'north',
+  s: 'south',
+  e: 'east',
+  w: 'west',
+  u: 'up',
+  d: 'down',
+  ne: 'northeast',
+  nw: 'northwest',
+  se: 'southeast',
+  sw: 'southwest',
+  north: 'north',
+  south: 'south',
+  east: 'east',
+  west: 'west',
+  up: 'up',
+  down: 'down',
+  out: 'out',
+  northeast: 'northeast',
+  northwest: 'northwest',
+  southeast: 'southeast',
+  southwest: 'southwest'
+});
+
+// Ordinal exit directions; the index is the direction's slot in a loaded room
+const EXIT_DIRECTIONS = Object.freeze([
+  'north', 'northeast', 'east', 'southeast',
+  'south', 'southwest', 'west', 'northwest',
+  'up', 'down', 'out'
+]);
+
+// Canonical direction -> slot
+const DIRECTION_SLOTS = Object.freeze(
+  Object.fromEntries(EXIT_DIRECTIONS.map((direction, slot) => [direction, slot]))
+);
+
+module.exports = { DIRECTION_ALIASES, EXIT_DIRECTIONS, DIRECTION_SLOTS };
@@ -0,0 +1,25 @@
+'use strict';
+
+/**
+ * Item Decay Constants (SSOT)
+ * How long loose items last on the ground before they rot away
+ */
+
+const ITEM_DECAY = {
+  // Decay time by item type (milliseconds)
+  decayMsByType: {
+    CORPSE: 5 * 60 * 1000,   // Corpses rot in 5 minutes
+    SKIN: 15 * 60 * 1000     // Skins left on the ground
+  },
+
+  // Anything else dropped on the ground
+  defaultDroppedMs: 30 * 60 * 1000,
+
+  // How often the expiry schedule is swept
+  sweepIntervalMs: 5 * 1000,
+
+  // Maximum items removed per sweep (the rest wait for the next sweep)
+  maxPerSweep: 200
+};
+
+module.exports = { ITEM_DECAY };
@@ -0,0 +1,47 @@
+'use strict';
+
+/**
+ * Area Shard Constants (SSOT)
+ * Message protocol between the gateway (systems/ShardManager.js) and the
+ * area shard workers (workers/shardWorker.js). Every message is
+ * { type, ...fields }; player state travels as plain data (no engine,
+ * connection or combat references).
+ */
+
+const SHARD_MESSAGES = Object.freeze({
+  // Gateway -> shard
+  ENTER: 'enter',         // { playerId, player, greeting, pending } player joins the shard (login or handoff)
+  RECONNECT: 'reconnect', // { playerId, greeting } a new session took over a player hosted here
+  INPUT: 'input',         // { playerId, line } one command line
+  LEAVE: 'leave',         // { playerId } the session is gone; remove the player
+  LOADS: 'loads',         // { shards } per-shard load table (SHARDS command)
+  RELOAD: 'reload',       // reload rooms, critical tables, NPCs and commands (HOTFIX ran in another shard)
+  STOP: 'stop',           // save players, flush writes and exit
+
+  // Shard -> gateway
+  READY: 'ready',         // { rooms, npcs } world loaded, accepting players
+  OUTPUT: 'output',       // { playerId, text } batched output for the player's session
+  CLOSE: 'close',         // { playerId } a command asked to disconnect the player
+  HANDOFF: 'handoff',     // { playerId, player, areaId, pending } player moved into another shard's area
+  BOUNCE: 'bounce',       // { playerId, line } input for a player no longer hosted here
+  LEFT: 'left',           // { playerId, player } final state after LEAVE
+  LOAD: 'load',           // { load } periodic load report
+  HOTFIX: 'hotfix',       // HOTFIX reloaded this shard; the others should reload too
+  STOPPED: 'stopped'      // players saved and writes flushed
+});
+
+const SHARDING = {
+  // How often shards report load and the gateway shares the table
+  loadIntervalMs: 5 * 1000,
+
+  // How long a shard may take to load the world before startup fails
+  readyTimeoutMs: 2 * 60 * 1000,
+
+  // How long the gateway waits for shards to save and flush on shutdown
+  stopTimeoutMs: 10 * 1000,
+
+  // Delay before a crashed shard is started again
+  restartDelayMs: 2 * 1000
+};
+
+module.exports = { SHARD_MESSAGES, SHARDING };
@@ -1,5 +1,7 @@
 'use strict';
 
+const { findByName } = require('../utils/keywordMatcher');
+
 /**
  * Argument Parser
  * Handles parsing of command arguments with dot notation
@@ -189,37 +191,7 @@ class ArgParser {
    * @return {*} Matching item or null
    */
   static findPartial(search, list, nameExtractor = (item) => item.name || item) {
-    if (!search || !list) {
-      return null;
-    }
-
-    const lowerSearch = search.toLowerCase();
-
-    // First try exact match
-    for (const item of list) {
-      const name = nameExtractor(item);
-      if (name && name.toLowerCase() === lowerSearch) {
-        return item;
-      }
-    }
-
-    // Then try starts with
-    for (const item of list) {
-      const name = nameExtractor(item);
-      if (name && name.toLowerCase().startsWith(lowerSearch)) {
-        return item;
-      }
-    }
-
-    // Finally try contains
-    for (const item of list) {
-      const name = nameExtractor(item);
-      if (name && name.toLowerCase().includes(lowerSearch)) {
-        return item;
-      }
-    }
-
-    return null;
+    return findByName(search, list, nameExtractor);
   }
 }
 
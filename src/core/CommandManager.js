@@ -2,6 +2,13 @@
 
 const fs = require('fs').promises;
 const path = require('path');
+const CommandResolver = require('./CommandResolver');
+const log = require('../utils/logger').child('command');
+const metrics = require('../utils/metrics');
+
+const commandLatency = metrics.histogram('gs3_command_duration_ms', 'Command execution latency by command');
+const commandDbOps = metrics.histogram('gs3_command_db_ops', 'Database round trips per command execution');
+const commandsTotal = metrics.counter('gs3_commands_total', 'Executed commands by command and result');
 
 /**
  * Command Manager
@@ -11,20 +18,18 @@ class CommandManager {
   constructor() {
     this.commands = new Map();
     this.aliases = new Map();
+    this.resolver = new CommandResolver(); // Precomputed word -> command/direction table
+    this.resolverStale = true;
+    this.commandsDir = null;
+    this.moduleFiles = new Map(); // file name -> command module loaded from it (reload fallback)
   }
 
   /**
    * Register a command
    */
   register(commandName, commandHandler) {
-    this.commands.set(commandName.toLowerCase(), commandHandler);
-    
-    // Register aliases if they exist
-    if (commandHandler.aliases) {
-      commandHandler.aliases.forEach(alias => {
-        this.aliases.set(alias.toLowerCase(), commandName.toLowerCase());
-      });
-    }
+    addCommand(this.commands, this.aliases, commandName, commandHandler);
+    this.resolverStale = true;
   }
 
   /**
@@ -34,28 +39,42 @@ class CommandManager {
     const command = this.getCommand(commandName);
     
     if (!command) {
-      console.error(`Command not found: ${commandName}`);
+      log.debug('Command not found', { command: commandName });
+      commandsTotal.inc({ command: 'unknown', result: 'not_found' });
       return { success: false, message: 'Huh?\r\n' };
     }
 
+    // Label by the registered name, not what was typed, so aliases share a series
+    const name = command.name || commandName.toLowerCase();
+    const context = { command: name, dbOps: 0 };
+    const started = metrics.now();
+    let outcome = 'ok';
+
     try {
       // Check if player has permission to use this command
       if (command.permission && !this.hasPermission(player, command.permission)) {
+        outcome = 'denied';
         return { success: false, message: 'You do not have permission to use this command.' };
       }
 
-      // Execute the command
-      const result = await command.execute(player, args);
+      // Execute the command (DB operations inside it are counted against this context)
+      const result = await metrics.runWithContext(context, () => command.execute(player, args));
       
       if (!result) {
         console.error(`Command ${commandName} returned no result`);
         return { success: true };
       }
       
+      if (result.success === false) outcome = 'failed';
       return result;
     } catch (error) {
+      outcome = 'error';
       console.error(`Error executing command ${commandName}:`, error);
       return { success: false, message: 'An error occurred while executing the command.' };
+    } finally {
+      commandLatency.observe(metrics.since(started), { command: name });
+      commandDbOps.observe(context.dbOps, { command: name });
+      commandsTotal.inc({ command: name, result: outcome });
     }
   }
 
@@ -96,62 +115,97 @@ class CommandManager {
    * Load commands from directory
    */
   async loadCommands(commandsDir) {
+    this.commandsDir = commandsDir;
     try {
-      const files = await fs.readdir(commandsDir);
-      
-      for (const file of files) {
-        if (file.endsWith('.js')) {
-          const commandPath = path.join(commandsDir, file);
-          const commandModule = require(commandPath);
-          
-          // Register the command
-          if (commandModule.name && commandModule.execute) {
-            this.register(commandModule.name, commandModule);
-            console.log(`Loaded command: ${commandModule.name}`);
-          }
-        }
+      const { modules, failed } = await readCommandModules(commandsDir);
+      for (const commandModule of modules.values()) {
+        this.register(commandModule.name, commandModule);
+        log.debug('Loaded command', { command: commandModule.name });
+      }
+      this.moduleFiles = modules;
+      for (const { file, error } of failed) {
+        console.error(`Error loading command ${file}:`, error);
       }
     } catch (error) {
       console.error('Error loading commands:', error);
     }
+    this.rebuildResolver();
   }
 
   /**
-   * Find a command with fuzzy matching
-   * Tries exact match first, then partial match
-   * Requires at least 3 characters for abbreviation matching
+   * Reload every command module from disk (hotfix) and rebuild the resolver
+   * The new set is built aside and swapped in at once, so input arriving during
+   * the reload still resolves against the old set. A module that fails to load
+   * keeps its previous version.
+   * @returns {number} Number of commands loaded
    */
-  findCommand(search) {
-    if (!search) {
-      return null;
-    }
-
-    const lowerSearch = search.toLowerCase();
+  async reloadCommands() {
+    if (!this.commandsDir) return this.commands.size;
 
-    // Try exact match
-    const exactMatch = this.getCommand(lowerSearch);
-    if (exactMatch) {
-      return lowerSearch;
+    const prefix = this.commandsDir + path.sep;
+    for (const modulePath of Object.keys(require.cache)) {
+      if (modulePath.startsWith(prefix)) {
+        delete require.cache[modulePath];
+      }
     }
 
-    // Fuzzy match requires at least 3 characters (to avoid ambiguous matches)
-    if (lowerSearch.length >= 3) {
-      // Try fuzzy match - starts with (commands)
-      for (const [name] of this.commands) {
-        if (name.startsWith(lowerSearch)) {
-          return name;
-        }
+    // Throws (leaving the current commands in place) if the directory cannot be read
+    const { modules, failed } = await readCommandModules(this.commandsDir);
+    const commands = new Map();
+    const aliases = new Map();
+    for (const commandModule of modules.values()) {
+      addCommand(commands, aliases, commandModule.name, commandModule);
+    }
+    for (const { file, error } of failed) {
+      log.error('Command failed to reload; keeping the loaded version', { file, error: error.message });
+      const previous = this.moduleFiles.get(file);
+      if (previous && !commands.has(previous.name.toLowerCase())) {
+        addCommand(commands, aliases, previous.name, previous);
+        modules.set(file, previous);
       }
+    }
 
-      // Try fuzzy match - aliases
-      for (const [alias, commandName] of this.aliases) {
-        if (alias.startsWith(lowerSearch)) {
-          return commandName;
-        }
-      }
+    const resolver = new CommandResolver();
+    resolver.build(commands, aliases);
+    this.commands = commands;
+    this.aliases = aliases;
+    this.moduleFiles = modules;
+    this.resolver = resolver;
+    this.resolverStale = false;
+    return commands.size;
+  }
+
+  /**
+   * Rebuild the word -> command/direction table from the registered commands
+   */
+  rebuildResolver() {
+    this.resolver.build(this.commands, this.aliases);
+    this.resolverStale = false;
+    log.debug('Built command resolver', { words: this.resolver.size });
+  }
+
+  /**
+   * Resolve the first word of an input line
+   * @param {string} word - Lower-case word
+   * @returns {Object|null} { type: 'command', name } or { type: 'direction', direction }
+   */
+  resolve(word) {
+    if (this.resolverStale) this.rebuildResolver();
+    return this.resolver.resolve(word);
+  }
+
+  /**
+   * Find a command by name, alias or unique abbreviation
+   * Abbreviations need at least 3 characters (to avoid ambiguous matches)
+   * @returns {string|null} Command name
+   */
+  findCommand(search) {
+    if (!search) {
+      return null;
     }
 
-    return null;
+    const resolution = this.resolve(search.toLowerCase());
+    return resolution && resolution.type === 'command' ? resolution.name : null;
   }
 
   /**
@@ -174,4 +228,41 @@ class CommandManager {
   }
 }
 
+/**
+ * Add a command and its aliases to a name and alias table
+ */
+function addCommand(commands, aliases, commandName, commandHandler) {
+  const name = commandName.toLowerCase();
+  commands.set(name, commandHandler);
+
+  // Register aliases if they exist
+  if (commandHandler.aliases) {
+    commandHandler.aliases.forEach(alias => {
+      aliases.set(alias.toLowerCase(), name);
+    });
+  }
+}
+
+/**
+ * Require every command module in a directory
+ * @returns {Promise<Object>} { modules: Map of file name -> module, failed: [{ file, error }] }
+ */
+async function readCommandModules(commandsDir) {
+  const files = await fs.readdir(commandsDir);
+  const modules = new Map();
+  const failed = [];
+  for (const file of files) {
+    if (!file.endsWith('.js')) continue;
+    try {
+      const commandModule = require(path.join(commandsDir, file));
+      if (commandModule.name && commandModule.execute) {
+        modules.set(file, commandModule);
+      }
+    } catch (error) {
+      failed.push({ file, error });
+    }
+  }
+  return { modules, failed };
+}
+
 module.exports = CommandManager;
@@ -0,0 +1,94 @@
+'use strict';
+
+const { DIRECTION_ALIASES } = require('../constants/directions');
+
+// Abbreviations shorter than this only match exact command names and aliases
+const MIN_ABBREVIATION = 3;
+
+/**
+ * Command Resolver
+ * Precomputed table of every word a player can start a line with: direction
+ * shortcuts, command names, aliases and their unique abbreviations. Built once
+ * when commands are loaded (and again on hotfix) so resolving input is a single
+ * Map lookup returning a shared, frozen entry.
+ *
+ * Priority when several entries claim the same word (GS-style, deterministic):
+ *   1. Direction shortcuts (n, sw, out, ...)
+ *   2. Exact command name
+ *   3. Exact alias
+ *   4. Abbreviation of a command name, then of an alias; ties go to the higher
+ *      `priority` declared by the command module, then alphabetical order
+ */
+class CommandResolver {
+  constructor() {
+    this.table = new Map(); // word -> { type, name?, direction? }
+  }
+
+  /**
+   * Rebuild the table from the registered commands and aliases
+   * @param {Map<string, Object>} commands - name -> command module
+   * @param {Map<string, string>} aliases - alias -> command name
+   */
+  build(commands, aliases) {
+    const table = new Map();
+    const ranks = new Map(); // word -> rank of the entry currently holding it (lower wins)
+
+    const claim = (word, entry, rank) => {
+      const held = ranks.get(word);
+      if (held !== undefined && !isBetter(rank, held)) return;
+      table.set(word, entry);
+      ranks.set(word, rank);
+    };
+
+    for (const [word, direction] of Object.entries(DIRECTION_ALIASES)) {
+      claim(word, Object.freeze({ type: 'direction', direction }), [0, 0, 0, word]);
+    }
+
+    const words = [];
+    for (const [name, command] of commands) {
+      words.push({ word: name, name, kind: 0, priority: command.priority || 0 });
+    }
+    for (const [alias, name] of aliases) {
+      if (!commands.has(name)) continue;
+      words.push({ word: alias, name, kind: 1, priority: commands.get(name).priority || 0 });
+    }
+
+    for (const { word, name, kind, priority } of words) {
+      const entry = Object.freeze({ type: 'command', name });
+      claim(word, entry, [1 + kind, 0, -priority, word]);
+      for (let length = MIN_ABBREVIATION; length < word.length; length++) {
+        claim(word.slice(0, length), entry, [3, kind, -priority, word]);
+      }
+    }
+
+    this.table = table;
+    return this;
+  }
+
+  /**
+   * Resolve a lower-case input word
+   * @returns {Object|null} { type: 'command', name } or { type: 'direction', direction }
+   */
+  resolve(word) {
+    return this.table.get(word) || null;
+  }
+
+  /**
+   * Number of words in the table
+   */
+  get size() {
+    return this.table.size;
+  }
+}
+
+/**
+ * Compare two ranks [tier, kind, -priority, word]; true if a beats b
+ */
+function isBetter(a, b) {
+  for (let i = 0; i < 3; i++) {
+    if (a[i] !== b[i]) return a[i] < b[i];
+  }
+  return a[3] < b[3];
+}
+
+module.exports = CommandResolver;
@@ -11,6 +11,26 @@ const ActionRecorder = require('../systems/ActionRecorder');
 const DailyProcessor = require('../systems/DailyProcessor');
 const NPCSystem = require('../systems/NPCSystem');
 const WoundSystem = require('../systems/WoundSystem');
+const CriticalSystem = require('../systems/CriticalSystem');
+const PersistenceQueue = require('../systems/PersistenceQueue');
+const ItemLifecycleSystem = require('../systems/ItemLifecycleSystem');
+const RoomEventBus = require('../systems/RoomEventBus');
+const WorldSnapshot = require('../systems/WorldSnapshot');
+// Used from the first tick and the first fight: loaded with the engine rather than during play
+const CombatSystem = require('../systems/CombatSystem');
+const NPCCombatBehavior = require('../systems/NPCCombatBehavior');
+const ExperienceSystem = require('../systems/ExperienceSystem');
+const DerivedStats = require('../services/derivedStats');
+const { verifyEncumbrance } = require('../utils/encumbrance');
+const databaseManager = require('../adapters/db/mongoClient');
+const SessionRegistry = require('./SessionRegistry');
+const StartupPlan = require('./StartupPlan');
+const log = require('../utils/logger').child('engine');
+const metrics = require('../utils/metrics');
+
+const tickDuration = metrics.histogram('gs3_tick_duration_ms', 'Game tick processing time');
+const tickPhaseDuration = metrics.histogram('gs3_tick_phase_duration_ms', 'Game tick processing time by phase');
+const tickOverruns = metrics.counter('gs3_tick_overruns_total', 'Ticks whose processing took longer than the tick rate');
 
 /**
  * Core Game Engine
@@ -35,8 +55,19 @@ class GameEngine extends EventEmitter {
     this.accountManager = new AccountManager(this.dataDir);
     this.actionRecorder = new ActionRecorder();
     this.dailyProcessor = new DailyProcessor(this.actionRecorder);
-    this.combatSystem = null; // Lazy loaded when needed
-    this.npcCombatBehavior = null; // Lazy loaded when needed
+    this.persistenceQueue = new PersistenceQueue(); // Batched world writes (corpses, room items)
+    this.itemLifecycle = new ItemLifecycleSystem(); // Decay of corpses and dropped items
+    this.roomEvents = new RoomEventBus(); // Room enter/leave events and occupancy
+    this.roomSystem.roomEvents = this.roomEvents;
+    this.npcSystem.roomEvents = this.roomEvents;
+    this.sessions = new SessionRegistry(); // Client sessions by connection and player ID
+    this.combatSystem = null; // Created during startup (see ensureCombatSystems)
+    this.npcCombatBehavior = null;
+    this.experienceSystem = new ExperienceSystem(); // Absorption pulses
+    this.shard = null; // { index, assignment, loads } when running as an area shard; null runs the whole world
+    this.snapshot = new WorldSnapshot(); // Live state kept across restarts
+    this.restoredPlayers = []; // Players who were online when the snapshot was taken
+    this.startup = null; // StartupPlan of the last start, for its timing report
     
     // Game state
     this.players = new Map();
@@ -48,6 +79,9 @@ class GameEngine extends EventEmitter {
     this._absorbCounter = 0; // seconds
     // Health regeneration pulse counter
     this._healthPulseCounter = 0; // seconds
+    // Encumbrance consistency check counter
+    this._encumbranceCheckCounter = 0; // seconds
+    this._encumbranceCheckRunning = false;
   }
 
   /**
@@ -57,21 +91,68 @@ class GameEngine extends EventEmitter {
     console.log('Starting GS3 Game Engine...');
     
     try {
-      // Initialize systems
-      await this.playerSystem.initialize();
-      await this.accountManager.initialize();
-      await this.actionRecorder.initialize();
-      await this.roomSystem.initialize();
-      await this.npcSystem.initialize(this.roomSystem.db); // Use existing DB connection
-      
-      // Start daily processing schedule
-      this.dailyProcessor.startDailySchedule();
+      // Phases start as soon as what they need is ready; independent ones overlap
+      let snapshot = null;
+      let pending = null;
+      const plan = new StartupPlan('Engine startup');
+      plan
+        // One shared connection; missing indexes are created here
+        .phase('database', [], () => databaseManager.initialize())
+        // World state saved by the previous process, if it is fresh
+        .phase('snapshot', [], () => { ({ state: snapshot, pending } = this.snapshot.load(this)); })
+        // Critical tables in memory so combat never queries them
+        .phase('critical tables', [], () => {
+          const critStats = CriticalSystem.loadTables();
+          console.log(`Loaded ${critStats.entries} critical table entries`);
+        })
+        // Combat systems subscribe to room events, so they must exist before NPCs spawn
+        .phase('combat systems', [], () => this.ensureCombatSystems())
+        .phase('players', ['database'], () => this.playerSystem.initialize())
+        .phase('accounts', ['database'], () => this.accountManager.initialize())
+        .phase('actions', ['database'], () => this.actionRecorder.initialize())
+        .phase('write queue', ['database', 'snapshot'], async () => {
+          const db = await databaseManager.initialize();
+          await this.npcSystem.initialize(db);
+          this.persistenceQueue.initialize(db);
+          if (pending) {
+            // Writes the previous process could not flush land before rooms and items are read back
+            this.persistenceQueue.importPending(pending);
+            await this.persistenceQueue.flush();
+          }
+        })
+        .phase('rooms', ['database', 'snapshot', 'write queue'], async () => {
+          await this.roomSystem.initialize({ load: false });
+          await this.loadGameData(snapshot);
+        })
+        // Restore item decay schedule (needs rooms loaded)
+        .phase('item decay', ['rooms', 'write queue'], () => this.itemLifecycle.initialize(
+          this.roomSystem.db, this.roomSystem, this.persistenceQueue,
+          { ownsRoom: this.shard ? roomId => this.ownsRoom(roomId) : null }
+        ))
+        // Spawn NPCs in rooms (or bring back the ones alive at shutdown)
+        .phase('npcs', ['rooms', 'write queue', 'combat systems'], async () => {
+          if (snapshot) {
+            this.restoreSnapshot(snapshot);
+          } else {
+            await this.spawnNPCs();
+          }
+        })
+        // Start daily processing schedule (unless it runs in its own process or the gateway runs it)
+        .phase('daily schedule', ['actions'], () => {
+          if (process.env.DAILY_PROCESSOR !== 'external' && !this.shard) {
+            this.dailyProcessor.startDailySchedule();
+          }
+        });
       
-      // Load game data
-      await this.loadGameData();
+      this.startup = plan;
+      try {
+        await plan.run();
+      } finally {
+        console.log(plan.report());
+      }
       
-      // Spawn NPCs in rooms
-      await this.spawnNPCs();
+      // Live values for the metrics endpoint and METRICS command
+      this.registerMetrics();
       
       // Start the game loop
       this.isRunning = true;
@@ -85,13 +166,95 @@ class GameEngine extends EventEmitter {
     }
   }
 
+  /**
+   * Bring back NPCs and online players from a world snapshot
+   * Players go into the character cache; the server puts them back in the world as linkdead
+   */
+  restoreSnapshot(snapshot) {
+    const summary = this.npcSystem.restoreNPCs(snapshot.npcs, this);
+    // An area shard gets its players back from the gateway as they log in again
+    const players = this.shard ? [] : snapshot.players;
+    for (const player of players) {
+      this.playerSystem.players.set(player.name, player);
+    }
+    this.restoredPlayers = players;
+    console.log(`Restored ${summary.restored} NPCs (${summary.missing} without a definition) and ${players.length} players from snapshot`);
+  }
+
+  /**
+   * Stop for a restart: save online players, snapshot the world and flush pending writes
+   * @returns {Promise<void>}
+   */
+  async shutdown() {
+    const state = this.snapshot.enabled && this.isRunning && this.roomSystem.rooms.size > 0
+      ? this.snapshot.capture(this)
+      : null;
+    
+    await Promise.all(Array.from(this.players.values(), player => this.playerSystem.updatePlayer(player).catch(error => {
+      console.error(`Error saving ${player.name} on shutdown:`, error);
+    })));
+    await this.stop();
+    
+    if (state) {
+      try {
+        // Whatever the final flush could not write goes into the snapshot
+        await this.snapshot.save(this, state, this.persistenceQueue.exportPending());
+      } catch (error) {
+        console.error('Error saving world snapshot:', error);
+      }
+    }
+  }
+
+  /**
+   * Start only what the sharded gateway needs: accounts, characters and the daily schedule
+   * Rooms, NPCs, combat and the game loop run in the area shards (see systems/ShardManager.js)
+   */
+  async startGateway() {
+    console.log('Starting GS3 gateway...');
+    const plan = new StartupPlan('Gateway startup');
+    plan
+      .phase('database', [], () => databaseManager.initialize())
+      .phase('players', ['database'], () => this.playerSystem.initialize())
+      .phase('accounts', ['database'], () => this.accountManager.initialize())
+      .phase('actions', ['database'], () => this.actionRecorder.initialize())
+      .phase('daily schedule', ['actions'], () => {
+        if (process.env.DAILY_PROCESSOR !== 'external') {
+          this.dailyProcessor.startDailySchedule();
+        }
+      });
+    this.startup = plan;
+    try {
+      await plan.run();
+    } finally {
+      console.log(plan.report());
+    }
+    this.registerMetrics();
+    this.isRunning = true;
+    this.emit('started');
+  }
+
   /**
    * Stop the game engine
+   * @returns {Promise<void>} Resolves once pending writes are flushed
    */
   stop() {
     console.log('Stopping GS3 Game Engine...');
     this.isRunning = false;
+    metrics.stopEventLoopMonitor();
+    this.itemLifecycle.stop();
+    const flushes = [
+      this.accountManager.stop().catch(error => {
+        console.error('Error stopping password workers:', error);
+      }),
+      this.persistenceQueue.stop().catch(error => {
+        console.error('Error flushing pending world writes:', error);
+      }),
+      this.actionRecorder.stop().catch(error => {
+        console.error('Error flushing recorded actions:', error);
+      })
+    ];
     this.emit('stopped');
+    return Promise.all(flushes).then(() => {});
   }
 
   /**
@@ -103,7 +266,14 @@ class GameEngine extends EventEmitter {
     this.tickCount++;
     
     // Process game tick
+    const started = metrics.now();
     this.processTick();
+    const elapsed = metrics.since(started);
+    tickDuration.observe(elapsed);
+    if (elapsed > this.tickRate) {
+      tickOverruns.inc();
+      log.warn('Tick overran tick rate', { tick: this.tickCount, ms: Math.round(elapsed) });
+    }
     
     // Schedule next tick
     setTimeout(() => this.gameLoop(), this.tickRate);
@@ -113,11 +283,8 @@ class GameEngine extends EventEmitter {
    * Process a single game tick
    */
   processTick() {
-    // Import combat system lazily
-    if (!this.combatSystem) {
-      const CombatSystem = require('../systems/CombatSystem');
-      this.combatSystem = new CombatSystem();
-    }
+    this.ensureCombatSystems();
+    let phaseStarted = metrics.now();
 
       // Process roundtime for all players in combat
     for (const [playerId, player] of this.players) {
@@ -136,12 +303,13 @@ class GameEngine extends EventEmitter {
       }
     }
 
+    phaseStarted = this.observePhase('players', phaseStarted);
+
     // Health regeneration pulses (roughly every 60 seconds / 1 minute)
     this._healthPulseCounter = (this._healthPulseCounter || 0) + 1;
     if (this._healthPulseCounter >= 60) {
       this._healthPulseCounter = 0;
       try {
-        const HealthCalculation = require('../services/healthCalculation');
         for (const [, player] of this.players) {
           if (!player.attributes?.health) continue;
           
@@ -155,7 +323,7 @@ class GameEngine extends EventEmitter {
           
           // Only regenerate if below max HP
           if (currentHP < maxHP) {
-            const regenAmount = HealthCalculation.calculateHealthRegen(player);
+            const regenAmount = DerivedStats.getBaseStats(player).healthRegen;
             const newHP = Math.min(maxHP, currentHP + regenAmount);
             
             if (newHP > currentHP) {
@@ -171,13 +339,14 @@ class GameEngine extends EventEmitter {
       }
     }
 
+    phaseStarted = this.observePhase('regen', phaseStarted);
+
     // Experience absorption pulses (roughly every 120 seconds)
     this._absorbCounter += 1;
     if (this._absorbCounter >= 120) {
       this._absorbCounter = 0;
       try {
-        const ExperienceSystem = require('../systems/ExperienceSystem');
-        const expSystem = new ExperienceSystem();
+        const expSystem = this.experienceSystem;
         for (const [, player] of this.players) {
           const room = this.roomSystem.getRoom(player.room);
           const beforeField = Math.trunc(player?.attributes?.experience?.field || 0);
@@ -194,24 +363,21 @@ class GameEngine extends EventEmitter {
       }
     }
 
-    // Import NPC combat behavior if needed
-    if (!this.npcCombatBehavior && this.combatSystem) {
-      const NPCCombatBehavior = require('../systems/NPCCombatBehavior');
-      this.npcCombatBehavior = new NPCCombatBehavior(this.combatSystem, this);
+    phaseStarted = this.observePhase('absorb', phaseStarted);
+
+    // Encumbrance ledger check (every 5 minutes, in the background)
+    this._encumbranceCheckCounter += 1;
+    if (this._encumbranceCheckCounter >= 300) {
+      this._encumbranceCheckCounter = 0;
+      this.verifyEncumbrance();
     }
 
     // Process roundtime for NPCs in combat
-    const allNPCs = this.npcSystem.getAllNPCs();
-    for (const npc of allNPCs) {
+    for (const npc of this.npcSystem.values()) {
       if (npc.combatData && npc.combatData.lag > 0) {
         npc.combatData.lag = Math.max(0, npc.combatData.lag - 1000);
       }
 
-      // Check aggressive NPCs (non-combat NPCs that should attack)
-      if (!this.combatSystem.isInCombat(npc) && npc.aggressive && npc.room) {
-        this.npcCombatBehavior?.checkAggressiveAttack(npc);
-      }
-
       // If NPC can act (lag expired) and is in combat, perform action
       if (npc.combatData && npc.combatData.lag === 0 && this.combatSystem.isInCombat(npc)) {
         // Perform combat action async (don't await to avoid blocking game loop)
@@ -221,18 +387,91 @@ class GameEngine extends EventEmitter {
       }
     }
     
+    phaseStarted = this.observePhase('npcs', phaseStarted);
+    
     // Emit tick event for other systems
     this.emit('tick', this.tickCount);
+    this.observePhase('listeners', phaseStarted);
+  }
+
+  /**
+   * Rebuild every online character's encumbrance ledger from the database
+   * One character at a time, off the tick; a check still running is not restarted
+   */
+  async verifyEncumbrance() {
+    if (this._encumbranceCheckRunning) return;
+    this._encumbranceCheckRunning = true;
+    try {
+      for (const player of Array.from(this.players.values())) {
+        const { drift } = await verifyEncumbrance(player);
+        if (drift !== 0) {
+          log.debug('Corrected encumbrance drift', { player: player.name, drift });
+        }
+      }
+    } catch (e) {
+      console.error('Error during encumbrance check:', e);
+    } finally {
+      this._encumbranceCheckRunning = false;
+    }
   }
 
   /**
-   * Load game data from files
+   * Record how long a tick phase took
+   * @returns {bigint} Start time for the next phase
    */
-  async loadGameData() {
+  observePhase(phase, started) {
+    const now = metrics.now();
+    tickPhaseDuration.observe(Number(now - started) / 1e6, { phase });
+    return now;
+  }
+
+  /**
+   * Register gauges read when metrics are exported
+   */
+  registerMetrics() {
+    metrics.startEventLoopMonitor();
+    metrics.gauge('gs3_players_online', 'Players in the world', () => this.players.size);
+    metrics.gauge('gs3_npcs', 'Spawned NPC instances', () => this.npcSystem.count);
+    metrics.gauge('gs3_sessions', 'Client sessions by state', () => {
+      const counts = this.sessions.getCounts();
+      return Object.values(SessionRegistry.STATES)
+        .filter(state => counts[state] !== undefined)
+        .map(state => ({ labels: { state }, value: counts[state] }));
+    });
+    metrics.gauge('gs3_persistence_queue_pending', 'World writes waiting to be flushed', () => this.persistenceQueue.getStats().pending);
+    metrics.gauge('gs3_password_queue', 'Password hashing jobs waiting for a worker', () => this.accountManager.passwordHasher.getStats().queued);
+    metrics.gauge('gs3_item_decay_scheduled', 'Items scheduled to decay', () => this.itemLifecycle.expiries.size);
+    metrics.gauge('gs3_process_memory_bytes', 'Process memory by kind', () => {
+      const usage = process.memoryUsage();
+      return ['rss', 'heapTotal', 'heapUsed', 'external'].map(kind => ({ labels: { kind }, value: usage[kind] }));
+    });
+  }
+
+  /**
+   * Create the combat system and NPC combat behavior (at startup, or on first use)
+   * Aggressive NPCs react to room events rather than being polled each tick
+   */
+  ensureCombatSystems() {
+    if (!this.combatSystem) {
+      this.combatSystem = new CombatSystem();
+    }
+    if (!this.npcCombatBehavior) {
+      this.npcCombatBehavior = new NPCCombatBehavior(this.combatSystem, this);
+    }
+  }
+
+  /**
+   * Load game data from the database (or a world snapshot)
+   */
+  async loadGameData(snapshot = null) {
     console.log('Loading game data...');
     
     // Load rooms
-    await this.roomSystem.loadRoomsFromDatabase();
+    if (snapshot) {
+      this.roomSystem.restoreRooms(snapshot.world);
+    } else {
+      await this.roomSystem.loadRoomsFromDatabase();
+    }
     this.rooms = this.roomSystem.getAllRooms();
     
     console.log(`Loaded ${this.rooms.length} rooms`);
@@ -246,8 +485,9 @@ class GameEngine extends EventEmitter {
     const playerId = player.id || player.name;
     player.id = playerId;
     this.players.set(playerId, player);
-    console.log(`GameEngine: Added player ${player.name} with ID ${playerId}`);
+    log.debug('Added player', { player: player.name, id: playerId });
     this.emit('playerAdded', player);
+    this.roomEvents.enter(player, player.room, { cause: 'login' });
   }
 
   /**
@@ -257,6 +497,7 @@ class GameEngine extends EventEmitter {
     const player = this.players.get(playerId);
     if (player) {
       this.players.delete(playerId);
+      this.roomEvents.leave(player, player.room, { cause: 'logout' });
       this.emit('playerRemoved', player);
     }
   }
@@ -268,6 +509,43 @@ class GameEngine extends EventEmitter {
     return this.players.get(playerId);
   }
 
+  /**
+   * Get the session (connection) for a player ID
+   */
+  getPlayerConnection(playerId) {
+    return this.sessions.getByPlayerId(playerId);
+  }
+
+  /**
+   * Move a player to another room and announce it on the room event bus
+   */
+  movePlayer(player, roomId, cause = 'move') {
+    const oldRoom = player.room;
+    player.room = roomId;
+    this.roomEvents.move(player, oldRoom, roomId, { cause });
+    return oldRoom;
+  }
+
+  /**
+   * Whether this engine hosts a room (always, unless running as an area shard)
+   * Rooms of areas missing from the shard assignment belong to shard 0
+   */
+  ownsRoom(roomId) {
+    if (!this.shard) return true;
+    const room = this.roomSystem.getRoom(roomId);
+    return (this.shard.assignment[(room && room.areaId) || ''] || 0) === this.shard.index;
+  }
+
+  /**
+   * Hand a player to another shard if they are now in a room this shard does not own
+   * @returns {boolean} True if the player was handed off (the new shard describes the room)
+   */
+  handOffIfOutside(player) {
+    if (!this.shard || this.ownsRoom(player.room)) return false;
+    this.emit('handoff', player);
+    return true;
+  }
+
   /**
    * Get a room by ID
    */
@@ -286,7 +564,7 @@ class GameEngine extends EventEmitter {
    * Process a command from a player
    */
   processCommand(player, command, args) {
-    console.log(`GameEngine: Processing command "${command}" for player ${player.name}`);
+    log.trace('Processing command', { player: player.name, command });
     
     // Record the command action
     this.recordAction(player.name, 'command', {
@@ -298,6 +576,94 @@ class GameEngine extends EventEmitter {
     return this.commandManager.execute(player, command, args);
   }
 
+  /**
+   * Run one line of input from a player in the world
+   * Directions and named exits move the player; anything else goes to the command manager
+   * @param {Object} player - Player in the world
+   * @param {string} message - Trimmed, non-empty input line
+   * @param {Object} connection - Session the player's output goes to
+   */
+  async handlePlayerInput(player, message, connection) {
+    // Parse command
+    const parts = message.split(' ');
+    const rawCommand = parts[0].toLowerCase();
+    const args = parts.slice(1);
+    
+    // Resolve directions, commands, aliases and abbreviations in one lookup
+    const resolution = this.commandManager.resolve(rawCommand);
+    let command = rawCommand;
+    let direction = null;
+    
+    if (resolution && resolution.type === 'direction') {
+      if (!this.roomSystem.hasVisibleExit(player.room, resolution.direction)) {
+        connection.writeLine('You can\'t go there.');
+        return;
+      }
+      direction = resolution.direction;
+    } else if (resolution) {
+      command = resolution.name;
+    } else if (this.roomSystem.hasVisibleExit(player.room, rawCommand)) {
+      // Named exits that are not compass directions
+      direction = rawCommand;
+    }
+    
+    if (direction) {
+      // Treat as movement command
+      const goCommand = this.commandManager.getCommand('go');
+      if (goCommand) {
+        const result = await goCommand.execute(player, [direction]);
+        
+        // Crossing into another shard's area: that shard sends the room description
+        if (this.handOffIfOutside(player)) return;
+        
+        // Send response
+        if (result && result.message) {
+          connection.writeLine(result.message);
+        }
+        
+        return;
+      }
+    }
+    
+    // Execute command
+    const result = await this.processCommand(player, command, args);
+    if (this.handOffIfOutside(player)) return;
+    
+    // Send response
+    if (result && result.message) {
+      connection.writeLine(result.message);
+    } else if (result && !result.message) {
+      log.debug('Command returned no message', { command });
+    }
+    
+    // Handle special cases
+    if (result && result.respawn) {
+      await this.respawnPlayer(player);
+    }
+    
+    if (result && result.disconnect) {
+      connection.close();
+    }
+  }
+
+  /**
+   * Handle player respawn
+   */
+  async respawnPlayer(player) {
+    const oldRoom = player.room;
+    const result = this.playerSystem.respawnPlayer(player);
+    if (result.success) {
+      this.roomEvents.move(player, oldRoom, player.room, { cause: 'respawn' });
+
+      player.connection.send(result.message);
+      if (this.handOffIfOutside(player)) return;
+      
+      // Move player to starting room
+      const roomDescription = await this.roomSystem.getRoomDescription(player.currentRoom, player, this);
+      player.connection.send(roomDescription);
+    }
+  }
+
   /**
    * Process bleed damage from wounds
    * Rank 2+ wounds cause bleeding damage over time
@@ -377,64 +743,23 @@ class GameEngine extends EventEmitter {
    */
   async spawnNPCs() {
     try {
-      // Track NPC spawns by type for summary
-      const npcCounts = new Map(); // npcId -> count
-      const npcErrors = new Map(); // npcId -> error count
-      let totalSpawned = 0;
-      let totalErrors = 0;
-      
-      // Get all areas that have been imported
-      const areas = await this.roomSystem.db.collection('areas').find({}).toArray();
-      
-      for (const area of areas) {
-        // Get all rooms in this area
-        const rooms = await this.roomSystem.db.collection('rooms').find({ areaId: area.id }).toArray();
-        
-        for (const room of rooms) {
-          // Check if room has NPCs defined
-          if (room.npcs && room.npcs.length > 0) {
-            for (const npcRef of room.npcs) {
-              try {
-                // Extract NPC ID from object or string
-                let npcId;
-                if (typeof npcRef === 'string') {
-                  npcId = npcRef;
-                } else if (npcRef && npcRef.id) {
-                  npcId = npcRef.id;
-                } else {
-                  totalErrors++;
-                  continue;
-                }
-                
-                // Get the full NPC definition
-                const npcDefinition = await this.npcSystem.getNPC(npcId);
-                
-                if (npcDefinition) {
-                  // Spawn the NPC in this room (pass gameEngine reference)
-                  const spawnedNPC = this.npcSystem.spawnNPC(npcDefinition, room.id, this);
-                  
-                  // Track spawn count by NPC type
-                  const currentCount = npcCounts.get(npcId) || 0;
-                  npcCounts.set(npcId, currentCount + 1);
-                  totalSpawned++;
-                } else {
-                  // Track missing NPC definitions
-                  const errorCount = npcErrors.get(npcId) || 0;
-                  npcErrors.set(npcId, errorCount + 1);
-                  totalErrors++;
-                }
-              } catch (error) {
-                totalErrors++;
-                console.error(`Error spawning NPC in room ${room.id}:`, error.message);
-              }
-            }
-          }
-        }
+      // Rooms are already in memory; definitions are fetched in one query
+      // (an area shard only spawns the NPCs of the areas it owns)
+      const rooms = this.roomSystem.getAllRooms().filter(room => this.ownsRoom(room.id));
+      const summary = await this.npcSystem.spawnFromRooms(rooms, this);
+      const npcCounts = summary.counts;
+      const npcErrors = summary.missing;
+      const totalSpawned = summary.spawned;
+      let totalErrors = summary.invalid;
+      for (const count of npcErrors.values()) {
+        totalErrors += count;
       }
       
       // Log summary
       console.log(`\n=== NPC Spawn Summary ===`);
       console.log(`Total NPCs spawned: ${totalSpawned}`);
+      const { gatherMs, fetchMs, spawnMs } = summary.timings;
+      console.log(`Timings: gather ${gatherMs}ms, fetch ${summary.fetched} definitions ${fetchMs}ms, spawn ${spawnMs}ms`);
       
       // Group and display by NPC type
       if (npcCounts.size > 0) {
@@ -465,16 +790,36 @@ class GameEngine extends EventEmitter {
     }
   }
 
+  /**
+   * Reload rooms, critical tables, NPCs and commands from the database and disk (HOTFIX)
+   * An area shard respawns only the NPCs of the areas it owns
+   * @returns {Promise<Object>} { rooms, criticals, npcs, commands } - npcs is the spawnFromRooms summary
+   */
+  async reloadWorld() {
+    // Queued room item changes must be in the database, or the reload drops them from memory
+    await this.persistenceQueue.flush();
+    await this.roomSystem.loadRoomsFromDatabase();
+    const rooms = this.roomSystem.getAllRooms();
+    const criticals = CriticalSystem.reloadTables();
+
+    this.npcSystem.clearAllNPCs();
+    const owned = rooms.filter(room => this.ownsRoom(room.id));
+    const npcs = await this.npcSystem.spawnFromRooms(owned, this, { refresh: true });
+
+    const commands = await this.commandManager.reloadCommands();
+    return { rooms: rooms.length, criticals, npcs, commands };
+  }
+
   /**
    * Setup event handlers
    */
   setupEventHandlers() {
     this.on('playerAdded', (player) => {
-      console.log(`Player ${player.name} joined the game`);
+      log.info('Player joined the game', { player: player.name });
     });
     
     this.on('playerRemoved', (player) => {
-      console.log(`Player ${player.name} left the game`);
+      log.info('Player left the game', { player: player.name });
     });
   }
 }
@@ -0,0 +1,365 @@
+'use strict';
+
+const { StringDecoder } = require('string_decoder');
+const log = require('../utils/logger').child('session');
+
+const DEFAULT_OPTIONS = {
+  maxLineLength: 2048,          // Longer input lines are discarded
+  maxQueuedCommands: 32,        // Lines waiting behind the running command
+  maxBufferedBytes: 256 * 1024, // Transport backlog above which output is dropped
+  kickBufferedBytes: 1024 * 1024, // Transport backlog above which the client is disconnected
+  slowConsumerPolicy: 'drop'    // 'drop' output or 'kick' the client once maxBufferedBytes is hit
+};
+
+/**
+ * Session
+ * Transport-agnostic client connection used by both the Telnet and WebSocket servers.
+ *
+ * Input is framed into lines (CRLF, LF or CR) and fed one line at a time to the
+ * line handler, so commands from one client run strictly in order. Output is
+ * batched: everything written while corked (e.g. during a command) or within the
+ * same event loop turn goes out as a single transport write.
+ *
+ * A Session exposes write()/send() so it can be used anywhere a raw socket was
+ * (LoginFlow, player.connection, combat messages).
+ */
+class Session {
+  /**
+   * @param {Object} transport - { kind, raw, write(chunk), close(), bufferedBytes(), isOpen() }
+   * @param {Object} options - See DEFAULT_OPTIONS
+   */
+  constructor(transport, options = {}) {
+    this.transport = transport;
+    this.kind = transport.kind;
+    this.remoteAddress = transport.remoteAddress || null;
+    this.options = { ...DEFAULT_OPTIONS, ...options };
+
+    this.decoder = new StringDecoder('utf8');
+    this.partial = '';
+    this.queue = [];
+    this.processing = false;
+    this.overflowNotified = false;
+    this.lineHandler = null;
+    this.closeHandler = null;
+
+    this.output = [];
+    this.corked = 0;
+    this.flushScheduled = false;
+    this.dropping = false;
+    this.closing = false;
+    this.closed = false;
+    this.closeReason = null; // 'server' (closed by us) or 'transport' (client went away)
+
+    this.stats = {
+      linesIn: 0,
+      commandsDropped: 0,
+      writes: 0,
+      bytesOut: 0,
+      outputDropped: 0
+    };
+  }
+
+  /**
+   * Wrap a net.Socket (Telnet)
+   */
+  static fromTelnet(socket, options) {
+    return new Session({
+      kind: 'telnet',
+      raw: socket,
+      remoteAddress: socket.remoteAddress,
+      write: chunk => socket.write(chunk),
+      close: () => socket.end(),
+      bufferedBytes: () => socket.writableLength || 0,
+      isOpen: () => !socket.destroyed && socket.writable
+    }, options);
+  }
+
+  /**
+   * Wrap a ws WebSocket
+   * @param {Object} req - The HTTP upgrade request (for the client address)
+   */
+  static fromWebSocket(ws, req, options) {
+    return new Session({
+      kind: 'websocket',
+      raw: ws,
+      remoteAddress: req && req.socket ? req.socket.remoteAddress : null,
+      write: chunk => ws.send(chunk),
+      close: () => ws.close(),
+      bufferedBytes: () => ws.bufferedAmount || 0,
+      isOpen: () => ws.readyState === 1 // WebSocket.OPEN
+    }, options);
+  }
+
+  /**
+   * Wrap a message channel (a player hosted on an area shard; see workers/shardWorker.js)
+   * @param {Function} send - Called with each flushed chunk of output
+   * @param {Function} close - Called once when the session is closed from this side
+   */
+  static fromChannel(send, close, options) {
+    let open = true;
+    return new Session({
+      kind: 'shard',
+      raw: null,
+      write: chunk => send(chunk),
+      close: () => {
+        open = false;
+        close();
+      },
+      bufferedBytes: () => 0, // The gateway session applies the slow consumer policy
+      isOpen: () => open
+    }, options);
+  }
+
+  /**
+   * A session with no connection behind it (a player restored from a world snapshot,
+   * held linkdead until they log in again); output is discarded
+   */
+  static detached(options) {
+    return new Session({
+      kind: 'detached',
+      raw: null,
+      write: () => {},
+      close: () => {},
+      bufferedBytes: () => 0,
+      isOpen: () => false
+    }, options);
+  }
+
+  /**
+   * Set the function that runs each complete input line: async (session, line) => {}
+   */
+  onLine(handler) {
+    this.lineHandler = handler;
+  }
+
+  /**
+   * Set the function called once when the session closes
+   */
+  onClose(handler) {
+    this.closeHandler = handler;
+  }
+
+  /**
+   * Feed raw transport data into the line framer
+   * @param {Buffer|string} data - Received bytes
+   * @param {boolean} endOfMessage - Treat a trailing partial line as complete (WebSocket frames)
+   */
+  receive(data, endOfMessage = false) {
+    if (this.closed) return;
+
+    let text = this.partial + (typeof data === 'string' ? data : this.decoder.write(data));
+    text = text.replace(/\0/g, '');
+
+    const lines = text.split(/\r\n|\n|\r/);
+    this.partial = endOfMessage ? '' : lines.pop();
+    if (endOfMessage && lines.length > 1 && lines[lines.length - 1] === '') {
+      lines.pop(); // Message ended with a newline
+    }
+
+    if (this.partial.length > this.options.maxLineLength) {
+      this.partial = '';
+      this.write('Input line too long; ignored.\r\n');
+    }
+
+    for (const line of lines) {
+      this.enqueue(line);
+    }
+  }
+
+  /**
+   * Queue one complete line behind any command still running
+   */
+  enqueue(line) {
+    if (line.length > this.options.maxLineLength) {
+      this.write('Input line too long; ignored.\r\n');
+      return;
+    }
+    this.stats.linesIn++;
+
+    if (this.queue.length >= this.options.maxQueuedCommands) {
+      this.stats.commandsDropped++;
+      // Tell the client once per overflow, not once per dropped line
+      if (!this.overflowNotified) {
+        this.overflowNotified = true;
+        this.write('You are entering commands too quickly; some were ignored.\r\n');
+      }
+      return;
+    }
+
+    this.overflowNotified = false;
+    this.queue.push(line);
+    this.drain();
+  }
+
+  /**
+   * Run queued lines one at a time, in order
+   */
+  async drain() {
+    if (this.processing) return;
+    this.processing = true;
+
+    try {
+      while (this.queue.length > 0 && !this.closed) {
+        const line = this.queue.shift();
+        this.cork();
+        try {
+          await this.lineHandler(this, line);
+        } catch (error) {
+          log.error('Error handling session input', error);
+          this.write('An error occurred. Please try again.\r\n');
+        } finally {
+          this.uncork();
+        }
+      }
+    } finally {
+      this.processing = false;
+    }
+  }
+
+  /**
+   * Queue output for the client
+   */
+  write(message) {
+    if (this.closed || message === undefined || message === null || message === '') return;
+    this.output.push(String(message));
+    if (this.corked === 0) {
+      this.scheduleFlush();
+    }
+  }
+
+  /**
+   * Alias of write() so sessions can stand in for WebSocket connections
+   */
+  send(message) {
+    this.write(message);
+  }
+
+  /**
+   * Queue output followed by a line break
+   */
+  writeLine(message) {
+    this.write(`${message}\r\n`);
+  }
+
+  /**
+   * Hold output until the matching uncork()
+   */
+  cork() {
+    this.corked++;
+  }
+
+  /**
+   * Release one cork; output is flushed when the last one is released
+   */
+  uncork() {
+    if (this.corked > 0) this.corked--;
+    if (this.corked === 0 && this.output.length > 0) {
+      this.flush();
+    }
+  }
+
+  /**
+   * Flush at the end of this event loop turn so back-to-back writes share one packet
+   */
+  scheduleFlush() {
+    if (this.flushScheduled) return;
+    this.flushScheduled = true;
+    setImmediate(() => {
+      this.flushScheduled = false;
+      if (this.corked === 0) this.flush();
+    });
+  }
+
+  /**
+   * Send buffered output as one transport write, applying the slow consumer policy
+   */
+  flush() {
+    if (this.output.length === 0 || this.closed) return;
+
+    const chunk = this.output.join('');
+    this.output = [];
+
+    if (!this.transport.isOpen()) {
+      return;
+    }
+
+    const backlog = this.transport.bufferedBytes();
+    if (backlog >= this.options.kickBufferedBytes ||
+        (backlog >= this.options.maxBufferedBytes && this.options.slowConsumerPolicy === 'kick')) {
+      log.warn('Disconnecting slow client', { transport: this.kind, address: this.remoteAddress, backlog });
+      this.close();
+      return;
+    }
+    if (backlog >= this.options.maxBufferedBytes) {
+      this.dropping = true;
+      this.stats.outputDropped += chunk.length;
+      return;
+    }
+
+    const text = this.dropping ? `[Output was dropped: connection too slow]\r\n${chunk}` : chunk;
+    this.dropping = false;
+
+    try {
+      this.transport.write(text);
+      this.stats.writes++;
+      this.stats.bytesOut += text.length;
+    } catch (error) {
+      log.warn('Session write failed', { transport: this.kind, error: error.message });
+      this.close();
+    }
+  }
+
+  /**
+   * Flush pending output and close the transport
+   */
+  close() {
+    if (this.closed || this.closing) return;
+    this.closing = true;
+    this.flush();
+    this.closed = true;
+    this.queue = [];
+    this.output = [];
+    try {
+      this.transport.close();
+    } catch (error) {
+      // Transport already gone
+    }
+    this.handleTransportClosed('server');
+  }
+
+  /**
+   * Called when the transport reports it has closed (or after close())
+   */
+  handleTransportClosed(reason = 'transport') {
+    if (!this.closeReason) this.closeReason = reason;
+    this.closed = true;
+    this.queue = [];
+    if (this.closeHandler) {
+      const handler = this.closeHandler;
+      this.closeHandler = null;
+      handler(this);
+    }
+  }
+
+  /**
+   * Alias used by callers that expect socket.end()
+   */
+  end() {
+    this.close();
+  }
+
+  /**
+   * Get session statistics
+   */
+  getStats() {
+    return {
+      ...this.stats,
+      queued: this.queue.length,
+      buffered: this.transport.bufferedBytes()
+    };
+  }
+}
+
+Session.DEFAULT_OPTIONS = DEFAULT_OPTIONS;
+
+module.exports = Session;
@@ -0,0 +1,177 @@
+'use strict';
+
+/**
+ * Session lifecycle states
+ */
+const SESSION_STATES = Object.freeze({
+  LOGIN: 'login',         // Account / password / character selection
+  CREATION: 'creation',   // Character creation
+  PLAYING: 'playing',     // Bound to a player in the world
+  LINKDEAD: 'linkdead',   // Connection dropped; player kept in the world for a grace period
+  CLOSED: 'closed'
+});
+
+/**
+ * Session Registry
+ * Single index of client sessions, keyed by session object and by player ID.
+ * Owns the session lifecycle (login -> creation -> playing -> linkdead -> closed)
+ * so lookups are constant time and disconnect cleanup happens in one place.
+ */
+class SessionRegistry {
+  /**
+   * @param {Object} options
+   * @param {number} options.linkdeadTimeoutMs - How long a dropped player stays in the world (default: 60s)
+   */
+  constructor(options = {}) {
+    this.linkdeadTimeoutMs = options.linkdeadTimeoutMs ?? 60 * 1000;
+    this.sessions = new Set();
+    this.byPlayerId = new Map(); // playerId -> session
+    this.linkdeadTimers = new Map(); // session -> timer
+    this.counts = {
+      [SESSION_STATES.LOGIN]: 0,
+      [SESSION_STATES.CREATION]: 0,
+      [SESSION_STATES.PLAYING]: 0,
+      [SESSION_STATES.LINKDEAD]: 0
+    };
+    this.totals = {
+      opened: 0,
+      closed: 0,
+      reconnected: 0
+    };
+  }
+
+  /**
+   * Register a new session (starts in the login state)
+   */
+  add(session) {
+    if (this.sessions.has(session)) return session;
+    this.sessions.add(session);
+    session.state = SESSION_STATES.LOGIN;
+    session.playerId = null;
+    this.counts[SESSION_STATES.LOGIN]++;
+    this.totals.opened++;
+    return session;
+  }
+
+  /**
+   * Move a session to another lifecycle state
+   */
+  setState(session, state) {
+    if (!this.sessions.has(session) || session.state === state) return;
+    if (this.counts[session.state] !== undefined) this.counts[session.state]--;
+    session.state = state;
+    if (this.counts[state] !== undefined) this.counts[state]++;
+  }
+
+  /**
+   * Bind a session to a player that entered the world
+   * @returns {Object|null} The session previously bound to this player (linkdead or a duplicate login)
+   */
+  bindPlayer(session, playerId) {
+    const previous = this.byPlayerId.get(playerId) || null;
+    if (previous && previous !== session) {
+      this.clearLinkdeadTimer(previous);
+      if (previous.state === SESSION_STATES.LINKDEAD) {
+        this.totals.reconnected++;
+      }
+      // The player now belongs to the new session; close out the old one
+      previous.playerId = null;
+      this.setState(previous, SESSION_STATES.CLOSED);
+      this.sessions.delete(previous);
+      this.totals.closed++;
+    }
+
+    session.playerId = playerId;
+    this.byPlayerId.set(playerId, session);
+    this.setState(session, SESSION_STATES.PLAYING);
+    return previous !== session ? previous : null;
+  }
+
+  /**
+   * Get the player ID bound to a session (null while logging in)
+   */
+  getPlayerId(session) {
+    return session && session.playerId ? session.playerId : null;
+  }
+
+  /**
+   * Get the session for a player ID
+   */
+  getByPlayerId(playerId) {
+    return this.byPlayerId.get(playerId) || null;
+  }
+
+  /**
+   * Keep a dropped player in the world for the grace period
+   * @param {Function} onExpire - Called with the session if nobody reconnects in time
+   * @returns {boolean} False if the session cannot go linkdead (not playing, or no grace period)
+   */
+  markLinkdead(session, onExpire) {
+    if (session.state !== SESSION_STATES.PLAYING || this.linkdeadTimeoutMs <= 0) {
+      return false;
+    }
+
+    this.setState(session, SESSION_STATES.LINKDEAD);
+    const timer = setTimeout(() => {
+      this.linkdeadTimers.delete(session);
+      if (session.state === SESSION_STATES.LINKDEAD) {
+        onExpire(session);
+      }
+    }, this.linkdeadTimeoutMs);
+    if (timer.unref) timer.unref();
+    this.linkdeadTimers.set(session, timer);
+    return true;
+  }
+
+  /**
+   * Cancel a pending linkdead expiry
+   */
+  clearLinkdeadTimer(session) {
+    const timer = this.linkdeadTimers.get(session);
+    if (timer) {
+      clearTimeout(timer);
+      this.linkdeadTimers.delete(session);
+    }
+  }
+
+  /**
+   * Remove a session for good
+   * @returns {string|null} The player ID it was bound to, if any
+   */
+  remove(session) {
+    if (!this.sessions.has(session)) return null;
+
+    this.clearLinkdeadTimer(session);
+    const playerId = session.playerId;
+    if (playerId && this.byPlayerId.get(playerId) === session) {
+      this.byPlayerId.delete(playerId);
+    }
+
+    this.setState(session, SESSION_STATES.CLOSED);
+    this.sessions.delete(session);
+    this.totals.closed++;
+    return playerId;
+  }
+
+  /**
+   * Whether a session is still going through login or character creation
+   */
+  isLoggingIn(session) {
+    return session.state === SESSION_STATES.LOGIN || session.state === SESSION_STATES.CREATION;
+  }
+
+  /**
+   * Get session counts by state (for monitoring)
+   */
+  getCounts() {
+    return {
+      ...this.counts,
+      total: this.sessions.size,
+      ...this.totals
+    };
+  }
+}
+
+SessionRegistry.STATES = SESSION_STATES;
+
+module.exports = SessionRegistry;
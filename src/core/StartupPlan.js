@@ -0,0 +1,124 @@
+'use strict';
+
+/**
+ * Startup Plan
+ * Startup as a dependency graph of named phases. Each phase starts as soon as
+ * the phases it depends on have finished, so independent work (database
+ * reads, file loads, module warm-up) overlaps. A phase may only depend on
+ * phases declared before it, which keeps the graph acyclic.
+ *
+ * After run(), report() prints when each phase started, how long it took and
+ * the critical path: the chain of phases that decided the total startup time.
+ */
+class StartupPlan {
+  /**
+   * @param {string} name - Shown in the report ("Engine startup")
+   */
+  constructor(name) {
+    this.name = name;
+    this.phases = new Map(); // name -> { name, after, run, startMs, ms, status }
+    this.totalMs = 0;
+  }
+
+  /**
+   * Add a phase
+   * @param {string} name - Phase name
+   * @param {string[]} after - Phases that must finish first
+   * @param {Function} run - Does the work; may return a promise
+   * @returns {StartupPlan} this
+   */
+  phase(name, after, run) {
+    if (this.phases.has(name)) {
+      throw new Error(`Startup phase "${name}" is declared twice`);
+    }
+    for (const dependency of after) {
+      if (!this.phases.has(dependency)) {
+        throw new Error(`Startup phase "${name}" depends on undeclared phase "${dependency}"`);
+      }
+    }
+    this.phases.set(name, { name, after, run, startMs: null, ms: null, status: 'pending' });
+    return this;
+  }
+
+  /**
+   * Run every phase; rejects with the first failure (its phase named in the message)
+   */
+  async run() {
+    const started = Date.now();
+    const done = new Map(); // name -> Promise
+
+    for (const phase of this.phases.values()) {
+      const dependencies = phase.after.map(name => done.get(name));
+      done.set(phase.name, Promise.all(dependencies).then(async () => {
+        phase.startMs = Date.now() - started;
+        phase.status = 'running';
+        try {
+          await phase.run();
+          phase.status = 'done';
+        } catch (error) {
+          phase.status = 'failed';
+          error.message = `${phase.name}: ${error.message}`;
+          throw error;
+        } finally {
+          phase.ms = Date.now() - started - phase.startMs;
+        }
+      }));
+    }
+
+    try {
+      await Promise.all(done.values());
+    } finally {
+      this.totalMs = Date.now() - started;
+    }
+  }
+
+  /**
+   * Phases that decided the total time, first to last
+   */
+  criticalPath() {
+    const finished = Array.from(this.phases.values()).filter(phase => phase.ms !== null);
+    const endOf = phase => phase.startMs + phase.ms;
+    // On a tie the later-declared phase ends the path: it may depend on the other, never the reverse
+    let phase = finished.reduce((last, p) => (!last || endOf(p) >= endOf(last) ? p : last), null);
+    const path = [];
+    while (phase) {
+      path.unshift(phase.name);
+      // The dependency that finished last is the one this phase waited for
+      phase = phase.after
+        .map(name => this.phases.get(name))
+        .filter(p => p.ms !== null)
+        .reduce((last, p) => (!last || endOf(p) > endOf(last) ? p : last), null);
+    }
+    return path;
+  }
+
+  /**
+   * Timing per phase, in start order
+   */
+  getTimings() {
+    return Array.from(this.phases.values())
+      .filter(phase => phase.startMs !== null)
+      .sort((a, b) => a.startMs - b.startMs)
+      .map(({ name, startMs, ms, status }) => ({ name, startMs, ms, status }));
+  }
+
+  /**
+   * Printable timing report
+   */
+  report() {
+    const timings = this.getTimings();
+    const width = Math.max(5, ...timings.map(timing => timing.name.length));
+    const lines = [
+      `${this.name}: ${this.totalMs}ms`,
+      `  ${'phase'.padEnd(width)} ${'start'.padStart(7)} ${'ms'.padStart(7)}`
+    ];
+    for (const timing of timings) {
+      const status = timing.status === 'done' ? '' : `  (${timing.status})`;
+      lines.push(`  ${timing.name.padEnd(width)} ${String(timing.startMs).padStart(7)} ${String(timing.ms ?? '-').padStart(7)}${status}`);
+    }
+    lines.push(`  critical path: ${this.criticalPath().join(' > ')}`);
+    return lines.join('\n');
+  }
+}
+
+module.exports = StartupPlan;
@@ -0,0 +1,92 @@
+'use strict';
+
+/**
+ * Combat Fixtures
+ * In-memory characters and creatures for the combat simulator
+ * (systems/CombatSimulator.js). Creature entries use the NPC definition
+ * document format, so they spawn through the real NPCSystem.
+ */
+
+// Giant rat as created by scripts/create-giant-rat-npcs.js
+const GIANT_RAT = {
+  id: 'giant-rat',
+  npcId: 'giant-rat',
+  name: 'a giant rat',
+  keywords: ['rat', 'giant rat', 'giant', 'rodent'],
+  level: 1,
+  attributes: {
+    level: 1,
+    health: { current: 28, max: 28 },
+    attackStrength: 34,
+    defenseStrength: 4,
+    armor: 1,
+    strength: 45,
+    constitution: 40,
+    agility: 50,
+    dexterity: 55
+  },
+  aggressive: true,
+  roundtime: 5000,
+  stats: { as: 34, ds: 4, dsRanged: 2, dsBolt: 2, udf: 32, armor: 1 },
+  combat: {
+    as: 34,
+    ds: 4,
+    attackType: 'bite',
+    damageType: ['puncture', 'crush', 'slash'],
+    attackName: 'bite',
+    damageFactors: {
+      1: 0.400, 5: 0.375, 6: 0.375, 7: 0.375, 8: 0.375, 9: 0.375, 10: 0.375,
+      11: 0.375, 12: 0.375, 13: 0.325, 14: 0.325, 15: 0.325, 16: 0.325,
+      17: 0.300, 18: 0.300, 19: 0.300, 20: 0.300
+    },
+    avd: {
+      1: 39, 5: 35, 6: 34, 7: 33, 8: 32, 9: 30, 10: 28, 11: 26, 12: 24,
+      13: 32, 14: 28, 15: 24, 16: 20, 17: 25, 18: 19, 19: 13, 20: 7
+    }
+  },
+  metadata: {
+    silverTier: 'low',
+    gemTier: 'low'
+  }
+};
+
+const NPCS = {
+  'giant-rat': GIANT_RAT
+};
+
+// A level 1 fighter with a broadsword; stats are base values (see services/statBonus.js)
+const FIGHTER = {
+  name: 'Simulant',
+  race: 'human',
+  level: 1,
+  combatStance: 'offensive',
+  attributes: {
+    strength: { base: 80, delta: 0 },
+    constitution: { base: 75, delta: 0 },
+    dexterity: { base: 70, delta: 0 },
+    agility: { base: 70, delta: 0 },
+    discipline: { base: 60, delta: 0 },
+    aura: { base: 50, delta: 0 },
+    logic: { base: 50, delta: 0 },
+    intelligence: { base: 50, delta: 0 },
+    wisdom: { base: 50, delta: 0 },
+    charisma: { base: 50, delta: 0 },
+    health: { base: 120, delta: 0 },
+    spirit: { base: 10, current: 10 }
+  },
+  skills: {
+    one_handed_edged: { ranks: 10 },
+    combat_maneuvers: { ranks: 4 },
+    armor_use: { ranks: 0 }
+  },
+  weapon: 'weapon_broadsword'
+};
+
+const CHARACTERS = {
+  fighter: FIGHTER
+};
+
+module.exports = {
+  NPCS,
+  CHARACTERS
+};
@@ -1,5 +1,7 @@
 'use strict';
 
+const random = require('../utils/random');
+
 // Generic level-based silver table and modifiers
 // Base range per level; pick random in range
 // Example: level 1 → 2..8, level N → 2N..8N
@@ -7,7 +9,7 @@ function getBaseSilverForLevel(level = 1) {
   const lvl = Math.max(1, Math.floor(level));
   const min = 2 * lvl;
   const max = 8 * lvl;
-  return Math.floor(Math.random() * (max - min + 1)) + min;
+  return random.int(min, max);
 }
 
 // Tier modifiers for silver
@@ -53,13 +55,13 @@ function pickGemByValueBand(minVal, maxVal) {
     }
   }
   if (candidates.length === 0) return null;
-  return candidates[Math.floor(Math.random() * candidates.length)];
+  return random.pick(candidates);
 }
 
 function maybeGenerateGemLoot(gemTier = 'none') {
   const cfg = GEM_TIER_CONFIG[String(gemTier || 'none').toLowerCase()] || GEM_TIER_CONFIG.none;
   if (cfg.chance <= 0) return null;
-  if (Math.random() > cfg.chance) return null;
+  if (random.random() > cfg.chance) return null;
   const pick = pickGemByValueBand(cfg.min, cfg.max);
   if (!pick) return null;
   return {
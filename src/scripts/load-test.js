@@ -0,0 +1,669 @@
+'use strict';
+
+const fs = require('fs');
+const path = require('path');
+const http = require('http');
+const { execSync } = require('child_process');
+const LoadClient = require('../utils/loadClient');
+const { Histogram } = require('../utils/metrics');
+const random = require('../utils/random');
+
+/**
+ * Load test a running game server
+ * Opens many Telnet and WebSocket sessions, logs in scripted characters and
+ * has them play a weighted mix of behaviors at a target command rate. Reports
+ * end-to-end command latency (command written to reply received) per
+ * behavior, throughput, login time, and from the server's metrics endpoint
+ * (adapters/http/metricsServer.js) the tick overrun rate, tick time, event
+ * loop delay and memory. Results can be saved as a baseline and later runs
+ * compared against it, so a regression shows up from one commit to the next.
+ *
+ * Usage:
+ *   node src/scripts/load-test.js provision [--clients N] [--prefix P] [--password S] [--room ID]
+ *       create the bot accounts and characters (P001..PN) in MongoDB; existing ones are kept
+ *   node src/scripts/load-test.js cleanup [--prefix P]
+ *       delete the bot accounts, characters and their items
+ *   node src/scripts/load-test.js [run] [options]
+ *     --clients N         concurrent sessions (default 50)
+ *     --websocket F       fraction of sessions over WebSocket, the rest Telnet (default 0.5)
+ *     --duration S        seconds of load after everyone has logged in (default 60)
+ *     --rate R            commands per second per client (default 0.5)
+ *     --mix SPEC          behavior weights (default walk=3,look=2,inventory=1,items=1,combat=1,say=2)
+ *     --route DIRS        walk this comma-separated route over and over instead of random exits
+ *     --target KEYWORD    what the combat behavior attacks (default rat)
+ *     --login-rate N      logins started per second (default 10)
+ *     --host H            server host (default 127.0.0.1); --telnet-port (4001), --ws-port (4000)
+ *     --metrics URL       server metrics endpoint (default http://127.0.0.1:9464/metrics)
+ *     --seed S            seed for the behavior choices
+ *     --json FILE         write the results as JSON
+ *     --baseline FILE     compare against this file (default data/load-test-baseline.json, if present)
+ *     --save-baseline     write this run's results as the new baseline
+ *     --tolerance PCT     allowed regression before a metric is flagged (default 10)
+ *
+ * The server limits password attempts per IP address; start it with e.g.
+ * LOGIN_IP_LIMIT=1000 when logging in many clients from one machine. With
+ * SHARDS > 1 the tick runs in the shard workers, so the tick figures here
+ * cover the gateway only. Exit code 3 means a metric regressed past the tolerance.
+ */
+
+const DEFAULTS = {
+  clients: 50,
+  websocket: 0.5,
+  duration: 60,
+  rate: 0.5,
+  mix: 'walk=3,look=2,inventory=1,items=1,combat=1,say=2',
+  route: null,
+  target: 'rat',
+  loginRate: 10,
+  host: '127.0.0.1',
+  telnetPort: 4001,
+  wsPort: 4000,
+  metrics: 'http://127.0.0.1:9464/metrics',
+  seed: null,
+  json: null,
+  baseline: path.join(__dirname, '..', '..', 'data', 'load-test-baseline.json'),
+  saveBaseline: false,
+  tolerance: 10,
+  prefix: 'loadbot',
+  password: 'loadtest',
+  room: 'wehnimers-landing-town:tsc',
+  timeoutMs: 10000,
+  maxOutstanding: 4 // Commands a client may have waiting before it skips its turn
+};
+
+// Room title line: the reply to LOOK and to a successful move
+const ROOM = /\[[^\]\r\n]+\]/;
+
+const PHRASES = ['Hello there.', 'Anyone hunting today?', 'Nice weather.', 'Heading north.', 'Watch out for rats.'];
+
+/**
+ * What each behavior sends and how its reply is recognized
+ * next(bot, options) returns the command line
+ */
+const BEHAVIORS = {
+  walk: {
+    next(bot, options) {
+      if (options.route) {
+        const direction = options.route[bot.routeIndex % options.route.length];
+        bot.routeIndex++;
+        return direction;
+      }
+      return bot.client.exits.length > 0 ? random.pick(bot.client.exits) : 'look';
+    },
+    expect: new RegExp(`${ROOM.source}|can't go|You are nowhere|must climb|leads nowhere|Go where`)
+  },
+  look: {
+    next: () => 'look',
+    expect: new RegExp(`${ROOM.source}|You are nowhere`)
+  },
+  inventory: {
+    next: () => 'inventory',
+    expect: /You are (?:holding|wearing|empty-handed)/
+  },
+  items: {
+    // The stone and sack created by "provision": alternate putting it away and taking it out
+    next(bot) {
+      bot.stoneStored = !bot.stoneStored;
+      return bot.stoneStored ? 'put stone in my sack' : 'get stone from my sack';
+    },
+    expect: /You put|You remove|You pick up|You place|is already in|aren't holding|don't see|hands are full|is full|nowhere to put|nothing here/
+  },
+  combat: {
+    next: (bot, options) => `attack ${options.target}`,
+    expect: /You swing|don't see that|can't attack|wounded arms/
+  },
+  say: {
+    next: () => `say ${random.pick(PHRASES)}`,
+    expect: /You say|You are nowhere/
+  }
+};
+
+function parseArgs(argv) {
+  const options = { ...DEFAULTS, mode: 'run' };
+  const args = argv.slice();
+  if (args[0] && !args[0].startsWith('--')) {
+    options.mode = args.shift();
+  }
+
+  const numbers = new Set(['clients', 'websocket', 'duration', 'rate', 'loginRate', 'telnetPort', 'wsPort', 'tolerance']);
+  while (args.length > 0) {
+    const flag = args.shift();
+    if (!flag.startsWith('--')) throw new Error(`Unexpected argument ${flag}`);
+    const key = flag.slice(2).replace(/-([a-z])/g, (_, letter) => letter.toUpperCase());
+    if (!(key in DEFAULTS)) throw new Error(`Unknown option ${flag}`);
+    if (key === 'saveBaseline') {
+      options.saveBaseline = true;
+      continue;
+    }
+    const value = args.shift();
+    if (value === undefined) throw new Error(`Missing value for ${flag}`);
+    options[key] = numbers.has(key) ? Number(value) : value;
+    if (numbers.has(key) && !Number.isFinite(options[key])) throw new Error(`${flag} must be a number`);
+  }
+
+  if (!['run', 'provision', 'cleanup'].includes(options.mode)) {
+    throw new Error(`Unknown mode "${options.mode}" (run, provision or cleanup)`);
+  }
+  options.mix = parseMix(options.mix);
+  options.route = options.route ? options.route.split(',').map(step => step.trim()).filter(Boolean) : null;
+  return options;
+}
+
+/**
+ * "walk=3,look=2" -> [{ name, weight }]
+ */
+function parseMix(spec) {
+  const mix = spec.split(',').map(part => {
+    const [name, weight = '1'] = part.split('=').map(text => text.trim());
+    if (!BEHAVIORS[name]) throw new Error(`Unknown behavior "${name}" (known: ${Object.keys(BEHAVIORS).join(', ')})`);
+    return { name, weight: Number(weight) };
+  }).filter(entry => entry.weight > 0);
+  if (mix.length === 0) throw new Error('--mix has no behavior with a positive weight');
+  return mix;
+}
+
+function pickBehavior(mix) {
+  const total = mix.reduce((sum, entry) => sum + entry.weight, 0);
+  let roll = random.random() * total;
+  for (const entry of mix) {
+    roll -= entry.weight;
+    if (roll < 0) return entry.name;
+  }
+  return mix[mix.length - 1].name;
+}
+
+function botName(prefix, index) {
+  return `${prefix}${String(index + 1).padStart(3, '0')}`;
+}
+
+function sleep(ms) {
+  return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+/**
+ * Read the server's Prometheus metrics; null if the endpoint is not reachable
+ * @returns {Promise<Array|null>} [{ name, labels, value }]
+ */
+function scrapeMetrics(url) {
+  return new Promise(resolve => {
+    const request = http.get(url, { timeout: 2000 }, response => {
+      let body = '';
+      response.setEncoding('utf8');
+      response.on('data', chunk => { body += chunk; });
+      response.on('end', () => resolve(response.statusCode === 200 ? parsePrometheus(body) : null));
+    });
+    request.on('timeout', () => request.destroy());
+    request.on('error', () => resolve(null));
+  });
+}
+
+function parsePrometheus(text) {
+  const samples = [];
+  for (const line of text.split('\n')) {
+    const match = /^([a-zA-Z_:][\w:]*)(?:\{([^}]*)\})?\s+(\S+)/.exec(line);
+    if (!match) continue;
+    const labels = {};
+    for (const pair of (match[2] || '').matchAll(/(\w+)="([^"]*)"/g)) {
+      labels[pair[1]] = pair[2];
+    }
+    samples.push({ name: match[1], labels, value: Number(match[3]) });
+  }
+  return samples;
+}
+
+/**
+ * Sum of the samples of one metric whose labels include the given ones
+ */
+function metricValue(samples, name, labels = {}) {
+  if (!samples) return null;
+  let total = null;
+  for (const sample of samples) {
+    if (sample.name !== name) continue;
+    if (Object.entries(labels).some(([key, value]) => sample.labels[key] !== String(value))) continue;
+    total = (total || 0) + sample.value;
+  }
+  return total;
+}
+
+/**
+ * One scripted player: connect, log in, then play until told to stop
+ */
+class Bot {
+  constructor(index, options, stats) {
+    this.index = index;
+    this.options = options;
+    this.stats = stats;
+    this.username = botName(options.prefix, index);
+    this.transport = index < Math.round(options.clients * options.websocket) ? 'websocket' : 'telnet';
+    this.client = new LoadClient({
+      transport: this.transport,
+      host: options.host,
+      telnetPort: options.telnetPort,
+      wsPort: options.wsPort,
+      timeoutMs: options.timeoutMs
+    });
+    this.routeIndex = index; // Spread bots along the route
+    this.stoneStored = false;
+    this.outstanding = 0;
+  }
+
+  async start() {
+    await this.client.connect();
+    const ms = await this.client.login(this.username, this.options.password);
+    this.stats.login.observe(ms);
+  }
+
+  /**
+   * Send commands at the target rate until the deadline
+   * The schedule does not wait for replies, so a slow server shows up as latency, not as a lower rate
+   */
+  async play(deadline) {
+    const interval = 1000 / this.options.rate;
+    // Start at a random point of the first interval so clients do not send in lockstep
+    let next = performance.now() + random.random() * interval;
+
+    while (!this.client.closed) {
+      const wait = next - performance.now();
+      if (wait > 0) await sleep(wait);
+      if (Date.now() >= deadline || this.client.closed) break;
+      next += interval * (0.5 + random.random()); // Mean interval, +/- 50%
+
+      if (this.outstanding >= this.options.maxOutstanding) {
+        this.stats.skipped++;
+        continue;
+      }
+      this.issue(pickBehavior(this.options.mix));
+    }
+  }
+
+  issue(name) {
+    const behavior = BEHAVIORS[name];
+    const line = behavior.next(this, this.options);
+    const sent = name === 'walk' && line === 'look' ? 'look' : name;
+    this.outstanding++;
+    this.stats.sent++;
+    this.client.send(line, BEHAVIORS[sent].expect)
+      .then(({ latencyMs }) => {
+        this.stats.latency.observe(latencyMs);
+        this.stats.byBehavior.observe(latencyMs, { behavior: sent });
+        this.stats.replies++;
+      })
+      .catch(error => {
+        if (error.timeout) this.stats.timeouts++;
+        else this.stats.errors++;
+      })
+      .finally(() => {
+        this.outstanding--;
+      });
+  }
+
+  /**
+   * Wait for outstanding replies (up to the command timeout), then quit
+   */
+  async stop() {
+    const until = Date.now() + this.options.timeoutMs;
+    while (this.outstanding > 0 && !this.client.closed && Date.now() < until) {
+      await sleep(50);
+    }
+    await this.client.quit();
+  }
+}
+
+function createStats(options) {
+  // Exact to a tenth of a millisecond, so baselines compare like for like
+  const histogram = (name, help) => new Histogram(name, help, { resolution: 0.1 });
+  return {
+    login: histogram('load_test_login_ms', 'Login time'),
+    latency: histogram('load_test_latency_ms', 'Command latency'),
+    byBehavior: histogram('load_test_behavior_latency_ms', 'Command latency by behavior'),
+    sent: 0,
+    replies: 0,
+    timeouts: 0,
+    errors: 0,
+    skipped: 0,
+    loginFailures: 0,
+    disconnects: 0,
+    clients: options.clients
+  };
+}
+
+/**
+ * Server figures from the metrics before and after the run plus periodic samples
+ */
+function serverSummary(before, after, samples) {
+  if (!before || !after) return null;
+  const delta = name => metricValue(after, name) - metricValue(before, name);
+  const ticks = delta('gs3_tick_duration_ms_count');
+  const overruns = delta('gs3_tick_overruns_total');
+  const rss = samples.map(sample => metricValue(sample, 'gs3_process_memory_bytes', { kind: 'rss' })).filter(v => v !== null);
+  const heap = samples.map(sample => metricValue(sample, 'gs3_process_memory_bytes', { kind: 'heapUsed' })).filter(v => v !== null);
+  const lag = samples.map(sample => metricValue(sample, 'gs3_event_loop_lag_ms', { quantile: 0.99 })).filter(v => v !== null);
+  const mb = bytes => Math.round((bytes / 1048576) * 10) / 10;
+
+  return {
+    ticks,
+    tickOverruns: overruns,
+    tickOverrunRate: ticks > 0 ? overruns / ticks : 0,
+    tickP99Ms: metricValue(after, 'gs3_tick_duration_ms', { quantile: 0.99 }),
+    serverCommands: delta('gs3_commands_total'),
+    eventLoopP99Ms: lag.length > 0 ? Math.max(...lag) : null,
+    rssStartMb: rss.length > 0 ? mb(rss[0]) : null,
+    rssPeakMb: rss.length > 0 ? mb(Math.max(...rss)) : null,
+    rssEndMb: rss.length > 0 ? mb(rss[rss.length - 1]) : null,
+    heapPeakMb: heap.length > 0 ? mb(Math.max(...heap)) : null
+  };
+}
+
+/**
+ * Summary numbers of a run (what the baseline keeps and compares)
+ */
+function summarize(stats, server, loadSeconds) {
+  const percentiles = (histogram, labels = null) => {
+    const { p50, p90, p99, max } = histogram.get(labels) || { p50: 0, p90: 0, p99: 0, max: 0 };
+    return { p50, p90, p99, max };
+  };
+  const behaviors = {};
+  for (const name of Object.keys(BEHAVIORS)) {
+    const latency = stats.byBehavior.get({ behavior: name });
+    if (latency) behaviors[name] = { count: latency.count, ...percentiles(stats.byBehavior, { behavior: name }) };
+  }
+  return {
+    clients: stats.clients,
+    loggedIn: stats.clients - stats.loginFailures,
+    loadSeconds: Math.round(loadSeconds * 10) / 10,
+    sent: stats.sent,
+    replies: stats.replies,
+    throughput: loadSeconds > 0 ? Math.round((stats.replies / loadSeconds) * 10) / 10 : 0,
+    timeouts: stats.timeouts,
+    errors: stats.errors,
+    skipped: stats.skipped,
+    disconnects: stats.disconnects,
+    latencyMs: percentiles(stats.latency),
+    loginMs: percentiles(stats.login),
+    behaviors,
+    server
+  };
+}
+
+function formatSummary(summary) {
+  const ms = value => `${(value ?? 0).toFixed(1)}ms`;
+  const row = (label, p) => `  ${label.padEnd(10)} p50 ${ms(p.p50).padStart(9)}  p90 ${ms(p.p90).padStart(9)}  p99 ${ms(p.p99).padStart(9)}  max ${ms(p.max).padStart(9)}`;
+  const lines = [
+    `Clients: ${summary.loggedIn}/${summary.clients} logged in, ${summary.disconnects} disconnected during the run`,
+    `Commands: ${summary.sent} sent, ${summary.replies} replies in ${summary.loadSeconds}s = ${summary.throughput}/s` +
+      ` (${summary.timeouts} timed out, ${summary.errors} failed, ${summary.skipped} skipped with ${DEFAULTS.maxOutstanding} waiting)`,
+    '',
+    'Latency (command written to reply received):',
+    row('all', summary.latencyMs)
+  ];
+  for (const [name, p] of Object.entries(summary.behaviors)) {
+    lines.push(`${row(name, p)}  n=${p.count}`);
+  }
+  lines.push(row('login', summary.loginMs));
+
+  const server = summary.server;
+  lines.push('');
+  if (server) {
+    lines.push(
+      `Server: ${server.ticks} ticks, ${server.tickOverruns} overran (${(server.tickOverrunRate * 100).toFixed(2)}%), tick p99 ${ms(server.tickP99Ms)}`,
+      `  ${server.serverCommands} commands executed, event loop delay p99 up to ${ms(server.eventLoopP99Ms)}`,
+      `  RSS ${server.rssStartMb} MB at start, ${server.rssPeakMb} MB peak, ${server.rssEndMb} MB at end; heap peak ${server.heapPeakMb} MB`
+    );
+  } else {
+    lines.push('Server: metrics endpoint not reachable (set --metrics, or METRICS_PORT on the server)');
+  }
+  return lines.join('\n');
+}
+
+/**
+ * Metrics compared against the baseline: [label, read(summary), higherIsWorse]
+ */
+const COMPARED = [
+  ['latency p50', s => s.latencyMs.p50, true],
+  ['latency p90', s => s.latencyMs.p90, true],
+  ['latency p99', s => s.latencyMs.p99, true],
+  ['throughput', s => s.throughput, false],
+  ['login p90', s => s.loginMs.p90, true],
+  ['tick overrun %', s => (s.server ? s.server.tickOverrunRate * 100 : null), true],
+  ['tick p99', s => (s.server ? s.server.tickP99Ms : null), true],
+  ['RSS peak MB', s => (s.server ? s.server.rssPeakMb : null), true]
+];
+
+/**
+ * Compare with a baseline run
+ * @returns {Object} { lines, regressions }
+ */
+function compareWithBaseline(summary, baseline, tolerance) {
+  const lines = [`Compared with baseline from ${baseline.date} (${baseline.commit || 'unknown commit'}):`];
+  const regressions = [];
+  const comparable = ['clients', 'loadSeconds'].every(key => Math.abs(summary[key] - baseline.summary[key]) <= summary[key] * 0.1);
+  if (!comparable) {
+    lines.push('  (different client count or duration; numbers are not directly comparable)');
+  }
+
+  for (const [label, read, higherIsWorse] of COMPARED) {
+    const now = read(summary);
+    const then = read(baseline.summary);
+    if (now === null || then === null || now === undefined || then === undefined) continue;
+    const change = then === 0 ? (now === 0 ? 0 : 100) : ((now - then) / Math.abs(then)) * 100;
+    const worse = higherIsWorse ? change > tolerance : change < -tolerance;
+    // Sub-millisecond latency moves are noise, not regressions
+    const negligible = label.startsWith('latency') && Math.abs(now - then) < 1;
+    const flag = worse && !negligible ? '  REGRESSION' : '';
+    if (flag) regressions.push(label);
+    lines.push(`  ${label.padEnd(15)} ${String(+then.toFixed(2)).padStart(10)} -> ${String(+now.toFixed(2)).padStart(10)}  ${change >= 0 ? '+' : ''}${change.toFixed(1)}%${flag}`);
+  }
+  return { lines, regressions };
+}
+
+function currentCommit() {
+  try {
+    return execSync('git rev-parse --short HEAD', { cwd: __dirname, stdio: ['ignore', 'pipe', 'ignore'] }).toString().trim();
+  } catch (_) {
+    return null;
+  }
+}
+
+async function runLoadTest(options) {
+  if (options.seed !== null) random.seed(options.seed);
+  const stats = createStats(options);
+  const bots = Array.from({ length: options.clients }, (_, i) => new Bot(i, options, stats));
+  const websocketCount = bots.filter(bot => bot.transport === 'websocket').length;
+  console.log(`Logging in ${options.clients} clients (${websocketCount} WebSocket, ${options.clients - websocketCount} Telnet) at ${options.loginRate}/s`);
+
+  const before = await scrapeMetrics(options.metrics);
+  const samples = before ? [before] : [];
+
+  // Ramp up
+  const started = [];
+  for (const bot of bots) {
+    started.push(bot.start().then(() => bot, error => {
+      stats.loginFailures++;
+      if (stats.loginFailures <= 5) console.log(`  ${bot.username}: ${error.message}`);
+      bot.client.quit().catch(() => {});
+      return null;
+    }));
+    await sleep(1000 / options.loginRate);
+  }
+  const active = (await Promise.all(started)).filter(Boolean);
+  if (active.length === 0) {
+    throw new Error('No client could log in');
+  }
+  for (const bot of active) {
+    bot.client.onClose = () => { stats.disconnects++; };
+  }
+  console.log(`${active.length} logged in (login p50 ${(stats.login.get()?.p50 ?? 0).toFixed(1)}ms); running for ${options.duration}s at ${options.rate} commands/s each`);
+
+  // Load
+  const sampler = before ? setInterval(async () => {
+    const sample = await scrapeMetrics(options.metrics);
+    if (sample) samples.push(sample);
+  }, 5000) : null;
+  const loadStarted = performance.now();
+  const deadline = Date.now() + options.duration * 1000;
+  await Promise.all(active.map(bot => bot.play(deadline)));
+  const loadSeconds = (performance.now() - loadStarted) / 1000;
+  if (sampler) clearInterval(sampler);
+
+  const after = await scrapeMetrics(options.metrics);
+  if (after) samples.push(after);
+  for (const bot of active) bot.client.onClose = null;
+  await Promise.all(active.map(bot => bot.stop()));
+
+  return summarize(stats, serverSummary(before, after, samples), loadSeconds);
+}
+
+/**
+ * Create the bot accounts and characters, each holding a stone and wearing a sack
+ */
+async function provisionBots(options) {
+  const databaseManager = require('../adapters/db/mongoClient');
+  const AccountManager = require('../systems/AccountManager');
+  const PlayerSystem = require('../systems/PlayerSystemMongoDB');
+  const HealthCalculation = require('../services/healthCalculation');
+
+  const db = await databaseManager.initialize();
+  const accountManager = new AccountManager();
+  await accountManager.initialize();
+  const playerSystem = new PlayerSystem();
+  await playerSystem.initialize();
+
+  let created = 0;
+  for (let i = 0; i < options.clients; i++) {
+    const username = botName(options.prefix, i);
+    if (await db.collection('accounts').findOne({ username })) continue;
+
+    const name = username.charAt(0).toUpperCase() + username.slice(1);
+    const sackId = `${username}-sack`;
+    const stoneId = `${username}-stone`;
+    await db.collection('items').insertMany([
+      {
+        id: sackId,
+        type: 'CONTAINER',
+        name: 'a small sack',
+        keywords: ['sack', 'small'],
+        description: 'A small cloth sack with a drawstring closure.',
+        metadata: { container: true, maxItems: 10, capacity: 5, weight: 1, slot: 'belt', items: [], loadTestBot: true },
+        createdAt: new Date()
+      },
+      {
+        id: stoneId,
+        type: 'ITEM',
+        name: 'a smooth stone',
+        keywords: ['stone', 'smooth'],
+        description: 'A smooth, palm-sized stone.',
+        metadata: { weight: 1, loadTestBot: true },
+        createdAt: new Date()
+      }
+    ]);
+
+    const stat = base => ({ base, delta: 0 });
+    const character = {
+      name,
+      gender: 'male',
+      race: 'human',
+      class: 'Warrior',
+      level: 1,
+      experience: 0,
+      attributes: {
+        strength: stat(70), constitution: stat(70), dexterity: stat(60), agility: stat(60),
+        discipline: stat(60), aura: stat(50), logic: stat(50), intelligence: stat(50),
+        wisdom: stat(50), charisma: stat(50), spirit: stat(10),
+        currency: { silver: 0, bank: 0 }
+      },
+      skills: { one_handed_edged: { ranks: 5 }, combat_maneuvers: { ranks: 2 } },
+      equipment: { rightHand: stoneId, belt: sackId },
+      inventory: [],
+      room: options.room,
+      account: username,
+      role: 'player',
+      combatStance: 'neutral',
+      wounds: { wounds: {}, scars: {} },
+      metadata: { creationDate: new Date().toISOString(), loadTestBot: true }
+    };
+    HealthCalculation.recalculateHealth(character);
+    await playerSystem.savePlayer(name, character);
+
+    const account = await accountManager.createAccount(username, options.password);
+    account.addCharacter(name);
+    account.metadata.loadTestBot = true; // cleanup deletes only marked accounts
+    await accountManager.saveAccount(account);
+    created++;
+  }
+
+  console.log(`${created} bots created, ${options.clients - created} already existed (${botName(options.prefix, 0)}..${botName(options.prefix, options.clients - 1)})`);
+  await accountManager.stop();
+  await databaseManager.close();
+}
+
+/**
+ * Delete every bot account, character and item created by provisionBots
+ */
+async function cleanupBots(options) {
+  const databaseManager = require('../adapters/db/mongoClient');
+  const db = await databaseManager.initialize();
+  const pattern = new RegExp(`^${options.prefix.replace(/[^\w-]/g, '')}\\d+`, 'i');
+
+  // Only documents provisionBots marked: a real player named like a bot is never touched
+  const bot = { 'metadata.loadTestBot': true };
+  const accounts = await db.collection('accounts').deleteMany({ username: pattern, ...bot });
+  const players = await db.collection('players').deleteMany({ name: pattern, ...bot });
+  const items = await db.collection('items').deleteMany({ id: new RegExp(`${pattern.source}-(?:sack|stone)$`, 'i'), ...bot });
+  console.log(`Deleted ${accounts.deletedCount} accounts, ${players.deletedCount} characters and ${items.deletedCount} items`);
+  await databaseManager.close();
+}
+
+async function main(options) {
+  if (options.mode === 'provision') return provisionBots(options);
+  if (options.mode === 'cleanup') return cleanupBots(options);
+
+  const summary = await runLoadTest(options);
+  console.log('');
+  console.log(formatSummary(summary));
+
+  const result = { date: new Date().toISOString(), commit: currentCommit(), options: { ...options, mix: undefined, mixSpec: options.mix }, summary };
+  let regressions = [];
+  if (fs.existsSync(options.baseline) && !options.saveBaseline) {
+    const baseline = JSON.parse(fs.readFileSync(options.baseline, 'utf8'));
+    const comparison = compareWithBaseline(summary, baseline, options.tolerance);
+    regressions = comparison.regressions;
+    console.log('');
+    console.log(comparison.lines.join('\n'));
+  }
+  if (options.json) {
+    fs.writeFileSync(options.json, JSON.stringify(result, null, 2));
+    console.log(`\nResults written to ${options.json}`);
+  }
+  if (options.saveBaseline) {
+    fs.mkdirSync(path.dirname(options.baseline), { recursive: true });
+    fs.writeFileSync(options.baseline, JSON.stringify(result, null, 2));
+    console.log(`\nBaseline saved to ${options.baseline}`);
+  }
+  return regressions;
+}
+
+// Command line usage
+if (require.main === module) {
+  let options;
+  try {
+    options = parseArgs(process.argv.slice(2));
+  } catch (error) {
+    console.error(`❌ ${error.message}`);
+    process.exit(2);
+  }
+
+  main(options)
+    .then(regressions => {
+      if (regressions && regressions.length > 0) {
+        console.log(`\n❌ Regressed: ${regressions.join(', ')}`);
+        process.exit(3);
+      }
+      process.exit(0);
+    })
+    .catch(error => {
+      console.error('\n❌ Error:', error.message);
+      process.exit(1);
+    });
+}
+
+module.exports = { runLoadTest, parseArgs, compareWithBaseline, parsePrometheus };
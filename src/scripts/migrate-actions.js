@@ -0,0 +1,84 @@
+'use strict';
+
+const databaseManager = require('../adapters/db/mongoClient');
+const ActionRecorder = require('../systems/ActionRecorder');
+const ActionRollups = require('../systems/ActionRollups');
+
+const BATCH_SIZE = 5000;
+
+/**
+ * Move recorded actions from the old `actions` collection (one document per
+ * action) into per-minute action_buckets and action_rollups, the storage the
+ * server and the daily content job read now.
+ *
+ * Each batch is deleted from `actions` once its buckets and rollups are stored,
+ * so the script can be stopped and run again without copying anything twice.
+ * Buckets older than the retention period are removed by their TTL index as usual.
+ *
+ * Usage: node src/scripts/migrate-actions.js [--drop]
+ *   --drop   drop the emptied `actions` collection at the end
+ */
+
+async function migrateActions(drop = false) {
+  const db = await databaseManager.initialize();
+  const exists = await db.listCollections({ name: 'actions' }, { nameOnly: true }).hasNext();
+  if (!exists) {
+    console.log('No actions collection: nothing to migrate');
+    return 0;
+  }
+
+  const recorder = new ActionRecorder();
+  recorder.db = db; // No flush timer; buckets are written directly
+  await recorder.ensureStorage();
+  const rollups = new ActionRollups();
+  rollups.db = db;
+
+  const source = db.collection('actions');
+  const total = await source.estimatedDocumentCount();
+  console.log(`Migrating about ${total} actions...`);
+
+  let migrated = 0;
+  for (;;) {
+    const batch = await source.find({}).sort({ timestamp: 1 }).limit(BATCH_SIZE).toArray();
+    if (batch.length === 0) break;
+
+    const records = batch.map(({ timestamp, playerId, action, context }) => ({ timestamp, playerId, action, context: context || {} }));
+    const failed = await recorder.insertBuckets(recorder.toBuckets(records));
+    if (failed.length > 0) {
+      throw new Error(`${failed.length} action buckets could not be written`);
+    }
+    for (const record of records) {
+      rollups.add(record);
+    }
+    await rollups.write();
+    if (rollups.minutes.size > 0) {
+      throw new Error('Action rollups could not be written');
+    }
+
+    await source.deleteMany({ _id: { $in: batch.map(doc => doc._id) } });
+    migrated += batch.length;
+    console.log(`  ${migrated} actions moved`);
+  }
+
+  if (drop) {
+    await source.drop();
+    console.log('Dropped the actions collection');
+  }
+  return migrated;
+}
+
+// Command line usage
+if (require.main === module) {
+  migrateActions(process.argv.includes('--drop'))
+    .then(async migrated => {
+      console.log(`\n✅ Migrated ${migrated} actions`);
+      await databaseManager.close();
+      process.exit(0);
+    })
+    .catch(error => {
+      console.error('\n❌ Error:', error.message);
+      process.exit(1);
+    });
+}
+
+module.exports = { migrateActions };
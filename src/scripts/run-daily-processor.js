@@ -0,0 +1,44 @@
+'use strict';
+
+const databaseManager = require('../adapters/db/mongoClient');
+const DailyProcessor = require('../systems/DailyProcessor');
+
+/**
+ * Run the daily content processor outside the game server
+ * It reads the per-minute action rollups the server writes, never raw actions.
+ * Start the server with DAILY_PROCESSOR=external so it does not also run the job.
+ *
+ * Usage: node src/scripts/run-daily-processor.js [--schedule]
+ *   --schedule   keep running and process every 24 hours (default: run once and exit)
+ */
+
+async function runDailyProcessor(schedule = false) {
+  const db = await databaseManager.initialize();
+  const processor = new DailyProcessor(null, { db });
+
+  await processor.processActions();
+  if (schedule) {
+    processor.startDailySchedule();
+    return;
+  }
+  await databaseManager.close();
+}
+
+// Command line usage
+if (require.main === module) {
+  const schedule = process.argv.includes('--schedule');
+
+  runDailyProcessor(schedule)
+    .then(() => {
+      if (!schedule) {
+        console.log('\n✅ Done!');
+        process.exit(0);
+      }
+    })
+    .catch(error => {
+      console.error('\n❌ Error:', error.message);
+      process.exit(1);
+    });
+}
+
+module.exports = { runDailyProcessor };
@@ -0,0 +1,137 @@
+'use strict';
+
+const os = require('os');
+const fs = require('fs');
+const path = require('path');
+const { Worker } = require('worker_threads');
+const CombatSimulator = require('../systems/CombatSimulator');
+
+/**
+ * Simulate combat headlessly for balance tuning and as a combat throughput benchmark
+ * Fights run through the real combat code (see systems/CombatSimulator.js) on
+ * worker threads; each worker gets its own seed (<seed>:<worker>), so a run is
+ * reproducible for the same --seed, --fights and --workers.
+ *
+ * Usage: node src/scripts/simulate-combat.js [options]
+ *   --fights N        fights to simulate (default 100000)
+ *   --workers N       worker threads (default: one per CPU)
+ *   --seed S          random seed (default: time based; printed so the run can be repeated)
+ *   --npc ID          creature from data/combat-fixtures.js (default giant-rat)
+ *   --character ID    character from data/combat-fixtures.js (default fighter)
+ *   --weapon ID       base weapon (e.g. weapon_broadsword, or none for unarmed)
+ *   --ranks N         weapon skill ranks
+ *   --stance NAME     offensive ... defensive
+ *   --engage WHO      player, npc or auto (default: the NPC starts if it is aggressive)
+ *   --json FILE       also write the merged results as JSON
+ */
+
+const WORKER_SCRIPT = path.join(__dirname, '..', 'workers', 'combatSimWorker.js');
+
+function parseArgs(argv) {
+  const options = {
+    fights: 100000,
+    workers: os.availableParallelism ? os.availableParallelism() : os.cpus().length,
+    seed: String(Date.now()),
+    json: null,
+    scenario: {}
+  };
+  const scenarioFlags = {
+    '--npc': ['npc', String],
+    '--character': ['character', String],
+    '--weapon': ['weapon', String],
+    '--ranks': ['weaponRanks', Number],
+    '--stance': ['stance', String],
+    '--engage': ['engage', String]
+  };
+
+  for (let i = 0; i < argv.length; i++) {
+    const flag = argv[i];
+    const value = argv[i + 1];
+    if (value === undefined) throw new Error(`Missing value for ${flag}`);
+    i++;
+    if (flag === '--fights') options.fights = parseInt(value, 10);
+    else if (flag === '--workers') options.workers = parseInt(value, 10);
+    else if (flag === '--seed') options.seed = value;
+    else if (flag === '--json') options.json = value;
+    else if (scenarioFlags[flag]) {
+      const [key, type] = scenarioFlags[flag];
+      options.scenario[key] = type(value);
+    } else {
+      throw new Error(`Unknown option ${flag}`);
+    }
+  }
+
+  if (!(options.fights > 0)) throw new Error('--fights must be a positive number');
+  if (!(options.workers > 0)) throw new Error('--workers must be a positive number');
+  options.workers = Math.min(options.workers, options.fights);
+  return options;
+}
+
+/**
+ * Run one worker's share of the fights
+ */
+function runWorker(index, seed, fights, scenario, onProgress) {
+  return new Promise((resolve, reject) => {
+    const worker = new Worker(WORKER_SCRIPT, {
+      workerData: { seed: `${seed}:${index}`, fights, scenario }
+    });
+    worker.on('message', message => {
+      if (message.type === 'progress') onProgress(index, message.fights);
+      else if (message.type === 'done') resolve(CombatSimulator.deserializeResults(message.results));
+      else if (message.type === 'error') reject(new Error(`Worker ${index}: ${message.error}`));
+    });
+    worker.on('error', reject);
+    worker.on('exit', code => {
+      if (code !== 0) reject(new Error(`Worker ${index} exited with code ${code}`));
+    });
+  });
+}
+
+async function simulateCombat(options) {
+  const { fights, workers, seed, scenario } = options;
+  console.log(`Simulating ${fights.toLocaleString()} fights on ${workers} worker threads (seed ${seed})`);
+
+  const progress = new Array(workers).fill(0);
+  const onProgress = (index, done) => {
+    progress[index] = done;
+    const total = progress.reduce((sum, count) => sum + count, 0);
+    process.stdout.write(`\r  ${Math.floor((total / fights) * 100)}% `);
+  };
+
+  const started = Date.now();
+  const shares = Array.from({ length: workers }, (_, i) =>
+    Math.floor(fights / workers) + (i < fights % workers ? 1 : 0));
+  const results = await Promise.all(shares.map((share, i) => runWorker(i, seed, share, scenario, onProgress)));
+  const merged = CombatSimulator.mergeResults(results);
+  process.stdout.write('\r');
+
+  console.log(CombatSimulator.formatResults(merged, scenario));
+  console.log(`Total including worker startup: ${((Date.now() - started) / 1000).toFixed(2)}s`);
+
+  if (options.json) {
+    const report = { seed, workers, scenario, results: CombatSimulator.serializeResults(merged) };
+    fs.writeFileSync(options.json, JSON.stringify(report, null, 2));
+    console.log(`Results written to ${options.json}`);
+  }
+  return merged;
+}
+
+// Command line usage
+if (require.main === module) {
+  let options;
+  try {
+    options = parseArgs(process.argv.slice(2));
+  } catch (error) {
+    console.error(`❌ ${error.message}`);
+    process.exit(2);
+  }
+
+  simulateCombat(options)
+    .then(() => process.exit(0))
+    .catch(error => {
+      console.error('\n❌ Error:', error.message);
+      process.exit(1);
+    });
+}
+
+module.exports = { simulateCombat, parseArgs };
@@ -5,7 +5,12 @@ const net = require('net');
 const GameEngine = require('./core/GameEngine');
 const CommandManager = require('./core/CommandManager');
 const LoginFlow = require('./systems/LoginFlow');
+const Session = require('./core/Session');
+const SessionRegistry = require('./core/SessionRegistry');
+const ShardManager = require('./systems/ShardManager');
 const path = require('path');
+const log = require('./utils/logger').child('server');
+const { startMetricsServer } = require('./adapters/http/metricsServer');
 
 class GameServer {
   constructor() {
@@ -13,8 +18,10 @@ class GameServer {
     this.gameEngine = new GameEngine();
     this.loginFlow = new LoginFlow(this.gameEngine.accountManager, this.gameEngine.playerSystem, this.gameEngine);
     this.wss = null;
-    this.connections = new Map(); // WebSocket -> player mapping
-    this.telnetConnections = new Map(); // Telnet socket -> player mapping
+    this.metricsServer = null;
+    // SHARDS=<n> (n > 1) runs the world as area shards on worker threads; this process keeps the sockets
+    const shardCount = parseInt(process.env.SHARDS, 10) || 1;
+    this.shards = shardCount > 1 ? new ShardManager(this.gameEngine, { size: shardCount }) : null;
   }
 
   /**
@@ -22,11 +29,20 @@ class GameServer {
    */
   async start() {
     try {
-      // Initialize the game engine
-      await this.gameEngine.start();
-      
-      // Load commands
-      await this.loadCommands();
+      if (this.shards) {
+        // Accounts and login here; rooms, NPCs, combat and commands in the shards
+        await this.gameEngine.startGateway();
+        await this.shards.start(this.gameEngine.playerSystem.db);
+      } else {
+        // Initialize the game engine
+        await this.gameEngine.start();
+        
+        // Load commands
+        await this.loadCommands();
+        
+        // Players who were online before a restart
+        this.restoreSessions();
+      }
       
       // Start WebSocket server
       this.startWebSocketServer();
@@ -34,6 +50,9 @@ class GameServer {
       // Start Telnet server
       this.startTelnetServer();
       
+      // Prometheus scrape endpoint (localhost only)
+      this.metricsServer = startMetricsServer();
+      
       console.log(`GS3 Game Server started on port ${this.port} (WebSocket) and port 4001 (Telnet)`);
     } catch (error) {
       console.error('Failed to start game server:', error);
@@ -41,6 +60,30 @@ class GameServer {
     }
   }
 
+  /**
+   * Put players restored from a world snapshot back in the world as linkdead,
+   * so logging in again within the grace period reconnects them where they were
+   */
+  restoreSessions() {
+    const sessions = this.gameEngine.sessions;
+    for (const data of this.gameEngine.restoredPlayers) {
+      const player = this.gameEngine.playerSystem.players.get(data.name) || data;
+      const playerId = player.id || player.name;
+      const session = Session.detached();
+      sessions.add(session);
+      sessions.bindPlayer(session, playerId);
+      session.onClose((s) => this.handleDisconnect(s));
+      
+      player.gameEngine = this.gameEngine;
+      player.connection = session;
+      this.gameEngine.addPlayer(player);
+      if (!sessions.markLinkdead(session, (s) => this.finalizeSession(s))) {
+        this.finalizeSession(session);
+      }
+    }
+    this.gameEngine.restoredPlayers = [];
+  }
+
   /**
    * Load all commands
    */
@@ -55,15 +98,17 @@ class GameServer {
   startWebSocketServer() {
     this.wss = new WebSocket.Server({ port: this.port });
     
-    this.wss.on('connection', (ws) => {
-      console.log('New WebSocket connection established');
+    this.wss.on('connection', (ws, req) => {
+      log.debug('New WebSocket connection', { address: req && req.socket ? req.socket.remoteAddress : null });
+      const session = this.attachSession(Session.fromWebSocket(ws, req));
       
       ws.on('message', (data) => {
-        this.handleMessage(ws, data);
+        // Each WebSocket message is complete even without a trailing newline
+        session.receive(data, true);
       });
       
       ws.on('close', () => {
-        this.handleDisconnect(ws);
+        session.handleTransportClosed();
       });
       
       ws.on('error', (error) => {
@@ -77,17 +122,15 @@ class GameServer {
    */
   startTelnetServer() {
     this.telnetServer = net.createServer((socket) => {
-      console.log('New Telnet connection established');
-      
-      // Start login process immediately for new telnet connections
-      this.loginFlow.startLogin(socket);
+      log.debug('New Telnet connection', { address: socket.remoteAddress });
+      const session = this.attachSession(Session.fromTelnet(socket));
       
       socket.on('data', (data) => {
-        this.handleTelnetMessage(socket, data);
+        session.receive(data);
       });
       
       socket.on('close', () => {
-        this.handleTelnetDisconnect(socket);
+        session.handleTransportClosed();
       });
       
       socket.on('error', (error) => {
@@ -101,383 +144,245 @@ class GameServer {
   }
 
   /**
-   * Handle incoming messages
+   * Wire a new session into the input pipeline and start the login process
    */
-  async handleMessage(ws, data) {
-    try {
-      const message = data.toString().trim();
-      
-      if (!message) return;
-      
-      // Check if player is in login process
-      if (this.loginFlow.isInLogin(ws)) {
-        const result = await this.loginFlow.processLoginInput(ws, message);
-        
-        if (result.success && result.player) {
-          // Login successful, add player to game
-          console.log(`WebSocket: Player logged in - ID: ${result.player.id || result.player.name}, Name: ${result.player.name}`);
-          this.connections.set(ws, result.player.id || result.player.name);
-          this.gameEngine.addPlayer(result.player);
-          result.player.gameEngine = this.gameEngine;
-          result.player.connection = ws;
-          
-          ws.send(result.message + '\n');
-          const roomDescription = await this.gameEngine.roomSystem.getRoomDescription(result.player.room, result.player, this.gameEngine);
-          ws.send(roomDescription + '\n');
-        } else if (result.disconnect) {
-          ws.close();
-        }
-        return;
-      }
-      
-      // Check if player is in character creation mode
-      if (this.gameEngine.characterCreationManager && this.gameEngine.characterCreationManager.isInCreation(ws)) {
-        const result = await this.gameEngine.characterCreationManager.processInput(ws, message);
-        if (result && result.message) {
-          ws.send(result.message);
-        }
-        return;
-      }
-      
-      // Get player
-      let player = this.getPlayerByConnection(ws);
-      if (!player) {
-        // Start login process
-        this.loginFlow.startLogin(ws);
-        return;
-      }
-      
-      // Parse command
-      const parts = message.split(' ');
-      const rawCommand = parts[0].toLowerCase();
-      const args = parts.slice(1);
-      
-      // Try to find the command with fuzzy matching (requires 3+ characters)
-      let command = rawCommand;
-      if (rawCommand.length >= 3) {
-        const fuzzyMatch = this.gameEngine.commandManager.findCommand(rawCommand);
-        if (fuzzyMatch) {
-          command = fuzzyMatch;
-        }
-      }
-      
-      console.log(`Player ${player.name} executing command: ${command} (from raw: ${rawCommand}) with args:`, args);
-      
-      // Check if it's a direction shortcut (n, s, e, w, ne, nw, se, sw, etc.)
-      const direction = this.checkDirectionShortcut(player, command);
-      if (direction === 'NO_EXIT') {
-        ws.send('You can\'t go there.\n');
-        return;
-      } else if (direction) {
-        // Treat as movement command
-        const goCommand = this.gameEngine.commandManager.getCommand('go');
-        if (goCommand) {
-          const result = await goCommand.execute(player, [direction]);
-          
-          console.log(`Movement result:`, result);
-          
-          // Send response
-          if (result && result.message) {
-            ws.send(result.message + '\n');
-          }
-          
-          return;
-        }
-      }
-      
-      // Execute command
-      const result = await this.gameEngine.processCommand(player, command, args);
-      
-      console.log(`Command result:`, result);
-      
-      // Send response
-      if (result && result.message) {
-        ws.send(result.message);
-      } else if (result && !result.message) {
-        console.log(`Command ${command} returned result but no message`);
-      }
-      
-      // Handle special cases
-      if (result.respawn) {
-        await this.handlePlayerRespawn(player);
-      }
-      
-      if (result.disconnect) {
-        this.handleDisconnect(ws);
-      }
-      
-    } catch (error) {
-      console.error('Error handling message:', error);
-      ws.send('An error occurred. Please try again.');
-    }
+  attachSession(session) {
+    this.gameEngine.sessions.add(session);
+    session.onLine((s, line) => this.handleInput(s, line));
+    session.onClose((s) => this.handleDisconnect(s));
+    this.loginFlow.startLogin(session);
+    return session;
   }
 
   /**
-   * Handle telnet messages
+   * Handle one line of input from a session (Telnet or WebSocket)
+   * Lines from the same session are run one at a time, in order
    */
-  async handleTelnetMessage(socket, data) {
-    try {
-      const message = data.toString().trim();
-      console.log(`Telnet: Received message: "${message}"`);
-      
-      if (!message) return;
-      
-      // Check if player is in login process
-      if (this.loginFlow.isInLogin(socket)) {
-        const result = await this.loginFlow.processLoginInput(socket, message);
-        
-        if (result.success && result.player) {
-          // Login successful, add player to game
-          console.log(`Telnet: Player logged in - ID: ${result.player.id}, Name: ${result.player.name}`);
-          this.telnetConnections.set(socket, result.player.id);
-          this.gameEngine.addPlayer(result.player);
-          result.player.gameEngine = this.gameEngine;
-          result.player.connection = socket;
-          
-          socket.write(result.message + '\r\n');
-          const roomDescription = await this.gameEngine.roomSystem.getRoomDescription(result.player.room, result.player, this.gameEngine);
-          socket.write(roomDescription + '\r\n');
-        } else if (result.disconnect) {
-          socket.end();
-        }
-        return;
-      }
-      
-      // Get player
-      let player = this.getPlayerByTelnetConnection(socket);
-      console.log(`Telnet: Player lookup result:`, player ? player.name : 'null');
-      
-      if (!player) {
-        console.log(`Telnet: No player found for socket, connection might have issues`);
-        // Player should be in login process already
-        return;
-      }
-      
-      // Parse command
-      const parts = message.split(' ');
-      const rawCommand = parts[0].toLowerCase();
-      const args = parts.slice(1);
-      
-      // Try to find the command with fuzzy matching (requires 3+ characters)
-      let command = rawCommand;
-      if (rawCommand.length >= 3) {
-        const fuzzyMatch = this.gameEngine.commandManager.findCommand(rawCommand);
-        if (fuzzyMatch) {
-          command = fuzzyMatch;
-        }
-      }
-      
-      console.log(`Telnet: Player ${player.name} executing command: ${command} (from raw: ${rawCommand}) with args:`, args);
-      
-      // Check if it's a direction shortcut (n, s, e, w, ne, nw, se, sw, etc.)
-      const direction = this.checkDirectionShortcut(player, command);
-      if (direction === 'NO_EXIT') {
-        socket.write('You can\'t go there.\r\n');
-        return;
-      } else if (direction) {
-        // Treat as movement command
-        const goCommand = this.gameEngine.commandManager.getCommand('go');
-        if (goCommand) {
-          const result = await goCommand.execute(player, [direction]);
-          
-          console.log(`Telnet: Movement result:`, result);
-          
-          // Send response
-          if (result && result.message) {
-            socket.write(result.message + '\r\n');
-          }
-          
-          return;
-        }
-      }
-      
-      // Execute command
-      const result = await this.gameEngine.processCommand(player, command, args);
-      
-      console.log(`Telnet: Command result:`, result);
-      
-      // Send response
-      if (result && result.message) {
-        socket.write(result.message + '\r\n');
-      } else if (result && !result.message) {
-        console.log(`Telnet: Command ${command} returned result but no message`);
-      }
-      
-      // Handle special cases
-      if (result.respawn) {
-        await this.handlePlayerRespawn(player);
-      }
-      
-      if (result.disconnect) {
-        this.handleTelnetDisconnect(socket);
+  async handleInput(session, line) {
+    const message = line.trim();
+    const sessions = this.gameEngine.sessions;
+    
+    if (!message) return;
+    
+    // Check if player is in login process
+    if (sessions.isLoggingIn(session)) {
+      const result = await this.loginFlow.processLoginInput(session, message);
+      
+      if (result.success && result.player) {
+        await this.enterWorld(session, result);
+      } else if (result.disconnect) {
+        session.close();
+      } else {
+        const inCreation = this.loginFlow.characterCreationManager.isInCreation(session);
+        sessions.setState(session, inCreation ? SessionRegistry.STATES.CREATION : SessionRegistry.STATES.LOGIN);
       }
-      
-    } catch (error) {
-      console.error('Error handling telnet message:', error);
-      socket.write('An error occurred. Please try again.\r\n');
+      return;
     }
-  }
-
-  /**
-   * Handle telnet disconnect
-   */
-  handleTelnetDisconnect(socket) {
-    const player = this.getPlayerByTelnetConnection(socket);
-    if (player) {
-      console.log(`Player ${player.name} disconnected (telnet)`);
-      this.gameEngine.removePlayer(player.id);
-      this.telnetConnections.delete(socket);
+    
+    // Commands run on the shard hosting the player when the world is sharded
+    const playerId = sessions.getPlayerId(session);
+    if (this.shards && playerId && this.shards.has(playerId)) {
+      this.shards.input(playerId, message);
+      return;
+    }
+    
+    // Get player
+    const player = this.getPlayerByConnection(session);
+    if (!player) {
+      // Start login process
+      sessions.setState(session, SessionRegistry.STATES.LOGIN);
+      this.loginFlow.startLogin(session);
+      return;
     }
+    
+    await this.gameEngine.handlePlayerInput(player, message, session);
   }
 
   /**
-   * Handle player disconnect
+   * Put a logged in character into the world
+   * A character that is still in the world (linkdead, or logged in elsewhere) is taken over
    */
-  handleDisconnect(ws) {
-    const player = this.getPlayerByConnection(ws);
+  async enterWorld(session, result) {
+    const sessions = this.gameEngine.sessions;
+    const playerId = result.player.id || result.player.name;
+    let player = this.gameEngine.getPlayer(playerId);
+    const inWorld = this.shards ? this.shards.has(playerId) : !!player;
+    const previous = sessions.bindPlayer(session, playerId);
+    
+    if (inWorld && previous && !previous.closed) {
+      previous.writeLine('Your character has been taken over by another connection.');
+      previous.close();
+    }
+    
+    if (this.shards) {
+      // The shard hosting the character writes the welcome and the room
+      if (inWorld) {
+        log.info('Player reconnected', { player: result.player.name, id: playerId, transport: session.kind });
+        this.shards.reconnect(playerId, `Welcome back, ${result.player.name}! You reconnect to the world.`);
+      } else if (this.shards.enter(result.player, result.message)) {
+        log.info('Player logged in', { player: result.player.name, id: playerId, transport: session.kind });
+      } else {
+        session.writeLine('That part of the world is not available right now. Please try again shortly.');
+        session.close();
+      }
+      return;
+    }
+    
     if (player) {
-      console.log(`Player ${player.name} disconnected`);
-      this.gameEngine.removePlayer(player.id);
-      this.connections.delete(ws);
+      log.info('Player reconnected', { player: player.name, id: playerId, transport: session.kind });
+      player.connection = session;
+      session.writeLine(`Welcome back, ${player.name}! You reconnect to the world.`);
+    } else {
+      player = result.player;
+      log.info('Player logged in', { player: player.name, id: playerId, transport: session.kind });
+      this.gameEngine.addPlayer(player);
+      player.gameEngine = this.gameEngine;
+      player.connection = session;
+      session.writeLine(result.message);
     }
+    
+    const roomDescription = await this.gameEngine.roomSystem.getRoomDescription(player.room, player, this.gameEngine);
+    session.writeLine(roomDescription);
   }
 
   /**
-   * Get player by WebSocket connection
+   * Handle session disconnect (transport closed or session closed by the server)
+   * A playing character whose connection dropped stays in the world as linkdead for a while
    */
-  getPlayerByConnection(ws) {
-    for (const [connection, playerId] of this.connections) {
-      if (connection === ws) {
-        return this.gameEngine.getPlayer(playerId);
-      }
+  handleDisconnect(session) {
+    this.loginFlow.clearLoginState(session);
+    this.loginFlow.characterCreationManager.clearCreationState(session);
+    
+    if (session.closeReason === 'transport' &&
+        this.gameEngine.sessions.markLinkdead(session, (s) => this.finalizeSession(s))) {
+      const player = this.getPlayerByConnection(session);
+      log.info('Player went linkdead', { player: player ? player.name : session.playerId, transport: session.kind });
+      return;
     }
-    return null;
+    
+    this.finalizeSession(session);
   }
 
   /**
-   * Get player by Telnet connection
+   * Drop a session from the registry and take its player out of the world
    */
-  getPlayerByTelnetConnection(socket) {
-    for (const [connection, playerId] of this.telnetConnections) {
-      if (connection === socket) {
-        return this.gameEngine.getPlayer(playerId);
+  finalizeSession(session) {
+    const playerId = this.gameEngine.sessions.remove(session);
+    if (this.shards) {
+      if (playerId && this.shards.has(playerId)) {
+        log.info('Player disconnected', { player: playerId, transport: session.kind });
+        this.shards.leave(playerId);
       }
+      return;
+    }
+    const player = playerId ? this.gameEngine.getPlayer(playerId) : null;
+    if (player) {
+      log.info('Player disconnected', { player: player.name, transport: session.kind });
+      this.gameEngine.removePlayer(player.id);
     }
-    return null;
   }
 
   /**
-   * Check if a command is a direction shortcut
-   * Returns canonical direction if it exists, null otherwise
+   * Get player by session
    */
-  checkDirectionShortcut(player, command) {
-    if (!player || !player.room || !player.gameEngine) {
-      return null;
-    }
-
-    const room = player.gameEngine.roomSystem.getRoom(player.room);
-    if (!room || !room.exits) {
-      return null;
-    }
-
-    // Map common shortcuts to full directions
-    const directionMap = {
-      'n': 'north',
-      's': 'south',
-      'e': 'east',
-      'w': 'west',
-      'u': 'up',
-      'd': 'down',
-      'up': 'up',
-      'down': 'down',
-      'out': 'out',
-      'ne': 'northeast',
-      'nw': 'northwest',
-      'se': 'southeast',
-      'sw': 'southwest'
-    };
-
-    const canonicalDirection = directionMap[command] || command;
-
-    // Check if this is a recognized direction shortcut
-    const isDirectionShortcut = command in directionMap;
-
-    // Check if this direction exists in the room
-    const exit = room.exits.find(e => e.direction === canonicalDirection && !e.hidden);
-    
-    if (exit) {
-      return canonicalDirection;
-    }
-    
-    // If it's a recognized direction but no exit exists, return special marker
-    if (isDirectionShortcut) {
-      return 'NO_EXIT';
-    }
-
-    return null;
+  getPlayerByConnection(session) {
+    const playerId = this.gameEngine.sessions.getPlayerId(session);
+    return playerId ? this.gameEngine.getPlayer(playerId) : null;
   }
 
   /**
    * Create a new telnet player
    */
-  async createTelnetPlayer(socket) {
+  async createTelnetPlayer(session) {
     // Create a temporary player for testing
     const player = await this.gameEngine.playerSystem.createPlayer({
       name: `Player_${Date.now()}`,
       currentRoom: 'start'
     });
     
-    // Store connection
-    this.telnetConnections.set(socket, player.name);
-    
     // Add to game engine
     this.gameEngine.addPlayer(player);
+    this.gameEngine.sessions.bindPlayer(session, player.id);
     
     // Set up player reference to game engine and connection
     player.gameEngine = this.gameEngine;
-    player.connection = socket;
+    player.connection = session;
     
     console.log(`New telnet player created: ${player.name}`);
     
     // Send welcome message
-    socket.write('Welcome to GS3!\r\n');
-    socket.write('Type "create <name> <race> <class>" to create a character\r\n');
-    socket.write('Available races: human, elf, dwarf, halfling\r\n');
-    socket.write('Available classes: warrior, rogue, wizard\r\n');
-    socket.write('Type "look" to see your surroundings\r\n');
+    session.write('Welcome to GS3!\r\n');
+    session.write('Type "create <name> <race> <class>" to create a character\r\n');
+    session.write('Available races: human, elf, dwarf, halfling\r\n');
+    session.write('Available classes: warrior, rogue, wizard\r\n');
+    session.write('Type "look" to see your surroundings\r\n');
     
     // Send initial room description
     const roomDescription = await this.gameEngine.roomSystem.getRoomDescription(player.room, player, this.gameEngine);
-    socket.write(roomDescription + '\r\n');
+    session.writeLine(roomDescription);
     
     return player;
   }
 
-  /**
-   * Handle player respawn
-   */
-  async handlePlayerRespawn(player) {
-    const result = this.gameEngine.playerSystem.respawnPlayer(player);
-    if (result.success) {
-      player.connection.send(result.message);
-      
-      // Move player to starting room
-      const roomDescription = await this.gameEngine.roomSystem.getRoomDescription(player.currentRoom, player, this.gameEngine);
-      player.connection.send(roomDescription);
-    }
-  }
-
   /**
    * Stop the server
+   * Players are saved and the live world is snapshotted for the next start (see systems/WorldSnapshot.js)
    */
-  stop() {
+  async stop() {
     console.log('Stopping GS3 Game Server...');
     
     if (this.wss) {
       this.wss.close();
     }
     
-    this.gameEngine.stop();
+    if (this.telnetServer) {
+      this.telnetServer.close();
+    }
+    
+    if (this.metricsServer) {
+      this.metricsServer.close();
+    }
+    
+    const sessions = Array.from(this.gameEngine.sessions.sessions);
+    for (const session of sessions) {
+      session.writeLine('The game is restarting. Please reconnect in a moment.');
+    }
+    
+    if (this.shards) {
+      try {
+        await this.shards.stop();
+      } catch (error) {
+        console.error('Error stopping area shards:', error);
+      }
+    }
+    
+    // Players are still in the world here, so the snapshot keeps them
+    await this.gameEngine.shutdown();
+    
+    for (const session of sessions) {
+      session.close();
+    }
+  }
+
+  /**
+   * Stop gracefully on SIGTERM (deploys) and SIGINT; a second signal exits at once
+   */
+  handleSignals() {
+    let stopping = false;
+    const onSignal = (signal) => {
+      if (stopping) {
+        console.log(`\n${signal} again, exiting without saving`);
+        process.exit(1);
+      }
+      stopping = true;
+      console.log('\nShutting down gracefully...');
+      this.stop().then(() => process.exit(0), (error) => {
+        console.error('Error during shutdown:', error);
+        process.exit(1);
+      });
+    };
+    process.on('SIGTERM', onSignal);
+    process.on('SIGINT', onSignal);
   }
 }
 
@@ -487,11 +392,7 @@ if (require.main === module) {
   server.start();
   
   // Handle graceful shutdown
-  process.on('SIGINT', () => {
-    console.log('\nShutting down gracefully...');
-    server.stop();
-    process.exit(0);
-  });
+  server.handleSignals();
 }
 
 module.exports = GameServer;
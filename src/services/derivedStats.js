@@ -0,0 +1,211 @@
+'use strict';
+
+/**
+ * Derived Stats Service
+ * Per-character cache of the values combat reads on every swing: stat
+ * bonuses, skill bonuses, spirit and health maximums, wound penalties and the
+ * wielded weapon document.
+ *
+ * Sections are computed on first use and kept until invalidated:
+ *   invalidate(character, 'stats' | 'skills') - raw stats, race or skill ranks changed (DamageSystem.setStat, TRAIN)
+ *   invalidate(character, 'wounds')           - a wound or scar was added or healed
+ *   invalidate(character, 'equipment')        - the wielded weapon was edited in place (EDIT)
+ *   invalidate(character)                     - everything (HOTFIX reloads the character)
+ * The weapon entry is also keyed by the right-hand item ID, so swapping
+ * weapons never reads a stale document.
+ */
+
+const { statBonus, getRawStat, normalizeRaceKey } = require('./statBonus');
+const HealthCalculation = require('./healthCalculation');
+
+const STAT_NAMES = [
+  'strength', 'constitution', 'dexterity', 'agility',
+  'discipline', 'aura', 'logic', 'intelligence',
+  'wisdom', 'charisma'
+];
+
+const COMBAT_SKILLS = ['one_handed_edged', 'one_handed_blunt', 'brawling'];
+
+const MAX_TABLE_RANKS = 200;
+
+/**
+ * Calculate skill bonus with diminishing returns
+ * Ranks 1-10: +5 per rank
+ * Ranks 11-20: +4 per rank
+ * Ranks 21-30: +3 per rank
+ * Ranks 31-40: +2 per rank
+ * Ranks 41+: +1 per rank
+ */
+function computeSkillBonus(ranks) {
+  let bonus = 0;
+  let remainingRanks = ranks;
+
+  if (remainingRanks > 40) {
+    bonus += (remainingRanks - 40) * 1;
+    remainingRanks = 40;
+  }
+  if (remainingRanks > 30) {
+    bonus += (remainingRanks - 30) * 2;
+    remainingRanks = 30;
+  }
+  if (remainingRanks > 20) {
+    bonus += (remainingRanks - 20) * 3;
+    remainingRanks = 20;
+  }
+  if (remainingRanks > 10) {
+    bonus += (remainingRanks - 10) * 4;
+    remainingRanks = 10;
+  }
+  if (remainingRanks > 0) {
+    bonus += remainingRanks * 5;
+  }
+
+  return bonus;
+}
+
+// Skill bonus by rank, 0..MAX_TABLE_RANKS
+const SKILL_BONUS_TABLE = Array.from({ length: MAX_TABLE_RANKS + 1 }, (_, ranks) => computeSkillBonus(ranks));
+
+/**
+ * Skill bonus for a rank count (table lookup)
+ */
+function skillBonus(ranks) {
+  const r = Math.trunc(ranks) || 0;
+  if (r <= 0) return 0;
+  return r <= MAX_TABLE_RANKS ? SKILL_BONUS_TABLE[r] : computeSkillBonus(r);
+}
+
+const cache = new WeakMap(); // character -> { base, wounds, weapon }
+
+function getEntry(character) {
+  let entry = cache.get(character);
+  if (!entry) {
+    entry = { base: null, wounds: null, weapon: null };
+    cache.set(character, entry);
+  }
+  return entry;
+}
+
+/**
+ * Stats and skills section
+ */
+function computeBase(character) {
+  const race = normalizeRaceKey(character.race);
+  const rawStats = {};
+  const statBonuses = {};
+  for (const statName of STAT_NAMES) {
+    rawStats[statName] = getRawStat(character, statName);
+    statBonuses[statName] = statBonus(race, statName, rawStats[statName]);
+  }
+
+  const skills = character.skills || {};
+  const ranks = skillId => skills[skillId]?.ranks || 0;
+  const skillBonuses = {};
+  for (const skillId of COMBAT_SKILLS) {
+    skillBonuses[skillId] = skillBonus(ranks(skillId));
+  }
+
+  return Object.freeze({
+    race,
+    rawStats: Object.freeze(rawStats),
+    statBonuses: Object.freeze(statBonuses),
+    skillBonuses: Object.freeze(skillBonuses),
+    combatManeuversBonus: Math.floor(ranks('combat_maneuvers') / 2),
+    armorUseRanks: ranks('armor_use'),
+    twoHandedRanks: ranks('two_handed'),
+    // Max spirit = round(Aura / 10), capped at 13
+    spiritMax: Math.min(13, Math.round((rawStats.aura || 50) / 10)),
+    maxHP: HealthCalculation.calculateMaxHP(character),
+    healthRegen: HealthCalculation.calculateHealthRegen(character)
+  });
+}
+
+/**
+ * Cached stat bonuses, skill bonuses and stat-derived maximums
+ */
+function getBaseStats(character) {
+  const entry = getEntry(character);
+  if (!entry.base) entry.base = computeBase(character);
+  return entry.base;
+}
+
+/**
+ * Cached wound penalties (see WoundSystem.getWoundPenalties)
+ */
+function getWoundPenalties(character) {
+  const entry = getEntry(character);
+  if (!entry.wounds) {
+    const WoundSystem = require('../systems/WoundSystem');
+    const penalties = WoundSystem.getWoundPenalties(character);
+    Object.freeze(penalties.bleedingWounds);
+    entry.wounds = Object.freeze(penalties);
+  }
+  return entry.wounds;
+}
+
+/**
+ * Weapon skill bonus for the weapon being used (brawling when unarmed)
+ */
+function getWeaponSkillBonus(character, weapon) {
+  const base = getBaseStats(character);
+  if (!character.skills) return 0;
+  if (!weapon) return base.skillBonuses.brawling;
+  const weaponType = weapon.metadata?.weapon_type || weapon.metadata?.baseWeapon || '';
+  if (weaponType.includes('edged')) return base.skillBonuses.one_handed_edged;
+  if (weaponType.includes('blunt')) return base.skillBonuses.one_handed_blunt;
+  return 0;
+}
+
+/**
+ * Wielded weapon document, read from the database once per weapon in hand
+ * @param {Object} character - Attacker
+ * @param {Object} damageSystem - Used to load the weapon on a cache miss
+ * @returns {Promise<Object|null>}
+ */
+async function getEquippedWeapon(character, damageSystem) {
+  const entry = getEntry(character);
+  const handId = character.equipment?.rightHand;
+  if (typeof handId !== 'string') {
+    entry.weapon = null;
+    return damageSystem.getEquippedWeapon(character);
+  }
+  if (entry.weapon && entry.weapon.id === handId) {
+    return entry.weapon.item;
+  }
+  const item = await damageSystem.getEquippedWeapon(character);
+  // Only remember a successful read (no database leaves item null)
+  if (item || character.gameEngine?.roomSystem?.db) {
+    entry.weapon = { id: handId, item };
+  }
+  return item;
+}
+
+/**
+ * Drop cached sections after a change
+ * @param {Object} character
+ * @param {...string} sections - 'stats', 'skills', 'wounds', 'equipment'; none for all
+ */
+function invalidate(character, ...sections) {
+  const entry = cache.get(character);
+  if (!entry) return;
+  if (sections.length === 0) {
+    cache.delete(character);
+    return;
+  }
+  for (const section of sections) {
+    if (section === 'stats' || section === 'skills') entry.base = null;
+    else if (section === 'wounds') entry.wounds = null;
+    else if (section === 'equipment') entry.weapon = null;
+  }
+}
+
+module.exports = {
+  skillBonus,
+  computeSkillBonus,
+  getBaseStats,
+  getWoundPenalties,
+  getWeaponSkillBonus,
+  getEquippedWeapon,
+  invalidate,
+  SKILL_BONUS_TABLE
+};
@@ -7,6 +7,8 @@
 
 const races = require('../data/races.json');
 
+const raceKeys = new Map(); // race name as stored on characters -> race key
+
 /**
  * Calculate stat bonus using formula: ⌊(RawStat - 50)/2⌋ + RaceModifier
  * @param {string} raceKey - Race identifier (e.g., 'human', 'elf', 'dark_elf')
@@ -40,14 +42,16 @@ function raceModifier(raceKey, statName) {
 function normalizeRaceKey(raceName) {
   if (!raceName) return 'human';
   
-  // Convert to lowercase and replace spaces/hyphens with underscores
-  const normalized = raceName.toLowerCase().replace(/[-\s]/g, '_');
-  
-  // Check if it exists in races
-  if (races[normalized]) return normalized;
-  
-  // Fallback to human
-  return 'human';
+  let key = raceKeys.get(raceName);
+  if (key === undefined) {
+    // Convert to lowercase and replace spaces/hyphens with underscores
+    const normalized = String(raceName).toLowerCase().replace(/[-\s]/g, '_');
+    
+    // Check if it exists in races, fallback to human
+    key = races[normalized] ? normalized : 'human';
+    raceKeys.set(raceName, key);
+  }
+  return key;
 }
 
 /**
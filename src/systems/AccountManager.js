@@ -1,7 +1,7 @@
 'use strict';
 
-const bcrypt = require('bcryptjs');
 const databaseManager = require('../adapters/db/mongoClient');
+const PasswordHasher = require('./PasswordHasher');
 
 /**
  * Account System
@@ -75,17 +75,17 @@ class Account {
   }
 
   /**
-   * Set password (hashed)
+   * Set password (hashed on the hasher's worker pool)
    */
-  setPassword(password) {
-    this.password = this._hashPassword(password);
+  async setPassword(password, hasher) {
+    this.password = await hasher.hash(password);
   }
 
   /**
-   * Check password
+   * Check password (compared on the hasher's worker pool)
    */
-  checkPassword(password) {
-    return bcrypt.compareSync(password, this.password);
+  checkPassword(password, hasher) {
+    return hasher.compare(password, this.password);
   }
 
   /**
@@ -112,14 +112,6 @@ class Account {
     this.deleted = true;
   }
 
-  /**
-   * Hash password using bcrypt
-   */
-  _hashPassword(password) {
-    const salt = bcrypt.genSaltSync(10);
-    return bcrypt.hashSync(password, salt);
-  }
-
   /**
    * Serialize account data for saving
    */
@@ -142,9 +134,10 @@ class Account {
  * Handles account creation, loading, and management
  */
 class AccountManager {
-  constructor(dataDir) {
+  constructor(dataDir, options = {}) {
     this.accounts = new Map(); // In-memory cache
     this.db = null;
+    this.passwordHasher = new PasswordHasher(options.passwordHasher);
   }
 
   /**
@@ -181,7 +174,7 @@ class AccountManager {
     });
 
     // Hash the password
-    account.setPassword(password);
+    await account.setPassword(password, this.passwordHasher);
 
     // Save to MongoDB
     await this.saveAccount(account);
@@ -275,10 +268,15 @@ class AccountManager {
       return { success: false, message: 'Account is deleted' };
     }
 
-    if (!account.checkPassword(password)) {
+    if (!(await account.checkPassword(password, this.passwordHasher))) {
       return { success: false, message: 'Invalid password' };
     }
 
+    // Upgrade hashes made with an older cost factor
+    if (this.passwordHasher.needsRehash(account.password)) {
+      await account.setPassword(password, this.passwordHasher);
+    }
+
     // Update last login
     account.updateLastLogin();
     await this.saveAccount(account);
@@ -306,6 +304,13 @@ class AccountManager {
     }
   }
   
+  /**
+   * Stop the password hashing workers
+   */
+  async stop() {
+    await this.passwordHasher.stop();
+  }
+
   /**
    * Delete account from MongoDB
    */
@@ -1,17 +1,70 @@
 'use strict';
 
+const fs = require('fs');
+const path = require('path');
+const { threadId } = require('worker_threads');
+const { ObjectId } = require('mongodb');
 const databaseManager = require('../adapters/db/mongoClient');
+const { ensureIndexes } = require('../adapters/db/indexes');
+const ActionRollups = require('./ActionRollups');
+const log = require('../utils/logger').child('actions');
+
+const BUCKET_MS = 60 * 1000; // One storage document per minute of actions (per flush)
+const MAX_ACTIONS_PER_DOC = 1000;
+const COLLECTION = 'action_buckets';
 
 /**
  * Player Action Recording System (Database Version)
  * Records all player actions for later analysis and content generation
+ *
+ * Recording is a push onto an in-memory buffer. Flushing swaps the buffer out
+ * (double buffering), groups the actions into per-minute bucket documents and
+ * writes them with one unordered insertMany. Failed batches are retried; when
+ * the retry backlog passes maxQueued actions the oldest batches are spilled to
+ * JSON-lines files and replayed once the database is back, so a Mongo outage
+ * neither loses actions nor grows memory without bound. Buckets expire after
+ * the retention period (TTL index).
+ *
+ * Actions used to be stored one document each in the `actions` collection;
+ * src/scripts/migrate-actions.js moves them into buckets and rollups.
  */
 class ActionRecorder {
-  constructor() {
+  /**
+   * @param {Object} options - Recorder configuration
+   * @param {number} options.bufferSize - Flush once this many actions are buffered (default: 500)
+   * @param {number} options.flushIntervalMs - Periodic flush (default: 5s)
+   * @param {number} options.maxQueued - Actions kept in memory for retry before spilling to disk (default: 50000)
+   * @param {number} options.retentionDays - How long buckets are kept (default: ACTIONS_RETENTION_DAYS env or 14)
+   * @param {string} options.spoolDir - Where spilled batches are written (one directory per area shard)
+   */
+  constructor(options = {}) {
     this.db = null;
     this.buffer = [];
-    this.bufferSize = 100; // Flush buffer when it reaches this size
-    this.flushInterval = 30000; // Flush every 30 seconds
+    this.bufferSize = options.bufferSize || 500;
+    this.flushInterval = options.flushIntervalMs || 5000;
+    this.maxQueued = options.maxQueued || 50000;
+    this.retentionDays = options.retentionDays || parseInt(process.env.ACTIONS_RETENTION_DAYS, 10) || 14;
+    this.spoolDir = options.spoolDir || path.join(__dirname, '../../data/action-spool');
+
+    this.retryQueue = []; // bucket documents whose insert failed, oldest first
+    this.retryQueued = 0; // actions inside retryQueue
+    this.spoolFiles = 0;
+    this.inFlight = null;
+    this.spilling = null; // Spill started outside a flush (full buffer), awaited by stop()
+    this.timer = null;
+    this.spoolSequence = 0;
+    this.rollups = new ActionRollups(); // Per-minute counts for the daily content job
+
+    this.stats = {
+      recorded: 0,
+      written: 0,
+      documents: 0,
+      failures: 0,
+      spilled: 0,
+      replayed: 0,
+      dropped: 0,
+      lastFlushMs: 0
+    };
   }
 
   /**
@@ -20,15 +73,30 @@ class ActionRecorder {
   async initialize() {
     try {
       this.db = await databaseManager.initialize();
+      await this.ensureStorage();
+      await this.rollups.initialize(this.db);
       console.log('Action recorder initialized with MongoDB');
-      
+
       // Start periodic flush
-      setInterval(() => this.flushBuffer(), this.flushInterval);
+      this.timer = setInterval(() => this.flushBuffer(), this.flushInterval);
+      if (this.timer.unref) this.timer.unref();
+
+      // Anything spilled during a previous outage or shutdown
+      this.spoolFiles = this.listSpoolFiles().length;
     } catch (error) {
       console.error('Failed to initialize action recorder:', error);
     }
   }
 
+  /**
+   * Create the bucket index; its TTL is the retention policy
+   * A retention change since the index was created updates it in place
+   */
+  async ensureStorage() {
+    const expireAfterSeconds = this.retentionDays * 24 * 60 * 60;
+    await ensureIndexes(this.db, COLLECTION, [{ key: { bucket: 1 }, expireAfterSeconds }]);
+  }
+
   /**
    * Record a player action
    */
@@ -45,97 +113,259 @@ class ActionRecorder {
     };
 
     this.buffer.push(record);
+    this.stats.recorded++;
+    this.rollups.add(record);
 
     // Flush buffer if it's full
     if (this.buffer.length >= this.bufferSize) {
-      this.flushBuffer();
+      if (this.buffer.length >= this.maxQueued) {
+        // A flush is stuck (database unreachable): move the buffer to disk instead of growing
+        const stalled = this.buffer;
+        this.buffer = [];
+        this.queueSpill(this.toBuckets(stalled));
+      } else {
+        this.flushBuffer();
+      }
     }
   }
 
   /**
    * Flush the buffer to database
+   * Safe to call at any time: only one flush runs, and actions recorded while
+   * it is writing go to the next buffer
+   */
+  flushBuffer() {
+    if (!this.inFlight) {
+      this.inFlight = this.drain()
+        .catch(error => console.error('Failed to flush action buffer:', error))
+        .finally(() => { this.inFlight = null; });
+    }
+    return this.inFlight;
+  }
+
+  /**
+   * Write everything buffered (and any retry backlog and spool files)
+   */
+  async drain() {
+    if (!this.db) return;
+    const started = Date.now();
+
+    // Swap buffers: new actions keep landing in a fresh array while this batch is written
+    const batch = this.buffer;
+    this.buffer = [];
+    const docs = this.retryQueue.concat(this.toBuckets(batch));
+    this.retryQueue = [];
+    this.retryQueued = 0;
+
+    if (docs.length > 0) {
+      const failed = await this.insertBuckets(docs);
+      if (failed.length > 0) {
+        this.stats.failures++;
+        await this.requeue(failed);
+        return;
+      }
+    }
+
+    if (this.spoolFiles > 0) {
+      await this.replaySpool();
+    }
+    this.stats.lastFlushMs = Date.now() - started;
+  }
+
+  /**
+   * Group actions into per-minute bucket documents
+   * IDs are assigned here so a retried insert can never store a bucket twice
    */
-  async flushBuffer() {
-    if (this.buffer.length === 0) return;
+  toBuckets(actions) {
+    const docs = [];
+    let current = null;
+    for (const record of actions) {
+      const bucket = record.timestamp - (record.timestamp % BUCKET_MS);
+      if (!current || current.bucket.getTime() !== bucket || current.actions.length >= MAX_ACTIONS_PER_DOC) {
+        current = { _id: new ObjectId(), bucket: new Date(bucket), count: 0, actions: [] };
+        docs.push(current);
+      }
+      current.actions.push(record);
+      current.count++;
+    }
+    return docs;
+  }
 
+  /**
+   * Insert bucket documents in one unordered batch
+   * @returns {Array} Documents that were not stored
+   */
+  async insertBuckets(docs) {
     try {
-      const collection = this.db.collection('actions');
-      await collection.insertMany(this.buffer);
-      
-      console.log(`Flushed ${this.buffer.length} actions to database`);
-      this.buffer = [];
+      await this.db.collection(COLLECTION).insertMany(docs, { ordered: false });
+      this.noteWritten(docs);
+      return [];
     } catch (error) {
-      console.error('Failed to flush action buffer:', error);
+      // Duplicate keys mean the bucket is already stored (an earlier attempt got through)
+      const failed = Array.isArray(error.writeErrors) && error.writeErrors.length > 0
+        ? error.writeErrors.filter(e => e.code !== 11000).map(e => docs[e.index])
+        : docs;
+      const failedSet = new Set(failed);
+      this.noteWritten(docs.filter(doc => !failedSet.has(doc)));
+      if (failed.length > 0) {
+        log.warn('Action bucket insert failed', { buckets: failed.length, error: error.message });
+      }
+      return failed;
+    }
+  }
+
+  noteWritten(docs) {
+    for (const doc of docs) {
+      this.stats.written += doc.count;
     }
+    this.stats.documents += docs.length;
   }
 
   /**
-   * Get actions from a specific time period
+   * Keep failed buckets for the next flush; past maxQueued, spill the oldest to disk
    */
-  async getActionsFromPeriod(startTime, endTime) {
+  async requeue(docs) {
+    this.retryQueue = docs.concat(this.retryQueue);
+    this.retryQueued = this.retryQueue.reduce((total, doc) => total + doc.count, 0);
+
+    if (this.retryQueued <= this.maxQueued) return;
+
+    const spill = [];
+    while (this.retryQueue.length > 0 && this.retryQueued > this.maxQueued / 2) {
+      const doc = this.retryQueue.shift();
+      this.retryQueued -= doc.count;
+      spill.push(doc);
+    }
+    await this.spill(spill);
+  }
+
+  /**
+   * Spill without waiting, one file after another; stop() waits for the last one
+   */
+  queueSpill(docs) {
+    const spilled = (this.spilling || Promise.resolve()).then(() => this.spill(docs));
+    this.spilling = spilled;
+    spilled.finally(() => {
+      if (this.spilling === spilled) this.spilling = null;
+    });
+    return spilled;
+  }
+
+  /**
+   * Append bucket documents to a spool file
+   */
+  async spill(docs) {
+    if (docs.length === 0) return;
+    const count = docs.reduce((total, doc) => total + doc.count, 0);
     try {
-      const collection = this.db.collection('actions');
-      const actions = await collection.find({
-        timestamp: { $gte: startTime, $lte: endTime }
-      }).toArray();
-      
-      return actions;
+      await fs.promises.mkdir(this.spoolDir, { recursive: true });
+      // Shard worker threads share the process ID; the thread ID keeps their names apart
+      const name = `actions-${Date.now()}-${process.pid}-${threadId}-${this.spoolSequence++}`;
+      const file = path.join(this.spoolDir, `${name}.jsonl`);
+      // Write then rename, so a replay never reads a half-written file
+      await fs.promises.writeFile(path.join(this.spoolDir, `${name}.tmp`), docs.map(doc => JSON.stringify(doc)).join('\n') + '\n');
+      await fs.promises.rename(path.join(this.spoolDir, `${name}.tmp`), file);
+      this.spoolFiles++;
+      this.stats.spilled += count;
+      log.warn('Spilled action buckets to disk', { file, actions: count });
     } catch (error) {
-      console.error('Failed to get actions from period:', error);
-      return [];
+      this.stats.dropped += count;
+      console.error(`Failed to spill ${count} actions to disk:`, error);
     }
   }
 
   /**
-   * Get actions from the last 24 hours
+   * Spool files, oldest first
    */
-  async getActionsFromLast24Hours() {
-    const endTime = Date.now();
-    const startTime = endTime - (24 * 60 * 60 * 1000); // 24 hours ago
-    return this.getActionsFromPeriod(startTime, endTime);
+  listSpoolFiles() {
+    try {
+      return fs.readdirSync(this.spoolDir)
+        .filter(name => name.endsWith('.jsonl'))
+        .sort()
+        .map(name => path.join(this.spoolDir, name));
+    } catch (error) {
+      return [];
+    }
   }
 
   /**
-   * Analyze patterns in actions
+   * Insert spilled buckets; a file is deleted only once all of it is stored
    */
-  analyzePatterns(actions) {
-    const patterns = {
-      popularLocations: {},
-      playerConflicts: [],
-      economicTrends: {},
-      socialDynamics: {},
-      contentGaps: []
-    };
+  async replaySpool() {
+    for (const file of this.listSpoolFiles()) {
+      const docs = (await fs.promises.readFile(file, 'utf8'))
+        .split('\n')
+        .filter(Boolean)
+        .map(line => {
+          const doc = JSON.parse(line);
+          doc._id = new ObjectId(doc._id);
+          doc.bucket = new Date(doc.bucket);
+          return doc;
+        });
 
-    // Analyze location popularity
-    actions.forEach(action => {
-      const location = action.context.location;
-      if (location && location !== 'unknown') {
-        patterns.popularLocations[location] = (patterns.popularLocations[location] || 0) + 1;
+      const failed = await this.insertBuckets(docs);
+      if (failed.length > 0) {
+        // Still failing: keep what is left of the file for the next attempt
+        await fs.promises.writeFile(file, failed.map(doc => JSON.stringify(doc)).join('\n') + '\n');
+        this.stats.failures++;
+        return;
       }
-    });
+      await fs.promises.unlink(file);
+      this.spoolFiles = Math.max(0, this.spoolFiles - 1);
+      this.stats.replayed += docs.reduce((total, doc) => total + doc.count, 0);
+    }
+    this.spoolFiles = 0;
+  }
 
-    // Analyze economic trends
-    actions.forEach(action => {
-      if (action.action === 'trade' || action.action === 'buy' || action.action === 'sell') {
-        const item = action.context.item;
-        if (item) {
-          patterns.economicTrends[item] = (patterns.economicTrends[item] || 0) + 1;
-        }
-      }
-    });
+  /**
+   * Flush what is left; anything the database will not take is spilled to disk
+   */
+  async stop() {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+    if (this.inFlight) await this.inFlight;
+    if (this.spilling) await this.spilling;
+    await this.flushBuffer();
+    await this.rollups.stop();
+    const leftover = this.retryQueue.concat(this.toBuckets(this.buffer));
+    this.retryQueue = [];
+    this.retryQueued = 0;
+    this.buffer = [];
+    await this.spill(leftover);
+  }
 
-    // Analyze social dynamics
-    actions.forEach(action => {
-      if (action.action === 'say' || action.action === 'tell' || action.action === 'group') {
-        const target = action.context.target;
-        if (target) {
-          patterns.socialDynamics[target] = (patterns.socialDynamics[target] || 0) + 1;
-        }
-      }
-    });
+  /**
+   * Get recorder statistics
+   */
+  getStats() {
+    return {
+      ...this.stats,
+      buffered: this.buffer.length,
+      retryQueued: this.retryQueued,
+      spoolFiles: this.spoolFiles
+    };
+  }
 
-    return patterns;
+  /**
+   * Get actions from a specific time period
+   */
+  async getActionsFromPeriod(startTime, endTime) {
+    try {
+      const collection = this.db.collection(COLLECTION);
+      const actions = await collection.aggregate([
+        { $match: { bucket: { $gte: new Date(startTime - (startTime % BUCKET_MS)), $lte: new Date(endTime) } } },
+        { $unwind: '$actions' },
+        { $replaceRoot: { newRoot: '$actions' } },
+        { $match: { timestamp: { $gte: startTime, $lte: endTime } } }
+      ]).toArray();
+
+      return actions;
+    } catch (error) {
+      console.error('Failed to get actions from period:', error);
+      return [];
+    }
   }
 }
 
@@ -0,0 +1,202 @@
+'use strict';
+
+const { ObjectId } = require('mongodb');
+const { ensureIndexes } = require('../adapters/db/indexes');
+const log = require('../utils/logger').child('actions');
+
+const COLLECTION = 'action_rollups';
+const MINUTE_MS = 60 * 1000;
+
+const TRADE_ACTIONS = new Set(['trade', 'buy', 'sell']);
+const SOCIAL_ACTIONS = new Set(['say', 'tell', 'group']);
+
+/**
+ * Add one action to a patterns object (the shape DailyProcessor consumes)
+ */
+function accumulate(patterns, record) {
+  const context = record.context || {};
+  const location = context.location;
+  if (location && location !== 'unknown') {
+    patterns.popularLocations[location] = (patterns.popularLocations[location] || 0) + 1;
+  }
+  if (TRADE_ACTIONS.has(record.action) && context.item) {
+    patterns.economicTrends[context.item] = (patterns.economicTrends[context.item] || 0) + 1;
+  }
+  if (SOCIAL_ACTIONS.has(record.action) && context.target) {
+    patterns.socialDynamics[context.target] = (patterns.socialDynamics[context.target] || 0) + 1;
+  }
+}
+
+/**
+ * Empty patterns object
+ */
+function emptyPatterns() {
+  return {
+    popularLocations: {},
+    playerConflicts: [],
+    economicTrends: {},
+    socialDynamics: {},
+    contentGaps: []
+  };
+}
+
+/**
+ * Action Rollups
+ * Per-minute counts of location visits, trades and social targets, kept up to
+ * date as actions are recorded and written to action_rollups every minute.
+ * The daily content job reads these compact documents instead of a day of raw
+ * actions, so it no longer needs the game process or gigabytes of memory.
+ *
+ * Each flush inserts one document per minute it covers; counts are stored as
+ * [key, count] pairs because location IDs and item names are not safe field names.
+ */
+class ActionRollups {
+  /**
+   * @param {Object} options
+   * @param {number} options.flushIntervalMs - How often rollups are written (default: 60s)
+   * @param {number} options.retentionDays - How long rollups are kept (default: 90)
+   */
+  constructor(options = {}) {
+    this.db = null;
+    this.flushIntervalMs = options.flushIntervalMs || MINUTE_MS;
+    this.retentionDays = options.retentionDays || 90;
+    this.minutes = new Map(); // minute start (ms) -> patterns
+    this.timer = null;
+    this.inFlight = null;
+    this.stats = {
+      documents: 0,
+      failures: 0
+    };
+  }
+
+  /**
+   * Attach the database, create the retention index and start the periodic write
+   */
+  async initialize(db) {
+    this.db = db;
+    try {
+      await ensureIndexes(db, COLLECTION, [
+        { key: { minute: 1 }, expireAfterSeconds: this.retentionDays * 24 * 60 * 60 }
+      ]);
+    } catch (error) {
+      console.error('Failed to create action rollup index:', error);
+    }
+    if (!this.timer) {
+      this.timer = setInterval(() => this.flush(), this.flushIntervalMs);
+      if (this.timer.unref) this.timer.unref();
+    }
+  }
+
+  /**
+   * Count one recorded action
+   */
+  add(record) {
+    const minute = record.timestamp - (record.timestamp % MINUTE_MS);
+    let patterns = this.minutes.get(minute);
+    if (!patterns) {
+      patterns = { total: 0, popularLocations: {}, economicTrends: {}, socialDynamics: {} };
+      this.minutes.set(minute, patterns);
+    }
+    patterns.total++;
+    accumulate(patterns, record);
+  }
+
+  /**
+   * Write the counts gathered so far; failed minutes are merged back for the next try
+   */
+  flush() {
+    if (!this.inFlight) {
+      this.inFlight = this.write()
+        .catch(error => console.error('Failed to write action rollups:', error))
+        .finally(() => { this.inFlight = null; });
+    }
+    return this.inFlight;
+  }
+
+  async write() {
+    if (!this.db || this.minutes.size === 0) return;
+
+    const minutes = this.minutes;
+    this.minutes = new Map();
+    const docs = Array.from(minutes, ([minute, patterns]) => ({
+      _id: new ObjectId(),
+      minute: new Date(minute),
+      total: patterns.total,
+      locations: Object.entries(patterns.popularLocations),
+      trades: Object.entries(patterns.economicTrends),
+      social: Object.entries(patterns.socialDynamics)
+    }));
+
+    try {
+      await this.db.collection(COLLECTION).insertMany(docs, { ordered: false });
+      this.stats.documents += docs.length;
+    } catch (error) {
+      const failed = Array.isArray(error.writeErrors) && error.writeErrors.length > 0
+        ? new Set(error.writeErrors.filter(e => e.code !== 11000).map(e => docs[e.index].minute.getTime()))
+        : new Set(minutes.keys());
+      for (const minute of failed) {
+        this.merge(minute, minutes.get(minute));
+      }
+      this.stats.failures++;
+      log.warn('Action rollup write failed', { minutes: failed.size, error: error.message });
+    }
+  }
+
+  /**
+   * Add unsaved counts for a minute back into the live rollups
+   */
+  merge(minute, patterns) {
+    const live = this.minutes.get(minute);
+    if (!live) {
+      this.minutes.set(minute, patterns);
+      return;
+    }
+    live.total += patterns.total;
+    for (const field of ['popularLocations', 'economicTrends', 'socialDynamics']) {
+      for (const [key, count] of Object.entries(patterns[field])) {
+        live[field][key] = (live[field][key] || 0) + count;
+      }
+    }
+  }
+
+  /**
+   * Stop the timer and write what is left
+   */
+  async stop() {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+    if (this.inFlight) await this.inFlight;
+    await this.flush();
+  }
+
+  /**
+   * Sum the rollups for a time period into a patterns object
+   * Streams the compact minute documents; no raw actions are read
+   */
+  static async loadPatterns(db, startTime, endTime) {
+    const patterns = emptyPatterns();
+    let total = 0;
+    const cursor = db.collection(COLLECTION).find(
+      { minute: { $gte: new Date(startTime), $lt: new Date(endTime) } },
+      { projection: { _id: 0, total: 1, locations: 1, trades: 1, social: 1 } }
+    );
+
+    const add = (target, pairs) => {
+      for (const [key, count] of pairs || []) {
+        target[key] = (target[key] || 0) + count;
+      }
+    };
+    for await (const doc of cursor) {
+      total += doc.total || 0;
+      add(patterns.popularLocations, doc.locations);
+      add(patterns.economicTrends, doc.trades);
+      add(patterns.socialDynamics, doc.social);
+    }
+
+    return { patterns, total };
+  }
+}
+
+module.exports = ActionRollups;
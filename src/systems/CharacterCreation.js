@@ -604,6 +604,7 @@ class CharacterCreation {
     character.tps[0] = physicalRemaining;
     character.tps[1] = mentalRemaining;
     skill.ranks += ranks;
+    require('../services/derivedStats').invalidate(character, 'skills');
 
     // If Physical Fitness was trained, recalculate HP
     if (skillId === 'physical_fitness') {
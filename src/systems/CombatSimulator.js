@@ -0,0 +1,444 @@
+'use strict';
+
+const RoomSystem = require('./RoomSystemMongoDB');
+const NPCSystem = require('./NPCSystem');
+const RoomEventBus = require('./RoomEventBus');
+const CombatSystem = require('./CombatSystem');
+const NPCCombatBehavior = require('./NPCCombatBehavior');
+const DamageSystem = require('./DamageSystem');
+const DerivedStats = require('../services/derivedStats');
+const attackCommand = require('../commands/attack');
+const { Histogram } = require('../utils/metrics');
+const BASE_WEAPONS = require('../data/base-weapons');
+const { NPCS, CHARACTERS } = require('../data/combat-fixtures');
+
+const ARENA_ROOM = 'sim-arena';
+const TICK_MS = 1000; // Same step as the GameEngine tick
+
+/**
+ * DamageSystem that reports every resolved attack to the simulator
+ */
+class ObservedDamageSystem extends DamageSystem {
+  constructor(observer) {
+    super();
+    this.observer = observer;
+  }
+
+  async applyDamageWithCritical(attacker, target, damage, weapon = null) {
+    const result = await super.applyDamageWithCritical(attacker, target, damage, weapon);
+    this.observer(attacker, target, result);
+    return result;
+  }
+}
+
+/**
+ * Exact-value histogram for a result (resolution 1 = whole numbers)
+ */
+function histogram(name, help, resolution = 1) {
+  return new Histogram(name, help, { resolution });
+}
+
+/**
+ * One-line summary: n, mean and the usual percentiles
+ * @param {string} unit - Appended to each value ("s")
+ */
+function summarize(histogram, unit = '') {
+  const stats = histogram.get();
+  if (!stats) return 'no samples';
+  const f = value => `${+value.toFixed(2)}${unit}`;
+  return `n=${stats.count} mean=${f(stats.mean)} p50=${f(stats.p50)} p90=${f(stats.p90)} p99=${f(stats.p99)} max=${f(stats.max)}`;
+}
+
+/**
+ * Text bar chart, one line per value (for small value ranges such as critical ranks)
+ * @param {number} width - Length of the longest bar
+ */
+function chart(histogram, width = 40, label = value => String(value)) {
+  const entries = histogram.entries();
+  const total = entries.reduce((sum, [, count]) => sum + count, 0);
+  const largest = Math.max(1, ...entries.map(([, count]) => count));
+  const labels = entries.map(([value]) => label(value));
+  const labelWidth = Math.max(...labels.map(text => text.length));
+  return entries.map(([, count], i) => {
+    const percent = ((count / total) * 100).toFixed(1).padStart(5);
+    return `${labels[i].padStart(labelWidth)} ${percent}% ${'#'.repeat(Math.round((count / largest) * width))}`;
+  });
+}
+
+const DEFAULT_SCENARIO = {
+  character: 'fighter',     // Key in data/combat-fixtures.js CHARACTERS
+  npc: 'giant-rat',         // Key in data/combat-fixtures.js NPCS
+  weapon: null,             // Base weapon key (data/base-weapons.js); null = the character's, 'none' = unarmed
+  weaponRanks: null,        // Override the character's weapon skill ranks
+  stance: null,             // Override the character's combat stance
+  engage: 'auto',           // Who starts: 'player', 'npc', or 'auto' (the NPC if it is aggressive)
+  maxFightSeconds: 600      // A fight still going after this long counts as a timeout
+};
+
+/**
+ * Combat Simulator
+ * Runs fights headlessly through the real combat code: the ATTACK command,
+ * DamageSystem, CriticalSystem, WoundSystem, NPCCombatBehavior and corpse loot,
+ * on an in-memory room with an NPC spawned by the real NPCSystem. Nothing
+ * touches the network or the database.
+ *
+ * Time is simulated with the game's one second tick: roundtime counts down
+ * once per tick, the player swings as soon as their roundtime is over and the
+ * NPC acts on the tick its roundtime reaches zero, as in GameEngine.
+ *
+ * Seed utils/random.js before a run to make it reproducible. Results are plain data
+ * (see mergeResults) so runs on several worker threads can be combined.
+ */
+class CombatSimulator {
+  /**
+   * @param {Object} scenario - See DEFAULT_SCENARIO
+   */
+  constructor(scenario = {}) {
+    this.scenario = { ...DEFAULT_SCENARIO, ...scenario };
+    this.definition = NPCS[this.scenario.npc];
+    if (!this.definition) {
+      throw new Error(`Unknown simulator NPC "${this.scenario.npc}" (known: ${Object.keys(NPCS).join(', ')})`);
+    }
+    if (!CHARACTERS[this.scenario.character]) {
+      throw new Error(`Unknown simulator character "${this.scenario.character}" (known: ${Object.keys(CHARACTERS).join(', ')})`);
+    }
+
+    this.engine = this.createEngine();
+    this.player = this.createPlayer();
+    this.results = CombatSimulator.createResults();
+    this.fight = null; // Per-fight state seen by the damage observer
+  }
+
+  /**
+   * The parts of GameEngine the combat code reaches for, with in-memory sinks
+   */
+  createEngine() {
+    const engine = {
+      roomEvents: new RoomEventBus(),
+      roomSystem: new RoomSystem(),
+      npcSystem: new NPCSystem(),
+      combatSystem: new CombatSystem(),
+      itemLifecycle: null,
+      // ATTACK and NPC attacks use this one, so every resolved attack is recorded
+      damageSystem: new ObservedDamageSystem((attacker, target, result) => this.observe(attacker, target, result)),
+      playerSystem: { updatePlayer: async () => true },
+      persistenceQueue: {
+        insertItem: item => {
+          if (this.fight) this.fight.corpses.push(item);
+        },
+        pushRoomItem: () => {}
+      }
+    };
+    engine.roomSystem.roomEvents = engine.roomEvents;
+    engine.npcSystem.roomEvents = engine.roomEvents;
+    // No game engine: the fight loop starts aggression itself instead of room-event timers
+    engine.npcCombatBehavior = new NPCCombatBehavior(engine.combatSystem, null, { damageSystem: engine.damageSystem });
+
+    engine.roomSystem.addRoomDocuments([{
+      id: ARENA_ROOM,
+      areaId: 'simulator',
+      title: 'Simulation Arena',
+      description: 'A featureless arena.',
+      exits: [],
+      items: []
+    }]);
+    return engine;
+  }
+
+  /**
+   * Build the simulated character from its fixture and the scenario overrides
+   */
+  createPlayer() {
+    const fixture = structuredClone(CHARACTERS[this.scenario.character]);
+    const baseWeapon = this.scenario.weapon || fixture.weapon;
+    delete fixture.weapon;
+
+    const player = {
+      ...fixture,
+      id: 'sim-player',
+      room: ARENA_ROOM,
+      equipment: {},
+      gameEngine: this.engine
+    };
+    if (this.scenario.stance) player.combatStance = this.scenario.stance;
+
+    if (baseWeapon && baseWeapon !== 'none') {
+      const base = BASE_WEAPONS[baseWeapon];
+      if (!base) throw new Error(`Unknown base weapon "${baseWeapon}"`);
+      // A full item object in the hand (not an ID), so no database read is needed
+      player.equipment.rightHand = {
+        id: `sim-${baseWeapon}`,
+        type: 'WEAPON',
+        name: `a ${base.name.toLowerCase()}`,
+        metadata: { baseWeapon, weapon_type: base.type }
+      };
+      if (this.scenario.weaponRanks !== null) {
+        player.skills[base.type] = { ranks: this.scenario.weaponRanks };
+      }
+    } else if (this.scenario.weaponRanks !== null) {
+      player.skills.brawling = { ranks: this.scenario.weaponRanks };
+    }
+
+    this.maxHealth = player.attributes.health.base;
+    this.engine.roomEvents.enter(player, ARENA_ROOM, { kind: 'player', cause: 'login' });
+    return player;
+  }
+
+  /**
+   * Empty result set; every field is a count or a Histogram so results merge exactly
+   */
+  static createResults() {
+    return {
+      fights: 0,
+      wins: 0,
+      losses: 0,
+      timeouts: 0,
+      playerSwings: 0,
+      playerHits: 0,       // Swings that did damage
+      npcSwings: 0,
+      npcHits: 0,
+      fatalCrits: 0,       // Kills by an instantly fatal critical
+      gemDrops: 0,
+      elapsedMs: 0,
+      damage: histogram('damage', 'Damage per damaging player swing'),
+      critRank: histogram('crit_rank', 'Critical rank per damaging player swing'),
+      npcDamage: histogram('npc_damage', 'Damage per damaging NPC swing'),
+      killSeconds: histogram('kill_seconds', 'Simulated seconds from the first swing to the kill'),
+      killSwings: histogram('kill_swings', 'Player swings per kill'),
+      silver: histogram('silver', 'Silver per corpse'),
+      gemValue: histogram('gem_value', 'Estimated value per gem dropped', 10),
+      gems: {}                      // Gem name -> drops
+    };
+  }
+
+  /**
+   * Record statistics for every attack the combat code resolves
+   */
+  observe(attacker, target, result) {
+    const fight = this.fight;
+    if (!fight) return;
+    const stats = this.results;
+
+    if (attacker === this.player) {
+      stats.playerSwings++;
+      fight.swings++;
+      if (result.baseDamage > 0) {
+        stats.playerHits++;
+        stats.damage.observe(result.damage);
+        stats.critRank.observe(result.critical.rank || 0);
+      }
+      if (target === fight.npc && result.targetDead) {
+        fight.npcDead = true;
+        if (result.critical.isFatal) stats.fatalCrits++;
+      }
+    } else if (target === this.player) {
+      stats.npcSwings++;
+      if (result.baseDamage > 0) {
+        stats.npcHits++;
+        stats.npcDamage.observe(result.damage);
+      }
+      if (result.targetDead) fight.playerDead = true;
+    }
+  }
+
+  /**
+   * Put the character back to full health with no wounds and no roundtime
+   */
+  resetPlayer() {
+    const player = this.player;
+    this.engine.combatSystem.removeFromCombat(player);
+    player.attributes.health.delta = 0;
+    player.wounds = undefined;
+    player.combatData = { lag: 0, roundStarted: 0 };
+    DerivedStats.invalidate(player, 'wounds');
+  }
+
+  /**
+   * Forget corpses and display names left in the arena by the last fight
+   */
+  clearArena() {
+    const room = this.engine.roomSystem.getRoom(ARENA_ROOM);
+    if (Array.isArray(room.items)) room.items.length = 0;
+    this.engine.roomSystem.itemDisplayNames.clear();
+  }
+
+  /**
+   * One fight to the death (or timeout) against a fresh NPC
+   */
+  async runFight() {
+    const { engine, player, results } = this;
+    const combat = engine.combatSystem;
+    const maxMs = this.scenario.maxFightSeconds * 1000;
+
+    this.resetPlayer();
+    const npc = engine.npcSystem.spawnNPC(this.definition, ARENA_ROOM, engine);
+    const keyword = this.definition.keywords[0];
+    const fight = this.fight = { npc, swings: 0, npcDead: false, playerDead: false, corpses: [] };
+
+    const engage = this.scenario.engage === 'auto'
+      ? (npc.aggressive ? 'npc' : 'player')
+      : this.scenario.engage;
+    if (engage === 'npc') {
+      engine.npcCombatBehavior.initiateCombat(npc, player);
+    }
+
+    let elapsed = 0;
+    while (!fight.npcDead && !fight.playerDead) {
+      // The player enters ATTACK as soon as their roundtime is over
+      if (combat.canAct(player)) {
+        // A refused attack (e.g. wounded arms) just costs the player this round
+        await attackCommand.execute(player, [keyword]);
+        if (fight.npcDead) break;
+      }
+
+      // Game tick: roundtime counts down, then NPCs whose roundtime is over act
+      elapsed += TICK_MS;
+      if (elapsed > maxMs) break;
+      combat.tickLag(player, TICK_MS);
+      if (npc.combatData && npc.combatData.lag > 0) {
+        npc.combatData.lag = Math.max(0, npc.combatData.lag - TICK_MS);
+      }
+      if (npc.combatData && npc.combatData.lag === 0 && combat.isInCombat(npc)) {
+        await engine.npcCombatBehavior.performCombatAction(npc);
+      }
+    }
+
+    results.fights++;
+    if (fight.npcDead) {
+      results.wins++;
+      results.killSeconds.observe(elapsed / 1000);
+      results.killSwings.observe(fight.swings);
+      const corpse = fight.corpses.find(item => item.metadata.npcName === npc.name);
+      if (corpse) {
+        results.silver.observe(corpse.metadata.loot.silver);
+        for (const gem of corpse.metadata.loot.items) {
+          results.gemDrops++;
+          results.gemValue.observe(gem.valueEstimate);
+          results.gems[gem.name] = (results.gems[gem.name] || 0) + 1;
+        }
+      }
+    } else if (fight.playerDead) {
+      results.losses++;
+    } else {
+      results.timeouts++;
+    }
+
+    // Whoever is left standing leaves the arena
+    combat.removeFromCombat(npc);
+    engine.npcSystem.removeNPC(npc.id);
+    this.clearArena();
+    this.fight = null;
+  }
+
+  /**
+   * Run a number of fights
+   * @param {number} fights
+   * @param {Object} options - { onProgress(results) called about once a second }
+   * @returns {Promise<Object>} Results (see createResults)
+   */
+  async run(fights, { onProgress = null } = {}) {
+    const started = process.hrtime.bigint();
+    let lastProgress = Date.now();
+
+    try {
+      for (let i = 0; i < fights; i++) {
+        await this.runFight();
+        if (onProgress && Date.now() - lastProgress >= 1000) {
+          lastProgress = Date.now();
+          onProgress(this.results);
+        }
+      }
+    } finally {
+      this.results.elapsedMs += Number(process.hrtime.bigint() - started) / 1e6;
+    }
+    return this.results;
+  }
+
+  /**
+   * Results as plain data (for postMessage or JSON)
+   */
+  static serializeResults(results) {
+    const data = {};
+    for (const [key, value] of Object.entries(results)) {
+      data[key] = value instanceof Histogram ? value.toJSON() : value;
+    }
+    return data;
+  }
+
+  static deserializeResults(data) {
+    const results = {};
+    for (const [key, value] of Object.entries(data)) {
+      results[key] = value && Array.isArray(value.series) ? Histogram.fromJSON(value) : value;
+    }
+    return results;
+  }
+
+  /**
+   * Combine results from several runs (e.g. one per worker thread)
+   * Wall time is the slowest run's, since the runs were concurrent
+   */
+  static mergeResults(list) {
+    const merged = CombatSimulator.createResults();
+    for (const results of list) {
+      for (const [key, value] of Object.entries(results)) {
+        if (key === 'elapsedMs') {
+          merged.elapsedMs = Math.max(merged.elapsedMs, value);
+        } else if (value instanceof Histogram) {
+          merged[key].merge(value);
+        } else if (key === 'gems') {
+          for (const [name, count] of Object.entries(value)) {
+            merged.gems[name] = (merged.gems[name] || 0) + count;
+          }
+        } else {
+          merged[key] += value;
+        }
+      }
+    }
+    return merged;
+  }
+
+  /**
+   * Printable report: outcomes, distributions and throughput
+   */
+  static formatResults(results, scenario = {}) {
+    const percent = (part, whole) => (whole > 0 ? `${((part / whole) * 100).toFixed(1)}%` : '-');
+    const seconds = results.elapsedMs / 1000;
+    const rate = count => (seconds > 0 ? Math.round(count / seconds).toLocaleString() : '-');
+    const swings = results.playerSwings + results.npcSwings;
+
+    const lines = [
+      `Scenario: ${JSON.stringify({ ...DEFAULT_SCENARIO, ...scenario })}`,
+      `Fights: ${results.fights.toLocaleString()}  won ${percent(results.wins, results.fights)}` +
+        `  lost ${percent(results.losses, results.fights)}  timed out ${percent(results.timeouts, results.fights)}`,
+      `Player swings: ${results.playerSwings.toLocaleString()}, ${percent(results.playerHits, results.playerSwings)} did damage`,
+      `NPC swings: ${results.npcSwings.toLocaleString()}, ${percent(results.npcHits, results.npcSwings)} did damage`,
+      '',
+      `Damage per hit:     ${summarize(results.damage)}`,
+      `NPC damage per hit: ${summarize(results.npcDamage)}`,
+      `Time to kill:       ${summarize(results.killSeconds, 's')}`,
+      `Swings per kill:    ${summarize(results.killSwings)}`,
+      `Kills by fatal critical: ${percent(results.fatalCrits, results.wins)}`,
+      '',
+      'Critical rank per hit:',
+      ...chart(results.critRank, 40, rank => `  rank ${rank}`),
+      '',
+      `Silver per kill:    ${summarize(results.silver)}`,
+      `Gems: ${percent(results.gemDrops, results.wins)} of kills, value ${summarize(results.gemValue)}`
+    ];
+
+    const gems = Object.entries(results.gems).sort((a, b) => b[1] - a[1]).slice(0, 5);
+    for (const [name, count] of gems) {
+      lines.push(`  ${String(count).padStart(8)}  ${name}`);
+    }
+
+    lines.push(
+      '',
+      `Throughput: ${rate(results.fights)} fights/s, ${rate(swings)} swings/s (${seconds.toFixed(2)}s wall)`
+    );
+    return lines.join('\n');
+  }
+}
+
+CombatSimulator.DEFAULT_SCENARIO = DEFAULT_SCENARIO;
+
+module.exports = CombatSimulator;
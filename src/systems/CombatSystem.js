@@ -7,6 +7,15 @@
 class CombatSystem {
   constructor() {
     this.activeCombatants = new Map(); // Track active combat states
+    this.combatEndListeners = [];
+  }
+
+  /**
+   * Call a listener whenever a character's last combatant is removed
+   * @param {Function} listener - listener(character)
+   */
+  onCombatEnd(listener) {
+    this.combatEndListeners.push(listener);
   }
 
   /**
@@ -95,21 +104,27 @@ class CombatSystem {
       return;
     }
 
-    if (attacker.combatants.has(target)) {
-      attacker.combatants.delete(target);
-    }
-
-    if (target.combatants.has(attacker)) {
-      target.combatants.delete(attacker);
-    }
+    const attackerRemoved = attacker.combatants.delete(target);
+    const targetRemoved = target.combatants.delete(attacker);
 
     // If no more combatants, end combat
     if (attacker.combatants.size === 0) {
       this.removeFromCombat(attacker);
+      if (attackerRemoved) this.notifyCombatEnd(attacker);
     }
 
     if (target.combatants.size === 0) {
       this.removeFromCombat(target);
+      if (targetRemoved) this.notifyCombatEnd(target);
+    }
+  }
+
+  /**
+   * Tell the combat end listeners a character has no combatants left
+   */
+  notifyCombatEnd(character) {
+    for (const listener of this.combatEndListeners) {
+      listener(character);
     }
   }
 
@@ -1,106 +1,179 @@
 'use strict';
 
-const databaseManager = require('../adapters/db/mongoClient');
+const path = require('path');
+const random = require('../utils/random');
+
+const CRIT_TABLE_DIR = path.join(__dirname, '../data/crit_tables');
+
+// Damage types with a shipped table in src/data/crit_tables/<type>-criticals-json.js
+const DAMAGE_TYPES = [
+  'slash', 'crush', 'puncture', 'lightning', 'impact',
+  'fire', 'noncorporeal', 'cold', 'grapple'
+];
+
+const BODY_PARTS = [
+  'HEAD', 'NECK', 'RIGHT_EYE', 'LEFT_EYE', 'CHEST', 'ABDOMEN', 'BACK',
+  'RIGHT_ARM', 'LEFT_ARM', 'RIGHT_HAND', 'LEFT_HAND', 'RIGHT_LEG', 'LEFT_LEG'
+];
+
+const MAX_RANK = 9;
+
+const DAMAGE_TYPE_INDEX = new Map(DAMAGE_TYPES.map((type, i) => [type, i]));
+const BODY_PART_INDEX = new Map(BODY_PARTS.map((part, i) => [part, i]));
+
+// Shared tables: tables[damageType][bodyPart][rank] -> frozen critical entry (or null)
+let tables = null;
+
+/**
+ * Precompute a critical entry: parse effect flags once so combat never re-scans them
+ */
+function compileEntry(damageType, bodyPart, entry) {
+  const effects = Object.freeze([...(entry.effects || [])]);
+  const stunTag = effects.find(e => typeof e === 'string' && /^S\d+$/i.test(e));
+
+  return Object.freeze({
+    damageType,
+    bodyPart,
+    rank: entry.rank,
+    damage: entry.damage || 0,
+    message: entry.message,
+    effects,
+    wounds: Object.freeze([...(entry.wounds || [])]),
+    isFatal: effects.includes('F'),
+    isStun: !!stunTag,
+    stunDuration: stunTag ? parseInt(stunTag.slice(1), 10) : 0,
+    isKnockdown: effects.includes('K'),
+    isAmputation: effects.includes('A')
+  });
+}
+
+/**
+ * Load every damage type table into dense arrays indexed [damageType][bodyPart][rank]
+ * @param {boolean} reload - Drop the require cache so edited data files are picked up
+ * @returns {Object} Load statistics
+ */
+function loadTables(reload = false) {
+  const loaded = [];
+  let entries = 0;
+
+  for (const damageType of DAMAGE_TYPES) {
+    const file = path.join(CRIT_TABLE_DIR, `${damageType}-criticals-json.js`);
+    if (reload) {
+      delete require.cache[require.resolve(file)];
+    }
+
+    const source = require(file);
+    const byPart = BODY_PARTS.map(() => new Array(MAX_RANK + 1).fill(null));
+
+    for (const [bodyPart, rows] of Object.entries(source)) {
+      const partIndex = BODY_PART_INDEX.get(bodyPart);
+      if (partIndex === undefined || !Array.isArray(rows)) continue;
+
+      for (const entry of rows) {
+        if (!Number.isInteger(entry.rank) || entry.rank < 0 || entry.rank > MAX_RANK) continue;
+        byPart[partIndex][entry.rank] = compileEntry(damageType, bodyPart, entry);
+        entries++;
+      }
+    }
+
+    loaded.push(byPart);
+  }
+
+  tables = loaded;
+  return { damageTypes: DAMAGE_TYPES.length, entries };
+}
+
+/**
+ * Determine rank from roll (0-9 based on roll value)
+ */
+function rankFromRoll(rollValue) {
+  const rank = Math.trunc((rollValue || 0) / 10);
+  return Math.max(0, Math.min(MAX_RANK, rank));
+}
 
 /**
  * Critical Hit System
- * Looks up critical hit results from MongoDB based on damage rolls
+ * Resolves critical hit results from in-memory tables built from src/data/crit_tables.
+ * Lookups are synchronous and never touch the database.
  */
 class CriticalSystem {
   constructor() {
-    this.db = null;
-    this.initialized = false;
+    if (!tables) {
+      loadTables();
+    }
+    this.initialized = true;
   }
 
   /**
-   * Initialize the critical system with database connection
+   * Kept for callers that still await initialization; tables load in the constructor
    */
   async initialize() {
-    if (this.initialized) return;
-
-    this.db = await databaseManager.initialize();
+    if (!tables) {
+      loadTables();
+    }
     this.initialized = true;
   }
 
+  /**
+   * Load the critical tables (called once at startup)
+   */
+  static loadTables() {
+    return loadTables(false);
+  }
+
+  /**
+   * Rebuild the critical tables from the data files (used by hotfix)
+   */
+  static reloadTables() {
+    return loadTables(true);
+  }
+
+  /**
+   * Get the table row for a damage type / body part, or null if not defined
+   */
+  getRow(damageType, bodyPart) {
+    const typeIndex = DAMAGE_TYPE_INDEX.get(damageType);
+    const partIndex = BODY_PART_INDEX.get(bodyPart);
+    if (typeIndex === undefined || partIndex === undefined) {
+      return null;
+    }
+    return tables[typeIndex][partIndex];
+  }
+
   /**
    * Get critical hit based on damage roll
    * @param {number} rollValue - The random roll value (typically 0-100 or 0-200)
    * @param {string} damageType - 'slash', 'crush', 'puncture'
-   * @returns {Promise<Object>} Critical hit result
+   * @returns {Object} Critical hit result
    */
-  async lookupCritical(rollValue, damageType = 'slash') {
-    if (!this.db) {
-      await this.initialize();
-    }
-
-    // Determine rank from roll (0-9 based on roll value)
-    let rank = 0;
-    if (rollValue >= 90) rank = 9;
-    else if (rollValue >= 80) rank = 8;
-    else if (rollValue >= 70) rank = 7;
-    else if (rollValue >= 60) rank = 6;
-    else if (rollValue >= 50) rank = 5;
-    else if (rollValue >= 40) rank = 4;
-    else if (rollValue >= 30) rank = 3;
-    else if (rollValue >= 20) rank = 2;
-    else if (rollValue >= 10) rank = 1;
-    else rank = 0;
-
-    try {
-      const critsCollection = this.db.collection('crits');
-      
-      // Query for critical by damage type and rank
-      const criticals = await critsCollection.find({
-        damageType: damageType,
-        rank: rank
-      }).toArray();
-
-      if (criticals.length === 0) {
-        // Return default critical
-        return {
-          rank: 1,
-          damage: 5,
-          message: 'Critical hit!',
-          effects: [],
-          wounds: [],
-          isFatal: false,
-          isStun: false,
-          isKnockdown: false,
-          isAmputation: false
-        };
+  lookupCritical(rollValue, damageType = 'slash') {
+    const rank = rankFromRoll(rollValue);
+    const typeIndex = DAMAGE_TYPE_INDEX.get(damageType);
+
+    // Pick random body part from available criticals
+    if (typeIndex !== undefined) {
+      const candidates = [];
+      for (const row of tables[typeIndex]) {
+        if (row[rank]) candidates.push(row[rank]);
+      }
+      if (candidates.length > 0) {
+        return random.pick(candidates);
       }
-
-      // Pick random body part from available criticals
-      const randomCrit = criticals[Math.floor(Math.random() * criticals.length)];
-
-      return {
-        rank: randomCrit.rank,
-        damage: randomCrit.damage,
-        message: randomCrit.message,
-        effects: randomCrit.effects || [],
-        wounds: randomCrit.wounds || [],
-        bodyPart: randomCrit.bodyPart,
-        isFatal: (randomCrit.effects || []).includes('F'),
-        isStun: (randomCrit.effects || []).some(e => e.startsWith('S')),
-        isKnockdown: (randomCrit.effects || []).includes('K'),
-        isAmputation: (randomCrit.effects || []).includes('A')
-      };
-    } catch (error) {
-      console.error('Error looking up critical:', error);
-      
-      // Return default on error
-      return {
-        rank: 1,
-        damage: Math.floor(rollValue / 5),
-        message: 'Critical hit!',
-        effects: [],
-        wounds: [],
-        isFatal: false,
-        isStun: false,
-        isKnockdown: false,
-        isAmputation: false
-      };
     }
+
+    // Return default critical
+    return {
+      rank: 1,
+      damage: 5,
+      message: 'Critical hit!',
+      effects: [],
+      wounds: [],
+      isFatal: false,
+      isStun: false,
+      stunDuration: 0,
+      isKnockdown: false,
+      isAmputation: false
+    };
   }
 
   /**
@@ -108,70 +181,29 @@ class CriticalSystem {
    * @param {string} damageType - Damage type (slash, crush, puncture, etc.)
    * @param {string} bodyPart - Body part (HEAD, CHEST, RIGHT_ARM, etc.)
    * @param {number} rank - Critical rank (0-9)
-   * @returns {Promise<Object>} Critical hit result
+   * @returns {Object} Critical hit result
    */
-  async lookupCriticalByBodyPart(damageType, bodyPart, rank) {
-    if (!this.db) {
-      await this.initialize();
+  lookupCriticalByBodyPart(damageType, bodyPart, rank) {
+    const row = this.getRow(damageType, bodyPart);
+    const critical = row ? row[rank] : null;
+    if (critical) {
+      return critical;
     }
 
-    try {
-      const critsCollection = this.db.collection('crits');
-      
-      // Query for critical by damage type, body part, and rank
-      const critical = await critsCollection.findOne({
-        damageType: damageType,
-        bodyPart: bodyPart,
-        rank: rank
-      });
-
-      if (!critical) {
-        console.log(`[CRITICAL] No critical found in DB for damageType="${damageType}", bodyPart="${bodyPart}", rank=${rank}`);
-        // Return default critical for this rank
-        return {
-          rank: rank,
-          damage: Math.floor(rank * 5),
-          message: `You strike the ${bodyPart.toLowerCase()}!`,
-          effects: [],
-          wounds: [],
-          bodyPart: bodyPart,
-          isFatal: false,
-          isStun: false,
-          isKnockdown: false,
-          isAmputation: false
-        };
-      }
-      
-      console.log(`[CRITICAL] Found critical in DB:`, JSON.stringify(critical.message));
-
-      return {
-        rank: critical.rank,
-        damage: critical.damage || 0,
-        message: critical.message,
-        effects: critical.effects || [],
-        wounds: critical.wounds || [],
-        bodyPart: critical.bodyPart,
-        isFatal: (critical.effects || []).includes('F'),
-        isStun: (critical.effects || []).some(e => e.startsWith('S')),
-        isKnockdown: (critical.effects || []).includes('K'),
-        isAmputation: (critical.effects || []).includes('A')
-      };
-    } catch (error) {
-      console.error('Error looking up critical by body part:', error);
-      
-      return {
-        rank: rank,
-        damage: Math.floor(rank * 5),
-        message: `You strike the ${bodyPart.toLowerCase()}!`,
-        effects: [],
-        wounds: [],
-        bodyPart: bodyPart,
-        isFatal: false,
-        isStun: false,
-        isKnockdown: false,
-        isAmputation: false
-      };
-    }
+    // Return default critical for this rank
+    return {
+      rank: rank,
+      damage: Math.floor(rank * 5),
+      message: `You strike the ${String(bodyPart).toLowerCase()}!`,
+      effects: [],
+      wounds: [],
+      bodyPart: bodyPart,
+      isFatal: false,
+      isStun: false,
+      stunDuration: 0,
+      isKnockdown: false,
+      isAmputation: false
+    };
   }
 
   /**
@@ -179,7 +211,7 @@ class CriticalSystem {
    */
   formatCriticalMessage(message, target) {
     if (!target) return message;
-    
+
     const targetName = target.name || 'target';
     return message.replace(/\[target\]/gi, targetName)
                   .replace(/target's/gi, `${targetName}'s`);
@@ -190,14 +222,16 @@ class CriticalSystem {
    */
   getStunDuration(effects) {
     if (!effects) return 0;
-    
+
     const stunEffect = effects.find(e => e.startsWith('S') && e.length > 1);
     if (!stunEffect) return 0;
-    
+
     const duration = parseInt(stunEffect.substring(1));
     return isNaN(duration) ? 0 : duration;
   }
 }
 
-module.exports = CriticalSystem;
+CriticalSystem.DAMAGE_TYPES = DAMAGE_TYPES;
+CriticalSystem.BODY_PARTS = BODY_PARTS;
 
+module.exports = CriticalSystem;
@@ -1,14 +1,24 @@
 'use strict';
 
-const ActionRecorder = require('./ActionRecorder');
+const ActionRollups = require('./ActionRollups');
 
 /**
  * Daily Content Processor
  * Analyzes player actions and generates new content
+ *
+ * Works from the per-minute action rollups (see ActionRollups), so it only
+ * needs a database handle and can run outside the game process
+ * (src/scripts/run-daily-processor.js, with DAILY_PROCESSOR=external set for the server).
  */
 class DailyProcessor {
-  constructor(actionRecorder) {
+  /**
+   * @param {ActionRecorder|null} actionRecorder - In-process recorder (its database is used)
+   * @param {Object} options
+   * @param {Object} options.db - Database handle when running without a recorder
+   */
+  constructor(actionRecorder, options = {}) {
     this.actionRecorder = actionRecorder;
+    this.db = options.db || null;
     this.isProcessing = false;
   }
 
@@ -25,17 +35,22 @@ class DailyProcessor {
     console.log('Starting daily content processing...');
 
     try {
-      // Get actions from last 24 hours
-      const actions = await this.actionRecorder.getActionsFromLast24Hours();
-      console.log(`Processing ${actions.length} actions from last 24 hours`);
+      // Make sure the last minutes of in-process counts are stored
+      if (this.actionRecorder) {
+        await this.actionRecorder.rollups.flush();
+      }
+
+      // Sum the rollups from the last 24 hours
+      const db = this.db || this.actionRecorder.db;
+      const endTime = Date.now();
+      const { patterns, total } = await ActionRollups.loadPatterns(db, endTime - 24 * 60 * 60 * 1000, endTime);
+      console.log(`Processing ${total} actions from last 24 hours`);
 
-      if (actions.length === 0) {
+      if (total === 0) {
         console.log('No actions to process');
         return;
       }
 
-      // Analyze patterns
-      const patterns = this.actionRecorder.analyzePatterns(actions);
       console.log('Analyzed patterns:', patterns);
 
       // Generate content based on patterns
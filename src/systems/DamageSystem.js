@@ -3,6 +3,10 @@
 const BASE_WEAPONS = require('../data/base-weapons');
 const CriticalSystem = require('./CriticalSystem');
 const WoundSystem = require('./WoundSystem');
+const DerivedStats = require('../services/derivedStats');
+const Loot = require('../data/loot-tables');
+const random = require('../utils/random');
+const log = require('../utils/logger').child('combat');
 
 /**
  * Damage System
@@ -15,12 +19,11 @@ class DamageSystem {
   }
 
   /**
-   * Initialize critical system
+   * Initialize critical system (in-memory tables, no database access)
    */
-  async initializeCriticalSystem() {
+  initializeCriticalSystem() {
     if (!this.criticalSystem) {
       this.criticalSystem = new CriticalSystem();
-      await this.criticalSystem.initialize();
     }
   }
 
@@ -80,7 +83,7 @@ class DamageSystem {
    */
   calculateUnarmedDamage(attacker, target) {
     const str = this.getStat(attacker, 'strength') || 50;
-    const baseDamage = Math.floor(Math.random() * 5) + 1; // 1-5 damage unarmed
+    const baseDamage = random.int(1, 5); // 1-5 damage unarmed
     const finalDamage = Math.max(1, baseDamage + Math.floor((str - 50) / 20));
 
     return {
@@ -99,7 +102,7 @@ class DamageSystem {
   calculateSimpleDamage(weapon, attacker, target) {
     const minDamage = weapon.metadata?.minDamage || 5;
     const maxDamage = weapon.metadata?.maxDamage || 15;
-    const baseDamage = Math.floor(Math.random() * (maxDamage - minDamage + 1)) + minDamage;
+    const baseDamage = random.int(minDamage, maxDamage);
     
     const str = this.getStat(attacker, 'strength') || 50;
     const finalDamage = baseDamage + Math.floor((str - 50) / 10);
@@ -198,6 +201,11 @@ class DamageSystem {
       return 0;
     }
 
+    // NPC health is { current, max }
+    if (typeof stat === 'object' && typeof stat.current === 'number') {
+      return stat.current;
+    }
+
     // Handle stat as object with base and delta
     if (typeof stat === 'object') {
       return (stat.base || 0) + (stat.delta || 0);
@@ -272,11 +280,16 @@ class DamageSystem {
     }
 
     const stat = character.attributes[statName];
-    if (typeof stat === 'object') {
+    if (typeof stat === 'object' && typeof stat.current === 'number') {
+      stat.current = value;
+    } else if (typeof stat === 'object') {
       stat.delta = value - (stat.base || 0);
     } else {
       character.attributes[statName] = value;
     }
+    if (statName !== 'health') {
+      DerivedStats.invalidate(character, 'stats');
+    }
   }
 
   /**
@@ -380,12 +393,12 @@ class DamageSystem {
    * @returns {string} Body part
    */
   determineBodyPart() {
-    const roll = Math.random() * 100;
+    const roll = random.random() * 100;
     
     // arms (either) 19.7%
-    if (roll < 19.7) return Math.random() < 0.5 ? 'RIGHT_ARM' : 'LEFT_ARM';
+    if (roll < 19.7) return random.random() < 0.5 ? 'RIGHT_ARM' : 'LEFT_ARM';
     // legs (either) 16.5%
-    else if (roll < 36.2) return Math.random() < 0.5 ? 'RIGHT_LEG' : 'LEFT_LEG';
+    else if (roll < 36.2) return random.random() < 0.5 ? 'RIGHT_LEG' : 'LEFT_LEG';
     // chest 14.7%
     else if (roll < 50.9) return 'CHEST';
     // abdomen 12.1%
@@ -393,11 +406,11 @@ class DamageSystem {
     // back 10.1%
     else if (roll < 73.1) return 'BACK';
     // hands (either) 9.0%
-    else if (roll < 82.1) return Math.random() < 0.5 ? 'RIGHT_HAND' : 'LEFT_HAND';
+    else if (roll < 82.1) return random.random() < 0.5 ? 'RIGHT_HAND' : 'LEFT_HAND';
     // neck 7.4%
     else if (roll < 89.5) return 'NECK';
     // eyes (either) 5.3%
-    else if (roll < 94.8) return Math.random() < 0.5 ? 'RIGHT_EYE' : 'LEFT_EYE';
+    else if (roll < 94.8) return random.random() < 0.5 ? 'RIGHT_EYE' : 'LEFT_EYE';
     // head 5.2%
     else return 'HEAD';
   }
@@ -409,10 +422,10 @@ class DamageSystem {
    * @param {Object} target - The target
    * @param {number} baseDamage - Base damage before critical
    * @param {string} damageType - Type of damage (slash, crush, puncture, etc.)
-   * @returns {Promise<Object>} Critical hit result
+   * @returns {Object} Critical hit result
    */
-  async calculateCriticalDamage(attacker, target, baseDamage, damageType = 'slash') {
-    await this.initializeCriticalSystem();
+  calculateCriticalDamage(attacker, target, baseDamage, damageType = 'slash') {
+    this.initializeCriticalSystem();
 
     // Determine which body part was hit (random roll happens first, before body type check)
     const bodyPart = this.determineBodyPart();
@@ -435,7 +448,7 @@ class DamageSystem {
 
     // Look up the critical result for this body part and rank
     // We still use the body part for damage calculation even if target doesn't have it
-    const critical = await this.criticalSystem.lookupCriticalByBodyPart(damageType, bodyPart, critRank);
+    const critical = this.criticalSystem.lookupCriticalByBodyPart(damageType, bodyPart, critRank);
     
     // Add critical damage to base damage
     const criticalDamage = critical.damage || 0;
@@ -580,13 +593,13 @@ class DamageSystem {
     // Pick random type if multiple (even distribution)
     let damageType = damageTypes[0];
     if (damageTypes.length > 1) {
-      damageType = damageTypes[Math.floor(Math.random() * damageTypes.length)];
+      damageType = random.pick(damageTypes);
     }
     
-    console.log(`[DAMAGE] Weapon: ${weapon?.name}, Available types: ${damageTypes.join('/')}, Selected: ${damageType}`);
+    log.trace('Damage type selected', { weapon: weapon?.name, available: damageTypes.join('/'), selected: damageType });
     
     // Calculate critical hit
-    const criticalResult = await this.calculateCriticalDamage(attacker, target, damage, damageType);
+    const criticalResult = this.calculateCriticalDamage(attacker, target, damage, damageType);
 
     // Determine instant-death based on damage type/body part/crit rank thresholds
     function simplifyBodyPart(bp) {
@@ -639,7 +652,7 @@ class DamageSystem {
     // Apply damage (or instant death)
     const newHealth = willDie ? 0 : (currentHealth - mitigatedDamage);
     
-    console.log(`[HEALTH CHECK] Target: ${target.name}, Current health: ${currentHealth}, Damage: ${mitigatedDamage}, New health: ${newHealth}, Will die: ${newHealth <= 0}`);
+    log.debug('Health check', { target: target.name, health: currentHealth, damage: mitigatedDamage, newHealth, willDie: newHealth <= 0 });
     
     // Update target health
     this.setStat(target, 'health', newHealth);
@@ -674,148 +687,20 @@ class DamageSystem {
       }
     }
 
-    // Get gameEngine from attacker if target doesn't have it (for logging)
-    const debugGameEngine = target.gameEngine || attacker.gameEngine;
-    const debugRoomSystem = target.gameEngine?.roomSystem || attacker.gameEngine?.roomSystem;
-    console.log(`[DEATH CHECK] newHealth <= 0: ${newHealth <= 0}, target: ${!!target}, room: ${target?.room}, gameEngine: ${!!debugGameEngine}, roomSystem: ${!!debugRoomSystem}`);
-    
     // If target died, create a corpse item in the room for SEARCH/SKIN
     // Get gameEngine from attacker if target doesn't have it
     const gameEngine = target.gameEngine || attacker.gameEngine;
-    const roomSystem = target.gameEngine?.roomSystem || attacker.gameEngine?.roomSystem;
     
-    if (newHealth <= 0 && target && target.room && gameEngine && roomSystem) {
-      console.log(`[CORPSE] Target died: ${target.name}, room: ${target.room}`);
+    if (newHealth <= 0 && target && target.room && gameEngine && gameEngine.roomSystem) {
       try {
-        const db = roomSystem.db;
-        if (db) {
-          console.log(`[CORPSE] DB available, creating corpse`);
-          const roomDoc = await db.collection('rooms').findOne({ id: target.room });
-          const corpseId = `corpse-${Date.now()}-${Math.random().toString(36).slice(2, 8)}`;
-          const npcName = target.name || 'creature';
-          const npcDefinitionId = target.definitionId; // For looking up skin info
-          // Load NPC definition to decide silver drop behavior
-          let npcDefinitionDoc = null;
-          try {
-            npcDefinitionDoc = npcDefinitionId ? await db.collection('npcs').findOne({ id: npcDefinitionId }) : null;
-          } catch (_) {}
-          const dropsSilver = npcDefinitionDoc?.metadata?.dropsSilver !== false; // default true unless explicitly false
-          let silverAmount = 0;
-          let gemLootItem = null;
-          if (dropsSilver) {
-            const definedSilver = npcDefinitionDoc?.metadata?.wealth?.silver;
-            if (typeof definedSilver === 'number' && isFinite(definedSilver) && definedSilver >= 0) {
-              silverAmount = Math.floor(definedSilver);
-            } else {
-              // Generic level-based silver using loot tables with tier modifier
-              const Loot = require('../data/loot-tables');
-              const levelForLoot = Number(target.level || target.attributes?.level || 1) || 1;
-              const baseSilver = Loot.getBaseSilverForLevel(levelForLoot);
-              const silverTier = npcDefinitionDoc?.metadata?.silverTier || 'normal';
-              silverAmount = Loot.applySilverTier(baseSilver, silverTier);
-            }
-          }
-          // Gem loot by tier
-          try {
-            const gemTier = npcDefinitionDoc?.metadata?.gemTier || 'none';
-            const Loot = require('../data/loot-tables');
-            gemLootItem = Loot.maybeGenerateGemLoot(gemTier);
-          } catch (_) {}
-          const corpseItem = {
-            id: corpseId,
-            type: 'CORPSE',
-            name: `${npcName} which appears dead`,
-            keywords: ['corpse', npcName.toLowerCase()],
-            description: `The ${npcName} lies here motionless.`,
-            location: roomDoc?._id ? String(roomDoc._id) : target.room,
-            metadata: {
-              corpse: true,
-              npcName,
-              npcDefinitionId: npcDefinitionId, // Store NPC definition ID for skinning
-              searched: false,
-              skinned: false,
-              loot: {
-                silver: silverAmount,
-                items: gemLootItem ? [gemLootItem] : []
-              }
-            },
-            createdAt: new Date()
-          };
-          await db.collection('items').insertOne(corpseItem);
-          console.log(`[CORPSE] Created corpse: ${corpseItem.name}, ID: ${corpseId}`);
-          
-          // Get NPC ID to remove
-          // target should be the actual spawned NPC object with id field
-          const npcSystem = gameEngine?.npcSystem;
-          const npcIdToRemove = target.id; // This is the spawned NPC ID
-          
-          // attach to room items and update cache
-          const newItems = Array.isArray(roomDoc?.items) ? [...roomDoc.items, corpseId] : [corpseId];
-          await db.collection('rooms').updateOne({ id: target.room }, { $set: { items: newItems } });
-          console.log(`[CORPSE] Added corpse to room items array`);
-          
-          // Update room cache
-          const cachedRoom = roomSystem.getRoom(target.room);
-          if (cachedRoom) {
-            roomSystem.rooms.set(target.room, { 
-              ...cachedRoom, 
-              items: newItems
-            });
-            console.log(`[CORPSE] Updated room cache with corpse`);
-          }
-          
-          // Remove NPC from system (don't touch room npcs array - that's templates)
-          console.log(`[CORPSE] target.id: ${target.id}, npcIdToRemove: ${npcIdToRemove}, has system: ${!!npcSystem}`);
-          if (npcSystem && npcIdToRemove) {
-            console.log(`[CORPSE] Removing NPC ${npcIdToRemove} from NPC system`);
-            // Remove NPC from the in-memory NPC system
-            npcSystem.removeNPC(npcIdToRemove);
-            console.log(`[CORPSE] NPC ${npcIdToRemove} removed from system`);
-          } else {
-            console.log(`[CORPSE] Cannot remove NPC - missing system or ID`);
-          }
-
-          // Award field experience to attacker (player-only)
-          try {
-            const playerSystem = gameEngine?.playerSystem;
-            const isPlayer = !!attacker?.name && attacker?.role !== 'npc';
-            if (isPlayer) {
-              // Award based on level difference chart
-              const npcLevel = Number(target.level || target.attributes?.level || 1) || 1;
-              const playerLevel = Number(attacker.level || attacker.attributes?.level || 1) || 1;
-              const diff = npcLevel - playerLevel;
-              let expGain = 0;
-              if (diff <= -10) {
-                expGain = 0;
-              } else if (diff < 0) {
-                expGain = 100 - 10 * Math.abs(diff);
-              } else if (diff === 0) {
-                expGain = 100;
-              } else if (diff <= 4) {
-                expGain = 100 + 10 * diff;
-              } else {
-                expGain = 150;
-              }
-              if (!attacker.attributes) attacker.attributes = {};
-              if (!attacker.attributes.experience) attacker.attributes.experience = {};
-              const prevField = Number(attacker.attributes.experience.field || 0) || 0;
-              attacker.attributes.experience.field = prevField + expGain;
-
-              // Persist to DB
-              if (playerSystem && typeof playerSystem.updatePlayer === 'function') {
-                await playerSystem.updatePlayer(attacker);
-              }
-            }
-          } catch (e) {
-            console.warn('[EXP] Failed to award experience on kill:', e?.message);
-          }
-        }
-      } catch (_) {
+        this.handleDeath(attacker, target, gameEngine);
+      } catch (e) {
         // non-fatal if corpse creation fails
+        console.warn('[DEATH] Failed to process death:', e?.message);
       }
     }
 
-    return {
+    const result = {
       damage: mitigatedDamage,
       originalDamage: finalDamage,
       baseDamage: damage,
@@ -824,6 +709,134 @@ class DamageSystem {
       targetHealth: newHealth,
       targetDead: newHealth <= 0
     };
+    return result;
+  }
+
+  /**
+   * Handle an NPC death entirely in memory: create the corpse, remove the NPC
+   * and award experience. Database writes go through the engine's persistence
+   * queue so a kill costs no more than an ordinary hit.
+   */
+  handleDeath(attacker, target, gameEngine) {
+    const roomSystem = gameEngine.roomSystem;
+    const npcSystem = gameEngine.npcSystem;
+
+    const corpseItem = this.createCorpse(target, roomSystem.getRoom(target.room), npcSystem);
+
+    // Attach to room items in memory; the room render picks it up immediately
+    const room = roomSystem.getRoom(target.room);
+    if (room) {
+      if (!Array.isArray(room.items)) room.items = [];
+      room.items.push(corpseItem.id);
+    }
+    roomSystem.setItemDisplayName(corpseItem);
+
+    // Start the decay clock before the document is queued so it carries expiresAt
+    if (gameEngine.itemLifecycle) {
+      gameEngine.itemLifecycle.schedule(corpseItem, target.room, { persist: false });
+    }
+    if (gameEngine.persistenceQueue) {
+      gameEngine.persistenceQueue.insertItem(corpseItem);
+      gameEngine.persistenceQueue.pushRoomItem(target.room, corpseItem.id);
+    }
+
+    // Remove NPC from system (don't touch room npcs array - that's templates)
+    // target should be the actual spawned NPC object with id field
+    if (npcSystem && target.id) {
+      npcSystem.removeNPC(target.id);
+    }
+
+    // Award field experience to attacker (player-only)
+    try {
+      const isPlayer = !!attacker?.name && attacker?.role !== 'npc';
+      if (isPlayer) {
+        // Award based on level difference chart
+        const npcLevel = Number(target.level || target.attributes?.level || 1) || 1;
+        const playerLevel = Number(attacker.level || attacker.attributes?.level || 1) || 1;
+        const diff = npcLevel - playerLevel;
+        let expGain = 0;
+        if (diff <= -10) {
+          expGain = 0;
+        } else if (diff < 0) {
+          expGain = 100 - 10 * Math.abs(diff);
+        } else if (diff === 0) {
+          expGain = 100;
+        } else if (diff <= 4) {
+          expGain = 100 + 10 * diff;
+        } else {
+          expGain = 150;
+        }
+        if (!attacker.attributes) attacker.attributes = {};
+        if (!attacker.attributes.experience) attacker.attributes.experience = {};
+        const prevField = Number(attacker.attributes.experience.field || 0) || 0;
+        attacker.attributes.experience.field = prevField + expGain;
+
+        // Persist in the background
+        const playerSystem = gameEngine.playerSystem;
+        if (playerSystem && typeof playerSystem.updatePlayer === 'function') {
+          playerSystem.updatePlayer(attacker).catch(e => {
+            console.warn('[EXP] Failed to save experience on kill:', e?.message);
+          });
+        }
+      }
+    } catch (e) {
+      console.warn('[EXP] Failed to award experience on kill:', e?.message);
+    }
+
+    return corpseItem;
+  }
+
+  /**
+   * Build the corpse item (with rolled loot) for a dead NPC
+   * Uses the in-memory NPC definition; no database access
+   */
+  createCorpse(target, room, npcSystem = null) {
+    const corpseId = `corpse-${Date.now()}-${Math.random().toString(36).slice(2, 8)}`;
+    const npcName = target.name || 'creature';
+    const npcDefinitionId = target.definitionId; // For looking up skin info
+    // NPC definition decides silver drop behavior
+    const npcDefinitionDoc = npcDefinitionId && npcSystem ? npcSystem.getDefinition(npcDefinitionId) : null;
+    const dropsSilver = npcDefinitionDoc?.metadata?.dropsSilver !== false; // default true unless explicitly false
+    let silverAmount = 0;
+    if (dropsSilver) {
+      const definedSilver = npcDefinitionDoc?.metadata?.wealth?.silver;
+      if (typeof definedSilver === 'number' && isFinite(definedSilver) && definedSilver >= 0) {
+        silverAmount = Math.floor(definedSilver);
+      } else {
+        // Generic level-based silver using loot tables with tier modifier
+        const levelForLoot = Number(target.level || target.attributes?.level || 1) || 1;
+        const baseSilver = Loot.getBaseSilverForLevel(levelForLoot);
+        const silverTier = npcDefinitionDoc?.metadata?.silverTier || 'normal';
+        silverAmount = Loot.applySilverTier(baseSilver, silverTier);
+      }
+    }
+    // Gem loot by tier
+    let gemLootItem = null;
+    try {
+      const gemTier = npcDefinitionDoc?.metadata?.gemTier || 'none';
+      gemLootItem = Loot.maybeGenerateGemLoot(gemTier);
+    } catch (_) {}
+
+    return {
+      id: corpseId,
+      type: 'CORPSE',
+      name: `${npcName} which appears dead`,
+      keywords: ['corpse', npcName.toLowerCase()],
+      description: `The ${npcName} lies here motionless.`,
+      location: room?.id || target.room,
+      metadata: {
+        corpse: true,
+        npcName,
+        npcDefinitionId: npcDefinitionId, // Store NPC definition ID for skinning
+        searched: false,
+        skinned: false,
+        loot: {
+          silver: silverAmount,
+          items: gemLootItem ? [gemLootItem] : []
+        }
+      },
+      createdAt: new Date()
+    };
   }
 }
 
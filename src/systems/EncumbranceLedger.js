@@ -0,0 +1,178 @@
+'use strict';
+
+/**
+ * Encumbrance Ledger
+ * Per-character cache of item weights and worn-container content totals.
+ *
+ * Item documents are read once (a single $in query for anything not seen
+ * before) and kept here; carried weight is then summed from memory over the
+ * character's hands, worn slots and inventory. Putting an item into or taking
+ * it out of a container adjusts that container's content total directly.
+ * The periodic consistency check (utils/encumbrance.verifyEncumbrance)
+ * rebuilds the ledger from the database and compares the totals.
+ *
+ * Counting rules: held and inventory items count their own weight; worn
+ * items count their own weight plus, for containers, their contents; the
+ * main armor piece is carried by capacity rules instead.
+ */
+class EncumbranceLedger {
+  constructor() {
+    this.items = new Map(); // itemId -> { weight, armor, container, contentIds, contents: Map<itemId, weight>|null, contentsWeight }
+  }
+
+  /**
+   * Remember an item document (commands call this with docs they already fetched)
+   */
+  learn(item) {
+    if (!item || !item.id) return null;
+    const weight = item.metadata?.weight || item.metadata?.baseWeight;
+    const isContainer = item.type === 'CONTAINER' && !!item.metadata?.container && Array.isArray(item.metadata.items);
+    const contentIds = isContainer ? item.metadata.items.filter(id => typeof id === 'string') : null;
+
+    // Keep weighed contents only if the document lists exactly the same items
+    const previous = this.items.get(item.id);
+    const keepContents = isContainer && previous && previous.contents &&
+      previous.contents.size === contentIds.length && contentIds.every(id => previous.contents.has(id));
+
+    const entry = {
+      weight: typeof weight === 'number' ? weight : null,
+      armor: !!item.metadata?.armorGroup,
+      container: isContainer,
+      contentIds,
+      contents: keepContents ? previous.contents : null,
+      contentsWeight: keepContents ? previous.contentsWeight : 0
+    };
+    this.items.set(item.id, entry);
+    return entry;
+  }
+
+  /**
+   * Item IDs the character carries, by how they count
+   */
+  static slots(player) {
+    const held = [];
+    const worn = [];
+    const equipment = player.equipment || {};
+    for (const key of Object.keys(equipment)) {
+      const itemId = equipment[key];
+      if (!itemId || typeof itemId !== 'string') continue;
+      if (key === 'rightHand' || key === 'leftHand') held.push(itemId);
+      else worn.push(itemId);
+    }
+    const inventory = Array.isArray(player.inventory) ? player.inventory.filter(id => typeof id === 'string') : [];
+    return { held, worn, inventory };
+  }
+
+  /**
+   * Load whatever the character carries that the ledger has not seen yet
+   * At most two queries (items, then worn-container contents); none when nothing is new
+   */
+  async sync(db, player) {
+    const { held, worn, inventory } = EncumbranceLedger.slots(player);
+
+    const missing = [...held, ...worn, ...inventory].filter(id => !this.items.has(id));
+    if (missing.length > 0 && db) {
+      const docs = await db.collection('items').find({ id: { $in: missing } }).toArray();
+      for (const doc of docs) this.learn(doc);
+    }
+
+    // Worn containers whose contents have not been weighed yet
+    const unweighed = worn.map(id => this.items.get(id)).filter(entry => entry && entry.container && !entry.contents);
+    if (unweighed.length === 0) return;
+
+    const contentIds = unweighed.flatMap(entry => entry.contentIds);
+    const weights = new Map();
+    if (contentIds.length > 0 && db) {
+      const docs = await db.collection('items').find({ id: { $in: contentIds } }).toArray();
+      for (const doc of docs) {
+        const entry = this.learn(doc);
+        weights.set(doc.id, entry.weight || 0);
+      }
+    }
+    for (const entry of unweighed) {
+      entry.contents = new Map();
+      entry.contentsWeight = 0;
+      for (const id of entry.contentIds) {
+        const weight = weights.get(id) || 0;
+        entry.contents.set(id, weight);
+        entry.contentsWeight += weight;
+      }
+    }
+  }
+
+  /**
+   * Carried item weight, summed from memory (call sync first)
+   */
+  carried(player) {
+    const { held, worn, inventory } = EncumbranceLedger.slots(player);
+    let total = 0;
+    for (const id of held) {
+      total += this.items.get(id)?.weight || 0;
+    }
+    for (const id of worn) {
+      const entry = this.items.get(id);
+      if (!entry || entry.weight === null || entry.armor) continue;
+      total += entry.weight;
+      if (entry.container) total += entry.contentsWeight;
+    }
+    for (const id of inventory) {
+      total += this.items.get(id)?.weight || 0;
+    }
+    return total;
+  }
+
+  /**
+   * An item was put into a container
+   */
+  containerAdded(containerId, item) {
+    const container = this.items.get(containerId);
+    const entry = this.learn(item);
+    if (!container || !container.container || !entry) return;
+    if (!container.contentIds.includes(item.id)) container.contentIds.push(item.id);
+    if (container.contents && !container.contents.has(item.id)) {
+      container.contents.set(item.id, entry.weight || 0);
+      container.contentsWeight += entry.weight || 0;
+    }
+  }
+
+  /**
+   * An item was taken out of a container
+   */
+  containerRemoved(containerId, itemId) {
+    const container = this.items.get(containerId);
+    if (!container || !container.container) return;
+    container.contentIds = container.contentIds.filter(id => id !== itemId);
+    if (container.contents && container.contents.has(itemId)) {
+      container.contentsWeight -= container.contents.get(itemId);
+      container.contents.delete(itemId);
+    }
+  }
+
+  /**
+   * Forget an item (e.g. destroyed)
+   */
+  forget(itemId) {
+    this.items.delete(itemId);
+  }
+
+  /**
+   * Drop entries for items the character no longer carries
+   */
+  prune(player) {
+    const { held, worn, inventory } = EncumbranceLedger.slots(player);
+    const keep = new Set([...held, ...worn, ...inventory]);
+    for (const id of keep) {
+      const entry = this.items.get(id);
+      if (entry && entry.contentIds) entry.contentIds.forEach(contentId => keep.add(contentId));
+    }
+    for (const id of this.items.keys()) {
+      if (!keep.has(id)) this.items.delete(id);
+    }
+  }
+
+  get size() {
+    return this.items.size;
+  }
+}
+
+module.exports = EncumbranceLedger;
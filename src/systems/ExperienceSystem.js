@@ -2,27 +2,42 @@
 
 const LEVELS = require('../data/experience-levels');
 
+// Sorted once at load; THRESHOLDS[i] is the total experience needed for SORTED_LEVELS[i]
+const SORTED_LEVELS = LEVELS.slice().sort((a, b) => a[0] - b[0]);
+const THRESHOLDS = SORTED_LEVELS.map(([, req]) => req);
+
+/**
+ * Index of the highest level entry reached with totalExp (-1 if none)
+ */
+function levelIndexFor(totalExp) {
+  let lo = 0;
+  let hi = THRESHOLDS.length - 1;
+  let found = -1;
+  while (lo <= hi) {
+    const mid = (lo + hi) >> 1;
+    if (THRESHOLDS[mid] <= totalExp) {
+      found = mid;
+      lo = mid + 1;
+    } else {
+      hi = mid - 1;
+    }
+  }
+  return found;
+}
+
 class ExperienceSystem {
   constructor() {
-    this.levels = LEVELS.slice().sort((a, b) => a[0] - b[0]);
+    this.levels = SORTED_LEVELS;
     this.pulseSeconds = 120; // absorption pulse cadence used by GameEngine
   }
 
   // Returns { level, nextLevel, nextLevelTotal }
   getLevelForTotalExp(totalExp) {
     if (!Number.isFinite(totalExp) || totalExp < 0) totalExp = 0;
-    let level = 0;
-    for (const [lvl, req] of this.levels) {
-      if (totalExp >= req) level = lvl; else break;
-    }
-    let idx = this.levels.findIndex(([lvl]) => lvl === level);
-    let next = null;
-    if (level === 0) {
-      // Below first threshold: next is the first level entry
-      next = this.levels[0] || null;
-    } else if (idx >= 0 && idx + 1 < this.levels.length) {
-      next = this.levels[idx + 1];
-    }
+    const idx = levelIndexFor(totalExp);
+    const level = idx >= 0 ? SORTED_LEVELS[idx][0] : 0;
+    // Below first threshold: next is the first level entry
+    const next = SORTED_LEVELS[idx + 1] || null;
     return { level, nextLevel: next ? next[0] : null, nextLevelTotal: next ? next[1] : null };
   }
 
@@ -75,9 +90,7 @@ class ExperienceSystem {
     else if (category === 'in-town') base = 22;
 
     // Logic bonus component
-    const { calculateStatBonus, getRawStat } = require('../services/statBonus');
-    const rawLOG = getRawStat(player, 'logic');
-    const logicBonus = calculateStatBonus(rawLOG, player.race, 'logic');
+    const logicBonus = require('../services/derivedStats').getBaseStats(player).statBonuses.logic;
     let logicAdd = 0;
     if (category === 'other') logicAdd = Math.trunc(logicBonus / 7);
     else logicAdd = Math.trunc(logicBonus / 5);
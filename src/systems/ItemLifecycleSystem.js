@@ -0,0 +1,329 @@
+'use strict';
+
+const { ITEM_DECAY } = require('../constants/itemDecay');
+
+/**
+ * Item Lifecycle System
+ * Decays corpses and dropped items so the items collection and room item
+ * arrays stop growing without bound.
+ *
+ * Each decaying item carries an `expiresAt` date. A Mongo TTL index on that
+ * field is the backstop; the in-memory schedule (a min-heap by expiry) removes
+ * expired IDs from rooms and caches in batches through the persistence queue.
+ * An area shard schedules and cleans up only the rooms it owns; items outside
+ * any room are handled by shard 0.
+ */
+class ItemLifecycleSystem {
+  constructor() {
+    this.db = null;
+    this.roomSystem = null;
+    this.persistenceQueue = null;
+    this.ownsRoom = null; // Area shard: only rooms it owns are scheduled here
+
+    this.expiries = new Map(); // itemId -> { roomId, expiresAt }
+    this.heap = []; // [expiresAt, itemId] min-heap; stale entries are skipped on pop
+
+    this.orphans = { strayCorpses: [], pickedUp: [], missing: [] }; // Found at start (see findOrphans)
+
+    this.timer = null;
+    this.stats = {
+      decayed: 0,
+      orphaned: 0,
+      sweeps: 0
+    };
+  }
+
+  /**
+   * Initialize after rooms are loaded: rebuild the schedule from the database
+   * and report references left behind while the server was down
+   * @param {Object} options - { ownsRoom: roomId => boolean, for an area shard }
+   */
+  async initialize(db, roomSystem, persistenceQueue, options = {}) {
+    this.db = db;
+    this.roomSystem = roomSystem;
+    this.persistenceQueue = persistenceQueue;
+    this.ownsRoom = options.ownsRoom || null;
+
+    try {
+      await this.restoreSchedule();
+    } catch (error) {
+      console.error('Error restoring item decay schedule:', error);
+    }
+
+    if (!this.timer) {
+      this.timer = setInterval(() => this.sweep(), ITEM_DECAY.sweepIntervalMs);
+      if (this.timer.unref) this.timer.unref();
+    }
+
+    const metrics = this.getMetrics();
+    console.log(`Item lifecycle initialized: ${metrics.live} decaying, ${metrics.orphansFound} orphaned references found`);
+    if (metrics.orphansFound > 0) {
+      console.log('  (ITEMS ORPHANS lists them, ITEMS ORPHANS CLEAN removes them)');
+    }
+  }
+
+  /**
+   * Rebuild the in-memory schedule from items that carry an expiry
+   * Orphans are only counted here: a reference can be missing just for now
+   * (an insert still queued), so removing them is an explicit admin action
+   */
+  async restoreSchedule() {
+    // Corpses created before decay existed get an expiry based on their age
+    // (items outside any room belong to the engine owning roomless data: shard 0)
+    if (this.owns(null)) {
+      await this.db.collection('items').updateMany(
+        { type: 'CORPSE', expiresAt: { $exists: false } },
+        [{ $set: { expiresAt: { $add: [{ $ifNull: ['$createdAt', '$$NOW'] }, ITEM_DECAY.decayMsByType.CORPSE] } } }]
+      );
+    }
+
+    const roomByItem = this.mapRoomItems();
+    const decaying = await this.findDecaying();
+    for (const item of decaying) {
+      const roomId = roomByItem.get(item.id);
+      if (roomId && this.owns(roomId)) this.track(item.id, roomId, new Date(item.expiresAt).getTime());
+    }
+
+    this.orphans = await this.findOrphans(roomByItem, decaying);
+  }
+
+  /**
+   * Map every room item reference back to its room (embedded item objects are not documents)
+   */
+  mapRoomItems() {
+    const roomByItem = new Map();
+    for (const room of this.roomSystem.getAllRooms()) {
+      if (!Array.isArray(room.items)) continue;
+      for (const ref of room.items) {
+        if (typeof ref === 'string') roomByItem.set(ref, room.id);
+      }
+    }
+    return roomByItem;
+  }
+
+  /**
+   * Items that carry an expiry
+   */
+  findDecaying() {
+    return this.db.collection('items')
+      .find({ expiresAt: { $exists: true } }, { projection: { id: 1, type: 1, expiresAt: 1 } })
+      .toArray();
+  }
+
+  /**
+   * Find what this engine is responsible for cleaning up (reads only)
+   * @returns {Promise<Object>} { strayCorpses: [itemId], pickedUp: [itemId], missing: [[roomId, itemId]] }
+   *   strayCorpses - decaying corpses no room points at (they can never be searched or seen)
+   *   pickedUp     - other items with an expiry that are no longer on the ground
+   *   missing      - room references whose item document is gone (e.g. removed by the TTL index)
+   */
+  async findOrphans(roomByItem = this.mapRoomItems(), decaying = null) {
+    const orphans = { strayCorpses: [], pickedUp: [], missing: [] };
+
+    if (this.owns(null)) {
+      for (const item of decaying || await this.findDecaying()) {
+        if (roomByItem.has(item.id)) continue;
+        if (item.type === 'CORPSE') orphans.strayCorpses.push(item.id);
+        else orphans.pickedUp.push(item.id);
+      }
+    }
+
+    const ids = Array.from(roomByItem.keys()).filter(itemId => this.owns(roomByItem.get(itemId)));
+    const existing = new Set();
+    for (let i = 0; i < ids.length; i += 1000) {
+      const found = await this.db.collection('items')
+        .find({ id: { $in: ids.slice(i, i + 1000) } }, { projection: { id: 1 } })
+        .toArray();
+      for (const doc of found) existing.add(doc.id);
+    }
+    for (const itemId of ids) {
+      if (!existing.has(itemId)) orphans.missing.push([roomByItem.get(itemId), itemId]);
+    }
+    return orphans;
+  }
+
+  /**
+   * Remove the orphans this engine owns (ITEMS ORPHANS CLEAN)
+   * Pending writes are flushed first so items still queued for insertion are not taken for orphans
+   * @returns {Promise<Object>} Counts removed: { strayCorpses, pickedUp, missing }
+   */
+  async cleanupOrphans() {
+    await this.persistenceQueue.flush();
+    const orphans = await this.findOrphans();
+
+    if (orphans.strayCorpses.length > 0) {
+      this.persistenceQueue.deleteItems(orphans.strayCorpses);
+    }
+    for (const itemId of orphans.pickedUp) {
+      // Not on the ground any more: it must not decay
+      this.persistenceQueue.updateItem(itemId, { $unset: { expiresAt: '' } });
+    }
+    for (const [roomId, itemId] of orphans.missing) {
+      this.removeFromRoom(roomId, itemId);
+    }
+    await this.persistenceQueue.flush();
+
+    const counts = {
+      strayCorpses: orphans.strayCorpses.length,
+      pickedUp: orphans.pickedUp.length,
+      missing: orphans.missing.length
+    };
+    this.stats.orphaned += counts.strayCorpses + counts.pickedUp + counts.missing;
+    this.orphans = { strayCorpses: [], pickedUp: [], missing: [] };
+    return counts;
+  }
+
+  /**
+   * Whether items in a room decay on this engine (every room unless it is an area shard)
+   */
+  owns(roomId) {
+    return !this.ownsRoom || this.ownsRoom(roomId);
+  }
+
+  /**
+   * Get decay time for an item based on its type
+   */
+  getDecayMs(item) {
+    return ITEM_DECAY.decayMsByType[item?.type] ?? ITEM_DECAY.defaultDroppedMs;
+  }
+
+  /**
+   * Start the decay clock for an item lying in a room
+   * Sets item.expiresAt; pass { persist: false } when the document has not been inserted yet
+   */
+  schedule(item, roomId, { persist = true } = {}) {
+    if (!item || !item.id) return null;
+
+    const expiresAt = new Date(Date.now() + this.getDecayMs(item));
+    item.expiresAt = expiresAt;
+    this.track(item.id, roomId, expiresAt.getTime());
+
+    if (persist && this.persistenceQueue) {
+      this.persistenceQueue.updateItem(item.id, { $set: { expiresAt } });
+    }
+    return expiresAt;
+  }
+
+  /**
+   * Stop the decay clock (item picked up); clears the stored expiry
+   */
+  cancel(itemId) {
+    if (!this.expiries.delete(itemId)) return false;
+    if (this.persistenceQueue) {
+      this.persistenceQueue.updateItem(itemId, { $unset: { expiresAt: '' } });
+    }
+    return true;
+  }
+
+  /**
+   * Drop an item from the schedule without touching the database (item destroyed)
+   */
+  forget(itemId) {
+    return this.expiries.delete(itemId);
+  }
+
+  /**
+   * Record an expiry in memory
+   */
+  track(itemId, roomId, expiresAt) {
+    this.expiries.set(itemId, { roomId, expiresAt });
+    this.heapPush([expiresAt, itemId]);
+  }
+
+  /**
+   * Remove every item whose time is up (bounded per sweep)
+   */
+  sweep(now = Date.now()) {
+    this.stats.sweeps++;
+    const expired = [];
+
+    while (this.heap.length > 0 && this.heap[0][0] <= now && expired.length < ITEM_DECAY.maxPerSweep) {
+      const [expiresAt, itemId] = this.heapPop();
+      const entry = this.expiries.get(itemId);
+      // Skip entries that were cancelled or rescheduled since they were pushed
+      if (!entry || entry.expiresAt !== expiresAt) continue;
+
+      this.expiries.delete(itemId);
+      this.removeFromRoom(entry.roomId, itemId);
+      expired.push(itemId);
+    }
+
+    if (expired.length > 0) {
+      this.persistenceQueue?.deleteItems(expired);
+      this.stats.decayed += expired.length;
+    }
+    return expired.length;
+  }
+
+  /**
+   * Take an item ID out of a room in memory, in the render cache and in the database
+   */
+  removeFromRoom(roomId, itemId) {
+    const room = this.roomSystem?.getRoom(roomId);
+    if (room && Array.isArray(room.items)) {
+      const index = room.items.findIndex(ref => (typeof ref === 'string' ? ref : ref?.id) === itemId);
+      if (index > -1) room.items.splice(index, 1);
+    }
+    this.roomSystem?.invalidateItemDisplayName(itemId);
+    this.persistenceQueue?.pullRoomItem(roomId, itemId);
+  }
+
+  /**
+   * Get lifecycle metrics
+   */
+  getMetrics() {
+    return {
+      live: this.expiries.size,
+      decayed: this.stats.decayed,
+      orphaned: this.stats.orphaned,
+      orphansFound: this.orphans.strayCorpses.length + this.orphans.pickedUp.length + this.orphans.missing.length,
+      sweeps: this.stats.sweeps,
+      nextExpiry: this.heap.length > 0 ? new Date(this.heap[0][0]) : null
+    };
+  }
+
+  /**
+   * Stop the sweep timer
+   */
+  stop() {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+  }
+
+  heapPush(entry) {
+    const heap = this.heap;
+    heap.push(entry);
+    let i = heap.length - 1;
+    while (i > 0) {
+      const parent = (i - 1) >> 1;
+      if (heap[parent][0] <= heap[i][0]) break;
+      [heap[parent], heap[i]] = [heap[i], heap[parent]];
+      i = parent;
+    }
+  }
+
+  heapPop() {
+    const heap = this.heap;
+    const top = heap[0];
+    const last = heap.pop();
+    if (heap.length > 0) {
+      heap[0] = last;
+      let i = 0;
+      for (;;) {
+        const left = 2 * i + 1;
+        const right = left + 1;
+        let smallest = i;
+        if (left < heap.length && heap[left][0] < heap[smallest][0]) smallest = left;
+        if (right < heap.length && heap[right][0] < heap[smallest][0]) smallest = right;
+        if (smallest === i) break;
+        [heap[smallest], heap[i]] = [heap[i], heap[smallest]];
+        i = smallest;
+      }
+    }
+    return top;
+  }
+}
+
+module.exports = ItemLifecycleSystem;
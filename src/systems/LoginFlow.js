@@ -1,6 +1,14 @@
 'use strict';
 
 const CharacterCreationManager = require('./CharacterCreationManager');
+const { RateLimiter } = require('../utils/rateLimiter');
+
+// Failed password and account creation attempts allowed per IP address
+// (LOGIN_IP_LIMIT raises it, e.g. for a load test creating many accounts from one host)
+const IP_ATTEMPT_LIMIT = { limit: parseInt(process.env.LOGIN_IP_LIMIT, 10) || 20, windowMs: 60 * 1000 };
+// Failed password attempts allowed per account username from one IP address
+// (keyed on both, so guessing from elsewhere cannot lock the owner out)
+const USERNAME_FAILURE_LIMIT = { limit: 5, windowMs: 5 * 60 * 1000 };
 
 /**
  * Login Flow Manager
@@ -13,6 +21,8 @@ class LoginFlow {
     this.playerSystem = playerSystem;
     this.gameEngine = gameEngine;
     this.loginStates = new Map(); // connection -> login state
+    this.ipLimiter = new RateLimiter(IP_ATTEMPT_LIMIT);
+    this.usernameLimiter = new RateLimiter(USERNAME_FAILURE_LIMIT);
     this.characterCreationManager = new CharacterCreationManager(
       gameEngine.characterCreation, 
       playerSystem, 
@@ -135,6 +145,12 @@ class LoginFlow {
       this.sendMessage(connection, 'Password must be at least 3 characters long. Try again:\r\n');
       return { success: false, message: 'Password too short' };
     }
+
+    const limited = this.checkRateLimit(connection, null);
+    if (limited) {
+      return limited;
+    }
+    this.ipLimiter.hit(this.clientIp(connection));
     
     try {
       // Create the new account
@@ -162,10 +178,24 @@ class LoginFlow {
    */
   async handlePassword(connection, password) {
     const state = this.loginStates.get(connection);
+
+    const limited = this.checkRateLimit(connection, state.username);
+    if (limited) {
+      return limited;
+    }
     
-    const authResult = await this.accountManager.authenticate(state.username, password);
+    let authResult;
+    try {
+      authResult = await this.accountManager.authenticate(state.username, password);
+    } catch (error) {
+      // Hashing pool full or failed; the password was not checked
+      this.sendMessage(connection, `${error.message}. Enter your password:\r\n`);
+      return { success: false, message: error.message };
+    }
     
     if (!authResult.success) {
+      this.ipLimiter.hit(this.clientIp(connection));
+      this.usernameLimiter.hit(this.attemptKey(connection, state.username));
       state.attempts++;
       if (state.attempts >= 3) {
         this.sendMessage(connection, 'Too many failed attempts. Disconnecting.\r\n');
@@ -178,6 +208,7 @@ class LoginFlow {
     }
 
     // Password correct, show character selection
+    this.usernameLimiter.reset(this.attemptKey(connection, state.username));
     state.account = authResult.account;
     state.step = 'character_selection';
     state.attempts = 0;
@@ -229,6 +260,44 @@ class LoginFlow {
   }
 
 
+  /**
+   * IP address a connection comes from
+   */
+  clientIp(connection) {
+    return connection.remoteAddress || 'unknown';
+  }
+
+  /**
+   * Failed password counter key: the username as tried from this connection's IP
+   */
+  attemptKey(connection, username) {
+    return `${this.clientIp(connection)}:${username}`;
+  }
+
+  /**
+   * Refuse a password or account creation attempt if this connection's IP, or
+   * this IP for the username, has failed too often (callers count the attempts)
+   * @returns {Object|null} Disconnect result if limited, null if the attempt may go ahead
+   */
+  checkRateLimit(connection, username) {
+    const ip = this.clientIp(connection);
+    const key = username ? this.attemptKey(connection, username) : null;
+    let retryAfterMs = 0;
+    if (this.ipLimiter.isLimited(ip)) {
+      retryAfterMs = this.ipLimiter.retryAfterMs(ip);
+    } else if (key && this.usernameLimiter.isLimited(key)) {
+      retryAfterMs = this.usernameLimiter.retryAfterMs(key);
+    }
+
+    if (retryAfterMs > 0) {
+      const seconds = Math.ceil(retryAfterMs / 1000);
+      this.sendMessage(connection, `Too many login attempts. Try again in ${seconds} seconds.\r\n`);
+      this.clearLoginState(connection);
+      return { success: false, message: 'Rate limited', disconnect: true };
+    }
+    return null;
+  }
+
   /**
    * Show character selection menu
    */
@@ -1,21 +1,142 @@
 'use strict';
 
+const DamageSystem = require('./DamageSystem');
+const random = require('../utils/random');
+
+// Default time between a player showing up and an aggressive NPC attacking
+// (override per NPC with combat.reactionDelayMs), plus random jitter so a room
+// full of creatures does not strike in the same instant
+const DEFAULT_REACTION_DELAY_MS = 1000;
+const REACTION_JITTER_MS = 1000;
+
 /**
  * NPC Combat Behavior System
  * Handles NPC combat actions, aggressive behavior, and AI
+ *
+ * Aggression is event driven: each aggressive NPC subscribes to the room it is
+ * in on the room event bus and reacts when a player enters, after its reaction
+ * delay, or when its fight ends while players are still around. NPCs with
+ * nobody around cost nothing per tick.
  */
 class NPCCombatBehavior {
-  constructor(combatSystem, gameEngine = null) {
+  /**
+   * @param {Object} options - { damageSystem: used for every NPC attack instead of a new one }
+   */
+  constructor(combatSystem, gameEngine = null, options = {}) {
     this.combatSystem = combatSystem;
     this.gameEngine = gameEngine;
+    this.damageSystem = options.damageSystem || null;
+    this.watchers = new Map(); // npcId -> unsubscribe function for its room
+    this.pendingAttacks = new Map(); // npcId -> reaction timer
+
+    if (gameEngine && gameEngine.roomEvents) {
+      this.attachRoomEvents(gameEngine.roomEvents);
+    }
+    if (combatSystem) {
+      combatSystem.onCombatEnd(character => this.handleCombatEnd(character));
+    }
+  }
+
+  /**
+   * A fight ended (target died, fled or was removed): look for the next player in the room
+   */
+  handleCombatEnd(character) {
+    if (!this.watchers.has(character.id) || character.isAlive === false) {
+      return;
+    }
+    const present = this.roomEvents.getPlayers(character.room);
+    if (present.length > 0) {
+      this.scheduleAggression(character, present[0]);
+    }
+  }
+
+  /**
+   * Follow aggressive NPCs as they spawn, move and die
+   */
+  attachRoomEvents(roomEvents) {
+    this.roomEvents = roomEvents;
+
+    roomEvents.on('enter', (event) => {
+      if (event.kind === 'npc' && event.entity.aggressive) {
+        this.watchRoom(event.entity, event.roomId);
+      }
+    });
+
+    roomEvents.on('leave', (event) => {
+      if (event.kind === 'npc') {
+        this.unwatchRoom(event.entity);
+      }
+    });
+  }
+
+  /**
+   * Subscribe an aggressive NPC to player arrivals in its room
+   */
+  watchRoom(npc, roomId) {
+    this.unwatchRoom(npc);
+
+    const unsubscribe = this.roomEvents.subscribe(roomId, (event) => {
+      if (event.type === 'enter' && event.kind === 'player') {
+        this.scheduleAggression(npc, event.entity);
+      }
+    });
+    this.watchers.set(npc.id, unsubscribe);
+
+    // Players may already be standing here (e.g. NPC spawned or wandered in)
+    const present = this.roomEvents.getPlayers(roomId);
+    if (present.length > 0) {
+      this.scheduleAggression(npc, present[0]);
+    }
+  }
+
+  /**
+   * Drop an NPC's room subscription and any attack it was about to make
+   */
+  unwatchRoom(npc) {
+    const unsubscribe = this.watchers.get(npc.id);
+    if (unsubscribe) {
+      unsubscribe();
+      this.watchers.delete(npc.id);
+    }
+
+    const timer = this.pendingAttacks.get(npc.id);
+    if (timer) {
+      clearTimeout(timer);
+      this.pendingAttacks.delete(npc.id);
+    }
+  }
+
+  /**
+   * Attack a player after the NPC's reaction delay (one pending attack per NPC)
+   */
+  scheduleAggression(npc, target) {
+    if (this.pendingAttacks.has(npc.id) || this.combatSystem.isInCombat(npc)) {
+      return;
+    }
+
+    const timer = setTimeout(() => {
+      this.pendingAttacks.delete(npc.id);
+      this.checkAggressiveAttack(npc, target);
+    }, this.getReactionDelay(npc));
+    if (timer.unref) timer.unref();
+
+    this.pendingAttacks.set(npc.id, timer);
+  }
+
+  /**
+   * Get how long an NPC waits before attacking a newly arrived player
+   */
+  getReactionDelay(npc) {
+    const base = npc.combat?.reactionDelayMs ?? DEFAULT_REACTION_DELAY_MS;
+    return Math.max(0, base) + random.int(0, REACTION_JITTER_MS - 1);
   }
 
   /**
    * Check if an aggressive NPC should initiate combat
-   * Called every game tick for non-combat NPCs that are aggressive
+   * Called when its reaction delay expires; prefers the player that triggered it
    */
-  checkAggressiveAttack(npc) {
-    if (!npc.aggressive) {
+  checkAggressiveAttack(npc, preferredTarget = null) {
+    if (!npc.aggressive || npc.isAlive === false) {
       return false;
     }
 
@@ -36,13 +157,20 @@ class NPCCombatBehavior {
       return false;
     }
 
+    // The NPC may have died or been cleared while waiting
+    if (this.gameEngine.npcSystem && this.gameEngine.npcSystem.getActiveNPC(npc.id) !== npc) {
+      return false;
+    }
+
     const playersInRoom = this.gameEngine.roomSystem.getPlayersInRoom(room);
     if (!playersInRoom || playersInRoom.length === 0) {
       return false;
     }
 
-    // Select first player as target
-    const target = playersInRoom[0];
+    // Attack whoever triggered the reaction if they are still here, else the first player
+    const target = preferredTarget && playersInRoom.includes(preferredTarget)
+      ? preferredTarget
+      : playersInRoom[0];
 
     // Initiate combat against player
     this.initiateCombat(npc, target);
@@ -112,13 +240,12 @@ class NPCCombatBehavior {
     const damageTypeConfig = npc.combat?.damageType || null;
     const damageType = damageTypeConfig
       ? (Array.isArray(damageTypeConfig) 
-          ? damageTypeConfig[Math.floor(Math.random() * damageTypeConfig.length)]
+          ? random.pick(damageTypeConfig)
           : damageTypeConfig)
       : null;
 
     // Calculate damage using GS4 formula
-    const DamageSystem = require('./DamageSystem');
-    const damageSystem = new DamageSystem();
+    const damageSystem = this.damageSystem || new DamageSystem();
     
     // Determine attack method: weapon > custom attack > unarmed
     let damageResult;
@@ -164,7 +291,7 @@ class NPCCombatBehavior {
     // Get target's DS (use player's actual DS if available, otherwise base)
     const targetDS = target.attributes?.defenseStrength || target.combat?.ds || 25;
     const avd = damageResult.avd;
-    const d100Roll = Math.floor(Math.random() * 100) + 1;
+    const d100Roll = random.d100();
     const endRoll = as - targetDS + avd + d100Roll;
     
     // Calculate raw damage if hit using GS4 formula: (endroll - 100) * damageFactor
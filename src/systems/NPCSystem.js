@@ -1,15 +1,49 @@
 'use strict';
 
 const databaseManager = require('../adapters/db/mongoClient');
+const { getMatchKey } = require('../utils/keywordMatcher');
+
+const DEFAULT_HEALTH = Object.freeze({ current: 100, max: 100 });
+
+/**
+ * Deep-freeze a plain data value (definition fields shared by every instance)
+ */
+function freezeDeep(value) {
+  if (value && typeof value === 'object' && !Object.isFrozen(value)) {
+    Object.freeze(value);
+    for (const key of Object.keys(value)) freezeDeep(value[key]);
+  }
+  return value;
+}
+
+/**
+ * Copy a health value so an instance can take damage without touching its definition
+ */
+function copyHealth(health) {
+  return health && typeof health === 'object' ? { ...health } : health;
+}
 
 /**
  * NPC System
  * Manages NPC spawning, behavior, and lifecycle
+ *
+ * Spawned NPCs are small objects whose prototype is a frozen template built
+ * once per definition (name, keywords, description, stats, combat, behaviors,
+ * equipment, base attributes, game engine). An instance holds only its own state:
+ * ID, room, health, alive flag and spawn time, plus combatData, combatants and
+ * wounds once it fights. Reads such as npc.combat.avd or npc.attributes.DS go
+ * through the prototype; nothing from the definition is copied per spawn.
  */
 class NPCSystem {
   constructor() {
     this.npcs = new Map(); // Active NPCs by ID
+    this.definitions = new Map(); // NPC definitions by definition ID (prefetched or as last spawned)
+    this.templates = new WeakMap(); // definition document -> frozen instance prototype
+    this.roomEvents = null; // Room event bus (set by GameEngine)
     this.db = null;
+    // Spawn IDs are <definition>_<process start>_<sequence>: unique even for many spawns in one millisecond
+    this.spawnEpoch = Date.now().toString(36);
+    this.spawnSequence = 0;
   }
 
   /**
@@ -27,18 +61,118 @@ class NPCSystem {
   }
 
   /**
-   * Get NPC definition from database
+   * Get NPC definition (from the definition cache, else the database)
    */
   async getNPC(npcId) {
+    const cached = this.definitions.get(npcId);
+    if (cached) {
+      return cached;
+    }
     try {
       const collection = this.db.collection('npcs');
-      return await collection.findOne({ id: npcId });
+      const definition = await collection.findOne({ id: npcId });
+      if (definition) {
+        this.definitions.set(npcId, definition);
+      }
+      return definition;
     } catch (error) {
       console.error(`Error getting NPC ${npcId}:`, error);
       return null;
     }
   }
 
+  /**
+   * Get an NPC definition already held in memory (no database access)
+   */
+  getDefinition(definitionId) {
+    return this.definitions.get(definitionId) || null;
+  }
+
+  /**
+   * Fetch NPC definitions into the definition cache with one $in query
+   * @param {Iterable<string>} npcIds - Definition IDs
+   * @param {Object} options
+   * @param {boolean} options.refresh - Re-read definitions that are already cached (hotfix)
+   * @returns {Promise<number>} Number of definitions fetched
+   */
+  async loadDefinitions(npcIds, options = {}) {
+    const ids = Array.from(new Set(npcIds)).filter(id => options.refresh || !this.definitions.has(id));
+    if (ids.length === 0) {
+      return 0;
+    }
+    const definitions = await this.db.collection('npcs').find({ id: { $in: ids } }).toArray();
+    if (options.refresh) {
+      // Definitions deleted from the database must not keep spawning
+      for (const id of ids) this.definitions.delete(id);
+    }
+    for (const definition of definitions) {
+      this.definitions.set(definition.id, definition);
+    }
+    return definitions.length;
+  }
+
+  /**
+   * Spawn every NPC referenced by a set of rooms
+   * Gathers the NPC references from the (in-memory) rooms, prefetches their
+   * definitions in one query and spawns them without further database access.
+   * @param {Array} rooms - Rooms with an npcs array of IDs or { id } references
+   * @param {Object} gameEngine - Passed to spawned NPCs
+   * @param {Object} options - { refresh: re-read cached definitions }
+   * @returns {Promise<Object>} { spawned, counts, missing, invalid, fetched, timings }
+   */
+  async spawnFromRooms(rooms, gameEngine = null, options = {}) {
+    const summary = {
+      spawned: 0,
+      counts: new Map(), // npcId -> spawned
+      missing: new Map(), // npcId -> rooms referencing a definition that does not exist
+      invalid: 0,
+      fetched: 0, // definitions read from the database
+      timings: {}
+    };
+
+    // Phase 1: collect spawn points from memory
+    let started = Date.now();
+    const spawns = [];
+    for (const room of rooms) {
+      if (!Array.isArray(room.npcs)) continue;
+      for (const npcRef of room.npcs) {
+        const npcId = typeof npcRef === 'string' ? npcRef : npcRef && npcRef.id;
+        if (npcId) {
+          spawns.push([npcId, room.id]);
+        } else {
+          summary.invalid++;
+        }
+      }
+    }
+    summary.timings.gatherMs = Date.now() - started;
+
+    // Phase 2: one query for every definition not cached yet
+    started = Date.now();
+    summary.fetched = await this.loadDefinitions(spawns.map(([npcId]) => npcId), options);
+    summary.timings.fetchMs = Date.now() - started;
+
+    // Phase 3: spawn
+    started = Date.now();
+    for (const [npcId, roomId] of spawns) {
+      const definition = this.definitions.get(npcId);
+      if (!definition) {
+        summary.missing.set(npcId, (summary.missing.get(npcId) || 0) + 1);
+        continue;
+      }
+      try {
+        this.spawnNPC(definition, roomId, gameEngine);
+        summary.counts.set(npcId, (summary.counts.get(npcId) || 0) + 1);
+        summary.spawned++;
+      } catch (error) {
+        summary.invalid++;
+        console.error(`Error spawning NPC ${npcId} in room ${roomId}:`, error.message);
+      }
+    }
+    summary.timings.spawnMs = Date.now() - started;
+
+    return summary;
+  }
+
   /**
    * Get all NPCs for an area
    */
@@ -53,45 +187,134 @@ class NPCSystem {
   }
 
   /**
-   * Spawn an NPC in a room
+   * Get the shared prototype for instances of a definition (built once per definition document)
    */
-  spawnNPC(npcData, roomId, gameEngine = null) {
-    const npcId = `${npcData.id}_${Date.now()}`;
-    
-    const activeNPC = {
-      id: npcId,
+  getTemplate(npcData, gameEngine = null) {
+    let template = this.templates.get(npcData);
+    if (template && template.gameEngine === gameEngine) {
+      return template;
+    }
+
+    const attributes = { ...(npcData.attributes || {}) };
+    delete attributes.health; // Per instance
+    template = Object.freeze({
       definitionId: npcData.id,
       npcId: npcData.npcId || npcData.id,
       name: npcData.name,
-      room: roomId,
       level: npcData.level || npcData.attributes?.level || 1,
-      keywords: npcData.keywords || [],
+      keywords: freezeDeep(structuredClone(npcData.keywords || [])),
       description: npcData.description,
-      attributes: { ...(npcData.attributes || {}) },
-      behaviors: { ...(npcData.behaviors || {}) },
+      baseAttributes: freezeDeep(structuredClone(attributes)),
+      behaviors: freezeDeep(structuredClone(npcData.behaviors || {})),
       // Combat-related fields
       aggressive: npcData.aggressive || npcData.behaviors?.aggressive || false,
       roundtime: npcData.roundtime || 2500, // Default 2.5 seconds
-      stats: npcData.stats || {},
-      combat: npcData.combat || {},
-      equipment: npcData.equipment || {},
-      // Health/status
-      health: npcData.attributes?.health || npcData.health || { current: 100, max: 100 },
-      isAlive: true,
-      spawnTime: Date.now(),
+      stats: freezeDeep(structuredClone(npcData.stats || {})),
+      combat: freezeDeep(structuredClone(npcData.combat || {})),
+      equipment: freezeDeep(structuredClone(npcData.equipment || {})),
+      baseHealth: freezeDeep(structuredClone(npcData.attributes?.health || npcData.health || DEFAULT_HEALTH)),
       // Reference to gameEngine for room system access
-      gameEngine: gameEngine
-    };
+      gameEngine,
+      // Same object as attributes.health (kept for callers of npc.health)
+      get health() {
+        return this.attributes.health;
+      }
+    });
 
-    // Ensure attributes.health exists
-    if (!activeNPC.attributes.health) {
-      activeNPC.attributes.health = activeNPC.health;
-    }
+    // Normalize name and keywords once per definition so LOOK/ATTACK matching is allocation free
+    getMatchKey(template);
+
+    this.templates.set(npcData, template);
+    return template;
+  }
+
+  /**
+   * Spawn an NPC in a room
+   */
+  spawnNPC(npcData, roomId, gameEngine = null) {
+    const npcId = `${npcData.id}_${this.spawnEpoch}_${++this.spawnSequence}`;
+    this.definitions.set(npcData.id, npcData);
+    const template = this.getTemplate(npcData, gameEngine);
+
+    // Own properties are the instance's mutable state. A literal with __proto__ gets an
+    // exactly sized layout (Object.create plus assignments leaves slack in every instance).
+    // Never give the template a field an instance assigns: frozen inherited fields cannot be shadowed.
+    const activeNPC = {
+      __proto__: template,
+      id: npcId,
+      room: roomId,
+      attributes: {
+        __proto__: template.baseAttributes,
+        health: copyHealth(template.baseHealth)
+      },
+      isAlive: true,
+      spawnTime: Date.now()
+    };
 
     this.npcs.set(npcId, activeNPC);
+    if (this.roomEvents) {
+      this.roomEvents.enter(activeNPC, roomId, { kind: 'npc', cause: 'spawn' });
+    }
     return activeNPC;
   }
 
+  /**
+   * Live NPC state and the definitions it uses, as plain data (world snapshot)
+   * Own properties only: health, alive flag, roundtime, wounds; combat opponents are not kept
+   */
+  exportNPCs() {
+    const npcs = [];
+    const definitionIds = new Set();
+    for (const npc of this.npcs.values()) {
+      const state = { definitionId: npc.definitionId };
+      for (const key of Object.keys(npc)) {
+        if (key === 'combatants') continue;
+        state[key] = key === 'attributes' ? { ...npc.attributes } : npc[key];
+      }
+      npcs.push(state);
+      definitionIds.add(npc.definitionId);
+    }
+    const definitions = [];
+    for (const definitionId of definitionIds) {
+      const definition = this.definitions.get(definitionId);
+      if (!definition) continue;
+      const { _id, ...data } = definition;
+      definitions.push(data);
+    }
+    return { definitions, npcs };
+  }
+
+  /**
+   * Recreate NPCs exported by a previous process (instead of spawning from rooms)
+   * @returns {Object} { restored, missing }
+   */
+  restoreNPCs(state, gameEngine = null) {
+    for (const definition of state.definitions) {
+      this.definitions.set(definition.id, definition);
+    }
+    const summary = { restored: 0, missing: 0 };
+    for (const { definitionId, attributes, ...own } of state.npcs) {
+      const definition = this.definitions.get(definitionId);
+      if (!definition) {
+        summary.missing++;
+        continue;
+      }
+      const template = this.getTemplate(definition, gameEngine);
+      // Spread defines own properties, so fields the template also has (frozen) are fine
+      const npc = {
+        __proto__: template,
+        ...own,
+        attributes: { __proto__: template.baseAttributes, ...attributes }
+      };
+      this.npcs.set(npc.id, npc);
+      if (this.roomEvents) {
+        this.roomEvents.enter(npc, npc.room, { kind: 'npc', cause: 'restore' });
+      }
+      summary.restored++;
+    }
+    return summary;
+  }
+
   /**
    * Get active NPC by ID
    */
@@ -103,6 +326,10 @@ class NPCSystem {
    * Get NPCs in a room
    */
   getNPCsInRoom(roomId) {
+    if (this.roomEvents) {
+      // Room occupancy index: no scan over every NPC in the world
+      return this.roomEvents.getNPCs(roomId).filter(npc => npc.isAlive);
+    }
     return Array.from(this.npcs.values()).filter(npc => npc.room === roomId && npc.isAlive);
   }
 
@@ -110,7 +337,11 @@ class NPCSystem {
    * Remove an NPC
    */
   removeNPC(npcId) {
+    const npc = this.npcs.get(npcId);
     this.npcs.delete(npcId);
+    if (npc && this.roomEvents) {
+      this.roomEvents.leave(npc, npc.room, { kind: 'npc', cause: 'despawn' });
+    }
   }
 
   /**
@@ -130,11 +361,31 @@ class NPCSystem {
     return Array.from(this.npcs.values());
   }
 
+  /**
+   * Iterate active NPCs without copying them into an array (tick loop)
+   */
+  values() {
+    return this.npcs.values();
+  }
+
+  /**
+   * Number of active NPCs
+   */
+  get count() {
+    return this.npcs.size;
+  }
+
   /**
    * Clear all NPCs (used for hotfix/reload)
    */
   clearAllNPCs() {
+    const npcs = Array.from(this.npcs.values());
     this.npcs.clear();
+    if (this.roomEvents) {
+      for (const npc of npcs) {
+        this.roomEvents.leave(npc, npc.room, { kind: 'npc', cause: 'despawn' });
+      }
+    }
   }
 }
 
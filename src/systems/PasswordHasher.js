@@ -0,0 +1,180 @@
+'use strict';
+
+const os = require('os');
+const path = require('path');
+const { Worker } = require('worker_threads');
+const bcrypt = require('bcryptjs');
+
+const WORKER_SCRIPT = path.join(__dirname, '../workers/passwordWorker.js');
+
+/**
+ * Password Hasher
+ * Bounded pool of worker threads running bcrypt, so logins and account creation
+ * never block the game loop. A burst of logins queues up (up to maxQueue) instead
+ * of freezing ticks and combat for everyone.
+ */
+class PasswordHasher {
+  /**
+   * @param {Object} options - Hasher configuration
+   * @param {number} options.cost - bcrypt cost factor (default: BCRYPT_COST env or 10)
+   * @param {number} options.size - Number of worker threads (default: CPUs - 1, 1 to 4)
+   * @param {number} options.maxQueue - Jobs allowed to wait for a worker (default: 200)
+   */
+  constructor(options = {}) {
+    this.cost = options.cost || parseInt(process.env.BCRYPT_COST, 10) || 10;
+    this.size = options.size || Math.max(1, Math.min(4, os.cpus().length - 1));
+    this.maxQueue = options.maxQueue || 200;
+
+    this.workers = []; // { worker, job }
+    this.queue = [];
+    this.nextId = 1;
+    this.stopped = false;
+
+    this.stats = {
+      hashes: 0,
+      compares: 0,
+      rejected: 0,
+      failures: 0,
+      hashMs: 0,      // Time spent inside bcrypt
+      maxHashMs: 0,
+      waitMs: 0       // Time jobs spent queued for a worker
+    };
+  }
+
+  /**
+   * Hash a password
+   * @returns {Promise<string>} bcrypt hash
+   */
+  hash(password) {
+    return this.submit({ op: 'hash', password, cost: this.cost });
+  }
+
+  /**
+   * Check a password against a stored hash
+   * @returns {Promise<boolean>}
+   */
+  compare(password, hash) {
+    if (!hash) return Promise.resolve(false);
+    return this.submit({ op: 'compare', password, hash });
+  }
+
+  /**
+   * Whether a stored hash was made with a different cost than the current one
+   */
+  needsRehash(hash) {
+    try {
+      return bcrypt.getRounds(hash) !== this.cost;
+    } catch (error) {
+      return false;
+    }
+  }
+
+  /**
+   * Queue a job for the pool
+   */
+  submit(message) {
+    if (this.stopped) {
+      return Promise.reject(new Error('Password hasher is stopped'));
+    }
+    if (this.queue.length >= this.maxQueue) {
+      this.stats.rejected++;
+      return Promise.reject(new Error('Login service is busy, please try again shortly'));
+    }
+
+    return new Promise((resolve, reject) => {
+      this.queue.push({ id: this.nextId++, message, resolve, reject, queuedAt: Date.now() });
+      this.dispatch();
+    });
+  }
+
+  /**
+   * Hand queued jobs to idle workers, starting workers up to the pool size
+   */
+  dispatch() {
+    while (this.queue.length > 0) {
+      let slot = this.workers.find(w => !w.job);
+      if (!slot) {
+        if (this.workers.length >= this.size) return;
+        slot = this.spawnWorker();
+      }
+
+      const job = this.queue.shift();
+      slot.job = job;
+      this.stats.waitMs += Date.now() - job.queuedAt;
+      slot.worker.postMessage({ id: job.id, ...job.message });
+    }
+  }
+
+  /**
+   * Start a worker thread and wire up its result handling
+   */
+  spawnWorker() {
+    const slot = { worker: new Worker(WORKER_SCRIPT), job: null };
+    slot.worker.unref(); // Idle workers must not keep the process alive
+
+    slot.worker.on('message', ({ id, result, error, ms }) => {
+      const job = slot.job;
+      if (!job || job.id !== id) return;
+      slot.job = null;
+
+      this.stats.hashMs += ms;
+      this.stats.maxHashMs = Math.max(this.stats.maxHashMs, ms);
+      if (job.message.op === 'hash') this.stats.hashes++;
+      else this.stats.compares++;
+
+      if (error) {
+        this.stats.failures++;
+        job.reject(new Error(error));
+      } else {
+        job.resolve(result);
+      }
+      this.dispatch();
+    });
+
+    const fail = (error) => {
+      this.workers = this.workers.filter(w => w !== slot);
+      if (slot.job) {
+        this.stats.failures++;
+        slot.job.reject(error instanceof Error ? error : new Error(`Password worker exited (${error})`));
+        slot.job = null;
+      }
+      if (!this.stopped) this.dispatch();
+    };
+    slot.worker.on('error', fail);
+    slot.worker.on('exit', fail);
+
+    this.workers.push(slot);
+    return slot;
+  }
+
+  /**
+   * Get hashing statistics
+   */
+  getStats() {
+    const jobs = this.stats.hashes + this.stats.compares;
+    return {
+      ...this.stats,
+      avgHashMs: jobs > 0 ? this.stats.hashMs / jobs : 0,
+      cost: this.cost,
+      workers: this.workers.length,
+      busy: this.workers.filter(w => w.job).length,
+      queued: this.queue.length
+    };
+  }
+
+  /**
+   * Terminate all workers; queued jobs are rejected
+   */
+  async stop() {
+    this.stopped = true;
+    for (const job of this.queue) {
+      job.reject(new Error('Password hasher is stopped'));
+    }
+    this.queue = [];
+    const workers = this.workers;
+    this.workers = [];
+    await Promise.all(workers.map(w => w.worker.terminate()));
+  }
+}
+
+module.exports = PasswordHasher;
@@ -0,0 +1,326 @@
+'use strict';
+
+/**
+ * Persistence Queue
+ * Buffers world writes produced on the combat hot path (corpse/loot item inserts,
+ * room item changes) and applies them to MongoDB in batches off the critical path.
+ *
+ * Room item changes are sent as $pull/$addToSet deltas instead of full-array $set
+ * rewrites, so concurrent changes to the same room never clobber each other and
+ * a retried batch never lists an item twice.
+ */
+class PersistenceQueue {
+  /**
+   * @param {Object} options - Queue configuration
+   * @param {number} options.flushIntervalMs - How often pending writes are flushed (default: 250ms)
+   * @param {number} options.maxPending - Flush early once this many writes are pending (default: 500)
+   */
+  constructor(options = {}) {
+    this.db = null;
+    this.flushIntervalMs = options.flushIntervalMs || 250;
+    this.maxPending = options.maxPending || 500;
+
+    this.itemInserts = [];
+    this.itemWrites = []; // ordered updateOne/deleteMany ops on existing items
+    this.roomChanges = new Map(); // roomId -> { pull: Set<itemId>, push: Set<itemId> }
+    this.pending = 0;
+
+    this.timer = null;
+    this.inFlight = null;
+    this.stats = {
+      batches: 0,
+      itemsInserted: 0,
+      itemWrites: 0,
+      roomUpdates: 0,
+      failures: 0,
+      lastFlushMs: 0
+    };
+  }
+
+  /**
+   * Attach the database and start the periodic flush
+   */
+  initialize(db) {
+    this.db = db;
+    if (!this.timer) {
+      this.timer = setInterval(() => {
+        this.flush().catch(error => console.error('Error flushing persistence queue:', error));
+      }, this.flushIntervalMs);
+      if (this.timer.unref) this.timer.unref();
+    }
+  }
+
+  /**
+   * Queue a new item document for insertion
+   */
+  insertItem(doc) {
+    this.itemInserts.push(doc);
+    this.noteWrite();
+  }
+
+  /**
+   * Queue an update to an existing item document
+   */
+  updateItem(itemId, update) {
+    this.itemWrites.push({ updateOne: { filter: { id: itemId }, update } });
+    this.noteWrite();
+  }
+
+  /**
+   * Queue deleting item documents (a single ID or an array of IDs)
+   */
+  deleteItems(itemIds) {
+    const ids = Array.isArray(itemIds) ? itemIds : [itemIds];
+    if (ids.length === 0) return;
+    this.itemWrites.push({ deleteMany: { filter: { id: { $in: ids } } } });
+    this.noteWrite();
+  }
+
+  /**
+   * Queue adding an item ID to a room's items array
+   */
+  pushRoomItem(roomId, itemId) {
+    this.getRoomChange(roomId).push.add(itemId);
+    this.noteWrite();
+  }
+
+  /**
+   * Queue removing an item ID from a room's items array
+   * A pull of an item that was pushed in the same batch cancels both writes
+   */
+  pullRoomItem(roomId, itemId) {
+    const change = this.getRoomChange(roomId);
+    if (!change.push.delete(itemId)) {
+      change.pull.add(itemId);
+    }
+    this.noteWrite();
+  }
+
+  /**
+   * Get (or create) the pending change set for a room
+   */
+  getRoomChange(roomId) {
+    let change = this.roomChanges.get(roomId);
+    if (!change) {
+      change = { pull: new Set(), push: new Set() };
+      this.roomChanges.set(roomId, change);
+    }
+    return change;
+  }
+
+  /**
+   * Count a queued write and flush early if the backlog is large
+   */
+  noteWrite() {
+    this.pending++;
+    if (this.pending >= this.maxPending) {
+      this.flush().catch(error => console.error('Error flushing persistence queue:', error));
+    }
+  }
+
+  /**
+   * Whether any writes are waiting to be flushed
+   */
+  hasPending() {
+    return this.pending > 0 || this.inFlight !== null;
+  }
+
+  /**
+   * Write all pending changes to the database
+   * Callers that need read-your-writes (e.g. SEARCH on a fresh corpse) can await this
+   */
+  async flush() {
+    // Wait for a flush already in progress, then write anything queued since
+    while (this.inFlight) {
+      await this.inFlight;
+    }
+    if (!this.db || this.pending === 0) {
+      return;
+    }
+
+    const itemInserts = this.itemInserts;
+    const itemWrites = this.itemWrites;
+    const roomChanges = this.roomChanges;
+    this.itemInserts = [];
+    this.itemWrites = [];
+    this.roomChanges = new Map();
+    this.pending = 0;
+
+    this.inFlight = this.writeBatch(itemInserts, itemWrites, roomChanges);
+    try {
+      await this.inFlight;
+    } finally {
+      this.inFlight = null;
+    }
+  }
+
+  /**
+   * Apply one swapped-out batch; failed writes are put back on the queue
+   */
+  async writeBatch(itemInserts, itemWrites, roomChanges) {
+    const started = Date.now();
+
+    // Items first so a room never references an item that does not exist yet
+    if (itemInserts.length > 0) {
+      try {
+        await this.db.collection('items').bulkWrite(
+          itemInserts.map(doc => ({ insertOne: { document: doc } })),
+          { ordered: false }
+        );
+        this.stats.itemsInserted += itemInserts.length;
+      } catch (error) {
+        // Duplicate keys mean the document is already there; retry everything else
+        const retry = Array.isArray(error.writeErrors)
+          ? error.writeErrors.filter(e => e.code !== 11000).map(e => itemInserts[e.index])
+          : itemInserts;
+        this.stats.itemsInserted += itemInserts.length - retry.length;
+        this.requeueItems(retry);
+        this.stats.failures++;
+        console.error(`Persistence queue: ${retry.length} item insert(s) failed:`, error.message);
+      }
+    }
+
+    // Updates and deletes keep their queued order
+    if (itemWrites.length > 0) {
+      try {
+        await this.db.collection('items').bulkWrite(itemWrites, { ordered: true });
+        this.stats.itemWrites += itemWrites.length;
+      } catch (error) {
+        // Ordered writes stop at the first write error: everything before it is applied,
+        // the failing op itself is dropped and the rest retried. Without a write error
+        // (e.g. a lost connection) the whole batch is retried.
+        const failedAt = Array.isArray(error.writeErrors) && error.writeErrors.length > 0
+          ? error.writeErrors[0].index
+          : -1;
+        const retry = failedAt >= 0 ? itemWrites.slice(failedAt + 1) : itemWrites;
+        this.itemWrites = retry.concat(this.itemWrites);
+        this.pending += retry.length;
+        this.stats.itemWrites += Math.max(0, failedAt);
+        this.stats.failures++;
+        console.error('Persistence queue: item update failed:', error.message);
+      }
+    }
+
+    const ops = [];
+    const opChanges = []; // [roomId, 'pull'|'push', itemIds] for each op, to requeue what did not apply
+    for (const [roomId, change] of roomChanges) {
+      // Pull before push so "remove then re-add" ends with the item present
+      if (change.pull.size > 0) {
+        const itemIds = Array.from(change.pull);
+        ops.push({ updateOne: { filter: { id: roomId }, update: { $pull: { items: { $in: itemIds } } } } });
+        opChanges.push([roomId, 'pull', itemIds]);
+      }
+      if (change.push.size > 0) {
+        const itemIds = Array.from(change.push);
+        ops.push({ updateOne: { filter: { id: roomId }, update: { $addToSet: { items: { $each: itemIds } } } } });
+        opChanges.push([roomId, 'push', itemIds]);
+      }
+    }
+
+    if (ops.length > 0) {
+      try {
+        await this.db.collection('rooms').bulkWrite(ops, { ordered: true });
+        this.stats.roomUpdates += ops.length;
+      } catch (error) {
+        // Ordered writes stop at the first write error: retry from the failing op on.
+        // Without a write error the whole batch is retried ($addToSet keeps that harmless).
+        const failedAt = Array.isArray(error.writeErrors) && error.writeErrors.length > 0
+          ? error.writeErrors[0].index
+          : 0;
+        const failed = new Map();
+        for (const [roomId, kind, itemIds] of opChanges.slice(failedAt)) {
+          let change = failed.get(roomId);
+          if (!change) {
+            change = { pull: new Set(), push: new Set() };
+            failed.set(roomId, change);
+          }
+          for (const itemId of itemIds) change[kind].add(itemId);
+        }
+        this.requeueRoomChanges(failed);
+        this.stats.roomUpdates += failedAt;
+        this.stats.failures++;
+        console.error('Persistence queue: room item update failed:', error.message);
+      }
+    }
+
+    this.stats.batches++;
+    this.stats.lastFlushMs = Date.now() - started;
+  }
+
+  /**
+   * Put failed item inserts back at the front of the queue
+   */
+  requeueItems(docs) {
+    if (docs.length === 0) return;
+    this.itemInserts = docs.concat(this.itemInserts);
+    this.pending += docs.length;
+  }
+
+  /**
+   * Merge failed room changes back in front of anything queued since
+   */
+  requeueRoomChanges(failed) {
+    const newer = this.roomChanges;
+    this.roomChanges = failed;
+    for (const change of failed.values()) {
+      this.pending += change.pull.size + change.push.size;
+    }
+    for (const [roomId, change] of newer) {
+      const merged = this.getRoomChange(roomId);
+      for (const itemId of change.pull) {
+        if (!merged.push.delete(itemId)) merged.pull.add(itemId);
+      }
+      for (const itemId of change.push) merged.push.add(itemId);
+    }
+  }
+
+  /**
+   * Writes still queued, as plain data (world snapshot on shutdown)
+   */
+  exportPending() {
+    return {
+      // The driver adds _id to documents it tried to insert; Mongo assigns a new one on retry
+      itemInserts: this.itemInserts.map(({ _id, ...doc }) => doc),
+      itemWrites: this.itemWrites.slice(),
+      roomChanges: Array.from(this.roomChanges, ([roomId, change]) => [roomId, Array.from(change.pull), Array.from(change.push)])
+    };
+  }
+
+  /**
+   * Queue writes exported by a previous process (before anything else is queued)
+   */
+  importPending(state) {
+    if (!state) return;
+    this.requeueItems(state.itemInserts || []);
+    this.itemWrites = (state.itemWrites || []).concat(this.itemWrites);
+    this.pending += (state.itemWrites || []).length;
+    const restored = new Map();
+    for (const [roomId, pull, push] of state.roomChanges || []) {
+      restored.set(roomId, { pull: new Set(pull), push: new Set(push) });
+    }
+    this.requeueRoomChanges(restored);
+  }
+
+  /**
+   * Get queue statistics
+   */
+  getStats() {
+    return {
+      ...this.stats,
+      pending: this.pending
+    };
+  }
+
+  /**
+   * Stop the periodic flush and write whatever is left
+   */
+  async stop() {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+    await this.flush();
+  }
+}
+
+module.exports = PersistenceQueue;
@@ -2,6 +2,10 @@
 
 const databaseManager = require('../adapters/db/mongoClient');
 const CharacterCreation = require('./CharacterCreation');
+const log = require('../utils/logger').child('player');
+const metrics = require('../utils/metrics');
+
+const cacheRequests = metrics.counter('gs3_cache_requests_total', 'Cache lookups by cache and result (hit/miss)');
 const characterCreation = new CharacterCreation();
 
 /**
@@ -94,20 +98,18 @@ class PlayerSystem {
     try {
       // Check memory cache first
       if (this.players.has(username)) {
+        cacheRequests.inc({ cache: 'players', result: 'hit' });
         const player = this.players.get(username);
         if (!player.id) player.id = player.name;
         return player;
       }
 
+      cacheRequests.inc({ cache: 'players', result: 'miss' });
       const collection = this.db.collection('players');
       const player = await collection.findOne({ name: username });
       
       if (player) {
-        console.log(`[LOAD PLAYER] Loading player ${username} from database`);
-        console.log(`[LOAD PLAYER] Skills:`, player.skills ? Object.keys(player.skills).join(', ') : 'none');
-        if (player.skills?.one_handed_edged) {
-          console.log(`[LOAD PLAYER] one_handed_edged ranks:`, player.skills.one_handed_edged.ranks);
-        }
+        log.debug('Loaded player from database', { player: username, skills: player.skills ? Object.keys(player.skills).length : 0 });
         
         // Set id if not present
         if (!player.id) player.id = player.name;
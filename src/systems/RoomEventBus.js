@@ -0,0 +1,166 @@
+'use strict';
+
+const EventEmitter = require('events');
+
+/**
+ * Room Event Bus
+ * Announces players and NPCs entering and leaving rooms (movement, login,
+ * respawn, spawn, death) and keeps a per-room occupant index.
+ *
+ * Systems can listen to every room (bus.on('enter' | 'leave', handler)) or
+ * subscribe to a single room (bus.subscribe(roomId, handler)), so idle rooms
+ * and idle NPCs cost nothing until something actually moves.
+ *
+ * Event shape: { type, kind, entity, roomId, fromRoomId, toRoomId, cause }
+ *   type: 'enter' | 'leave'
+ *   kind: 'player' | 'npc'
+ *   cause: 'move' | 'login' | 'logout' | 'respawn' | 'teleport' | 'spawn' | 'despawn' | 'restore'
+ */
+class RoomEventBus extends EventEmitter {
+  constructor() {
+    super();
+    this.occupants = new Map(); // roomId -> { players: Set, npcs: Set }
+    this.subscribers = new Map(); // roomId -> Set<handler>
+    this.stats = {
+      enters: 0,
+      leaves: 0
+    };
+  }
+
+  /**
+   * Announce an entity arriving in a room
+   */
+  enter(entity, roomId, { kind = 'player', cause = 'move', fromRoomId = null } = {}) {
+    if (!entity || !roomId) return;
+
+    this.getOccupants(roomId)[kind === 'npc' ? 'npcs' : 'players'].add(entity);
+    this.stats.enters++;
+    this.dispatch({ type: 'enter', kind, entity, roomId, fromRoomId, toRoomId: roomId, cause });
+  }
+
+  /**
+   * Announce an entity leaving a room
+   */
+  leave(entity, roomId, { kind = 'player', cause = 'move', toRoomId = null } = {}) {
+    if (!entity || !roomId) return;
+
+    const occupants = this.occupants.get(roomId);
+    if (occupants) {
+      occupants[kind === 'npc' ? 'npcs' : 'players'].delete(entity);
+      if (occupants.players.size === 0 && occupants.npcs.size === 0) {
+        this.occupants.delete(roomId);
+      }
+    }
+    this.stats.leaves++;
+    this.dispatch({ type: 'leave', kind, entity, roomId, fromRoomId: roomId, toRoomId, cause });
+  }
+
+  /**
+   * Announce an entity moving from one room to another (leave, then enter)
+   */
+  move(entity, fromRoomId, toRoomId, { kind = 'player', cause = 'move' } = {}) {
+    if (fromRoomId === toRoomId) return;
+    if (fromRoomId) {
+      this.leave(entity, fromRoomId, { kind, cause, toRoomId });
+    }
+    this.enter(entity, toRoomId, { kind, cause, fromRoomId });
+  }
+
+  /**
+   * Listen to enter/leave events for one room
+   * @returns {Function} Call to unsubscribe
+   */
+  subscribe(roomId, handler) {
+    let handlers = this.subscribers.get(roomId);
+    if (!handlers) {
+      handlers = new Set();
+      this.subscribers.set(roomId, handlers);
+    }
+    handlers.add(handler);
+
+    return () => {
+      handlers.delete(handler);
+      if (handlers.size === 0 && this.subscribers.get(roomId) === handlers) {
+        this.subscribers.delete(roomId);
+      }
+    };
+  }
+
+  /**
+   * Deliver an event to room subscribers, then to global listeners
+   * A failing handler is logged and never stops the others
+   */
+  dispatch(event) {
+    const handlers = this.subscribers.get(event.roomId);
+    if (handlers) {
+      // Copy: handlers may unsubscribe (or subscribe) while being called
+      for (const handler of Array.from(handlers)) {
+        try {
+          handler(event);
+        } catch (error) {
+          console.error(`Room event handler failed (${event.type} ${event.roomId}):`, error);
+        }
+      }
+    }
+
+    try {
+      this.emit(event.type, event);
+    } catch (error) {
+      console.error(`Room event listener failed (${event.type} ${event.roomId}):`, error);
+    }
+  }
+
+  /**
+   * Get (or create) the occupant sets for a room
+   */
+  getOccupants(roomId) {
+    let occupants = this.occupants.get(roomId);
+    if (!occupants) {
+      occupants = { players: new Set(), npcs: new Set() };
+      this.occupants.set(roomId, occupants);
+    }
+    return occupants;
+  }
+
+  /**
+   * Get the players currently in a room
+   */
+  getPlayers(roomId) {
+    const occupants = this.occupants.get(roomId);
+    return occupants ? Array.from(occupants.players) : [];
+  }
+
+  /**
+   * Get the NPCs currently in a room
+   */
+  getNPCs(roomId) {
+    const occupants = this.occupants.get(roomId);
+    return occupants ? Array.from(occupants.npcs) : [];
+  }
+
+  /**
+   * Whether any player is in a room
+   */
+  hasPlayers(roomId) {
+    const occupants = this.occupants.get(roomId);
+    return !!occupants && occupants.players.size > 0;
+  }
+
+  /**
+   * Get bus statistics
+   */
+  getStats() {
+    let subscriptions = 0;
+    for (const handlers of this.subscribers.values()) {
+      subscriptions += handlers.size;
+    }
+    return {
+      ...this.stats,
+      occupiedRooms: this.occupants.size,
+      subscribedRooms: this.subscribers.size,
+      subscriptions
+    };
+  }
+}
+
+module.exports = RoomEventBus;
@@ -1,25 +1,45 @@
 'use strict';
 
 const databaseManager = require('../adapters/db/mongoClient');
+const metrics = require('../utils/metrics');
+const { indexKeywords } = require('../utils/keywordMatcher');
+const { ROOM_PROJECTION, StringPool, compactRoom, findExit } = require('../utils/compactRoom');
+
+const cacheRequests = metrics.counter('gs3_cache_requests_total', 'Cache lookups by cache and result (hit/miss)');
+
+// How long an item ID with no document is remembered before it is looked up again
+// (a new item can be listed in a room just before its queued insert is written)
+const MISSING_ITEM_TTL_MS = 60 * 1000;
 
 /**
  * Room System (Database Version)
  * Manages rooms, areas, and room-related functionality
+ *
+ * Rooms are held in the compact form built by utils/compactRoom (interned
+ * strings, indexed exits, no import bookkeeping); getRoomDocument reads the
+ * full document when it is needed for editing.
  */
 class RoomSystem {
   constructor() {
-    this.rooms = new Map(); // In-memory cache
+    this.rooms = new Map(); // In-memory cache (compact rooms)
+    this.strings = new StringPool(); // Interning while rooms are loaded
     this.areas = new Map(); // In-memory cache
+    this.renderCache = new Map(); // roomId -> precompiled static render parts
+    this.itemDisplayNames = new Map(); // itemId -> "You also see" text
+    this.missingItems = new Map(); // itemId -> time to look it up again (no item document)
     this.db = null;
   }
 
   /**
    * Initialize the room system
+   * @param {Object} options - { load: false when rooms come from a world snapshot }
    */
-  async initialize() {
+  async initialize(options = {}) {
     try {
       this.db = await databaseManager.initialize();
-      await this.loadRoomsFromDatabase();
+      if (options.load !== false) {
+        await this.loadRoomsFromDatabase();
+      }
       console.log('Room system initialized with database');
     } catch (error) {
       console.error('Error initializing room system:', error);
@@ -38,11 +58,14 @@ class RoomSystem {
         this.areas.set(area.id, area);
       }
 
-      // Load rooms
-      const rooms = await this.db.collection('rooms').find({}).toArray();
-      for (const room of rooms) {
-        this.rooms.set(room.id, room);
-      }
+      // Load rooms (fields only the editor needs stay in the database)
+      const docs = await this.db.collection('rooms')
+        .find({}, { projection: ROOM_PROJECTION })
+        .toArray();
+      const rooms = this.addRoomDocuments(docs);
+
+      // Warm item display names so room renders never need to hit the database
+      await this.loadItemDisplayNames(this.collectRoomItemIds(rooms));
 
       console.log(`Loaded ${this.areas.size} areas and ${this.rooms.size} rooms from database`);
     } catch (error) {
@@ -52,6 +75,63 @@ class RoomSystem {
     }
   }
 
+  /**
+   * Compact and cache a batch of room documents
+   * @returns {Array} The compact rooms
+   */
+  addRoomDocuments(docs) {
+    const rooms = [];
+    for (const doc of docs) {
+      const room = this.compactRoom(doc);
+      this.rooms.set(room.id, room);
+      rooms.push(room);
+    }
+    // Interned strings are now referenced by the rooms; the lookup table is no longer needed
+    this.strings.clear();
+    this.invalidateRoomRender();
+    return rooms;
+  }
+
+  /**
+   * Load areas, rooms and item display names from a world snapshot instead of the database
+   * @param {Object} state - { areas, rooms, itemNames } (see WorldSnapshot)
+   */
+  restoreRooms(state) {
+    for (const area of state.areas) {
+      this.areas.set(area.id, area);
+    }
+    this.addRoomDocuments(state.rooms);
+    for (const [itemId, text] of state.itemNames) {
+      this.itemDisplayNames.set(itemId, text);
+    }
+    console.log(`Restored ${this.areas.size} areas and ${this.rooms.size} rooms from snapshot`);
+  }
+
+  /**
+   * Rooms, areas and item display names as plain data (world snapshot)
+   */
+  exportRooms() {
+    const areas = [];
+    for (const { _id, ...area } of this.areas.values()) {
+      areas.push(area);
+    }
+    const rooms = [];
+    for (const room of this.rooms.values()) {
+      rooms.push({
+        id: room.id,
+        areaId: room.areaId,
+        title: room.title,
+        description: room.description,
+        exits: room.exits.map(({ direction, roomId, hidden, requiresClimb }) => ({ direction, roomId, hidden, requiresClimb })),
+        items: room.items,
+        npcs: room.npcs,
+        features: room.features,
+        metadata: room.metadata
+      });
+    }
+    return { areas, rooms, itemNames: Array.from(this.itemDisplayNames) };
+  }
+
   /**
    * Create default rooms if none exist
    */
@@ -103,7 +183,7 @@ class RoomSystem {
 
       // Add to cache
       this.areas.set('default', defaultArea);
-      this.rooms.set('default:start', startRoom);
+      this.rooms.set('default:start', this.compactRoom(startRoom));
 
       console.log('Created default rooms');
     } catch (error) {
@@ -111,6 +191,22 @@ class RoomSystem {
     }
   }
 
+  /**
+   * Build the in-memory form of a room document
+   */
+  compactRoom(doc) {
+    const room = compactRoom(doc, this.strings);
+    indexKeywords(room.exits);
+    return room;
+  }
+
+  /**
+   * Read a room's full document (admin editing)
+   */
+  async getRoomDocument(roomId) {
+    return this.db.collection('rooms').findOne({ id: roomId });
+  }
+
   /**
    * Get a room by ID
    */
@@ -150,122 +246,197 @@ class RoomSystem {
    * Get players in a specific room
    */
   getPlayersInRoom(roomId) {
-    // This would need to be implemented with the player system
-    // For now, return empty array
-    return [];
+    // Occupancy is tracked by the room event bus (see GameEngine)
+    return this.roomEvents ? this.roomEvents.getPlayers(roomId) : [];
   }
 
   /**
-   * Get room description with players and items
+   * Get the precompiled static render parts for a room
+   * Built once per room and reused until the room is changed
    */
-  async getRoomDescription(roomId, player = null, gameEngine = null) {
+  getRoomRender(roomId) {
+    let render = this.renderCache.get(roomId);
+    if (render) {
+      cacheRequests.inc({ cache: 'room_render', result: 'hit' });
+      return render;
+    }
+    cacheRequests.inc({ cache: 'room_render', result: 'miss' });
+
     const room = this.getRoom(roomId);
     if (!room) {
-      return 'You are in a void. There is nothing here.';
+      return null;
     }
 
-    // Check if player is admin (refresh from DB if available to ensure role is current)
-    let isAdmin = false;
-    if (player) {
-      // Try to refresh role from database if player has gameEngine reference
-      if (this.db && player.name) {
-        try {
-          const freshPlayer = await this.db.collection('players').findOne({ name: player.name });
-          if (freshPlayer && freshPlayer.role) {
-            player.role = freshPlayer.role;
-          }
-        } catch (error) {
-          // Fall back to in-memory role if DB lookup fails
-        }
+    const exits = Array.isArray(room.exits) ? room.exits : [];
+    // Regular players only see non-hidden exits
+    const visibleExits = exits.filter(exit => !exit.hidden).map(exit => exit.direction);
+    // Admins see all exits, mark hidden ones
+    const adminExits = exits.map(exit => exit.hidden ? `${exit.direction} [hidden]` : exit.direction);
+
+    render = {
+      titleLine: `[${room.title}]`,
+      adminTitleLine: `[${room.title}] [ ${room.id} ]`,
+      description: room.description,
+      exitDirections: new Set(visibleExits),
+      exitsLine: visibleExits.length > 0 ? `\r\nObvious paths: ${visibleExits.join(', ')}` : '',
+      adminExitsLine: adminExits.length > 0 ? `\r\nObvious paths: ${adminExits.join(', ')}` : ''
+    };
+    this.renderCache.set(roomId, render);
+    return render;
+  }
+
+  /**
+   * Whether a room has a non-hidden exit in a direction
+   */
+  hasVisibleExit(roomId, direction) {
+    const render = this.getRoomRender(roomId);
+    return !!render && render.exitDirections.has(direction);
+  }
+
+  /**
+   * Drop cached render parts for a room (or all rooms if no ID is given)
+   */
+  invalidateRoomRender(roomId = null) {
+    if (roomId === null) {
+      this.renderCache.clear();
+    } else {
+      this.renderCache.delete(roomId);
+    }
+  }
+
+  /**
+   * Collect the item IDs referenced by a list of rooms
+   */
+  collectRoomItemIds(rooms) {
+    const ids = new Set();
+    for (const room of rooms) {
+      if (!Array.isArray(room.items)) continue;
+      for (const ref of room.items) {
+        const id = typeof ref === 'string' ? ref : ref?.id;
+        if (id) ids.add(id);
       }
-      isAdmin = player.role === 'admin';
     }
-    const titleLine = isAdmin
-      ? `[${room.title}] [ ${room.id} ]`
-      : `[${room.title}]`;
-    let description = `${titleLine}\r\n${room.description}`;
-    
-    // Get items in room
-    let itemDescriptions = [];
-    if (room.items && room.items.length > 0 && this.db) {
-      try {
-        const itemIds = room.items.map(item => typeof item === 'string' ? item : (item.id || item.name || 'an item'));
-        const items = await this.db.collection('items')
-          .find({ id: { $in: itemIds } })
-          .toArray();
-        
-        itemDescriptions = items.map(item => item.roomDesc || item.name || item.id);
-      } catch (error) {
-        // Fallback to IDs if database lookup fails
-        itemDescriptions = room.items.map(item => typeof item === 'string' ? item : (item.id || item.name || 'an item'));
+    return Array.from(ids);
+  }
+
+  /**
+   * Fetch display names for the given item IDs in a single query
+   */
+  async loadItemDisplayNames(itemIds) {
+    if (!this.db || itemIds.length === 0) {
+      return;
+    }
+
+    try {
+      const items = await this.db.collection('items')
+        .find({ id: { $in: itemIds } }, { projection: { id: 1, name: 1, roomDesc: 1 } })
+        .toArray();
+      for (const item of items) {
+        this.setItemDisplayName(item);
+      }
+      const retryAt = Date.now() + MISSING_ITEM_TTL_MS;
+      for (const itemId of itemIds) {
+        if (!this.itemDisplayNames.has(itemId)) this.missingItems.set(itemId, retryAt);
       }
+    } catch (error) {
+      console.error('Error loading item display names:', error);
     }
+  }
 
-    // Get NPCs from NPC system if available
-    let npcNames = [];
-    if (gameEngine && gameEngine.npcSystem) {
-      const npcsInRoom = gameEngine.npcSystem.getNPCsInRoom(roomId);
-      npcNames = npcsInRoom.filter(npc => npc.isAlive).map(npc => npc.name || npc.npcId);
+  /**
+   * Record how an item is shown in a room description
+   */
+  setItemDisplayName(item) {
+    if (item && item.id) {
+      this.itemDisplayNames.set(item.id, item.roomDesc || item.name || item.id);
+      this.missingItems.delete(item.id);
     }
+  }
 
-    // Get other players in room
-    let otherPlayerNames = [];
-    if (gameEngine && player) {
-      // Get players from GameEngine.players Map (where online players are stored)
-      const allPlayers = Array.from(gameEngine.players.values());
-      const playersInRoom = allPlayers.filter(p => p.room === roomId);
-      otherPlayerNames = playersInRoom
-        .filter(p => p.name !== player.name)
-        .map(p => p.name);
+  /**
+   * Forget a cached item display name (after the item is edited or destroyed)
+   */
+  invalidateItemDisplayName(itemId) {
+    this.itemDisplayNames.delete(itemId);
+    this.missingItems.delete(itemId);
+  }
+
+  /**
+   * Get display names for the items lying in a room
+   * Served from memory; only items never seen before are fetched. Items without
+   * a document are left out (and not looked up again for a while)
+   */
+  async getRoomItemDescriptions(room) {
+    if (!room || !Array.isArray(room.items) || room.items.length === 0) {
+      return [];
     }
 
-    // Combine all entities (items, NPCs, players) for "You also see:" line
-    const allEntities = [];
-    if (itemDescriptions.length > 0) {
-      allEntities.push(...itemDescriptions);
+    const now = Date.now();
+    const refs = room.items.map(item => typeof item === 'string' ? item : item && item.id).filter(Boolean);
+    const missing = refs.filter(id => !this.itemDisplayNames.has(id) && !(this.missingItems.get(id) > now));
+    cacheRequests.inc({ cache: 'item_names', result: 'hit' }, refs.length - missing.length);
+    if (missing.length > 0) {
+      cacheRequests.inc({ cache: 'item_names', result: 'miss' }, missing.length);
+      await this.loadItemDisplayNames(missing);
     }
-    if (npcNames.length > 0) {
-      allEntities.push(...npcNames);
+
+    return refs.map(id => this.itemDisplayNames.get(id)).filter(Boolean);
+  }
+
+  /**
+   * Join entity names GS-style: "a", "a and b", "a, b, and c"
+   */
+  formatEntityList(entities) {
+    if (entities.length === 1) {
+      return entities[0];
     }
-    if (otherPlayerNames.length > 0) {
-      allEntities.push(...otherPlayerNames);
+    if (entities.length === 2) {
+      return entities[0] + ' and ' + entities[1];
     }
+    return entities.slice(0, -1).join(', ') + ', and ' + entities[entities.length - 1];
+  }
 
-    // Add "You also see:" line if there are any entities
-    if (allEntities.length > 0) {
-      description += '  You also see ';
-      if (allEntities.length === 1) {
-        description += allEntities[0] + '.';
-      } else if (allEntities.length === 2) {
-        description += allEntities[0] + ' and ' + allEntities[1] + '.';
-      } else {
-        description += allEntities.slice(0, -1).join(', ') + ', and ' + allEntities[allEntities.length - 1] + '.';
-      }
+  /**
+   * Get room description with players and items
+   * Static parts come from the render cache; items, NPCs and players are
+   * composed from in-memory state
+   */
+  async getRoomDescription(roomId, player = null, gameEngine = null) {
+    const render = this.getRoomRender(roomId);
+    if (!render) {
+      return 'You are in a void. There is nothing here.';
     }
 
-    // Add exits
-    if (room.exits && room.exits.length > 0) {
-      // Admins can see all exits, including hidden ones (marked with [hidden])
-      let exitsToShow;
-      if (isAdmin) {
-        // Admins see all exits, mark hidden ones
-        exitsToShow = room.exits.map(exit => {
-          if (exit.hidden) {
-            return `${exit.direction} [hidden]`;
-          }
-          return exit.direction;
-        });
-      } else {
-        // Regular players only see non-hidden exits
-        exitsToShow = room.exits.filter(exit => !exit.hidden).map(exit => exit.direction);
+    const isAdmin = !!player && player.role === 'admin';
+    let description = `${isAdmin ? render.adminTitleLine : render.titleLine}\r\n${render.description}`;
+
+    // Combine all entities (items, NPCs, players) for "You also see:" line
+    const allEntities = await this.getRoomItemDescriptions(this.getRoom(roomId));
+
+    // Get NPCs from NPC system if available
+    if (gameEngine && gameEngine.npcSystem) {
+      for (const npc of gameEngine.npcSystem.getNPCsInRoom(roomId)) {
+        if (npc.isAlive) allEntities.push(npc.name || npc.npcId);
       }
-      
-      if (exitsToShow.length > 0) {
-        description += '\r\nObvious paths: ';
-        description += exitsToShow.join(', ');
+    }
+
+    // Get other players in room from GameEngine.players Map (where online players are stored)
+    if (gameEngine && player) {
+      for (const other of gameEngine.players.values()) {
+        if (other.room === roomId && other.name !== player.name) {
+          allEntities.push(other.name);
+        }
       }
     }
 
+    // Add "You also see:" line if there are any entities
+    if (allEntities.length > 0) {
+      description += '  You also see ' + this.formatEntityList(allEntities) + '.';
+    }
+
+    // Admins can see all exits, including hidden ones (marked with [hidden])
+    description += isAdmin ? render.adminExitsLine : render.exitsLine;
+
     return description;
   }
 
@@ -282,50 +453,7 @@ class RoomSystem {
    * e.g., "well" matches "old well", "tree" matches "oak tree"
    */
   getExit(roomId, direction) {
-    const room = this.getRoom(roomId);
-    if (!room || !room.exits) {
-      return null;
-    }
-
-    if (!direction || typeof direction !== 'string') {
-      return null;
-    }
-
-    const searchDir = direction.trim().toLowerCase();
-    
-    // First try exact case-insensitive match
-    let exit = room.exits.find(exit => 
-      exit.direction && exit.direction.toLowerCase() === searchDir
-    );
-    
-    if (exit) {
-      return exit;
-    }
-    
-    // If no exact match, try partial match (input matches end of exit name)
-    // e.g., "well" matches "old well", "tree" matches "oak tree"
-    const matchingExits = room.exits.filter(exit => {
-      if (!exit.direction) return false;
-      const exitDir = exit.direction.toLowerCase();
-      
-      // Check if search direction matches the end of exit direction
-      // e.g., "well" matches "old well", "tree" matches "oak tree"
-      return exitDir === searchDir || exitDir.endsWith(' ' + searchDir);
-    });
-    
-    if (matchingExits.length === 0) {
-      return null;
-    }
-    
-    // If multiple matches, prefer the shortest (most specific) match
-    // e.g., if both "well" and "old well" exist, prefer "well"
-    if (matchingExits.length > 1) {
-      matchingExits.sort((a, b) => 
-        (a.direction.length || 0) - (b.direction.length || 0)
-      );
-    }
-    
-    return matchingExits[0];
+    return findExit(this.getRoom(roomId), direction);
   }
 
   /**
@@ -358,7 +486,8 @@ class RoomSystem {
         { upsert: true }
       );
       
-      this.rooms.set(roomData.id, roomData);
+      this.rooms.set(roomData.id, this.compactRoom(roomData));
+      this.invalidateRoomRender(roomData.id);
       console.log(`Added room: ${roomData.id}`);
     } catch (error) {
       console.error(`Error adding room ${roomData.id}:`, error);
@@ -376,7 +505,10 @@ class RoomSystem {
         throw new Error(`Room ${roomId} not found`);
       }
 
-      const updatedRoom = { ...room, ...updates };
+      // Edit the full document; the in-memory room only has what the game reads
+      const document = await this.getRoomDocument(roomId) || { id: room.id, areaId: room.areaId, title: room.title, description: room.description, exits: room.exits };
+      delete document._id;
+      const updatedRoom = { ...document, items: room.items, ...updates };
       // Normalize exits on update as well
       if (Array.isArray(updatedRoom.exits)) {
         const seen = new Set();
@@ -393,7 +525,8 @@ class RoomSystem {
         updatedRoom
       );
       
-      this.rooms.set(roomId, updatedRoom);
+      this.rooms.set(roomId, this.compactRoom(updatedRoom));
+      this.invalidateRoomRender(roomId);
       console.log(`Updated room: ${roomId}`);
     } catch (error) {
       console.error(`Error updating room ${roomId}:`, error);
@@ -0,0 +1,399 @@
+'use strict';
+
+const path = require('path');
+const { Worker } = require('worker_threads');
+const { StringPool } = require('../utils/compactRoom');
+const { serializePlayer } = require('../utils/playerState');
+const { SHARD_MESSAGES: MSG, SHARDING } = require('../constants/shards');
+const log = require('../utils/logger').child('shards');
+
+const WORKER_SCRIPT = path.join(__dirname, '../workers/shardWorker.js');
+
+/**
+ * Shard Manager
+ * Runs the world as area shards on worker threads (SHARDS=<n>, n > 1).
+ *
+ * The gateway process (GameServer) keeps the Telnet and WebSocket sockets,
+ * sessions and login. Each shard worker runs a GameEngine whose tick, NPCs,
+ * combat and item decay cover only the areas assigned to it; areas are spread
+ * over shards by room count. Input lines of a player in the world are posted to
+ * the shard hosting them and output comes back batched per event loop turn.
+ *
+ * A command that leaves a player in another shard's area (walking through a
+ * cross-area exit, teleporting, respawning) makes the shard hand the player back
+ * here; the gateway posts them to the owning shard, which describes the room.
+ * Lines still queued behind the command travel with the handoff, and lines that
+ * reach the old shard afterwards are bounced here and rerouted.
+ * See constants/shards.js for the message protocol.
+ */
+class ShardManager {
+  /**
+   * @param {Object} gameEngine - Gateway engine (sessions and the character cache)
+   * @param {Object} options
+   * @param {number} options.size - Number of area shards
+   */
+  constructor(gameEngine, options = {}) {
+    this.gameEngine = gameEngine;
+    this.size = Math.max(1, options.size || 2);
+
+    this.shards = []; // { index, worker, areas, rooms, ready, load, restarts }
+    this.roomAreas = new Map(); // roomId -> areaId (routes logins)
+    this.areaShards = new Map(); // areaId -> shard index
+    this.locations = new Map(); // playerId -> shard index hosting the player
+    this.loadTimer = null;
+    this.stopped = false;
+
+    this.stats = {
+      entered: 0,
+      handoffs: 0,
+      bounced: 0,
+      restarts: 0
+    };
+  }
+
+  /**
+   * Spread areas over shards by room count, largest area first onto the least loaded shard
+   * @param {Map<string, number>} roomCounts - areaId -> rooms
+   * @param {number} size - Number of shards
+   * @returns {Map<string, number>} areaId -> shard index
+   */
+  static assignAreas(roomCounts, size) {
+    const loads = new Array(size).fill(0);
+    const assignment = new Map();
+    const areas = Array.from(roomCounts.entries())
+      .sort((a, b) => b[1] - a[1] || (a[0] < b[0] ? -1 : a[0] > b[0] ? 1 : 0));
+    for (const [areaId, rooms] of areas) {
+      let index = 0;
+      for (let i = 1; i < size; i++) {
+        if (loads[i] < loads[index]) index = i;
+      }
+      assignment.set(areaId, index);
+      loads[index] += rooms;
+    }
+    return assignment;
+  }
+
+  /**
+   * Assign areas and start the shard workers; resolves once every shard has loaded the world
+   * @param {Object} db - Database (rooms are read for the area directory)
+   */
+  async start(db) {
+    const strings = new StringPool();
+    const roomCounts = new Map();
+    const rooms = await db.collection('rooms')
+      .find({}, { projection: { _id: 0, id: 1, areaId: 1 } })
+      .toArray();
+    for (const room of rooms) {
+      const areaId = strings.intern(room.areaId || '');
+      this.roomAreas.set(room.id, areaId);
+      roomCounts.set(areaId, (roomCounts.get(areaId) || 0) + 1);
+    }
+
+    this.areaShards = ShardManager.assignAreas(roomCounts, this.size);
+    this.assignment = Object.fromEntries(this.areaShards);
+    for (let index = 0; index < this.size; index++) {
+      const areas = Array.from(this.areaShards).filter(([, shard]) => shard === index).map(([areaId]) => areaId);
+      this.shards.push({
+        index,
+        worker: null,
+        areas,
+        rooms: areas.reduce((total, areaId) => total + roomCounts.get(areaId), 0),
+        ready: false,
+        load: null,
+        restarts: 0
+      });
+    }
+
+    await Promise.all(this.shards.map(shard => this.startShard(shard)));
+
+    this.loadTimer = setInterval(() => this.shareLoads(), SHARDING.loadIntervalMs);
+    if (this.loadTimer.unref) this.loadTimer.unref();
+    log.info('Area shards started', { shards: this.size, areas: this.areaShards.size, rooms: rooms.length });
+  }
+
+  /**
+   * Start (or restart) one shard worker
+   * @returns {Promise<void>} Resolves when the shard reports ready
+   */
+  startShard(shard) {
+    return new Promise((resolve, reject) => {
+      const worker = new Worker(WORKER_SCRIPT, {
+        workerData: { index: shard.index, assignment: this.assignment }
+      });
+      shard.worker = worker;
+      shard.ready = false;
+      shard.onReady = resolve;
+
+      const timeout = setTimeout(() => {
+        if (!shard.ready) reject(new Error(`Shard ${shard.index} did not start within ${SHARDING.readyTimeoutMs}ms`));
+      }, SHARDING.readyTimeoutMs);
+      if (timeout.unref) timeout.unref();
+
+      worker.on('message', message => this.handleMessage(shard, message));
+      worker.on('error', error => {
+        log.error('Shard worker failed', { shard: shard.index, error: error.message });
+        if (!shard.ready) reject(error);
+      });
+      worker.on('exit', code => {
+        clearTimeout(timeout);
+        this.handleExit(shard, worker, code);
+      });
+    });
+  }
+
+  /**
+   * Handle a message from a shard worker
+   */
+  handleMessage(shard, message) {
+    const sessions = this.gameEngine.sessions;
+    switch (message.type) {
+      case MSG.READY:
+        shard.ready = true;
+        shard.npcs = message.npcs;
+        log.info('Shard ready', { shard: shard.index, areas: shard.areas.length, rooms: shard.rooms, npcs: message.npcs });
+        if (shard.onReady) {
+          shard.onReady();
+          shard.onReady = null;
+        }
+        break;
+
+      case MSG.OUTPUT: {
+        const session = sessions.getByPlayerId(message.playerId);
+        if (session) session.write(message.text);
+        break;
+      }
+
+      case MSG.CLOSE: {
+        const session = sessions.getByPlayerId(message.playerId);
+        if (session) session.close();
+        break;
+      }
+
+      case MSG.HANDOFF:
+        this.handoff(message);
+        break;
+
+      case MSG.BOUNCE:
+        // Input that reached the old shard after the player was handed off
+        if (this.locations.has(message.playerId)) {
+          this.stats.bounced++;
+          this.input(message.playerId, message.line);
+        }
+        break;
+
+      case MSG.LEFT:
+        this.cachePlayer(message.playerId, message.player);
+        break;
+
+      case MSG.LOAD:
+        shard.load = message.load;
+        break;
+
+      case MSG.HOTFIX:
+        log.info('Reloading shards after hotfix', { shard: shard.index });
+        for (const other of this.shards) {
+          if (other !== shard) this.post(other.index, MSG.RELOAD);
+        }
+        break;
+
+      case MSG.STOPPED:
+        log.info('Shard stopped', { shard: shard.index });
+        break;
+
+      default:
+        log.warn('Unknown shard message', { shard: shard.index, type: message.type });
+    }
+  }
+
+  /**
+   * A shard handed a player back: post them to the shard owning their new area
+   */
+  handoff({ playerId, player, areaId, pending }) {
+    if (!this.locations.has(playerId)) {
+      // The session ended while the handoff was in flight
+      this.cachePlayer(playerId, player);
+      return;
+    }
+    const index = this.shardForArea(areaId);
+    this.locations.set(playerId, index);
+    this.stats.handoffs++;
+    this.post(index, MSG.ENTER, { playerId, player, greeting: null, pending });
+  }
+
+  /**
+   * Remember a player's final state, as the single-process character cache would
+   */
+  cachePlayer(playerId, player) {
+    if (!player || this.locations.has(playerId)) return;
+    this.gameEngine.playerSystem.players.set(player.name, player);
+  }
+
+  /**
+   * A shard worker exited: tell its players and start it again unless the gateway is stopping
+   */
+  handleExit(shard, worker, code) {
+    if (shard.worker !== worker) return;
+    shard.worker = null;
+    shard.ready = false;
+    if (this.stopped) return;
+
+    log.error('Shard exited', { shard: shard.index, code });
+    for (const [playerId, index] of this.locations) {
+      if (index !== shard.index) continue;
+      this.locations.delete(playerId);
+      const session = this.gameEngine.sessions.getByPlayerId(playerId);
+      if (session) {
+        session.writeLine('The part of the world you were in has failed. Please log in again.');
+        session.close();
+      }
+    }
+
+    shard.restarts++;
+    this.stats.restarts++;
+    const timer = setTimeout(() => {
+      if (this.stopped) return;
+      this.startShard(shard).catch(error => {
+        log.error('Shard restart failed', { shard: shard.index, error: error.message });
+      });
+    }, SHARDING.restartDelayMs);
+    if (timer.unref) timer.unref();
+  }
+
+  /**
+   * Post a message to a shard
+   */
+  post(index, type, fields) {
+    const shard = this.shards[index];
+    if (!shard || !shard.worker) {
+      log.warn('Message for a shard that is not running', { shard: index, type });
+      return false;
+    }
+    shard.worker.postMessage({ type, ...fields });
+    return true;
+  }
+
+  /**
+   * Shard owning an area (areas missing from the assignment belong to shard 0)
+   */
+  shardForArea(areaId) {
+    return this.areaShards.get(areaId || '') || 0;
+  }
+
+  /**
+   * Shard owning a room
+   */
+  shardForRoom(roomId) {
+    return this.shardForArea(this.roomAreas.get(roomId));
+  }
+
+  /**
+   * Whether a player is in the world on one of the shards
+   */
+  has(playerId) {
+    return this.locations.has(playerId);
+  }
+
+  /**
+   * Put a logged in character into the world on the shard owning their room
+   * @param {Object} player - Character loaded by the login flow
+   * @param {string} greeting - Welcome message
+   */
+  enter(player, greeting) {
+    const playerId = player.id || player.name;
+    player.id = playerId;
+    const index = this.shardForRoom(player.room);
+    if (!this.shards[index] || !this.shards[index].ready) return false;
+
+    // The shard now holds the live character; a later login must not reuse this copy
+    this.gameEngine.playerSystem.players.delete(player.name);
+    this.locations.set(playerId, index);
+    this.stats.entered++;
+    return this.post(index, MSG.ENTER, {
+      playerId,
+      player: serializePlayer(player),
+      greeting,
+      pending: []
+    });
+  }
+
+  /**
+   * A new session took over a player already in the world
+   */
+  reconnect(playerId, greeting) {
+    return this.post(this.locations.get(playerId), MSG.RECONNECT, { playerId, greeting });
+  }
+
+  /**
+   * Send one input line to the shard hosting the player
+   */
+  input(playerId, line) {
+    return this.post(this.locations.get(playerId), MSG.INPUT, { playerId, line });
+  }
+
+  /**
+   * Take a player out of the world (their session is gone)
+   */
+  leave(playerId) {
+    const index = this.locations.get(playerId);
+    if (index === undefined) return;
+    this.locations.delete(playerId);
+    this.post(index, MSG.LEAVE, { playerId });
+  }
+
+  /**
+   * Per-shard load table (gateway view)
+   */
+  getLoads() {
+    const players = new Array(this.size).fill(0);
+    for (const index of this.locations.values()) players[index]++;
+    return this.shards.map(shard => ({
+      index: shard.index,
+      ready: shard.ready,
+      areas: shard.areas.length,
+      rooms: shard.rooms,
+      players: players[shard.index],
+      restarts: shard.restarts,
+      ...(shard.load || {})
+    }));
+  }
+
+  /**
+   * Send the load table to every shard (read by the SHARDS command)
+   */
+  shareLoads() {
+    const table = { shards: this.getLoads(), stats: { ...this.stats } };
+    for (const shard of this.shards) {
+      if (shard.ready) this.post(shard.index, MSG.LOADS, table);
+    }
+  }
+
+  /**
+   * Ask every shard to save its players and flush writes, then end the workers
+   * @returns {Promise<void>}
+   */
+  async stop() {
+    this.stopped = true;
+    if (this.loadTimer) {
+      clearInterval(this.loadTimer);
+      this.loadTimer = null;
+    }
+
+    await Promise.all(this.shards.map(shard => {
+      const worker = shard.worker;
+      if (!worker) return null;
+      return new Promise(resolve => {
+        const timer = setTimeout(() => {
+          log.warn('Shard did not stop in time', { shard: shard.index });
+          worker.terminate().then(resolve, resolve);
+        }, SHARDING.stopTimeoutMs);
+        worker.once('exit', () => {
+          clearTimeout(timer);
+          resolve();
+        });
+        worker.postMessage({ type: MSG.STOP });
+      });
+    }));
+  }
+}
+
+module.exports = ShardManager;
@@ -2,6 +2,7 @@
 
 const databaseManager = require('../adapters/db/mongoClient');
 const BASE_WEAPONS = require('../data/base-weapons');
+const random = require('../utils/random');
 
 /**
  * Weapon System
@@ -87,7 +88,7 @@ class WeaponSystem {
    */
   rollDamage(weapon) {
     const range = this.getDamageRange(weapon);
-    return Math.floor(Math.random() * (range.max - range.min + 1)) + range.min;
+    return random.int(range.min, range.max);
   }
 
   /**
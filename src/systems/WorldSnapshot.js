@@ -0,0 +1,151 @@
+'use strict';
+
+const fs = require('fs');
+const path = require('path');
+const v8 = require('v8');
+const zlib = require('zlib');
+const { promisify } = require('util');
+const { serializePlayer } = require('../utils/playerState');
+const log = require('../utils/logger').child('snapshot');
+
+const gzip = promisify(zlib.gzip);
+
+const FORMAT = 1; // Bump when the snapshot layout changes; older files are ignored
+
+/**
+ * World Snapshot
+ * Saves live world state on shutdown and restores it on the next start, so a
+ * redeploy keeps the world as it was and skips the cold load from MongoDB.
+ *
+ * Contents: areas, rooms (with the items lying in them) and item display names;
+ * active NPCs (health, roundtime, wounds) with their definitions; the players
+ * who were online (wounds, roundtime) so they can reconnect in place; and world
+ * writes the final flush could not apply.
+ *
+ * The file is v8-serialized (dates survive) and gzipped, written under a
+ * temporary name and renamed, and used once: it is removed when read. The world
+ * in a snapshot older than maxAgeMs or from another shard layout is ignored and
+ * loads from the database as usual, but its unflushed writes are still applied;
+ * a snapshot of another format is ignored entirely.
+ * SNAPSHOT=off disables saving and restoring (e.g. after editing rooms offline).
+ */
+class WorldSnapshot {
+  /**
+   * @param {Object} options
+   * @param {boolean} options.enabled - Save and restore (default: unless SNAPSHOT=off)
+   * @param {string} options.file - Snapshot path (default: SNAPSHOT_FILE env or data/world-snapshot.bin.gz)
+   * @param {number} options.maxAgeMs - Oldest snapshot restored (default: SNAPSHOT_MAX_AGE_MS env or 10 minutes)
+   */
+  constructor(options = {}) {
+    this.enabled = options.enabled ?? process.env.SNAPSHOT !== 'off';
+    this.file = options.file || process.env.SNAPSHOT_FILE || path.join(__dirname, '../../data/world-snapshot.bin.gz');
+    this.maxAgeMs = options.maxAgeMs || parseInt(process.env.SNAPSHOT_MAX_AGE_MS, 10) || 10 * 60 * 1000;
+  }
+
+  /**
+   * Snapshot path for an engine (each area shard keeps its own)
+   */
+  pathFor(engine) {
+    if (!engine.shard) return this.file;
+    return this.file.replace(/(\.[^./]+)*$/, ext => `-shard-${engine.shard.index}${ext}`);
+  }
+
+  /**
+   * Which part of the world an engine runs; a snapshot only restores into the same layout
+   */
+  static layoutOf(engine) {
+    return engine.shard ? JSON.stringify([engine.shard.index, engine.shard.assignment]) : null;
+  }
+
+  /**
+   * Capture the live world (before the engine stops; save() adds the unflushed writes)
+   */
+  capture(engine) {
+    const started = Date.now();
+    const state = {
+      format: FORMAT,
+      savedAt: started,
+      layout: WorldSnapshot.layoutOf(engine),
+      world: engine.roomSystem.exportRooms(),
+      npcs: engine.npcSystem.exportNPCs(),
+      players: Array.from(engine.players.values(), serializePlayer),
+      pending: null
+    };
+    state.captureMs = Date.now() - started;
+    return state;
+  }
+
+  /**
+   * Write a captured snapshot
+   * @param {Object} state - From capture()
+   * @param {Object} pending - PersistenceQueue.exportPending() after the final flush
+   * @returns {Promise<Object>} { file, bytes, ms }
+   */
+  async save(engine, state, pending) {
+    const started = Date.now();
+    state.pending = pending;
+    const data = await gzip(v8.serialize(state));
+    const file = this.pathFor(engine);
+    await fs.promises.mkdir(path.dirname(file), { recursive: true });
+    // Write then rename, so a start never reads a half-written file
+    await fs.promises.writeFile(`${file}.tmp`, data);
+    await fs.promises.rename(`${file}.tmp`, file);
+
+    const ms = state.captureMs + Date.now() - started;
+    log.info('Saved world snapshot', {
+      file,
+      kb: Math.round(data.length / 1024),
+      ms,
+      rooms: state.world.rooms.length,
+      npcs: state.npcs.npcs.length,
+      players: state.players.length
+    });
+    return { file, bytes: data.length, ms };
+  }
+
+  /**
+   * Read the snapshot for an engine
+   * @returns {Object} { state, pending }: state is the snapshot to restore the world from
+   *   (null to load it from the database); pending holds the writes the previous
+   *   process could not flush, kept even when the world is not restored
+   */
+  load(engine) {
+    const none = { state: null, pending: null };
+    if (!this.enabled) return none;
+    const file = this.pathFor(engine);
+    let data;
+    try {
+      data = fs.readFileSync(file);
+    } catch (error) {
+      return none; // No snapshot: a cold start
+    }
+    // Used at most once: a later crash restart must not roll the world back
+    fs.rmSync(file, { force: true });
+
+    let state;
+    try {
+      state = v8.deserialize(zlib.gunzipSync(data));
+    } catch (error) {
+      log.warn('Ignoring unreadable world snapshot', { file, error: error.message });
+      return none;
+    }
+    if (state.format !== FORMAT) {
+      log.warn('Ignoring world snapshot of another format', { file, format: state.format });
+      return none;
+    }
+
+    const ageMs = Date.now() - state.savedAt;
+    let reason = null;
+    if (ageMs > this.maxAgeMs) reason = 'stale';
+    else if (state.layout !== WorldSnapshot.layoutOf(engine)) reason = 'layout';
+    if (reason) {
+      log.info('Ignoring world in snapshot, applying its pending writes', { file, reason, ageMs });
+      return { state: null, pending: state.pending };
+    }
+
+    log.info('Restoring world snapshot', { file, ageMs, kb: Math.round(data.length / 1024) });
+    return { state, pending: state.pending };
+  }
+}
+
+module.exports = WorldSnapshot;
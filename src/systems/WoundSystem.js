@@ -1,5 +1,7 @@
 'use strict';
 
+const DerivedStats = require('../services/derivedStats');
+
 /**
  * Wound System
  * Manages wounds, scars, and their penalties
@@ -201,6 +203,7 @@ class WoundSystem {
         rank: rank,
         timestamp: Date.now()
       };
+      DerivedStats.invalidate(character, 'wounds');
     }
   }
 
@@ -226,6 +229,7 @@ class WoundSystem {
           timestamp: Date.now()
         };
       }
+      DerivedStats.invalidate(character, 'wounds');
     }
   }
 
@@ -444,6 +448,8 @@ class WoundSystem {
       healed = true;
     }
     
+    if (healed) DerivedStats.invalidate(character, 'wounds');
+
     return {
       healed,
       healedWound,
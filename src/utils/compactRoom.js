@@ -0,0 +1,226 @@
+'use strict';
+
+/**
+ * Compact Room
+ * The in-memory form of a room document.
+ *
+ * Only what the game reads is kept: id, area, title, description, exits,
+ * items, NPC spawn references, features and gameplay metadata. Mongo's _id,
+ * canonical_id, import bookkeeping and per-exit extras stay in the database
+ * (RoomSystem.getRoomDocument fetches the full document for editing).
+ * Titles, descriptions, area IDs, exit directions and exit targets are
+ * interned while loading, so the many rooms sharing a description or pointing
+ * at the same room hold one string.
+ *
+ * Exits are resolved without scanning:
+ *   exitSlots  - compass direction slot (constants/directions) -> exit index
+ *   exitNames  - named exits ("old well"): exact names, their prefixes and their
+ *                trailing words ("well") -> exit index; null if the room has none
+ */
+
+const { DIRECTION_ALIASES, EXIT_DIRECTIONS, DIRECTION_SLOTS } = require('../constants/directions');
+
+const EMPTY = Object.freeze([]);
+const EMPTY_METADATA = Object.freeze({});
+
+// Metadata written by importers that nothing reads at runtime
+const IMPORT_METADATA = new Set(['importedAt', 'source', 'originalFormat', 'tags']);
+
+// Room fields the loader leaves in the database (the editor reads the full document)
+const ROOM_PROJECTION = Object.freeze({
+  _id: 0,
+  canonical_id: 0,
+  ...Object.fromEntries(Array.from(IMPORT_METADATA, key => [`metadata.${key}`, 0]))
+});
+
+// Named-exit index values hold the match kind in the low two bits and the exit index
+// above them, so any number of exits fits
+const KIND_BITS = 2;
+const KIND_MASK = 0b11;
+const EXACT = 0;
+const PREFIX = 1;
+const TAIL = 2;
+
+const hasOwn = (object, key) => Object.prototype.hasOwnProperty.call(object, key);
+
+// Abbreviated compass direction -> slots it can stand for ("nor" -> north, northeast, northwest)
+const DIRECTION_PREFIXES = new Map();
+EXIT_DIRECTIONS.forEach((direction, slot) => {
+  for (let length = 1; length < direction.length; length++) {
+    const prefix = direction.slice(0, length);
+    if (!DIRECTION_PREFIXES.has(prefix)) DIRECTION_PREFIXES.set(prefix, []);
+    DIRECTION_PREFIXES.get(prefix).push(slot);
+  }
+});
+
+/**
+ * String intern pool used while loading rooms
+ */
+class StringPool {
+  constructor() {
+    this.strings = new Map();
+  }
+
+  intern(value) {
+    if (typeof value !== 'string') return value;
+    const interned = this.strings.get(value);
+    if (interned !== undefined) return interned;
+    this.strings.set(value, value);
+    return value;
+  }
+
+  clear() {
+    this.strings.clear();
+  }
+
+  get size() {
+    return this.strings.size;
+  }
+}
+
+function slotOf(direction) {
+  const lower = direction.toLowerCase();
+  return hasOwn(DIRECTION_SLOTS, lower) ? DIRECTION_SLOTS[lower] : -1;
+}
+
+/**
+ * Index of named (non-compass) exits; null when the room has none
+ * Earlier keys win: exact names, then prefixes, then trailing words (shortest exit first)
+ */
+function buildNameIndex(exits) {
+  const named = [];
+  exits.forEach((exit, exitIndex) => {
+    if (slotOf(exit.direction) === -1) named.push([exit.direction.toLowerCase(), exitIndex]);
+  });
+  if (named.length === 0) return null;
+
+  const index = new Map();
+  const add = (key, exitIndex, kind) => {
+    if (!index.has(key)) index.set(key, (exitIndex << KIND_BITS) | kind);
+  };
+  for (const [name, exitIndex] of named) {
+    add(name, exitIndex, EXACT);
+  }
+  for (const [name, exitIndex] of named) {
+    for (let length = 1; length < name.length; length++) add(name.slice(0, length), exitIndex, PREFIX);
+  }
+  // "well" matches "old well"; prefer the shortest (most specific) exit
+  const byLength = named.slice().sort((a, b) => a[0].length - b[0].length);
+  for (const [name, exitIndex] of byLength) {
+    for (let space = name.indexOf(' '); space !== -1; space = name.indexOf(' ', space + 1)) {
+      add(name.slice(space + 1), exitIndex, TAIL);
+    }
+  }
+  return index;
+}
+
+/**
+ * Gameplay metadata (node flags, town flags, ...) without import bookkeeping
+ */
+function compactMetadata(metadata) {
+  if (!metadata || typeof metadata !== 'object') return EMPTY_METADATA;
+  let kept = null;
+  for (const key of Object.keys(metadata)) {
+    if (IMPORT_METADATA.has(key)) continue;
+    if (!kept) kept = {};
+    kept[key] = metadata[key];
+  }
+  return kept || EMPTY_METADATA;
+}
+
+/**
+ * Build the in-memory form of a room document
+ * @param {Object} doc - Room document
+ * @param {StringPool} pool - Intern pool
+ * @returns {Object} Compact room
+ */
+function compactRoom(doc, pool) {
+  const exits = [];
+  for (const exit of Array.isArray(doc.exits) ? doc.exits : EMPTY) {
+    if (!exit || typeof exit.direction !== 'string' || !exit.direction) continue;
+    exits.push({
+      direction: pool.intern(exit.direction),
+      roomId: pool.intern(exit.roomId),
+      hidden: !!exit.hidden,
+      requiresClimb: !!exit.requiresClimb
+    });
+  }
+
+  let exitSlots = null;
+  exits.forEach((exit, exitIndex) => {
+    const slot = slotOf(exit.direction);
+    if (slot === -1) return;
+    if (!exitSlots) exitSlots = new Array(EXIT_DIRECTIONS.length).fill(-1);
+    if (exitSlots[slot] === -1) exitSlots[slot] = exitIndex;
+  });
+
+  return {
+    id: pool.intern(doc.id),
+    areaId: pool.intern(doc.areaId),
+    title: pool.intern(doc.title),
+    description: pool.intern(doc.description),
+    exits,
+    exitSlots,
+    exitNames: buildNameIndex(exits),
+    items: Array.isArray(doc.items) ? doc.items : [],
+    npcs: Array.isArray(doc.npcs) && doc.npcs.length > 0 ? doc.npcs : EMPTY,
+    features: Array.isArray(doc.features) && doc.features.length > 0 ? doc.features : EMPTY,
+    metadata: compactMetadata(doc.metadata)
+  };
+}
+
+/**
+ * Resolve what a player typed to one of a room's exits
+ * Compass directions and shortcuts, then exact exit names, then prefixes
+ * ("nor", "gat") and trailing words ("well" for "old well"); a substring scan
+ * over the room's exits is the last resort
+ * @param {Object} room - Compact room
+ * @param {string} input - Direction or exit name
+ * @returns {Object|null} Exit
+ */
+function findExit(room, input) {
+  if (!room || typeof input !== 'string') return null;
+  const key = input.trim().toLowerCase();
+  if (!key) return null;
+  const exits = room.exits;
+  const exitSlots = room.exitSlots;
+
+  if (exitSlots && hasOwn(DIRECTION_ALIASES, key)) {
+    const exitIndex = exitSlots[DIRECTION_SLOTS[DIRECTION_ALIASES[key]]];
+    if (exitIndex >= 0) return exits[exitIndex];
+  }
+
+  let best = -1;
+  let bestKind = Infinity;
+  const entry = room.exitNames ? room.exitNames.get(key) : undefined;
+  if (entry !== undefined) {
+    best = entry >> KIND_BITS;
+    bestKind = entry & KIND_MASK;
+    if (bestKind === EXACT) return exits[best];
+  }
+
+  // Abbreviated compass direction: a prefix match like a named exit's; the earlier exit wins
+  const slots = exitSlots ? DIRECTION_PREFIXES.get(key) : undefined;
+  if (slots) {
+    for (const slot of slots) {
+      const exitIndex = exitSlots[slot];
+      if (exitIndex >= 0 && (bestKind > PREFIX || exitIndex < best)) {
+        best = exitIndex;
+        bestKind = PREFIX;
+      }
+    }
+  }
+  if (best >= 0) return exits[best];
+
+  for (const exit of exits) {
+    if (exit.direction.toLowerCase().includes(key)) return exit;
+  }
+  return null;
+}
+
+module.exports = {
+  ROOM_PROJECTION,
+  StringPool,
+  compactRoom,
+  findExit
+};
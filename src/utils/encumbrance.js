@@ -7,97 +7,37 @@
 
 const encumbranceService = require('../services/encumbrance');
 const { ENCUMBRANCE } = require('../constants/encumbrance');
+const EncumbranceLedger = require('../systems/EncumbranceLedger');
+
+const MAX_LEDGER_ENTRIES = 256; // Prune items no longer carried past this size
+
+const ledgers = new WeakMap(); // player -> EncumbranceLedger
 
 /**
- * Calculate carried weight (includes DB queries for items)
+ * Get (or create) a character's weight ledger
+ */
+function getLedger(player) {
+  let ledger = ledgers.get(player);
+  if (!ledger) {
+    ledger = new EncumbranceLedger();
+    ledgers.set(player, ledger);
+  }
+  return ledger;
+}
+
+/**
+ * Calculate carried weight from the ledger
+ * Only items never seen before are read from the database
  * @param {Object} player - Player object with gameEngine reference
  * @returns {Promise<number>} Total carried weight in pounds
  */
 async function getCarriedWeight(player) {
-  // Sum of held and worn items weights + container contents + silvers weight
-  let total = 0;
-  const db = player.gameEngine?.roomSystem?.db;
-  
-  // Check hands (now stores IDs)
-  const hands = [player.equipment?.rightHand, player.equipment?.leftHand];
-  for (const itemId of hands) {
-    if (itemId && typeof itemId === 'string' && db) {
-      try {
-        const item = await db.collection('items').findOne({ id: itemId });
-        if (item) {
-          const weight = item.metadata?.weight || item.metadata?.baseWeight;
-          if (typeof weight === 'number') {
-            total += weight;
-          }
-        }
-      } catch (_) {}
-    }
-  }
-  
-  // Add worn equipment weights (exclude main armor standard weight)
-  try {
-    const eq = player.equipment || {};
-    for (const key of Object.keys(eq)) {
-      if (key === 'rightHand' || key === 'leftHand') continue;
-      const itemId = eq[key];
-      if (!itemId || typeof itemId !== 'string') continue;
-      
-      // Fetch item from DB
-      if (db) {
-        try {
-          const item = await db.collection('items').findOne({ id: itemId });
-          if (!item) continue;
-          
-          const w = item.metadata?.weight || item.metadata?.baseWeight;
-          if (typeof w !== 'number') continue;
-          const isArmorMain = !!item.metadata?.armorGroup;
-          if (isArmorMain) {
-            // Skip main armor weight; capacity adjusted elsewhere
-            continue;
-          }
-          total += w;
-          
-          // Check if this item is a container and add its contents
-          if (item.type === 'CONTAINER' && item.metadata?.container && Array.isArray(item.metadata.items)) {
-            for (const containedId of item.metadata.items) {
-              if (typeof containedId !== 'string') continue;
-              try {
-                const containedItem = await db.collection('items').findOne({ id: containedId });
-                if (containedItem) {
-                  const containedWeight = containedItem.metadata?.weight || containedItem.metadata?.baseWeight;
-                  if (typeof containedWeight === 'number') {
-                    total += containedWeight;
-                  }
-                }
-              } catch (_) {}
-            }
-          }
-        } catch (_) {}
-      }
-    }
-  } catch (_) {}
-  
-  // Check inventory items
-  if (Array.isArray(player.inventory) && db) {
-    for (const itemId of player.inventory) {
-      if (typeof itemId !== 'string') continue;
-      try {
-        const item = await db.collection('items').findOne({ id: itemId });
-        if (item) {
-          const weight = item.metadata?.weight || item.metadata?.baseWeight;
-          if (typeof weight === 'number') {
-            total += weight;
-          }
-        }
-      } catch (_) {}
-    }
-  }
-  
-  // Add currency weight
+  const ledger = getLedger(player);
+  await ledger.sync(player.gameEngine?.roomSystem?.db, player);
+  if (ledger.size > MAX_LEDGER_ENTRIES) ledger.prune(player);
+
   const silvers = player.attributes?.currency?.silver || 0;
-  total += encumbranceService.currencyWeight(silvers);
-  
-  return total;
+  return ledger.carried(player) + encumbranceService.currencyWeight(silvers);
 }
 
 /**
@@ -134,6 +74,43 @@ async function recalcEncumbrance(player) {
   } catch (_) {}
 }
 
+/**
+ * Rebuild a character's ledger from the database and correct any drift
+ * Drift is the rebuilt carried weight minus what the old ledger had recorded
+ * @returns {Promise<Object>} { carried, drift } in pounds
+ */
+async function verifyEncumbrance(player) {
+  const before = player.attributes?.encumbrance?.carried;
+  ledgers.set(player, new EncumbranceLedger());
+  await recalcEncumbrance(player);
+  const carried = player.attributes?.encumbrance?.carried;
+  return {
+    carried,
+    drift: typeof before === 'number' && typeof carried === 'number' ? carried - before : 0
+  };
+}
+
+/**
+ * Tell the ledger about an item document a command already has
+ */
+function noteItem(player, item) {
+  getLedger(player).learn(item);
+}
+
+/**
+ * An item was put into one of the character's containers
+ */
+function noteContainerAdd(player, containerId, item) {
+  getLedger(player).containerAdded(containerId, item);
+}
+
+/**
+ * An item was taken out of one of the character's containers
+ */
+function noteContainerRemove(player, containerId, itemId) {
+  getLedger(player).containerRemoved(containerId, itemId);
+}
+
 // Re-export pure functions for convenience
 const getBodyWeight = encumbranceService.getBodyWeight;
 const getUnencumberedCapacity = encumbranceService.getUnencumberedCapacity;
@@ -144,6 +121,12 @@ module.exports = {
   getCarriedWeight,
   getEncumbrancePercent,
   recalcEncumbrance,
+  verifyEncumbrance,
+
+  // Ledger updates from inventory commands
+  noteItem,
+  noteContainerAdd,
+  noteContainerRemove,
   
   // Re-exported pure functions
   getBodyWeight,
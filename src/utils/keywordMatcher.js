@@ -1,78 +1,234 @@
 'use strict';
 
+/**
+ * Keyword Matcher
+ * Shared matching for items, NPCs, exits and players.
+ *
+ * Each target's name (or exit direction) and keywords are normalized once and
+ * kept in a WeakMap next to the object, so matching a search against a list of
+ * candidates compares precomputed lower-case strings without allocating per
+ * candidate. The normalized form is rebuilt only if the name or keywords change.
+ * Searches are compiled once per input ("other iron chest" -> terms + OTHER flag).
+ */
+
+const EMPTY = Object.freeze([]);
+const MAX_CACHED_SEARCHES = 256;
+const MAX_CACHED_NAMES = 10000;
+
+const matchKeys = new WeakMap(); // target -> normalized name and keywords
+const compiledSearches = new Map(); // raw search -> compiled search
+const lowerNames = new Map(); // raw name -> lower-case name (for findByName)
+
+/**
+ * Get the normalized name and keywords of an item, NPC or exit
+ * Built on first use and reused until the name or keywords change
+ */
+function getMatchKey(target) {
+  const source = target.name ?? target.direction ?? target.npcId ?? '';
+  const keywordSource = Array.isArray(target.keywords) ? target.keywords : null;
+  const keywordCount = keywordSource ? keywordSource.length : 0;
+
+  let key = matchKeys.get(target);
+  if (!key) {
+    // Instances built on a shared template (NPCs) use the template's key
+    const proto = Object.getPrototypeOf(target);
+    if (proto && proto !== Object.prototype) key = matchKeys.get(proto);
+  }
+  if (key && key.source === source && key.keywordSource === keywordSource && key.keywordCount === keywordCount) {
+    return key;
+  }
+
+  const keywords = keywordSource ? keywordSource.map(k => String(k).toLowerCase()) : EMPTY;
+  key = {
+    source,
+    keywordSource,
+    keywordCount,
+    name: String(source).toLowerCase(),
+    keywords,
+    keywordSet: new Set(keywords)
+  };
+  matchKeys.set(target, key);
+  return key;
+}
+
+/**
+ * Normalize targets up front (called when NPCs spawn and rooms load)
+ */
+function indexKeywords(targets) {
+  for (const target of targets) {
+    if (target && typeof target === 'object') getMatchKey(target);
+  }
+}
+
+/**
+ * Compile a search string into lower-case terms and the OTHER flag
+ * "other iron chest" / "iron chest other" -> { terms: ['iron', 'chest'], other: true }
+ */
+function compileSearch(searchTerm) {
+  let search = compiledSearches.get(searchTerm);
+  if (search) return search;
+
+  const words = String(searchTerm).toLowerCase().split(/\s+/).filter(Boolean);
+  // Only a separate word counts as OTHER, and never the whole search ("look other")
+  const otherIndex = words.length > 1 ? words.indexOf('other') : -1;
+  if (otherIndex !== -1) words.splice(otherIndex, 1);
+
+  search = Object.freeze({
+    terms: Object.freeze(words),
+    text: words.join(' '),
+    other: otherIndex !== -1
+  });
+
+  if (compiledSearches.size >= MAX_CACHED_SEARCHES) compiledSearches.clear();
+  compiledSearches.set(searchTerm, search);
+  return search;
+}
+
+/**
+ * Whether one lower-case term matches a normalized key
+ * (substring of the name, or keyword overlap in either direction)
+ */
+function termMatches(key, term) {
+  if (key.keywordSet.has(term) || key.name.includes(term)) return true;
+  const keywords = key.keywords;
+  for (let i = 0; i < keywords.length; i++) {
+    if (keywords[i].includes(term) || term.includes(keywords[i])) return true;
+  }
+  return false;
+}
+
+/**
+ * Whether every term of a compiled search matches a target
+ */
+function matchesSearch(search, target) {
+  const terms = search.terms;
+  if (terms.length === 0) return false;
+  const key = getMatchKey(target);
+  for (let i = 0; i < terms.length; i++) {
+    if (!termMatches(key, terms[i])) return false;
+  }
+  return true;
+}
+
+/**
+ * Whether a lower-case phrase appears in a target's name or one of its keywords
+ */
+function matchesText(target, lowerText) {
+  const key = getMatchKey(target);
+  if (key.name.includes(lowerText)) return true;
+  const keywords = key.keywords;
+  for (let i = 0; i < keywords.length; i++) {
+    if (keywords[i].includes(lowerText)) return true;
+  }
+  return false;
+}
+
 /**
  * Matches an item search term against item names and keywords
  * Supports partial matches and multi-word search terms
- * 
+ *
  * @param {Array} searchTerms - Array of search keywords (e.g., ['iron', 'chest'])
  * @param {Object} item - Item with name, keywords fields
  * @returns {boolean} - True if all search terms match
  */
 function matchItemKeywords(searchTerms, item) {
   if (!searchTerms || searchTerms.length === 0) return false;
-  
-  const itemName = (item.name || '').toLowerCase();
-  const itemKeywords = (item.keywords || []).map(k => k.toLowerCase());
-  const allItemText = [itemName, ...itemKeywords].join(' ');
-  
-  // Check if all search terms appear somewhere in the item's text
-  return searchTerms.every(term => {
-    const searchLower = term.toLowerCase();
-    return itemName.includes(searchLower) || 
-           itemKeywords.some(kw => kw.includes(searchLower) || searchLower.includes(kw));
-  });
+  return matchesSearch(compileSearch(searchTerms.join(' ')), item);
 }
 
 /**
  * Filters a list of items to those that match the search keywords
- * 
+ *
  * @param {Array} items - List of items to filter
  * @param {string} searchTerm - User's search string (e.g., "iron chest")
  * @returns {Array} - Matching items
  */
 function filterItemsByKeywords(items, searchTerm) {
   if (!searchTerm || !items) return [];
-  
-  const searchTerms = searchTerm.toLowerCase().split(/\s+/);
-  
-  return items.filter(item => matchItemKeywords(searchTerms, item));
+  const search = compileSearch(searchTerm);
+  return items.filter(item => item && matchesSearch(search, item));
+}
+
+/**
+ * Find the first match of a search in a candidate list, or the second one for OTHER
+ * (OTHER falls back to the first match when there is only one)
+ *
+ * @param {string|Object} searchTerm - User's search string, or a compiled search
+ * @param {Iterable} candidates - Items, NPCs or exits
+ * @returns {Object|null}
+ */
+function findMatch(searchTerm, candidates) {
+  if (!searchTerm || !candidates) return null;
+  const search = typeof searchTerm === 'string' ? compileSearch(searchTerm) : searchTerm;
+
+  let first = null;
+  for (const candidate of candidates) {
+    if (!candidate || !matchesSearch(search, candidate)) continue;
+    if (!search.other) return candidate;
+    if (first) return candidate;
+    first = candidate;
+  }
+  return first;
 }
 
 /**
  * Handles "OTHER" keyword to reference the second item in a list
  * If OTHER is in the search term, it returns the second matching item instead of the first
- * 
+ *
  * @param {string} searchTerm - User's search string
  * @param {Array} items - List of items to search
  * @returns {Object|null} - The matching item, or null if not found
  */
 function findItemWithOther(searchTerm, items) {
-  if (!searchTerm || !items) return null;
-  
-  const searchLower = searchTerm.toLowerCase();
-  const isOther = searchLower.includes(' other');
-  
-  // Remove "other" from search term if present
-  const cleanSearchTerm = isOther ? searchTerm.replace(/\s*other\s*/i, '').trim() : searchTerm;
-  
-  // Filter matching items
-  const searchTerms = cleanSearchTerm.toLowerCase().split(/\s+/);
-  const matches = items.filter(item => matchItemKeywords(searchTerms, item));
-  
-  if (matches.length === 0) return null;
-  
-  // If "other" was used and we have at least 2 matches, return the second one
-  // Otherwise return the first match
-  if (isOther && matches.length >= 2) {
-    return matches[1];
+  return findMatch(searchTerm, items);
+}
+
+/**
+ * Lower-case a name through a bounded cache (names repeat across lookups)
+ */
+function lowerName(name) {
+  let lower = lowerNames.get(name);
+  if (lower === undefined) {
+    lower = name.toLowerCase();
+    if (lowerNames.size >= MAX_CACHED_NAMES) lowerNames.clear();
+    lowerNames.set(name, lower);
   }
-  
-  return matches[0];
+  return lower;
+}
+
+/**
+ * Find by name: exact match first, then starts with, then contains
+ * @param {string} search - Search term
+ * @param {Iterable} list - Candidates
+ * @param {Function} nameExtractor - Function to extract name from a candidate
+ * @returns {*} Best match or null
+ */
+function findByName(search, list, nameExtractor) {
+  if (!search || !list) return null;
+  const lowerSearch = lowerName(search);
+
+  let startsWith = null;
+  let contains = null;
+  for (const item of list) {
+    const name = nameExtractor(item);
+    if (!name) continue;
+    const lower = lowerName(name);
+    if (lower === lowerSearch) return item;
+    if (!startsWith && lower.startsWith(lowerSearch)) startsWith = item;
+    else if (!contains && lower.includes(lowerSearch)) contains = item;
+  }
+  return startsWith || contains;
 }
 
 module.exports = {
+  getMatchKey,
+  indexKeywords,
+  compileSearch,
+  matchesSearch,
+  matchesText,
   matchItemKeywords,
   filterItemsByKeywords,
-  findItemWithOther
+  findMatch,
+  findItemWithOther,
+  findByName
 };
-
@@ -0,0 +1,199 @@
+'use strict';
+
+const net = require('net');
+const WebSocket = require('ws');
+
+// Reply to a command refused because of roundtime; counts as the response to any command
+const ROUNDTIME_REPLY = /You must wait \d+ more second/;
+
+/**
+ * Load Client
+ * One scripted player connection for scripts/load-test.js, over Telnet or
+ * WebSocket. It logs in through the normal login prompts and sends commands,
+ * timing each one from the moment it is written to the moment its reply
+ * arrives.
+ *
+ * Replies are recognized by pattern, in order: the server runs one
+ * session's commands strictly in sequence, so the oldest outstanding command
+ * owns the next matching text. Text that matches nothing (other players
+ * talking or arriving, NPC attacks) is ignored.
+ */
+class LoadClient {
+  /**
+   * @param {Object} options - { transport: 'telnet'|'websocket', host, telnetPort, wsPort, timeoutMs }
+   */
+  constructor(options) {
+    this.options = options;
+    this.kind = options.transport;
+    this.socket = null;
+    this.buffer = '';
+    this.pending = []; // Outstanding commands, oldest first: { expect, sentAt, resolve, reject, timer }
+    this.closed = false;
+    this.exits = [];   // Exits of the last room seen, for walking
+    this.onClose = null;
+  }
+
+  /**
+   * Open the transport
+   */
+  connect() {
+    return new Promise((resolve, reject) => {
+      const { host, telnetPort, wsPort } = this.options;
+      const onData = data => this.receive(data.toString());
+      const onClose = () => this.handleClose();
+
+      if (this.kind === 'websocket') {
+        const ws = new WebSocket(`ws://${host}:${wsPort}`);
+        ws.once('open', () => resolve());
+        ws.once('error', reject);
+        ws.on('message', onData);
+        ws.on('close', onClose);
+        this.socket = ws;
+      } else {
+        const socket = net.connect({ host, port: telnetPort }, () => resolve());
+        socket.setNoDelay(true);
+        socket.once('error', reject);
+        socket.on('data', onData);
+        socket.on('close', onClose);
+        this.socket = socket;
+      }
+    });
+  }
+
+  /**
+   * Log in with an existing account and its first character
+   * @returns {Promise<number>} Milliseconds from the username prompt to the first room
+   */
+  async login(username, password) {
+    await this.waitFor(/account username\?/);
+    const started = performance.now();
+    const afterName = await this.command(username, /Enter your password|not found/);
+    if (/not found/.test(afterName)) {
+      throw new Error(`Account ${username} does not exist (run: load-test.js provision)`);
+    }
+    const afterPassword = await this.command(password, /Your choice:|Too many|Invalid|Try again/);
+    if (!/Your choice:/.test(afterPassword)) {
+      throw new Error(`Login failed for ${username}: ${afterPassword.trim().split('\r\n').pop()}`);
+    }
+    await this.command('1', /\[[^\]\r\n]+\]/);
+    return performance.now() - started;
+  }
+
+  /**
+   * Send one command and wait for its reply
+   * @param {string} line - Command text
+   * @param {RegExp} expect - Matches the reply
+   * @returns {Promise<string>} Server text up to and including the match
+   */
+  command(line, expect) {
+    return this.send(line, expect).then(result => result.text);
+  }
+
+  /**
+   * Send one command; resolves with { text, latencyMs } once the reply arrives
+   */
+  send(line, expect) {
+    if (this.closed) return Promise.reject(new Error('Connection closed'));
+    // Nothing received while no command was outstanding can be a reply
+    if (this.pending.length === 0) this.buffer = '';
+    return new Promise((resolve, reject) => {
+      const entry = { expect, sentAt: performance.now(), resolve, reject, timer: null };
+      entry.timer = setTimeout(() => {
+        const index = this.pending.indexOf(entry);
+        if (index >= 0) this.pending.splice(index, 1);
+        const error = new Error(`No reply to "${line}" within ${this.options.timeoutMs}ms`);
+        error.timeout = true;
+        reject(error);
+      }, this.options.timeoutMs);
+      this.pending.push(entry);
+      this.write(`${line}\r\n`);
+    });
+  }
+
+  /**
+   * Wait for server text without sending anything (e.g. the login banner)
+   */
+  waitFor(expect) {
+    return new Promise((resolve, reject) => {
+      const entry = { expect, sentAt: performance.now(), resolve: result => resolve(result.text), reject, timer: null };
+      entry.timer = setTimeout(() => {
+        const index = this.pending.indexOf(entry);
+        if (index >= 0) this.pending.splice(index, 1);
+        reject(new Error(`Timed out waiting for ${expect}`));
+      }, this.options.timeoutMs);
+      this.pending.push(entry);
+      this.match();
+    });
+  }
+
+  write(text) {
+    if (this.kind === 'websocket') {
+      this.socket.send(text);
+    } else {
+      this.socket.write(text);
+    }
+  }
+
+  /**
+   * Collect server output and settle the commands it answers
+   */
+  receive(text) {
+    this.buffer += text;
+    const exits = /Obvious (?:paths|exits): ([^\r\n]+)/.exec(text);
+    if (exits) {
+      this.exits = exits[1].split(',').map(exit => exit.trim().replace(/\.$/, '')).filter(Boolean);
+    }
+    this.match();
+  }
+
+  match() {
+    while (this.pending.length > 0 && this.buffer.length > 0) {
+      const head = this.pending[0];
+      const found = head.expect.exec(this.buffer) || ROUNDTIME_REPLY.exec(this.buffer);
+      if (!found) {
+        // Keep the tail only: a reply never needs more than the last few KB
+        if (this.buffer.length > 65536) this.buffer = this.buffer.slice(-16384);
+        return;
+      }
+      const end = found.index + found[0].length;
+      const reply = this.buffer.slice(0, end);
+      this.buffer = this.buffer.slice(end);
+      this.pending.shift();
+      clearTimeout(head.timer);
+      head.resolve({ text: reply, latencyMs: performance.now() - head.sentAt });
+    }
+    if (this.pending.length === 0 && this.buffer.length > 65536) {
+      this.buffer = '';
+    }
+  }
+
+  handleClose() {
+    if (this.closed) return;
+    this.closed = true;
+    for (const entry of this.pending.splice(0)) {
+      clearTimeout(entry.timer);
+      entry.reject(new Error('Connection closed'));
+    }
+    if (this.onClose) this.onClose(this);
+  }
+
+  /**
+   * Leave the game and close the connection
+   */
+  async quit() {
+    if (this.closed) return;
+    try {
+      this.write('quit\r\n');
+    } catch (_) {
+      // Already gone
+    }
+    await new Promise(resolve => setTimeout(resolve, 50));
+    if (this.kind === 'websocket') {
+      this.socket.close();
+    } else {
+      this.socket.end();
+    }
+  }
+}
+
+module.exports = LoadClient;
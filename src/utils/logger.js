@@ -0,0 +1,293 @@
+'use strict';
+
+const fs = require('fs');
+
+/**
+ * Logger Utility
+ * Leveled, per-subsystem logging with sampling, text or JSON output and an
+ * asynchronous buffered sink, for code on the command and combat hot paths.
+ *
+ * Usage:
+ *   const log = require('../utils/logger').child('combat');
+ *   log.debug('Damage applied', { target: target.name, damage });
+ *
+ * Disabled levels cost one comparison: messages and fields are only formatted
+ * for records that will actually be written.
+ *
+ * Configuration (environment, all optional):
+ *   LOG_LEVEL=info                       global level (error, warn, info, debug, trace, off)
+ *   LOG_SUBSYSTEMS=combat=debug,get=off  per-subsystem levels
+ *   LOG_FORMAT=text|json
+ */
+
+const LEVELS = Object.freeze({ off: -1, error: 0, warn: 1, info: 2, debug: 3, trace: 4 });
+const LEVEL_NAMES = ['error', 'warn', 'info', 'debug', 'trace'];
+
+const MAX_BUFFERED_RECORDS = 10000;
+
+/**
+ * Parse "a=debug,b=off" into a Map
+ */
+function parseSubsystemLevels(spec) {
+  const levels = new Map();
+  for (const part of (spec || '').split(',')) {
+    const [name, level] = part.split('=').map(s => s && s.trim().toLowerCase());
+    if (name && level in LEVELS) {
+      levels.set(name, LEVELS[level]);
+    }
+  }
+  return levels;
+}
+
+class Logger {
+  constructor() {
+    this.level = LEVELS[(process.env.LOG_LEVEL || 'info').toLowerCase()] ?? LEVELS.info;
+    this.subsystemLevels = parseSubsystemLevels(process.env.LOG_SUBSYSTEMS);
+    this.sampleRates = new Map(); // subsystem -> 0..1 (applies to info and below)
+    this.format = (process.env.LOG_FORMAT || 'text').toLowerCase() === 'json' ? 'json' : 'text';
+    this.children = new Map();
+
+    this.stdout = [];
+    this.stderr = [];
+    this.buffered = 0;
+    this.flushScheduled = false;
+    this.stats = {
+      written: 0,
+      dropped: 0,
+      sampledOut: 0
+    };
+
+    // Whatever is still buffered when the process exits is written synchronously
+    process.on('exit', () => this.flushSync());
+  }
+
+  /**
+   * Get (or create) the logger for a subsystem
+   */
+  child(subsystem) {
+    let child = this.children.get(subsystem);
+    if (!child) {
+      child = new SubsystemLogger(this, subsystem);
+      this.children.set(subsystem, child);
+    }
+    return child;
+  }
+
+  /**
+   * Set the global level, or one subsystem's level
+   * @returns {boolean} False if the level name is unknown
+   */
+  setLevel(level, subsystem = null) {
+    const value = LEVELS[String(level).toLowerCase()];
+    if (value === undefined) return false;
+
+    if (subsystem) {
+      this.subsystemLevels.set(subsystem, value);
+    } else {
+      this.level = value;
+    }
+    this.refreshChildren();
+    return true;
+  }
+
+  /**
+   * Go back to the global level for a subsystem
+   */
+  clearLevel(subsystem) {
+    this.subsystemLevels.delete(subsystem);
+    this.refreshChildren();
+  }
+
+  /**
+   * Keep only a fraction of a subsystem's info/debug/trace records (1 = keep all)
+   */
+  setSampleRate(subsystem, rate) {
+    const value = Math.max(0, Math.min(1, Number(rate)));
+    if (Number.isNaN(value)) return false;
+    if (value >= 1) {
+      this.sampleRates.delete(subsystem);
+    } else {
+      this.sampleRates.set(subsystem, value);
+    }
+    this.refreshChildren();
+    return true;
+  }
+
+  /**
+   * Switch between 'text' and 'json' output
+   */
+  setFormat(format) {
+    if (format !== 'text' && format !== 'json') return false;
+    this.format = format;
+    return true;
+  }
+
+  /**
+   * Recompute the cached threshold on every subsystem logger
+   */
+  refreshChildren() {
+    for (const child of this.children.values()) {
+      child.refresh();
+    }
+  }
+
+  /**
+   * Effective level for a subsystem
+   */
+  levelFor(subsystem) {
+    return this.subsystemLevels.has(subsystem) ? this.subsystemLevels.get(subsystem) : this.level;
+  }
+
+  /**
+   * Format a record and queue it for the sink
+   */
+  write(levelValue, subsystem, message, fields) {
+    if (this.buffered >= MAX_BUFFERED_RECORDS) {
+      this.stats.dropped++;
+      return;
+    }
+
+    const level = LEVEL_NAMES[levelValue];
+    const time = new Date().toISOString();
+    let line;
+
+    if (this.format === 'json') {
+      const record = { time, level, subsystem, msg: message };
+      if (fields instanceof Error) {
+        record.error = fields.message;
+        record.stack = fields.stack;
+      } else if (fields) {
+        Object.assign(record, fields);
+      }
+      line = safeStringify(record);
+    } else {
+      line = `${time} ${level.toUpperCase().padEnd(5)} [${subsystem}] ${message}`;
+      if (fields instanceof Error) {
+        line += ` ${fields.stack || fields.message}`;
+      } else if (fields) {
+        line += ' ' + Object.entries(fields)
+          .map(([key, value]) => `${key}=${typeof value === 'object' && value !== null ? safeStringify(value) : value}`)
+          .join(' ');
+      }
+    }
+
+    (levelValue <= LEVELS.warn ? this.stderr : this.stdout).push(line);
+    this.buffered++;
+    this.stats.written++;
+    this.scheduleFlush();
+  }
+
+  /**
+   * Write buffered records after the current event loop turn, in one write per stream
+   */
+  scheduleFlush() {
+    if (this.flushScheduled) return;
+    this.flushScheduled = true;
+    setImmediate(() => this.flush());
+  }
+
+  /**
+   * Hand buffered records to stdout/stderr
+   */
+  flush() {
+    this.flushScheduled = false;
+    if (this.stdout.length > 0) {
+      process.stdout.write(this.stdout.join('\n') + '\n');
+      this.stdout = [];
+    }
+    if (this.stderr.length > 0) {
+      process.stderr.write(this.stderr.join('\n') + '\n');
+      this.stderr = [];
+    }
+    this.buffered = 0;
+  }
+
+  /**
+   * Write buffered records synchronously (process exit)
+   */
+  flushSync() {
+    try {
+      if (this.stdout.length > 0) fs.writeSync(1, this.stdout.join('\n') + '\n');
+      if (this.stderr.length > 0) fs.writeSync(2, this.stderr.join('\n') + '\n');
+    } catch (error) {
+      // Nothing left to report to
+    }
+    this.stdout = [];
+    this.stderr = [];
+    this.buffered = 0;
+  }
+
+  /**
+   * Current configuration and counters
+   */
+  getStatus() {
+    const levelName = value => (value < 0 ? 'off' : LEVEL_NAMES[value]);
+    return {
+      level: levelName(this.level),
+      format: this.format,
+      subsystems: Object.fromEntries(Array.from(this.subsystemLevels, ([name, value]) => [name, levelName(value)])),
+      sampling: Object.fromEntries(this.sampleRates),
+      known: Array.from(this.children.keys()).sort(),
+      ...this.stats
+    };
+  }
+}
+
+/**
+ * Logger bound to one subsystem; caches its threshold so disabled calls return immediately
+ */
+class SubsystemLogger {
+  constructor(root, subsystem) {
+    this.root = root;
+    this.subsystem = subsystem;
+    this.refresh();
+  }
+
+  refresh() {
+    this.threshold = this.root.levelFor(this.subsystem);
+    this.sampleRate = this.root.sampleRates.has(this.subsystem) ? this.root.sampleRates.get(this.subsystem) : 1;
+  }
+
+  isEnabled(level) {
+    return LEVELS[level] <= this.threshold;
+  }
+
+  log(levelValue, message, fields) {
+    if (levelValue > this.threshold) return;
+    // Errors and warnings are never sampled out
+    if (levelValue > LEVELS.warn && this.sampleRate < 1 && Math.random() >= this.sampleRate) {
+      this.root.stats.sampledOut++;
+      return;
+    }
+    this.root.write(levelValue, this.subsystem, message, fields);
+  }
+
+  error(message, fields) { this.log(LEVELS.error, message, fields); }
+  warn(message, fields) { this.log(LEVELS.warn, message, fields); }
+  info(message, fields) { this.log(LEVELS.info, message, fields); }
+  debug(message, fields) { this.log(LEVELS.debug, message, fields); }
+  trace(message, fields) { this.log(LEVELS.trace, message, fields); }
+}
+
+/**
+ * JSON.stringify that tolerates cycles (game objects reference the engine)
+ */
+function safeStringify(value) {
+  const seen = new WeakSet();
+  try {
+    return JSON.stringify(value, (key, val) => {
+      if (typeof val === 'object' && val !== null) {
+        if (seen.has(val)) return '[Circular]';
+        seen.add(val);
+      }
+      return val;
+    });
+  } catch (error) {
+    return String(value);
+  }
+}
+
+const logger = new Logger();
+logger.LEVELS = LEVELS;
+
+module.exports = logger;
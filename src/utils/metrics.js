@@ -0,0 +1,388 @@
+'use strict';
+
+const { AsyncLocalStorage } = require('async_hooks');
+const { monitorEventLoopDelay } = require('perf_hooks');
+
+/**
+ * Metrics Utility
+ * Counters and HDR-style latency histograms for the engine, exported as
+ * Prometheus text (see adapters/http/metricsServer.js) and read by the
+ * admin METRICS command.
+ *
+ * Usage:
+ *   const metrics = require('../utils/metrics');
+ *   const commandLatency = metrics.histogram('gs3_command_duration_ms', 'Command latency');
+ *   const started = metrics.now();
+ *   ...
+ *   commandLatency.observe(metrics.since(started), { command: 'look' });
+ */
+
+// Log-linear buckets (like HdrHistogram): values are recorded in microseconds,
+// exactly below 16us, then 8 sub-buckets per power of two (about 12% precision)
+const SUB_BUCKETS = 8;
+const LINEAR_LIMIT = 16;
+const QUANTILES = [0.5, 0.9, 0.99];
+
+function bucketIndex(micros) {
+  if (micros < LINEAR_LIMIT) return Math.max(0, Math.floor(micros));
+  const exponent = Math.floor(Math.log2(micros));
+  const sub = Math.floor(micros / 2 ** (exponent - 3)) - SUB_BUCKETS;
+  return LINEAR_LIMIT + (exponent - 4) * SUB_BUCKETS + Math.min(SUB_BUCKETS - 1, sub);
+}
+
+function bucketUpperBound(index) {
+  if (index < LINEAR_LIMIT) return index + 1;
+  const offset = index - LINEAR_LIMIT;
+  const exponent = Math.floor(offset / SUB_BUCKETS) + 4;
+  const sub = offset % SUB_BUCKETS;
+  return (SUB_BUCKETS + sub + 1) * 2 ** (exponent - 3);
+}
+
+/**
+ * Stable key for a label set
+ */
+function labelKey(labels) {
+  if (!labels) return '';
+  const keys = Object.keys(labels);
+  if (keys.length === 0) return '';
+  keys.sort();
+  return keys.map(k => `${k}=${labels[k]}`).join(',');
+}
+
+function formatLabels(labels, extra = null) {
+  const all = { ...(labels || {}), ...(extra || {}) };
+  const parts = Object.entries(all).map(([k, v]) => `${k}="${String(v).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n')}"`);
+  return parts.length > 0 ? `{${parts.join(',')}}` : '';
+}
+
+class Counter {
+  constructor(name, help) {
+    this.name = name;
+    this.help = help;
+    this.type = 'counter';
+    this.series = new Map(); // labelKey -> { labels, value }
+  }
+
+  inc(labels = null, amount = 1) {
+    const key = labelKey(labels);
+    let series = this.series.get(key);
+    if (!series) {
+      series = { labels: labels ? { ...labels } : null, value: 0 };
+      this.series.set(key, series);
+    }
+    series.value += amount;
+  }
+
+  get(labels = null) {
+    const series = this.series.get(labelKey(labels));
+    return series ? series.value : 0;
+  }
+
+  reset() {
+    this.series.clear();
+  }
+
+  toPrometheus() {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} counter`];
+    for (const series of this.series.values()) {
+      lines.push(`${this.name}${formatLabels(series.labels)} ${series.value}`);
+    }
+    return lines.join('\n');
+  }
+}
+
+class Histogram {
+  /**
+   * @param {Object} options
+   * @param {number} options.resolution - Count exact values rounded to this step (1 = whole
+   *   numbers, 0.1 = tenths) instead of latency buckets; for small value ranges such as
+   *   damage or critical ranks. Memory grows with distinct values, not samples.
+   */
+  constructor(name, help, options = {}) {
+    this.name = name;
+    this.help = help;
+    this.type = 'histogram';
+    this.resolution = options.resolution || null;
+    this.steps = this.resolution ? 1 / this.resolution : 0; // Buckets per unit; dividing by it keeps 1.2 exact
+    this.series = new Map(); // labelKey -> { labels, buckets, count, sum, max }
+  }
+
+  /**
+   * Record a value (milliseconds, or any unit with a resolution)
+   */
+  observe(ms, labels = null) {
+    const key = labelKey(labels);
+    let series = this.series.get(key);
+    if (!series) {
+      series = { labels: labels ? { ...labels } : null, buckets: new Map(), count: 0, sum: 0, max: 0 };
+      this.series.set(key, series);
+    }
+    const index = this.resolution ? Math.round(ms * this.steps) : bucketIndex(Math.max(0, ms) * 1000);
+    series.buckets.set(index, (series.buckets.get(index) || 0) + 1);
+    series.count++;
+    series.sum += ms;
+    if (ms > series.max) series.max = ms;
+  }
+
+  /**
+   * Largest value a bucket holds
+   */
+  bucketValue(index) {
+    return this.resolution ? index / this.steps : bucketUpperBound(index) / 1000;
+  }
+
+  /**
+   * Value at quantile q (0..1) for one series; bucket upper bound, capped at the max seen
+   */
+  quantile(series, q) {
+    if (!series || series.count === 0) return 0;
+    const rank = Math.max(1, Math.ceil(q * series.count));
+    const indexes = Array.from(series.buckets.keys()).sort((a, b) => a - b);
+    let seen = 0;
+    for (const index of indexes) {
+      seen += series.buckets.get(index);
+      if (seen >= rank) {
+        return Math.min(series.max, this.bucketValue(index));
+      }
+    }
+    return series.max;
+  }
+
+  /**
+   * [value, count] pairs of one series in ascending value order
+   */
+  entries(labels = null) {
+    const series = this.series.get(labelKey(labels));
+    if (!series) return [];
+    return Array.from(series.buckets.keys())
+      .sort((a, b) => a - b)
+      .map(index => [this.bucketValue(index), series.buckets.get(index)]);
+  }
+
+  /**
+   * Add another histogram's series (same bucketing) into this one, e.g. from a worker thread
+   */
+  merge(other) {
+    for (const [key, source] of other.series) {
+      let series = this.series.get(key);
+      if (!series) {
+        series = { labels: source.labels ? { ...source.labels } : null, buckets: new Map(), count: 0, sum: 0, max: 0 };
+        this.series.set(key, series);
+      }
+      for (const [index, count] of source.buckets) {
+        series.buckets.set(index, (series.buckets.get(index) || 0) + count);
+      }
+      series.count += source.count;
+      series.sum += source.sum;
+      if (source.max > series.max) series.max = source.max;
+    }
+    return this;
+  }
+
+  /**
+   * Plain data, to pass between threads or write to a file (see fromJSON)
+   */
+  toJSON() {
+    return {
+      name: this.name,
+      help: this.help,
+      resolution: this.resolution,
+      series: Array.from(this.series, ([key, series]) => [key, { ...series, buckets: Array.from(series.buckets) }])
+    };
+  }
+
+  static fromJSON(data) {
+    const histogram = new Histogram(data.name, data.help, { resolution: data.resolution });
+    for (const [key, series] of data.series) {
+      histogram.series.set(key, { ...series, buckets: new Map(series.buckets) });
+    }
+    return histogram;
+  }
+
+  /**
+   * Summary of every series: count, mean, p50/p90/p99, max
+   */
+  summarize() {
+    return Array.from(this.series.values()).map(series => ({
+      labels: series.labels || {},
+      count: series.count,
+      mean: series.count > 0 ? series.sum / series.count : 0,
+      p50: this.quantile(series, 0.5),
+      p90: this.quantile(series, 0.9),
+      p99: this.quantile(series, 0.99),
+      max: series.max
+    }));
+  }
+
+  get(labels = null) {
+    const series = this.series.get(labelKey(labels));
+    if (!series) return null;
+    return {
+      count: series.count,
+      mean: series.count > 0 ? series.sum / series.count : 0,
+      p50: this.quantile(series, 0.5),
+      p90: this.quantile(series, 0.9),
+      p99: this.quantile(series, 0.99),
+      max: series.max
+    };
+  }
+
+  reset() {
+    this.series.clear();
+  }
+
+  // Exported as a Prometheus summary: quantiles are computed here from the buckets
+  toPrometheus() {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} summary`];
+    for (const series of this.series.values()) {
+      for (const q of QUANTILES) {
+        lines.push(`${this.name}${formatLabels(series.labels, { quantile: q })} ${this.quantile(series, q)}`);
+      }
+      lines.push(`${this.name}_sum${formatLabels(series.labels)} ${series.sum}`);
+      lines.push(`${this.name}_count${formatLabels(series.labels)} ${series.count}`);
+    }
+    return lines.join('\n');
+  }
+}
+
+class Metrics {
+  constructor() {
+    this.metrics = new Map();
+    this.gauges = new Map(); // name -> { help, collect: () => number | [{ labels, value }] }
+    this.context = new AsyncLocalStorage();
+    this.eventLoop = null;
+    this.eventLoopWindow = { p50: 0, p99: 0, max: 0 };
+    this.eventLoopTimer = null;
+  }
+
+  counter(name, help) {
+    return this.getOrCreate(name, () => new Counter(name, help));
+  }
+
+  histogram(name, help, options = {}) {
+    return this.getOrCreate(name, () => new Histogram(name, help, options));
+  }
+
+  getOrCreate(name, create) {
+    let metric = this.metrics.get(name);
+    if (!metric) {
+      metric = create();
+      this.metrics.set(name, metric);
+    }
+    return metric;
+  }
+
+  /**
+   * Register a gauge read at export time
+   * collect() returns a number, or an array of { labels, value }
+   */
+  gauge(name, help, collect) {
+    this.gauges.set(name, { help, collect });
+  }
+
+  /**
+   * High resolution timestamp for since()
+   */
+  now() {
+    return process.hrtime.bigint();
+  }
+
+  /**
+   * Milliseconds elapsed since a now() timestamp
+   */
+  since(started) {
+    return Number(process.hrtime.bigint() - started) / 1e6;
+  }
+
+  /**
+   * Run fn with a per-operation context (e.g. to count DB round trips of one command)
+   */
+  runWithContext(store, fn) {
+    return this.context.run(store, fn);
+  }
+
+  /**
+   * Context of the operation currently running, if any
+   */
+  currentContext() {
+    return this.context.getStore();
+  }
+
+  /**
+   * Start sampling event loop delay; each window's percentiles are kept for export
+   */
+  startEventLoopMonitor(windowMs = 10000) {
+    if (this.eventLoop) return;
+    this.eventLoop = monitorEventLoopDelay({ resolution: 20 });
+    this.eventLoop.enable();
+    this.eventLoopTimer = setInterval(() => {
+      const h = this.eventLoop;
+      this.eventLoopWindow = {
+        p50: h.percentile(50) / 1e6,
+        p99: h.percentile(99) / 1e6,
+        max: h.max / 1e6
+      };
+      h.reset();
+    }, windowMs);
+    if (this.eventLoopTimer.unref) this.eventLoopTimer.unref();
+
+    this.gauge('gs3_event_loop_lag_ms', 'Event loop delay over the last window', () => [
+      { labels: { quantile: 0.5 }, value: this.eventLoopWindow.p50 },
+      { labels: { quantile: 0.99 }, value: this.eventLoopWindow.p99 },
+      { labels: { quantile: 1 }, value: this.eventLoopWindow.max }
+    ]);
+  }
+
+  stopEventLoopMonitor() {
+    if (this.eventLoopTimer) clearInterval(this.eventLoopTimer);
+    if (this.eventLoop) this.eventLoop.disable();
+    this.eventLoopTimer = null;
+    this.eventLoop = null;
+  }
+
+  /**
+   * Read every registered gauge
+   */
+  collectGauges() {
+    const result = [];
+    for (const [name, gauge] of this.gauges) {
+      let values;
+      try {
+        values = gauge.collect();
+      } catch (error) {
+        continue;
+      }
+      if (typeof values === 'number') values = [{ labels: null, value: values }];
+      result.push({ name, help: gauge.help, values: values || [] });
+    }
+    return result;
+  }
+
+  /**
+   * Prometheus text exposition format
+   */
+  toPrometheus() {
+    const blocks = Array.from(this.metrics.values()).map(metric => metric.toPrometheus());
+    for (const gauge of this.collectGauges()) {
+      const lines = [`# HELP ${gauge.name} ${gauge.help}`, `# TYPE ${gauge.name} gauge`];
+      for (const { labels, value } of gauge.values) {
+        lines.push(`${gauge.name}${formatLabels(labels)} ${Number(value) || 0}`);
+      }
+      blocks.push(lines.join('\n'));
+    }
+    return blocks.join('\n') + '\n';
+  }
+
+  /**
+   * Clear all counters and histograms (gauges are live values)
+   */
+  reset() {
+    for (const metric of this.metrics.values()) {
+      metric.reset();
+    }
+  }
+}
+
+module.exports = new Metrics();
+// Unregistered histograms for tools that keep their own (combat simulator, load test)
+module.exports.Histogram = Histogram;
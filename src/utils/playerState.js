@@ -0,0 +1,36 @@
+'use strict';
+
+/**
+ * Player State Utility
+ * Plain data copy of a live character, for a shard handoff, the gateway's
+ * character cache and the world snapshot. Engine, connection and combatant
+ * references stay with the process hosting the player; roundtime goes along.
+ */
+
+// Live references that never leave the process hosting the player
+const RUNTIME_FIELDS = new Set(['_id', 'gameEngine', 'connection', 'combatants']);
+
+/**
+ * Copy a player's own data fields
+ * @param {Object} player - Live player
+ * @returns {Object} Data that survives structured cloning
+ */
+function serializePlayer(player) {
+  const data = {};
+  for (const key of Object.keys(player)) {
+    if (RUNTIME_FIELDS.has(key)) continue;
+    if (key === 'combatData') {
+      // Roundtime only; opponents are references
+      const { lag = 0, roundStarted = 0 } = player.combatData || {};
+      data.combatData = { lag, roundStarted };
+      continue;
+    }
+    data[key] = player[key];
+  }
+  return data;
+}
+
+module.exports = {
+  serializePlayer,
+  RUNTIME_FIELDS
+};
@@ -0,0 +1,118 @@
+'use strict';
+
+/**
+ * Random Numbers
+ * The single source of randomness for game rules (hit rolls, body parts,
+ * critical picks, loot). Normally this is Math.random; seed() switches to a
+ * deterministic generator (sfc32) so a combat simulation can be replayed
+ * exactly from its seed. Identifiers (corpse ids, item ids) keep their own
+ * randomness and are not affected.
+ */
+
+let generator = Math.random;
+let currentSeed = null;
+
+/**
+ * Hash a seed (number or string) to four 32-bit words (cyrb128)
+ */
+function hashSeed(value) {
+  const text = String(value);
+  let h1 = 1779033703, h2 = 3144134277, h3 = 1013904242, h4 = 2773480762;
+  for (let i = 0; i < text.length; i++) {
+    const k = text.charCodeAt(i);
+    h1 = h2 ^ Math.imul(h1 ^ k, 597399067);
+    h2 = h3 ^ Math.imul(h2 ^ k, 2869860233);
+    h3 = h4 ^ Math.imul(h3 ^ k, 951274213);
+    h4 = h1 ^ Math.imul(h4 ^ k, 2716044179);
+  }
+  h1 = Math.imul(h3 ^ (h1 >>> 18), 597399067);
+  h2 = Math.imul(h4 ^ (h2 >>> 22), 2869860233);
+  h3 = Math.imul(h1 ^ (h3 >>> 17), 951274213);
+  h4 = Math.imul(h2 ^ (h4 >>> 19), 2716044179);
+  h1 ^= (h2 ^ h3 ^ h4);
+  h2 ^= h1;
+  h3 ^= h1;
+  h4 ^= h1;
+  return [h1 >>> 0, h2 >>> 0, h3 >>> 0, h4 >>> 0];
+}
+
+/**
+ * sfc32: small, fast generator with a 128-bit state; returns floats in [0, 1)
+ */
+function sfc32(a, b, c, d) {
+  return function next() {
+    a |= 0; b |= 0; c |= 0; d |= 0;
+    const t = (((a + b) | 0) + d) | 0;
+    d = (d + 1) | 0;
+    a = b ^ (b >>> 9);
+    b = (c + (c << 3)) | 0;
+    c = (c << 21) | (c >>> 11);
+    c = (c + t) | 0;
+    return (t >>> 0) / 4294967296;
+  };
+}
+
+/**
+ * Make every roll deterministic from now on
+ * @param {number|string} value - The same seed always produces the same rolls
+ */
+function seed(value) {
+  const generatorFn = sfc32(...hashSeed(value));
+  // Discard the first outputs; sfc32 mixes its state over a few rounds
+  for (let i = 0; i < 12; i++) generatorFn();
+  generator = generatorFn;
+  currentSeed = value;
+}
+
+/**
+ * Go back to Math.random
+ */
+function unseed() {
+  generator = Math.random;
+  currentSeed = null;
+}
+
+/**
+ * The active seed, or null when unseeded
+ */
+function getSeed() {
+  return currentSeed;
+}
+
+/**
+ * Float in [0, 1)
+ */
+function random() {
+  return generator();
+}
+
+/**
+ * Integer in [min, max], both inclusive
+ */
+function int(min, max) {
+  return Math.floor(generator() * (max - min + 1)) + min;
+}
+
+/**
+ * 1-100 roll (d100) used by attack resolution
+ */
+function d100() {
+  return Math.floor(generator() * 100) + 1;
+}
+
+/**
+ * Random element of an array (undefined for an empty array)
+ */
+function pick(array) {
+  return array[Math.floor(generator() * array.length)];
+}
+
+module.exports = {
+  seed,
+  unseed,
+  getSeed,
+  random,
+  int,
+  d100,
+  pick
+};
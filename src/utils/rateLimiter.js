@@ -0,0 +1,80 @@
+'use strict';
+
+/**
+ * Rate Limiter Utility
+ * Fixed-window counters keyed by an arbitrary string (IP address, username, ...)
+ */
+class RateLimiter {
+  /**
+   * @param {Object} options
+   * @param {number} options.limit - Events allowed per window
+   * @param {number} options.windowMs - Window length in milliseconds
+   */
+  constructor({ limit, windowMs }) {
+    this.limit = limit;
+    this.windowMs = windowMs;
+    this.windows = new Map(); // key -> { count, resetAt }
+  }
+
+  /**
+   * Get the live window for a key (null if none or expired)
+   */
+  getWindow(key, now = Date.now()) {
+    const window = this.windows.get(key);
+    if (window && window.resetAt <= now) {
+      this.windows.delete(key);
+      return null;
+    }
+    return window || null;
+  }
+
+  /**
+   * Whether the key has used up its allowance
+   */
+  isLimited(key, now = Date.now()) {
+    const window = this.getWindow(key, now);
+    return !!window && window.count >= this.limit;
+  }
+
+  /**
+   * Count one event for a key
+   * @returns {boolean} True if the key is now over its limit
+   */
+  hit(key, now = Date.now()) {
+    let window = this.getWindow(key, now);
+    if (!window) {
+      window = { count: 0, resetAt: now + this.windowMs };
+      this.windows.set(key, window);
+      this.prune(now);
+    }
+    window.count++;
+    return window.count > this.limit;
+  }
+
+  /**
+   * Forget a key (e.g. after a successful login)
+   */
+  reset(key) {
+    this.windows.delete(key);
+  }
+
+  /**
+   * Milliseconds until a limited key may try again
+   */
+  retryAfterMs(key, now = Date.now()) {
+    const window = this.getWindow(key, now);
+    return window ? Math.max(0, window.resetAt - now) : 0;
+  }
+
+  /**
+   * Drop expired windows once the map grows (keeps memory bounded under a storm)
+   */
+  prune(now = Date.now()) {
+    if (this.windows.size < 1000) return;
+    for (const [key, window] of this.windows) {
+      if (window.resetAt <= now) this.windows.delete(key);
+    }
+  }
+}
+
+module.exports = { RateLimiter };
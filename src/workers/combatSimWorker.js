@@ -0,0 +1,26 @@
+'use strict';
+
+const { parentPort, workerData } = require('worker_threads');
+const CombatSimulator = require('../systems/CombatSimulator');
+const random = require('../utils/random');
+
+/**
+ * Combat Simulation Worker
+ * Runs a share of the fights for scripts/simulate-combat.js on its own seed.
+ * workerData:  { seed, fights, scenario }
+ * Message out: { type: 'progress', fights } about once a second,
+ *              then { type: 'done', results } (CombatSimulator.serializeResults)
+ *              or { type: 'error', error }
+ */
+async function run({ seed, fights, scenario }) {
+  random.seed(seed);
+  const simulator = new CombatSimulator(scenario);
+  const results = await simulator.run(fights, {
+    onProgress: progress => parentPort.postMessage({ type: 'progress', fights: progress.fights })
+  });
+  parentPort.postMessage({ type: 'done', results: CombatSimulator.serializeResults(results) });
+}
+
+run(workerData).catch(error => {
+  parentPort.postMessage({ type: 'error', error: error.stack || error.message });
+});
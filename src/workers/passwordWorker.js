@@ -0,0 +1,22 @@
+'use strict';
+
+const { parentPort } = require('worker_threads');
+const bcrypt = require('bcryptjs');
+
+/**
+ * Password Worker
+ * Runs bcrypt off the main thread for PasswordHasher.
+ * Message in:  { id, op: 'hash', password, cost } | { id, op: 'compare', password, hash }
+ * Message out: { id, result, ms } | { id, error, ms }
+ */
+parentPort.on('message', ({ id, op, password, hash, cost }) => {
+  const started = process.hrtime.bigint();
+  try {
+    const result = op === 'hash'
+      ? bcrypt.hashSync(password, cost)
+      : bcrypt.compareSync(password, hash);
+    parentPort.postMessage({ id, result, ms: Number(process.hrtime.bigint() - started) / 1e6 });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message, ms: Number(process.hrtime.bigint() - started) / 1e6 });
+  }
+});
@@ -0,0 +1,215 @@
+'use strict';
+
+const path = require('path');
+const v8 = require('v8');
+const { parentPort, workerData } = require('worker_threads');
+const GameEngine = require('../core/GameEngine');
+const Session = require('../core/Session');
+const metrics = require('../utils/metrics');
+const { serializePlayer } = require('../utils/playerState');
+const { SHARD_MESSAGES: MSG, SHARDING } = require('../constants/shards');
+const log = require('../utils/logger').child(`shard-${workerData.index}`);
+
+/**
+ * Area Shard Worker
+ * Runs the tick, NPCs, combat and item decay for the areas assigned to it by
+ * ShardManager. Every shard loads all rooms so exits and descriptions resolve
+ * anywhere, but NPCs spawn and players live only in the areas it owns.
+ * Message protocol: constants/shards.js
+ */
+
+const engine = new GameEngine();
+engine.shard = { index: workerData.index, assignment: workerData.assignment, loads: null };
+// Each shard spills and replays its own action spool, so shards never replay the same files
+engine.actionRecorder.spoolDir = path.join(engine.actionRecorder.spoolDir, `shard-${workerData.index}`);
+
+const connections = new Map(); // playerId -> channel Session
+const arriving = new Map(); // playerId -> input lines received while the room is being described
+
+function post(type, fields = {}) {
+  parentPort.postMessage({ type, ...fields });
+}
+
+/**
+ * Output channel for a player hosted here; writes become OUTPUT messages
+ */
+function openConnection(player, playerId) {
+  const connection = Session.fromChannel(
+    text => post(MSG.OUTPUT, { playerId, text }),
+    () => {
+      // Closed by a command (QUIT): the gateway closes the real session
+      if (connections.get(playerId) === connection) post(MSG.CLOSE, { playerId });
+    }
+  );
+  connection.onLine((session, line) => engine.handlePlayerInput(player, line, session));
+  connections.set(playerId, connection);
+  engine.sessions.add(connection);
+  engine.sessions.bindPlayer(connection, playerId);
+  return connection;
+}
+
+/**
+ * Drop a player's channel without closing the gateway session
+ * @returns {string[]} Input lines that had not run yet
+ */
+function detach(playerId) {
+  const connection = connections.get(playerId);
+  if (!connection) return [];
+  connections.delete(playerId);
+  engine.sessions.remove(connection);
+  const pending = connection.queue.splice(0);
+  connection.close();
+  return pending;
+}
+
+/**
+ * A player joins this shard (login or handoff)
+ */
+async function enter({ playerId, player, greeting, pending }) {
+  arriving.set(playerId, pending || []);
+  player.id = playerId;
+  player.gameEngine = engine;
+  const connection = openConnection(player, playerId);
+  player.connection = connection;
+  engine.addPlayer(player);
+  engine.playerSystem.players.set(player.name, player);
+
+  connection.cork();
+  try {
+    if (greeting) connection.writeLine(greeting);
+    connection.writeLine(await engine.roomSystem.getRoomDescription(player.room, player, engine));
+  } finally {
+    connection.uncork();
+    // Lines typed before the handoff, then any that arrived meanwhile, in order
+    const lines = arriving.get(playerId) || [];
+    arriving.delete(playerId);
+    for (const line of lines) connection.enqueue(line);
+  }
+}
+
+/**
+ * The player walked (or was moved) into another shard's area
+ */
+engine.on('handoff', (player) => {
+  const playerId = player.id;
+  const pending = detach(playerId);
+  engine.removePlayer(playerId);
+  const room = engine.roomSystem.getRoom(player.room);
+  post(MSG.HANDOFF, {
+    playerId,
+    player: serializePlayer(player),
+    areaId: (room && room.areaId) || '',
+    pending
+  });
+});
+
+/**
+ * HOTFIX ran here: ask the gateway to reload the other shards
+ */
+engine.on('reload', () => post(MSG.HOTFIX));
+
+/**
+ * Periodic load report for the gateway's per-shard view
+ */
+function reportLoad() {
+  const tick = metrics.histogram('gs3_tick_duration_ms').get();
+  const lag = (metrics.collectGauges().find(gauge => gauge.name === 'gs3_event_loop_lag_ms') || {}).values || [];
+  const lagP99 = lag.find(({ labels }) => labels && labels.quantile === 0.99);
+  post(MSG.LOAD, {
+    load: {
+      hosted: engine.players.size,
+      npcs: engine.npcSystem.count,
+      ticks: engine.tickCount,
+      tickP50: tick ? tick.p50 : 0,
+      tickP99: tick ? tick.p99 : 0,
+      tickMax: tick ? tick.max : 0,
+      overruns: metrics.counter('gs3_tick_overruns_total').get(),
+      lagP99: lagP99 ? lagP99.value : 0,
+      heapMB: v8.getHeapStatistics().used_heap_size / (1024 * 1024),
+      pendingWrites: engine.persistenceQueue.getStats().pending
+    }
+  });
+}
+
+/**
+ * Save every hosted player, snapshot this shard's world, flush writes and exit
+ */
+async function stop() {
+  await engine.shutdown();
+  post(MSG.STOPPED);
+  parentPort.close();
+  process.exit(0);
+}
+
+parentPort.on('message', (message) => {
+  switch (message.type) {
+    case MSG.ENTER:
+      enter(message).catch(error => {
+        log.error('Error entering player', { playerId: message.playerId, error: error.message });
+      });
+      break;
+
+    case MSG.RECONNECT: {
+      const player = engine.getPlayer(message.playerId);
+      const connection = connections.get(message.playerId);
+      if (!player || !connection) break;
+      connection.writeLine(message.greeting);
+      engine.roomSystem.getRoomDescription(player.room, player, engine)
+        .then(description => connection.writeLine(description))
+        .catch(error => log.error('Error describing room on reconnect', { error: error.message }));
+      break;
+    }
+
+    case MSG.INPUT: {
+      const connection = connections.get(message.playerId);
+      if (arriving.has(message.playerId)) {
+        arriving.get(message.playerId).push(message.line);
+      } else if (connection) {
+        connection.enqueue(message.line);
+      } else {
+        post(MSG.BOUNCE, { playerId: message.playerId, line: message.line });
+      }
+      break;
+    }
+
+    case MSG.LEAVE: {
+      const player = engine.getPlayer(message.playerId);
+      if (!player) break; // Handed off while the session ended; the gateway has the state
+      detach(message.playerId);
+      engine.removePlayer(message.playerId);
+      post(MSG.LEFT, { playerId: message.playerId, player: serializePlayer(player) });
+      break;
+    }
+
+    case MSG.LOADS:
+      engine.shard.loads = message;
+      break;
+
+    case MSG.RELOAD:
+      engine.reloadWorld()
+        .then(summary => log.info('Reloaded after hotfix', { rooms: summary.rooms, npcs: summary.npcs.spawned, commands: summary.commands }))
+        .catch(error => log.error('Error reloading after hotfix', { error: error.message }));
+      break;
+
+    case MSG.STOP:
+      stop().catch(error => {
+        log.error('Error stopping shard', { error: error.message });
+        process.exit(1);
+      });
+      break;
+
+    default:
+      log.warn('Unknown gateway message', { type: message.type });
+  }
+});
+
+(async () => {
+  await engine.start();
+  await engine.commandManager.loadCommands(path.join(__dirname, '../commands'));
+  const reportTimer = setInterval(reportLoad, SHARDING.loadIntervalMs);
+  if (reportTimer.unref) reportTimer.unref();
+  post(MSG.READY, { npcs: engine.npcSystem.count });
+})().catch(error => {
+  // Surfaces as the worker's 'error' event in the gateway
+  setImmediate(() => { throw error; });
+});
@@ -0,0 +1,39 @@
+'use strict';
+
+const CommandResolver = require('../../src/core/CommandResolver');
+
+function build(modules, aliases = {}) {
+  const commands = new Map(Object.entries(modules));
+  return new CommandResolver().build(commands, new Map(Object.entries(aliases)));
+}
+
+describe('CommandResolver', () => {
+  test('direction shortcuts win over command abbreviations', () => {
+    const resolver = build({ north: {}, news: {} });
+    expect(resolver.resolve('n')).toEqual({ type: 'direction', direction: 'north' });
+    expect(resolver.resolve('north')).toEqual({ type: 'direction', direction: 'north' });
+  });
+
+  test('exact names, then aliases, then abbreviations', () => {
+    const resolver = build({ look: {}, loot: {}, inventory: {} }, { l: 'look', inv: 'inventory', loo: 'loot' });
+    expect(resolver.resolve('look')).toEqual({ type: 'command', name: 'look' });
+    expect(resolver.resolve('l')).toEqual({ type: 'command', name: 'look' });
+    expect(resolver.resolve('loo')).toEqual({ type: 'command', name: 'loot' });
+    expect(resolver.resolve('inve')).toEqual({ type: 'command', name: 'inventory' });
+  });
+
+  test('abbreviations need three characters', () => {
+    const resolver = build({ inventory: {} });
+    expect(resolver.resolve('in')).toBeNull();
+    expect(resolver.resolve('inv')).toEqual({ type: 'command', name: 'inventory' });
+  });
+
+  test('abbreviation ties go to the higher priority, then alphabetical order', () => {
+    expect(build({ attack: {}, attune: { priority: 1 } }).resolve('att').name).toBe('attune');
+    expect(build({ attack: {}, attune: {} }).resolve('att').name).toBe('attack');
+  });
+
+  test('aliases of unregistered commands are ignored', () => {
+    expect(build({ look: {} }, { x: 'examine' }).resolve('x')).toBeNull();
+  });
+});
@@ -0,0 +1,156 @@
+'use strict';
+
+const logger = require('../../src/utils/logger');
+const Session = require('../../src/core/Session');
+
+/**
+ * Fake transport recording every write; `backlog` stands for the socket's buffered bytes
+ */
+function fakeTransport() {
+  return {
+    kind: 'telnet',
+    writes: [],
+    backlog: 0,
+    open: true,
+    closed: 0,
+    write(chunk) { this.writes.push(chunk); },
+    close() { this.closed++; this.open = false; },
+    bufferedBytes() { return this.backlog; },
+    isOpen() { return this.open; }
+  };
+}
+
+function createSession(options = {}) {
+  const transport = fakeTransport();
+  const session = new Session(transport, options);
+  const lines = [];
+  session.onLine(async (s, line) => { lines.push(line); });
+  return { transport, session, lines };
+}
+
+const nextTurn = () => new Promise(resolve => setImmediate(resolve));
+
+beforeAll(() => {
+  logger.setLevel('off', 'session');
+});
+
+afterAll(() => {
+  logger.clearLevel('session');
+});
+
+describe('Session input framing', () => {
+  test('splits CRLF, LF and CR lines and keeps a partial line for the next chunk', async () => {
+    const { session, lines } = createSession();
+    session.receive(Buffer.from('look\r\nnorth\nsou'));
+    session.receive(Buffer.from('th\rinv'));
+    await nextTurn();
+
+    expect(lines).toEqual(['look', 'north', 'south']);
+    expect(session.partial).toBe('inv');
+  });
+
+  test('a UTF-8 character split across packets is decoded whole', async () => {
+    const { session, lines } = createSession();
+    const bytes = Buffer.from('say café\n');
+    session.receive(bytes.subarray(0, 8)); // Ends inside the two bytes of é
+    session.receive(bytes.subarray(8));
+    await nextTurn();
+
+    expect(lines).toEqual(['say café']);
+  });
+
+  test('a WebSocket message ends its last line', async () => {
+    const { session, lines } = createSession();
+    session.receive('look', true);
+    session.receive('north\n', true);
+    await nextTurn();
+
+    expect(lines).toEqual(['look', 'north']);
+  });
+
+  test('an overlong line is ignored with a notice', async () => {
+    const { transport, session, lines } = createSession({ maxLineLength: 10 });
+    session.receive('x'.repeat(20) + '\nlook\n');
+    await nextTurn();
+
+    expect(lines).toEqual(['look']);
+    expect(transport.writes.join('')).toContain('Input line too long');
+  });
+});
+
+describe('Session command queue', () => {
+  test('runs one command at a time, in order, with each command\'s output in one write', async () => {
+    const { transport, session } = createSession();
+    let running = 0;
+    let mostRunning = 0;
+    session.onLine(async (s, line) => {
+      mostRunning = Math.max(mostRunning, ++running);
+      s.write(`${line} 1\r\n`);
+      await nextTurn();
+      s.write(`${line} 2\r\n`);
+      running--;
+    });
+
+    session.receive('a\nb\n');
+    await new Promise(resolve => setTimeout(resolve, 20));
+
+    expect(mostRunning).toBe(1);
+    expect(transport.writes).toEqual(['a 1\r\na 2\r\n', 'b 1\r\nb 2\r\n']);
+  });
+
+  test('drops lines past maxQueuedCommands and tells the client once', async () => {
+    const { transport, session, lines } = createSession({ maxQueuedCommands: 2 });
+    let release;
+    session.onLine(async (s, line) => {
+      lines.push(line);
+      if (line === 'first') await new Promise(resolve => { release = resolve; });
+    });
+
+    session.receive('first\n');
+    session.receive('a\nb\nc\nd\n');
+    release();
+    await new Promise(resolve => setTimeout(resolve, 10));
+
+    expect(lines).toEqual(['first', 'a', 'b']);
+    expect(session.stats.commandsDropped).toBe(2);
+    expect(transport.writes.join('').match(/too quickly/g)).toHaveLength(1);
+  });
+});
+
+describe('Session backpressure', () => {
+  test('drops output while the client is behind and says so once it catches up', async () => {
+    const { transport, session } = createSession({ maxBufferedBytes: 100 });
+    transport.backlog = 150;
+    session.write('lost\r\n');
+    await nextTurn();
+    transport.backlog = 0;
+    session.write('kept\r\n');
+    await nextTurn();
+
+    expect(transport.writes).toEqual(['[Output was dropped: connection too slow]\r\nkept\r\n']);
+    expect(session.stats.outputDropped).toBe(6);
+  });
+
+  test('the kick policy disconnects a slow client and reports the close once', async () => {
+    const { transport, session } = createSession({ maxBufferedBytes: 100, slowConsumerPolicy: 'kick' });
+    const reasons = [];
+    session.onClose(s => reasons.push(s.closeReason));
+    transport.backlog = 150;
+    session.write('hello\r\n');
+    await nextTurn();
+    session.handleTransportClosed();
+
+    expect(transport.closed).toBe(1);
+    expect(reasons).toEqual(['server']);
+  });
+
+  test('a backlog past kickBufferedBytes disconnects even under the drop policy', async () => {
+    const { transport, session } = createSession({ maxBufferedBytes: 100, kickBufferedBytes: 1000 });
+    transport.backlog = 1000;
+    session.write('hello\r\n');
+    await nextTurn();
+
+    expect(session.closed).toBe(true);
+    expect(transport.writes).toEqual([]);
+  });
+});
@@ -0,0 +1,69 @@
+'use strict';
+
+const SessionRegistry = require('../../src/core/SessionRegistry');
+
+const { STATES } = SessionRegistry;
+
+afterEach(() => {
+  jest.useRealTimers();
+});
+
+describe('SessionRegistry', () => {
+  test('tracks sessions through login, play and removal with matching counts', () => {
+    const registry = new SessionRegistry();
+    const session = registry.add({});
+    expect(registry.isLoggingIn(session)).toBe(true);
+
+    registry.setState(session, STATES.CREATION);
+    registry.bindPlayer(session, 'zoso');
+
+    expect(registry.getByPlayerId('zoso')).toBe(session);
+    expect(registry.getPlayerId(session)).toBe('zoso');
+    expect(registry.getCounts()).toMatchObject({ login: 0, creation: 0, playing: 1, total: 1, opened: 1 });
+
+    expect(registry.remove(session)).toBe('zoso');
+    expect(registry.getByPlayerId('zoso')).toBeNull();
+    expect(registry.getCounts()).toMatchObject({ playing: 0, total: 0, closed: 1 });
+  });
+
+  test('a linkdead player who logs in again takes over from the old session', () => {
+    jest.useFakeTimers();
+    const registry = new SessionRegistry({ linkdeadTimeoutMs: 1000 });
+    const dropped = registry.add({});
+    registry.bindPlayer(dropped, 'zoso');
+    const expired = jest.fn();
+    expect(registry.markLinkdead(dropped, expired)).toBe(true);
+
+    const fresh = registry.add({});
+    expect(registry.bindPlayer(fresh, 'zoso')).toBe(dropped);
+    jest.advanceTimersByTime(2000);
+
+    expect(expired).not.toHaveBeenCalled();
+    expect(dropped.state).toBe(STATES.CLOSED);
+    expect(registry.getByPlayerId('zoso')).toBe(fresh);
+    expect(registry.getCounts()).toMatchObject({ playing: 1, linkdead: 0, total: 1, reconnected: 1 });
+  });
+
+  test('a linkdead player nobody reconnects expires after the grace period', () => {
+    jest.useFakeTimers();
+    const registry = new SessionRegistry({ linkdeadTimeoutMs: 1000 });
+    const session = registry.add({});
+    registry.bindPlayer(session, 'zoso');
+    const expired = jest.fn();
+    registry.markLinkdead(session, expired);
+
+    jest.advanceTimersByTime(999);
+    expect(expired).not.toHaveBeenCalled();
+    jest.advanceTimersByTime(1);
+    expect(expired).toHaveBeenCalledWith(session);
+  });
+
+  test('only a playing session can go linkdead, and not without a grace period', () => {
+    const registry = new SessionRegistry({ linkdeadTimeoutMs: 0 });
+    const playing = registry.add({});
+    registry.bindPlayer(playing, 'zoso');
+
+    expect(registry.markLinkdead(registry.add({}), () => {})).toBe(false);
+    expect(registry.markLinkdead(playing, () => {})).toBe(false);
+  });
+});
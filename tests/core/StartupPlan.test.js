@@ -0,0 +1,64 @@
+'use strict';
+
+const StartupPlan = require('../../src/core/StartupPlan');
+
+const tick = () => new Promise(resolve => setImmediate(resolve));
+
+describe('StartupPlan', () => {
+  test('a phase starts only after the phases it depends on', async () => {
+    const order = [];
+    const plan = new StartupPlan('Test');
+    plan
+      .phase('database', [], async () => { await tick(); order.push('database'); })
+      .phase('files', [], () => { order.push('files'); })
+      .phase('rooms', ['database', 'files'], () => { order.push('rooms'); });
+
+    await plan.run();
+
+    expect(order).toEqual(['files', 'database', 'rooms']);
+    expect(plan.getTimings().every(timing => timing.status === 'done')).toBe(true);
+  });
+
+  test('independent phases overlap', async () => {
+    let running = 0;
+    let overlap = 0;
+    const work = async () => {
+      running++;
+      overlap = Math.max(overlap, running);
+      await tick();
+      running--;
+    };
+    const plan = new StartupPlan('Test').phase('a', [], work).phase('b', [], work);
+
+    await plan.run();
+
+    expect(overlap).toBe(2);
+  });
+
+  test('a failure names its phase and dependents never start', async () => {
+    const dependent = jest.fn();
+    const plan = new StartupPlan('Test')
+      .phase('database', [], () => { throw new Error('refused'); })
+      .phase('rooms', ['database'], dependent);
+
+    await expect(plan.run()).rejects.toThrow('database: refused');
+    expect(dependent).not.toHaveBeenCalled();
+  });
+
+  test('phases must be declared once and only depend on earlier phases', () => {
+    const plan = new StartupPlan('Test').phase('a', [], () => {});
+    expect(() => plan.phase('a', [], () => {})).toThrow('declared twice');
+    expect(() => plan.phase('b', ['c'], () => {})).toThrow('undeclared phase "c"');
+  });
+
+  test('the critical path follows the dependency that finished last', async () => {
+    const plan = new StartupPlan('Test')
+      .phase('slow', [], async () => { await new Promise(resolve => setTimeout(resolve, 30)); })
+      .phase('fast', [], () => {})
+      .phase('last', ['slow', 'fast'], () => {});
+
+    await plan.run();
+
+    expect(plan.criticalPath()).toEqual(['slow', 'last']);
+  });
+});
@@ -0,0 +1,118 @@
+'use strict';
+
+const DerivedStats = require('../../src/services/derivedStats');
+const DamageSystem = require('../../src/systems/DamageSystem');
+const WoundSystem = require('../../src/systems/WoundSystem');
+
+function createCharacter() {
+  return {
+    race: 'human',
+    attributes: { strength: { base: 70, delta: 0 }, aura: { base: 80, delta: 0 } },
+    skills: { one_handed_edged: { ranks: 10 } },
+    equipment: { rightHand: 'sword-1' }
+  };
+}
+
+/**
+ * Fake damage system counting weapon reads; returns a copy of `weapon` as it stands
+ */
+function fakeDamageSystem(weapon) {
+  return {
+    reads: 0,
+    async getEquippedWeapon(character) {
+      this.reads++;
+      return { ...weapon, id: character.equipment.rightHand };
+    }
+  };
+}
+
+describe('derivedStats', () => {
+  test('the skill bonus table matches the diminishing returns formula', () => {
+    expect(DerivedStats.skillBonus(10)).toBe(50);
+    expect(DerivedStats.skillBonus(25)).toBe(105);
+    expect(DerivedStats.skillBonus(250)).toBe(DerivedStats.computeSkillBonus(250));
+    expect(DerivedStats.skillBonus(-3)).toBe(0);
+  });
+
+  test('base stats are cached until a stat change invalidates them', () => {
+    const character = createCharacter();
+    const first = DerivedStats.getBaseStats(character);
+    expect(DerivedStats.getBaseStats(character)).toBe(first);
+    expect(first.spiritMax).toBe(8);
+
+    new DamageSystem().setStat(character, 'aura', 100);
+
+    const second = DerivedStats.getBaseStats(character);
+    expect(second).not.toBe(first);
+    expect(second.spiritMax).toBe(10);
+  });
+
+  test('trained skill ranks show up after a skills invalidation', () => {
+    const character = createCharacter();
+    expect(DerivedStats.getWeaponSkillBonus(character, { metadata: { weapon_type: 'edged' } })).toBe(50);
+
+    character.skills.one_handed_edged.ranks = 20;
+    DerivedStats.invalidate(character, 'skills');
+
+    expect(DerivedStats.getWeaponSkillBonus(character, { metadata: { weapon_type: 'edged' } })).toBe(90);
+  });
+
+  test('adding and healing wounds refreshes the cached penalties', () => {
+    const character = createCharacter();
+    expect(DerivedStats.getWoundPenalties(character).woundCount).toBe(0);
+
+    WoundSystem.addWound(character, 'HEAD', 2);
+    expect(DerivedStats.getWoundPenalties(character)).toMatchObject({ woundCount: 1, canSpellcast: false });
+
+    WoundSystem.removeWound(character, 'head');
+    expect(DerivedStats.getWoundPenalties(character)).toMatchObject({ woundCount: 0, canSpellcast: true });
+  });
+
+  test('a wound invalidation leaves the base stats cached', () => {
+    const character = createCharacter();
+    const base = DerivedStats.getBaseStats(character);
+
+    DerivedStats.invalidate(character, 'wounds');
+
+    expect(DerivedStats.getBaseStats(character)).toBe(base);
+  });
+
+  test('the weapon is read once per weapon in hand and again after an equipment invalidation', async () => {
+    const character = createCharacter();
+    character.gameEngine = { roomSystem: { db: {} } };
+    const damageSystem = fakeDamageSystem({ metadata: { weapon_type: 'edged', damage_factor: 0.4 } });
+
+    await DerivedStats.getEquippedWeapon(character, damageSystem);
+    await DerivedStats.getEquippedWeapon(character, damageSystem);
+    expect(damageSystem.reads).toBe(1);
+
+    character.equipment.rightHand = 'sword-2';
+    expect((await DerivedStats.getEquippedWeapon(character, damageSystem)).id).toBe('sword-2');
+    expect(damageSystem.reads).toBe(2);
+
+    DerivedStats.invalidate(character, 'equipment');
+    await DerivedStats.getEquippedWeapon(character, damageSystem);
+    expect(damageSystem.reads).toBe(3);
+  });
+
+  test('a failed read without a database is not cached', async () => {
+    const character = createCharacter();
+    const damageSystem = { reads: 0, async getEquippedWeapon() { this.reads++; return null; } };
+
+    await DerivedStats.getEquippedWeapon(character, damageSystem);
+    await DerivedStats.getEquippedWeapon(character, damageSystem);
+
+    expect(damageSystem.reads).toBe(2);
+  });
+
+  test('invalidating everything drops all sections', () => {
+    const character = createCharacter();
+    const base = DerivedStats.getBaseStats(character);
+    const wounds = DerivedStats.getWoundPenalties(character);
+
+    DerivedStats.invalidate(character);
+
+    expect(DerivedStats.getBaseStats(character)).not.toBe(base);
+    expect(DerivedStats.getWoundPenalties(character)).not.toBe(wounds);
+  });
+});
@@ -0,0 +1,135 @@
+'use strict';
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const logger = require('../../src/utils/logger');
+const ActionRecorder = require('../../src/systems/ActionRecorder');
+
+/**
+ * Fake database whose insertMany fails while `down` is set; stored buckets are kept by ID
+ */
+function fakeDb() {
+  const stored = new Map();
+  return {
+    down: false,
+    stored,
+    collection() {
+      return {
+        insertMany: async (docs) => {
+          if (this.down) throw new Error('connection refused');
+          const writeErrors = [];
+          docs.forEach((doc, index) => {
+            if (stored.has(String(doc._id))) writeErrors.push({ index, code: 11000 });
+            else stored.set(String(doc._id), doc);
+          });
+          if (writeErrors.length > 0) {
+            const error = new Error('duplicate key');
+            error.writeErrors = writeErrors;
+            throw error;
+          }
+        }
+      };
+    }
+  };
+}
+
+function storedActions(db) {
+  return Array.from(db.stored.values()).reduce((total, doc) => total + doc.count, 0);
+}
+
+let dir;
+
+function createRecorder(db, options = {}) {
+  const recorder = new ActionRecorder({ spoolDir: dir, bufferSize: 10, maxQueued: 20, ...options });
+  recorder.db = db; // No periodic flush timer
+  recorder.rollups.db = null; // Rollups are covered by their own tests
+  return recorder;
+}
+
+function record(recorder, count) {
+  for (let i = 0; i < count; i++) {
+    recorder.recordAction('player-1', 'look', { location: 'room-1' });
+  }
+}
+
+beforeAll(() => {
+  logger.setLevel('off', 'actions');
+});
+
+afterAll(() => {
+  logger.clearLevel('actions');
+});
+
+beforeEach(() => {
+  dir = fs.mkdtempSync(path.join(os.tmpdir(), 'action-spool-test-'));
+  jest.spyOn(console, 'error').mockImplementation(() => {});
+});
+
+afterEach(() => {
+  fs.rmSync(dir, { recursive: true, force: true });
+  jest.restoreAllMocks();
+});
+
+describe('ActionRecorder', () => {
+  test('toBuckets groups actions into per-minute buckets', () => {
+    const recorder = createRecorder(fakeDb());
+    const actions = [0, 1000, 61000, 62000].map(timestamp => ({ timestamp, action: 'look' }));
+
+    const docs = recorder.toBuckets(actions);
+
+    expect(docs.map(doc => [doc.bucket.getTime(), doc.count])).toEqual([[0, 2], [60000, 2]]);
+  });
+
+  test('a failed flush is retried with the same bucket IDs', async () => {
+    const db = fakeDb();
+    const recorder = createRecorder(db, { bufferSize: 100 });
+    record(recorder, 5);
+    db.down = true;
+    await recorder.flushBuffer();
+    const ids = recorder.retryQueue.map(doc => String(doc._id));
+
+    db.down = false;
+    await recorder.flushBuffer();
+
+    expect(Array.from(db.stored.keys())).toEqual(ids);
+    expect(recorder.getStats()).toMatchObject({ written: 5, failures: 1, retryQueued: 0 });
+  });
+
+  test('a long outage spills to disk and the spool is replayed once the database is back', async () => {
+    const db = fakeDb();
+    const recorder = createRecorder(db);
+    db.down = true;
+    for (let i = 0; i < 5; i++) {
+      record(recorder, 10);
+      await recorder.flushBuffer();
+    }
+
+    expect(recorder.getStats().spilled).toBeGreaterThan(0);
+    expect(recorder.retryQueued).toBeLessThanOrEqual(20);
+    expect(recorder.listSpoolFiles().length).toBe(recorder.spoolFiles);
+
+    db.down = false;
+    await recorder.flushBuffer();
+
+    expect(storedActions(db)).toBe(50);
+    expect(recorder.listSpoolFiles()).toEqual([]);
+    expect(recorder.getStats().dropped).toBe(0);
+  });
+
+  test('stop waits for a spill started by a full buffer', async () => {
+    const db = fakeDb();
+    const recorder = createRecorder(db);
+    db.down = true;
+    recorder.inFlight = new Promise(() => {}); // A flush stuck on the database
+    record(recorder, 20);
+    expect(recorder.spilling).not.toBeNull();
+
+    recorder.inFlight = null;
+    await recorder.stop();
+
+    expect(recorder.spilling).toBeNull();
+    expect(recorder.getStats().spilled).toBe(20);
+    expect(recorder.listSpoolFiles().length).toBe(1);
+  });
+});
@@ -0,0 +1,97 @@
+'use strict';
+
+const logger = require('../../src/utils/logger');
+const ActionRollups = require('../../src/systems/ActionRollups');
+
+/**
+ * Fake database keeping inserted rollups; insertMany fails while `down` is set
+ */
+function fakeDb() {
+  const docs = [];
+  return {
+    down: false,
+    docs,
+    collection() {
+      return {
+        insertMany: async (batch) => {
+          if (this.down) throw new Error('connection refused');
+          docs.push(...batch);
+        },
+        find: (filter) => {
+          const matching = docs.filter(doc => doc.minute >= filter.minute.$gte && doc.minute < filter.minute.$lt);
+          return {
+            async *[Symbol.asyncIterator]() {
+              yield* matching;
+            }
+          };
+        }
+      };
+    }
+  };
+}
+
+function action(timestamp, action, context) {
+  return { timestamp, playerId: 'zoso', action, context };
+}
+
+function createRollups(db) {
+  const rollups = new ActionRollups();
+  rollups.db = db; // No periodic write timer
+  return rollups;
+}
+
+beforeAll(() => {
+  logger.setLevel('off', 'actions');
+});
+
+afterAll(() => {
+  logger.clearLevel('actions');
+});
+
+describe('ActionRollups', () => {
+  test('counts locations, trades and social targets per minute', async () => {
+    const db = fakeDb();
+    const rollups = createRollups(db);
+    rollups.add(action(1000, 'look', { location: 'town:square' }));
+    rollups.add(action(2000, 'buy', { location: 'town:shop', item: 'dagger' }));
+    rollups.add(action(61000, 'say', { location: 'unknown', target: 'Bob' }));
+
+    await rollups.flush();
+
+    expect(db.docs.map(doc => [doc.minute.getTime(), doc.total])).toEqual([[0, 2], [60000, 1]]);
+    expect(db.docs[0].locations).toEqual([['town:square', 1], ['town:shop', 1]]);
+    expect(db.docs[0].trades).toEqual([['dagger', 1]]);
+    expect(db.docs[1]).toMatchObject({ locations: [], social: [['Bob', 1]] });
+  });
+
+  test('a failed write is merged back into the live counts and written next time', async () => {
+    const db = fakeDb();
+    const rollups = createRollups(db);
+    rollups.add(action(1000, 'look', { location: 'town:square' }));
+    db.down = true;
+    await rollups.flush();
+    rollups.add(action(2000, 'look', { location: 'town:square' }));
+
+    db.down = false;
+    await rollups.flush();
+
+    expect(db.docs).toHaveLength(1);
+    expect(db.docs[0]).toMatchObject({ total: 2, locations: [['town:square', 2]] });
+    expect(rollups.stats).toMatchObject({ documents: 1, failures: 1 });
+  });
+
+  test('loadPatterns sums the minutes of a period', async () => {
+    const db = fakeDb();
+    const rollups = createRollups(db);
+    rollups.add(action(1000, 'look', { location: 'town:square' }));
+    await rollups.flush();
+    rollups.add(action(2000, 'look', { location: 'town:square' }));
+    rollups.add(action(120000, 'look', { location: 'forest' }));
+    await rollups.flush();
+
+    const { patterns, total } = await ActionRollups.loadPatterns(db, 0, 60000);
+
+    expect(total).toBe(2);
+    expect(patterns.popularLocations).toEqual({ 'town:square': 2 });
+  });
+});
@@ -0,0 +1,102 @@
+'use strict';
+
+const EncumbranceLedger = require('../../src/systems/EncumbranceLedger');
+
+/**
+ * Fake database answering `items` $in queries from the given documents; `queries` counts the finds
+ */
+function fakeDb(items) {
+  const byId = new Map(items.map(item => [item.id, item]));
+  return {
+    queries: [],
+    collection() {
+      return {
+        find: (filter) => {
+          const ids = filter.id.$in;
+          this.queries.push(ids);
+          return { toArray: async () => ids.filter(id => byId.has(id)).map(id => byId.get(id)) };
+        }
+      };
+    }
+  };
+}
+
+function item(id, weight, metadata = {}) {
+  return { id, type: 'ITEM', metadata: { weight, ...metadata } };
+}
+
+function container(id, weight, items) {
+  return { id, type: 'CONTAINER', metadata: { weight, container: 'in', items } };
+}
+
+const player = {
+  equipment: { rightHand: 'sword', back: 'pack', chest: 'armor' },
+  inventory: ['gem']
+};
+
+function createDb() {
+  return fakeDb([
+    item('sword', 5),
+    container('pack', 3, ['rope', 'torch']),
+    item('armor', 20, { armorGroup: 'chain' }),
+    item('gem', 1),
+    item('rope', 2),
+    item('torch', 1)
+  ]);
+}
+
+describe('EncumbranceLedger', () => {
+  test('sync weighs carried items and worn container contents, skipping the main armor', async () => {
+    const db = createDb();
+    const ledger = new EncumbranceLedger();
+
+    await ledger.sync(db, player);
+
+    expect(ledger.carried(player)).toBe(5 + 3 + 2 + 1 + 1);
+    expect(db.queries).toEqual([['sword', 'pack', 'armor', 'gem'], ['rope', 'torch']]);
+  });
+
+  test('a second sync queries nothing when the character carries nothing new', async () => {
+    const db = createDb();
+    const ledger = new EncumbranceLedger();
+    await ledger.sync(db, player);
+
+    await ledger.sync(db, player);
+
+    expect(db.queries).toHaveLength(2);
+  });
+
+  test('putting an item into or taking it out of a worn container adjusts its total', async () => {
+    const ledger = new EncumbranceLedger();
+    await ledger.sync(createDb(), player);
+
+    ledger.containerAdded('pack', item('lockpick', 4));
+    expect(ledger.carried(player)).toBe(16);
+
+    ledger.containerRemoved('pack', 'rope');
+    expect(ledger.carried(player)).toBe(14);
+    expect(ledger.items.get('pack').contentIds).toEqual(['torch', 'lockpick']);
+  });
+
+  test('learning a container with the same contents keeps its weighed total', async () => {
+    const ledger = new EncumbranceLedger();
+    await ledger.sync(createDb(), player);
+
+    ledger.learn(container('pack', 3, ['torch', 'rope']));
+    expect(ledger.items.get('pack').contentsWeight).toBe(3);
+
+    ledger.learn(container('pack', 3, ['torch']));
+    expect(ledger.items.get('pack').contents).toBeNull();
+  });
+
+  test('prune keeps carried items and worn container contents only', async () => {
+    const ledger = new EncumbranceLedger();
+    await ledger.sync(createDb(), player);
+    ledger.learn(item('dropped', 2));
+
+    ledger.prune({ ...player, inventory: [] });
+
+    expect(Array.from(ledger.items.keys()).sort()).toEqual(['armor', 'pack', 'rope', 'sword', 'torch']);
+    expect(ledger.size).toBe(5);
+  });
+});
@@ -0,0 +1,143 @@
+'use strict';
+
+const ItemLifecycleSystem = require('../../src/systems/ItemLifecycleSystem');
+
+/**
+ * Fake items collection: find() understands { expiresAt: { $exists } } and { id: { $in } }
+ */
+function fakeDb(docs) {
+  const calls = [];
+  return {
+    calls,
+    collection(name) {
+      return {
+        updateMany: async (filter, update) => {
+          calls.push({ collection: name, op: 'updateMany', filter, update });
+        },
+        find: (filter) => ({
+          toArray: async () => docs.filter(doc => {
+            if (filter.expiresAt) return doc.expiresAt !== undefined;
+            if (filter.id) return filter.id.$in.includes(doc.id);
+            return true;
+          })
+        })
+      };
+    }
+  };
+}
+
+function fakeRoomSystem(rooms) {
+  const byId = new Map(rooms.map(room => [room.id, room]));
+  return {
+    getAllRooms: () => Array.from(byId.values()),
+    getRoom: roomId => byId.get(roomId) || null,
+    invalidateItemDisplayName: () => {}
+  };
+}
+
+function fakeQueue() {
+  return {
+    flushes: 0,
+    deleted: [],
+    updates: [],
+    pulls: [],
+    deleteItems(itemIds) { this.deleted.push(...itemIds); },
+    updateItem(itemId, update) { this.updates.push([itemId, update]); },
+    pullRoomItem(roomId, itemId) { this.pulls.push([roomId, itemId]); },
+    async flush() { this.flushes++; }
+  };
+}
+
+function createSystem({ docs, rooms, ownsRoom = null }) {
+  const lifecycle = new ItemLifecycleSystem();
+  lifecycle.db = fakeDb(docs);
+  lifecycle.roomSystem = fakeRoomSystem(rooms);
+  lifecycle.persistenceQueue = fakeQueue();
+  lifecycle.ownsRoom = ownsRoom;
+  return lifecycle;
+}
+
+const later = new Date(Date.now() + 60000);
+
+afterEach(() => {
+  jest.restoreAllMocks();
+});
+
+describe('ItemLifecycleSystem', () => {
+  test('sweep removes expired items in expiry order and skips cancelled ones', () => {
+    const lifecycle = createSystem({ docs: [], rooms: [{ id: 'room-1', items: ['a', 'b', 'c'] }] });
+    lifecycle.track('c', 'room-1', 300);
+    lifecycle.track('a', 'room-1', 100);
+    lifecycle.track('b', 'room-1', 200);
+    lifecycle.forget('b');
+
+    expect(lifecycle.sweep(250)).toBe(1);
+    expect(lifecycle.persistenceQueue.deleted).toEqual(['a']);
+    expect(lifecycle.roomSystem.getRoom('room-1').items).toEqual(['b', 'c']);
+
+    expect(lifecycle.sweep(1000)).toBe(1);
+    expect(lifecycle.persistenceQueue.deleted).toEqual(['a', 'c']);
+    expect(lifecycle.getMetrics().live).toBe(0);
+  });
+
+  test('a rescheduled item only expires at its latest time', () => {
+    const lifecycle = createSystem({ docs: [], rooms: [{ id: 'room-1', items: ['a'] }] });
+    lifecycle.track('a', 'room-1', 100);
+    lifecycle.track('a', 'room-1', 500);
+
+    expect(lifecycle.sweep(200)).toBe(0);
+    expect(lifecycle.sweep(600)).toBe(1);
+  });
+
+  test('restoreSchedule tracks owned decaying items and only reports orphans', async () => {
+    const lifecycle = createSystem({
+      docs: [
+        { id: 'corpse-1', type: 'CORPSE', expiresAt: later },
+        { id: 'corpse-2', type: 'CORPSE', expiresAt: later },
+        { id: 'dagger', type: 'WEAPON', expiresAt: later }
+      ],
+      rooms: [{ id: 'room-1', items: ['corpse-1', 'gone'] }]
+    });
+
+    await lifecycle.restoreSchedule();
+
+    expect(lifecycle.expiries.has('corpse-1')).toBe(true);
+    expect(lifecycle.orphans).toEqual({ strayCorpses: ['corpse-2'], pickedUp: ['dagger'], missing: [['room-1', 'gone']] });
+    expect(lifecycle.getMetrics().orphansFound).toBe(3);
+
+    const queue = lifecycle.persistenceQueue;
+    expect([queue.deleted, queue.updates, queue.pulls]).toEqual([[], [], []]);
+    expect(lifecycle.roomSystem.getRoom('room-1').items).toEqual(['corpse-1', 'gone']);
+  });
+
+  test('a shard only looks at its own rooms and leaves roomless items to shard 0', async () => {
+    const lifecycle = createSystem({
+      docs: [{ id: 'corpse-2', type: 'CORPSE', expiresAt: later }],
+      rooms: [{ id: 'room-1', items: ['gone-1'] }, { id: 'room-2', items: ['gone-2'] }],
+      ownsRoom: roomId => roomId === 'room-2'
+    });
+
+    await lifecycle.restoreSchedule();
+
+    expect(lifecycle.db.calls).toEqual([]);
+    expect(lifecycle.orphans).toEqual({ strayCorpses: [], pickedUp: [], missing: [['room-2', 'gone-2']] });
+  });
+
+  test('cleanupOrphans flushes pending writes before looking, then removes what is still missing', async () => {
+    const docs = [{ id: 'corpse-2', type: 'CORPSE', expiresAt: later }];
+    const lifecycle = createSystem({ docs, rooms: [{ id: 'room-1', items: ['queued', 'gone'] }] });
+    // The queued insert lands on the first flush
+    lifecycle.persistenceQueue.flush = async function () {
+      this.flushes++;
+      if (this.flushes === 1) docs.push({ id: 'queued' });
+    };
+
+    const removed = await lifecycle.cleanupOrphans();
+
+    expect(removed).toEqual({ strayCorpses: 1, pickedUp: 0, missing: 1 });
+    expect(lifecycle.persistenceQueue.deleted).toEqual(['corpse-2']);
+    expect(lifecycle.persistenceQueue.pulls).toEqual([['room-1', 'gone']]);
+    expect(lifecycle.roomSystem.getRoom('room-1').items).toEqual(['queued']);
+    expect(lifecycle.getMetrics().orphaned).toBe(2);
+  });
+});
@@ -0,0 +1,42 @@
+'use strict';
+
+const LoginFlow = require('../../src/systems/LoginFlow');
+
+function fakeConnection(remoteAddress) {
+  return { remoteAddress, output: [], write(message) { this.output.push(message); } };
+}
+
+function createFlow() {
+  const accountManager = {
+    authenticate: async (username, password) => (password === 'right'
+      ? { success: true, account: { username, getActiveCharacters: () => [] } }
+      : { success: false, message: 'Invalid password' })
+  };
+  return new LoginFlow(accountManager, {}, {});
+}
+
+async function tryPassword(flow, connection, password) {
+  flow.loginStates.set(connection, { step: 'password', username: 'zoso', attempts: 0 });
+  return flow.handlePassword(connection, password);
+}
+
+describe('LoginFlow rate limits', () => {
+  test('failed passwords from one IP do not lock the account out for other IPs', async () => {
+    const flow = createFlow();
+    const attacker = fakeConnection('10.0.0.1');
+    for (let i = 0; i < 5; i++) {
+      await tryPassword(flow, attacker, 'wrong');
+    }
+
+    expect((await tryPassword(flow, attacker, 'right')).message).toBe('Rate limited');
+    expect((await tryPassword(flow, fakeConnection('10.0.0.2'), 'right')).success).toBe(true);
+  });
+
+  test('successful logins do not use up the IP budget', async () => {
+    const flow = createFlow();
+    for (let i = 0; i < 30; i++) {
+      expect((await tryPassword(flow, fakeConnection('10.0.0.3'), 'right')).success).toBe(true);
+    }
+    expect(flow.ipLimiter.isLimited('10.0.0.3')).toBe(false);
+  });
+});
@@ -0,0 +1,123 @@
+'use strict';
+
+const NPCSystem = require('../../src/systems/NPCSystem');
+
+/**
+ * Fake database answering `npcs` $in queries from the given definitions; `queries` records the IDs asked for
+ */
+function fakeDb(definitions) {
+  return {
+    queries: [],
+    collection() {
+      return {
+        find: (filter) => {
+          const ids = filter.id.$in;
+          this.queries.push(ids);
+          return { toArray: async () => definitions.filter(definition => ids.includes(definition.id)) };
+        }
+      };
+    }
+  };
+}
+
+function goblin() {
+  return {
+    id: 'goblin',
+    name: 'a goblin',
+    keywords: ['goblin'],
+    level: 2,
+    attributes: { health: { current: 30, max: 30 }, DS: 15 },
+    combat: { avd: 20 },
+    behaviors: { aggressive: true }
+  };
+}
+
+describe('NPCSystem templates', () => {
+  test('instances share one frozen template and own only their state', () => {
+    const system = new NPCSystem();
+    const definition = goblin();
+    const first = system.spawnNPC(definition, 'room-1');
+    const second = system.spawnNPC(definition, 'room-2');
+
+    expect(Object.getPrototypeOf(first)).toBe(Object.getPrototypeOf(second));
+    expect(Object.isFrozen(Object.getPrototypeOf(first))).toBe(true);
+    expect(Object.keys(first).sort()).toEqual(['attributes', 'id', 'isAlive', 'room', 'spawnTime']);
+    expect(first.id).not.toBe(second.id);
+    expect(first.combat.avd).toBe(20);
+    expect(first.attributes.DS).toBe(15);
+    expect(first.aggressive).toBe(true);
+  });
+
+  test('damage to one instance leaves its definition and the other instances alone', () => {
+    const system = new NPCSystem();
+    const definition = goblin();
+    const first = system.spawnNPC(definition, 'room-1');
+    const second = system.spawnNPC(definition, 'room-1');
+
+    first.attributes.health.current = 5;
+    first.combatData = { target: 'zoso' };
+
+    expect(first.health.current).toBe(5);
+    expect(second.health.current).toBe(30);
+    expect(definition.attributes.health.current).toBe(30);
+    expect(Object.getPrototypeOf(second).combatData).toBeUndefined();
+  });
+
+  test('a template is rebuilt only for a new definition document or game engine', () => {
+    const system = new NPCSystem();
+    const definition = goblin();
+    const engine = {};
+    const template = system.getTemplate(definition, engine);
+
+    expect(system.getTemplate(definition, engine)).toBe(template);
+    expect(system.getTemplate(definition, {})).not.toBe(template);
+    expect(system.getTemplate(goblin(), engine)).not.toBe(template);
+  });
+
+  test('spawnFromRooms fetches missing definitions in one query and reports unknown ones', async () => {
+    const system = new NPCSystem();
+    system.db = fakeDb([goblin()]);
+    const rooms = [
+      { id: 'room-1', npcs: ['goblin', { id: 'goblin' }] },
+      { id: 'room-2', npcs: ['dragon', null] }
+    ];
+
+    const summary = await system.spawnFromRooms(rooms);
+
+    expect(system.db.queries).toEqual([['goblin', 'dragon']]);
+    expect(summary).toMatchObject({ spawned: 2, fetched: 1, invalid: 1 });
+    expect(summary.missing.get('dragon')).toBe(1);
+    expect(system.getNPCsInRoom('room-1')).toHaveLength(2);
+
+    await system.spawnFromRooms([{ id: 'room-3', npcs: ['goblin'] }]);
+    expect(system.db.queries).toHaveLength(1);
+  });
+
+  test('exported NPCs are restored with their own state on the same kind of template', () => {
+    const system = new NPCSystem();
+    const npc = system.spawnNPC(goblin(), 'room-1');
+    npc.attributes.health.current = 12;
+    npc.combatants = new Set(['zoso']);
+    npc.wounds = { wounds: { head: { rank: 1 } }, scars: {} };
+
+    const state = structuredClone(system.exportNPCs());
+    const restored = new NPCSystem();
+    const summary = restored.restoreNPCs(state);
+    const copy = restored.getActiveNPC(npc.id);
+
+    expect(summary).toEqual({ restored: 1, missing: 0 });
+    expect(copy.health).toEqual({ current: 12, max: 30 });
+    expect(copy.wounds.wounds.head.rank).toBe(1);
+    expect(copy.combatants).toBeUndefined();
+    expect(copy.combat.avd).toBe(20);
+    expect(Object.isFrozen(Object.getPrototypeOf(copy))).toBe(true);
+  });
+
+  test('restoring skips NPCs whose definition was not exported', () => {
+    const system = new NPCSystem();
+    const summary = system.restoreNPCs({ definitions: [], npcs: [{ definitionId: 'ghost', id: 'ghost_1', room: 'room-1' }] });
+
+    expect(summary).toEqual({ restored: 0, missing: 1 });
+    expect(system.count).toBe(0);
+  });
+});
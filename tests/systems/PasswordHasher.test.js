@@ -0,0 +1,43 @@
+'use strict';
+
+const PasswordHasher = require('../../src/systems/PasswordHasher');
+
+let hasher;
+
+afterEach(async () => {
+  await hasher.stop();
+});
+
+describe('PasswordHasher', () => {
+  test('hashes in a worker and compares against the hash', async () => {
+    hasher = new PasswordHasher({ cost: 4, size: 1 });
+
+    const hash = await hasher.hash('hunter2');
+
+    expect(await hasher.compare('hunter2', hash)).toBe(true);
+    expect(await hasher.compare('hunter3', hash)).toBe(false);
+    expect(await hasher.compare('hunter2', null)).toBe(false);
+    expect(hasher.getStats()).toMatchObject({ hashes: 1, compares: 2, workers: 1, busy: 0, queued: 0 });
+  });
+
+  test('needsRehash spots a hash made with another cost', async () => {
+    hasher = new PasswordHasher({ cost: 5, size: 1 });
+    const other = new PasswordHasher({ cost: 4, size: 1 });
+    const hash = await other.hash('hunter2');
+    await other.stop();
+
+    expect(hasher.needsRehash(hash)).toBe(true);
+  });
+
+  test('rejects jobs past the queue limit instead of queueing forever', async () => {
+    hasher = new PasswordHasher({ cost: 4, size: 1, maxQueue: 1 });
+    hasher.dispatch = () => {}; // Keep jobs queued
+
+    const queued = hasher.hash('one');
+    await expect(hasher.hash('two')).rejects.toThrow('busy');
+    expect(hasher.getStats().rejected).toBe(1);
+
+    await hasher.stop();
+    await expect(queued).rejects.toThrow('stopped');
+  });
+});
@@ -0,0 +1,187 @@
+'use strict';
+
+const PersistenceQueue = require('../../src/systems/PersistenceQueue');
+
+/**
+ * Fake database recording every bulkWrite; failures are queued per collection
+ */
+function fakeDb() {
+  const calls = [];
+  const failures = { items: [], rooms: [] };
+  return {
+    calls,
+    failures,
+    collection(name) {
+      return {
+        bulkWrite: async (ops, options) => {
+          calls.push({ collection: name, ops, options });
+          const failure = failures[name].shift();
+          if (failure) throw failure;
+        }
+      };
+    }
+  };
+}
+
+function writeError(index, code = 121) {
+  const error = new Error('write failed');
+  error.writeErrors = [{ index, code }];
+  return error;
+}
+
+function roomChanges(queue) {
+  return Array.from(queue.roomChanges, ([roomId, change]) => [roomId, Array.from(change.pull), Array.from(change.push)]);
+}
+
+function createQueue(db) {
+  const queue = new PersistenceQueue();
+  queue.db = db; // No periodic flush timer
+  return queue;
+}
+
+beforeEach(() => {
+  jest.spyOn(console, 'error').mockImplementation(() => {});
+});
+
+afterEach(() => {
+  jest.restoreAllMocks();
+});
+
+describe('PersistenceQueue', () => {
+  test('flush writes item inserts, item writes, then room changes', async () => {
+    const db = fakeDb();
+    const queue = createQueue(db);
+    queue.pushRoomItem('room-1', 'corpse-1');
+    queue.updateItem('sword', { $set: { name: 'a sword' } });
+    queue.insertItem({ id: 'corpse-1' });
+
+    await queue.flush();
+
+    expect(db.calls.map(call => call.collection)).toEqual(['items', 'items', 'rooms']);
+    expect(db.calls[0].ops).toEqual([{ insertOne: { document: { id: 'corpse-1' } } }]);
+    expect(db.calls[2].ops).toEqual([
+      { updateOne: { filter: { id: 'room-1' }, update: { $addToSet: { items: { $each: ['corpse-1'] } } } } }
+    ]);
+    expect(queue.getStats().pending).toBe(0);
+  });
+
+  test('a pull of an item pushed in the same batch cancels both writes', async () => {
+    const db = fakeDb();
+    const queue = createQueue(db);
+    queue.pushRoomItem('room-1', 'coin');
+    queue.pullRoomItem('room-1', 'coin');
+
+    await queue.flush();
+
+    expect(db.calls).toEqual([]);
+  });
+
+  test('room pulls are written before pushes so remove-then-re-add keeps the item', async () => {
+    const db = fakeDb();
+    const queue = createQueue(db);
+    queue.pullRoomItem('room-1', 'rock');
+    queue.pushRoomItem('room-1', 'rock');
+
+    await queue.flush();
+
+    const updates = db.calls[0].ops.map(op => Object.keys(op.updateOne.update)[0]);
+    expect(updates).toEqual(['$pull', '$addToSet']);
+  });
+
+  test('a failed room batch requeues only the ops from the first write error on', async () => {
+    const db = fakeDb();
+    const queue = createQueue(db);
+    queue.pushRoomItem('room-1', 'a');
+    queue.pushRoomItem('room-2', 'b');
+    queue.pushRoomItem('room-3', 'c');
+    db.failures.rooms.push(writeError(1));
+
+    await queue.flush();
+
+    expect(roomChanges(queue)).toEqual([['room-2', [], ['b']], ['room-3', [], ['c']]]);
+    expect(queue.getStats().pending).toBe(2);
+  });
+
+  test('a room batch failing without write errors is retried whole', async () => {
+    const db = fakeDb();
+    const queue = createQueue(db);
+    queue.pullRoomItem('room-1', 'a');
+    queue.pushRoomItem('room-1', 'b');
+    db.failures.rooms.push(new Error('connection lost'));
+
+    await queue.flush();
+
+    expect(roomChanges(queue)).toEqual([['room-1', ['a'], ['b']]]);
+  });
+
+  test('requeued room changes merge with changes queued since', async () => {
+    const db = fakeDb();
+    const queue = createQueue(db);
+    queue.pushRoomItem('room-1', 'a');
+    db.failures.rooms.push(new Error('connection lost'));
+
+    const flushing = queue.flush();
+    // Queued while the batch is in flight: the newer pull must cancel the requeued push
+    queue.pullRoomItem('room-1', 'a');
+    queue.pushRoomItem('room-1', 'b');
+    await flushing;
+
+    expect(roomChanges(queue)).toEqual([['room-1', [], ['b']]]);
+  });
+
+  test('ordered item writes retry after the failing op and keep their order ahead of newer writes', async () => {
+    const db = fakeDb();
+    const queue = createQueue(db);
+    queue.updateItem('one', { $set: { n: 1 } });
+    queue.updateItem('two', { $set: { n: 2 } });
+    queue.updateItem('three', { $set: { n: 3 } });
+    db.failures.items.push(writeError(1));
+
+    await queue.flush();
+    queue.updateItem('four', { $set: { n: 4 } });
+    await queue.flush();
+
+    const retried = db.calls[1].ops.map(op => op.updateOne.filter.id);
+    expect(retried).toEqual(['three', 'four']);
+  });
+
+  test('duplicate-key item inserts are not retried', async () => {
+    const db = fakeDb();
+    const queue = createQueue(db);
+    queue.insertItem({ id: 'a' });
+    queue.insertItem({ id: 'b' });
+    const error = new Error('insert failed');
+    error.writeErrors = [{ index: 0, code: 11000 }, { index: 1, code: 91 }];
+    db.failures.items.push(error);
+
+    await queue.flush();
+
+    expect(queue.itemInserts).toEqual([{ id: 'b' }]);
+    expect(queue.getStats().itemsInserted).toBe(1);
+  });
+
+  test('concurrent flushes write each change once', async () => {
+    const db = fakeDb();
+    const queue = createQueue(db);
+    queue.insertItem({ id: 'a' });
+
+    await Promise.all([queue.flush(), queue.flush()]);
+
+    expect(db.calls).toHaveLength(1);
+  });
+
+  test('exported pending writes import into a new queue', () => {
+    const queue = createQueue(null);
+    queue.insertItem({ id: 'a', _id: 'driver-assigned' });
+    queue.deleteItems(['b']);
+    queue.pullRoomItem('room-1', 'c');
+
+    const restored = createQueue(null);
+    restored.importPending(JSON.parse(JSON.stringify(queue.exportPending())));
+
+    expect(restored.itemInserts).toEqual([{ id: 'a' }]);
+    expect(restored.itemWrites).toEqual([{ deleteMany: { filter: { id: { $in: ['b'] } } } }]);
+    expect(roomChanges(restored)).toEqual([['room-1', ['c'], []]]);
+    expect(restored.getStats().pending).toBe(3);
+  });
+});
@@ -0,0 +1,88 @@
+'use strict';
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const logger = require('../../src/utils/logger');
+const WorldSnapshot = require('../../src/systems/WorldSnapshot');
+
+function fakeEngine(shard = null) {
+  return {
+    shard,
+    players: new Map(),
+    roomSystem: {
+      exportRooms: () => ({ areas: [['town', { id: 'town' }]], rooms: [['room-1', { id: 'room-1', items: ['corpse-1'] }]], itemNames: [] })
+    },
+    npcSystem: {
+      exportNPCs: () => ({ npcs: [{ id: 'goblin-1', health: 7 }], definitions: [] })
+    }
+  };
+}
+
+const pending = { itemInserts: [{ id: 'corpse-1', createdAt: new Date(0) }], itemWrites: [], roomChanges: [['room-1', [], ['corpse-1']]] };
+
+let dir;
+
+beforeAll(() => {
+  logger.setLevel('off', 'snapshot');
+});
+
+afterAll(() => {
+  logger.clearLevel('snapshot');
+});
+
+beforeEach(() => {
+  dir = fs.mkdtempSync(path.join(os.tmpdir(), 'snapshot-test-'));
+});
+
+afterEach(() => {
+  fs.rmSync(dir, { recursive: true, force: true });
+});
+
+async function saveSnapshot(snapshot, engine) {
+  const state = snapshot.capture(engine);
+  await snapshot.save(engine, state, pending);
+}
+
+describe('WorldSnapshot', () => {
+  test('a saved snapshot restores once, dates included', async () => {
+    const snapshot = new WorldSnapshot({ enabled: true, file: path.join(dir, 'world.bin.gz') });
+    const engine = fakeEngine();
+    await saveSnapshot(snapshot, engine);
+
+    const { state, pending: restored } = snapshot.load(engine);
+
+    expect(state.world.rooms).toEqual([['room-1', { id: 'room-1', items: ['corpse-1'] }]]);
+    expect(state.npcs.npcs).toEqual([{ id: 'goblin-1', health: 7 }]);
+    expect(restored).toEqual(pending);
+    // Deserialized outside the test sandbox, so compare the tag rather than the constructor
+    expect(Object.prototype.toString.call(restored.itemInserts[0].createdAt)).toBe('[object Date]');
+    expect(snapshot.load(engine)).toEqual({ state: null, pending: null });
+  });
+
+  test('a stale snapshot still hands back its pending writes', async () => {
+    const snapshot = new WorldSnapshot({ enabled: true, file: path.join(dir, 'world.bin.gz'), maxAgeMs: 1 });
+    const engine = fakeEngine();
+    await saveSnapshot(snapshot, engine);
+    await new Promise(resolve => setTimeout(resolve, 5));
+
+    expect(snapshot.load(engine)).toEqual({ state: null, pending });
+  });
+
+  test('a snapshot from another shard layout still hands back its pending writes', async () => {
+    const snapshot = new WorldSnapshot({ enabled: true, file: path.join(dir, 'world.bin.gz') });
+    await saveSnapshot(snapshot, fakeEngine({ index: 0, assignment: { town: 0 } }));
+
+    const reshard = fakeEngine({ index: 0, assignment: { town: 0, forest: 0 } });
+    expect(snapshot.pathFor(reshard)).toBe(path.join(dir, 'world-shard-0.bin.gz'));
+    expect(snapshot.load(reshard)).toEqual({ state: null, pending });
+  });
+
+  test('a disabled snapshot reads nothing', async () => {
+    const file = path.join(dir, 'world.bin.gz');
+    await saveSnapshot(new WorldSnapshot({ enabled: true, file }), fakeEngine());
+
+    expect(new WorldSnapshot({ enabled: false, file }).load(fakeEngine())).toEqual({ state: null, pending: null });
+    expect(fs.existsSync(file)).toBe(true);
+  });
+});
@@ -0,0 +1,90 @@
+'use strict';
+
+const { StringPool, compactRoom, findExit } = require('../../src/utils/compactRoom');
+
+function room(directions) {
+  return compactRoom({
+    id: 'test:room',
+    areaId: 'test',
+    title: 'Test Room',
+    description: 'A room.',
+    exits: directions.map((direction, i) => ({ direction, roomId: `test:${i}` }))
+  }, new StringPool());
+}
+
+const target = (compact, input) => {
+  const exit = findExit(compact, input);
+  return exit ? exit.direction : null;
+};
+
+describe('findExit', () => {
+  test('compass shortcuts and full names resolve to their exit', () => {
+    const compact = room(['north', 'southwest', 'out']);
+    expect(target(compact, 'n')).toBe('north');
+    expect(target(compact, 'sw')).toBe('southwest');
+    expect(target(compact, 'NORTH')).toBe('north');
+    expect(target(compact, ' out ')).toBe('out');
+  });
+
+  test('a missing compass direction does not match anything', () => {
+    expect(target(room(['north']), 'e')).toBeNull();
+  });
+
+  test('an exact exit name beats a prefix of another exit', () => {
+    const compact = room(['gate house', 'gate']);
+    expect(target(compact, 'gate')).toBe('gate');
+  });
+
+  test('a prefix matches the earlier exit', () => {
+    expect(target(room(['gatehouse', 'gateway']), 'gat')).toBe('gatehouse');
+  });
+
+  test('abbreviated compass directions resolve to the earlier exit', () => {
+    expect(target(room(['east', 'northwest', 'north']), 'nor')).toBe('northwest');
+  });
+
+  test('a named exit prefix competes with compass abbreviations by exit order', () => {
+    expect(target(room(['norton path', 'north']), 'nor')).toBe('norton path');
+    expect(target(room(['north', 'norton path']), 'nor')).toBe('north');
+  });
+
+  test('a trailing word matches the shortest exit ending with it', () => {
+    expect(target(room(['deep old well', 'old well']), 'well')).toBe('old well');
+  });
+
+  test('a substring is the last resort', () => {
+    expect(target(room(['rickety bridge']), 'ckety')).toBe('rickety bridge');
+  });
+
+  test('named exits past the 255th still resolve to their own exit', () => {
+    const names = Array.from({ length: 300 }, (_, i) => `door ${i}`);
+    const compact = room(names);
+    expect(target(compact, 'door 299')).toBe('door 299');
+    expect(target(compact, 'door 256')).toBe('door 256');
+    expect(target(compact, '299')).toBe('door 299');
+  });
+
+  test('empty or non-string input and missing rooms return null', () => {
+    const compact = room(['north']);
+    expect(findExit(compact, '')).toBeNull();
+    expect(findExit(compact, null)).toBeNull();
+    expect(findExit(null, 'north')).toBeNull();
+  });
+});
+
+describe('compactRoom', () => {
+  test('interns shared strings and drops import metadata', () => {
+    const pool = new StringPool();
+    const description = ['A long', 'shared description.'].join(' ');
+    const a = compactRoom({ id: 'a', description, metadata: { source: 'import', town: true } }, pool);
+    const b = compactRoom({ id: 'b', description: ['A long', 'shared description.'].join(' ') }, pool);
+    expect(a.description).toBe(b.description);
+    expect(pool.size).toBe(3);
+    expect(a.metadata).toEqual({ town: true });
+  });
+
+  test('skips exits without a direction', () => {
+    const compact = compactRoom({ id: 'a', exits: [{ roomId: 'b' }, { direction: 'up', roomId: 'c' }] }, new StringPool());
+    expect(compact.exits.map(exit => exit.direction)).toEqual(['up']);
+  });
+});
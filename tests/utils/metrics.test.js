@@ -0,0 +1,98 @@
+'use strict';
+
+const metrics = require('../../src/utils/metrics');
+
+const { Histogram } = metrics;
+
+describe('metrics Histogram', () => {
+  test('latency quantiles stay within the bucket precision and never pass the max', () => {
+    const histogram = new Histogram('latency_ms', 'Latency');
+    for (let ms = 1; ms <= 1000; ms++) histogram.observe(ms);
+
+    const { count, mean, p50, p90, p99, max } = histogram.get();
+    expect([count, mean, max]).toEqual([1000, 500.5, 1000]);
+    for (const [quantile, exact] of [[p50, 500], [p90, 900], [p99, 990]]) {
+      expect(quantile).toBeGreaterThanOrEqual(exact);
+      expect(quantile).toBeLessThanOrEqual(exact * 1.125);
+    }
+  });
+
+  test('values below 16 microseconds are exact', () => {
+    const histogram = new Histogram('latency_ms', 'Latency');
+    histogram.observe(0.003);
+    histogram.observe(0.009);
+
+    expect(histogram.get()).toMatchObject({ p50: 0.004, max: 0.009 });
+  });
+
+  test('labelled series are kept apart', () => {
+    const histogram = new Histogram('command_ms', 'Command latency');
+    histogram.observe(5, { command: 'look' });
+    histogram.observe(50, { command: 'attack' });
+
+    expect(histogram.get({ command: 'look' }).max).toBe(5);
+    expect(histogram.summarize().map(series => series.labels.command)).toEqual(['look', 'attack']);
+    expect(histogram.get({ command: 'say' })).toBeNull();
+  });
+
+  test('with a resolution it counts exact values', () => {
+    const histogram = new Histogram('damage', 'Damage', { resolution: 1 });
+    for (const value of [3, 1, 2, 2, 9.6]) histogram.observe(value);
+
+    expect(histogram.entries()).toEqual([[1, 1], [2, 2], [3, 1], [10, 1]]);
+    expect(histogram.get()).toMatchObject({ count: 5, p50: 2, p90: 9.6, max: 9.6 });
+  });
+
+  test('merge adds every labelled series', () => {
+    const a = new Histogram('latency', 'Latency', { resolution: 0.1 });
+    const b = new Histogram('latency', 'Latency', { resolution: 0.1 });
+    a.observe(1.2, { behavior: 'look' });
+    b.observe(1.2, { behavior: 'look' });
+    b.observe(5, { behavior: 'look' });
+    b.observe(0.5, { behavior: 'walk' });
+
+    a.merge(b);
+
+    expect(a.get({ behavior: 'look' })).toMatchObject({ count: 3, max: 5 });
+    expect(a.entries({ behavior: 'look' })).toEqual([[1.2, 2], [5, 1]]);
+    expect(a.get({ behavior: 'walk' }).count).toBe(1);
+  });
+
+  test('toJSON and fromJSON round trip through structured clone', () => {
+    const histogram = new Histogram('gem_value', 'Gem value', { resolution: 10 });
+    histogram.observe(24);
+    histogram.observe(51);
+
+    const copy = Histogram.fromJSON(structuredClone(histogram.toJSON()));
+
+    expect(copy.resolution).toBe(10);
+    expect(copy.entries()).toEqual(histogram.entries());
+    expect(copy.get()).toEqual(histogram.get());
+  });
+});
+
+describe('metrics registry', () => {
+  afterEach(() => {
+    metrics.metrics.clear();
+    metrics.gauges.clear();
+  });
+
+  test('exports counters, histograms and gauges as Prometheus text', () => {
+    metrics.counter('test_commands_total', 'Commands').inc({ command: 'say "hi"' }, 2);
+    metrics.histogram('test_tick_ms', 'Tick time').observe(4);
+    metrics.gauge('test_players', 'Players online', () => 3);
+
+    const text = metrics.toPrometheus();
+
+    expect(text).toContain('# TYPE test_commands_total counter');
+    expect(text).toContain('test_commands_total{command="say \\"hi\\""} 2');
+    expect(text).toContain('# TYPE test_tick_ms summary');
+    expect(text).toContain('test_tick_ms{quantile="0.5"} 4');
+    expect(text).toContain('test_tick_ms_count 1');
+    expect(text).toContain('test_players 3');
+  });
+
+  test('the registry hands back the same metric for a name', () => {
+    expect(metrics.counter('test_total', 'Total')).toBe(metrics.counter('test_total', 'Total'));
+  });
+});
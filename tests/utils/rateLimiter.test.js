@@ -0,0 +1,40 @@
+'use strict';
+
+const { RateLimiter } = require('../../src/utils/rateLimiter');
+
+describe('RateLimiter', () => {
+  test('a key is limited once it uses up its window and free again when the window ends', () => {
+    const limiter = new RateLimiter({ limit: 2, windowMs: 1000 });
+
+    expect(limiter.hit('1.2.3.4', 0)).toBe(false);
+    expect(limiter.isLimited('1.2.3.4', 10)).toBe(false);
+    expect(limiter.hit('1.2.3.4', 10)).toBe(false);
+    expect(limiter.isLimited('1.2.3.4', 20)).toBe(true);
+    expect(limiter.hit('1.2.3.4', 20)).toBe(true);
+    expect(limiter.retryAfterMs('1.2.3.4', 400)).toBe(600);
+
+    expect(limiter.isLimited('1.2.3.4', 1000)).toBe(false);
+    expect(limiter.retryAfterMs('1.2.3.4', 1000)).toBe(0);
+  });
+
+  test('keys are counted separately and reset forgets one', () => {
+    const limiter = new RateLimiter({ limit: 1, windowMs: 1000 });
+    limiter.hit('a', 0);
+    limiter.hit('b', 0);
+    limiter.reset('a');
+
+    expect(limiter.isLimited('a', 1)).toBe(false);
+    expect(limiter.isLimited('b', 1)).toBe(true);
+  });
+
+  test('expired windows are pruned once the map grows', () => {
+    const limiter = new RateLimiter({ limit: 1, windowMs: 1000 });
+    for (let i = 0; i < 1000; i++) {
+      limiter.hit(`ip-${i}`, 0);
+    }
+
+    limiter.hit('late', 5000);
+
+    expect(limiter.windows.size).toBe(1);
+  });
+});